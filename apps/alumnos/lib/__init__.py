@@ -0,0 +1 @@
+# Lib package for alumnos app
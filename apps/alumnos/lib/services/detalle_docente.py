@@ -0,0 +1,230 @@
+"""
+Servicio de datos para la vista de detalle de un docente.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+from apps.core.models import Curso
+from apps.core.lib.services.cache import CacheService
+from apps.core.lib.utils.concurrencia import ejecutar_en_paralelo
+from apps.docentes.models import Docente
+from apps.evaluacion.models import Respuesta
+from apps.evaluacion.lib.services.catalogo import CatalogoPreguntasService
+from apps.evaluacion.lib.services.comentarios import AnalisisComentariosService
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+
+
+class DetalleDocenteService:
+    """Servicio para construir el detalle de cursos, módulos y comentarios de un docente."""
+
+    @staticmethod
+    def get_detalle(docente_id, periodo_id=None) -> Optional[Dict]:
+        """
+        Obtiene los datos del detalle de un docente.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            periodo_id: ID del periodo a mostrar (si es None, todos los periodos)
+
+        Returns:
+            Diccionario con el contexto de la plantilla o None si el docente no existe
+        """
+        return DetalleDocenteService._armar(
+            *(
+                consulta()
+                for consulta in DetalleDocenteService._consultas(docente_id, periodo_id)
+            )
+        )
+
+    @staticmethod
+    async def aget_detalle(docente_id, periodo_id=None) -> Optional[Dict]:
+        """
+        Versión asíncrona de get_detalle: todas las consultas filtran por el ID
+        del docente, por lo que se ejecutan a la vez.
+        """
+        return DetalleDocenteService._armar(
+            *await ejecutar_en_paralelo(
+                *DetalleDocenteService._consultas(docente_id, periodo_id)
+            )
+        )
+
+    @staticmethod
+    def get_evaluaciones(docente_id, periodo_id=None) -> Dict:
+        """
+        Obtiene desde caché los promedios recibidos por un docente.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            periodo_id: ID del periodo (si es None, todos los periodos)
+
+        Returns:
+            Diccionario con "cursos", "preguntas" y "modulos" (ver
+            calcular_desglose)
+        """
+        return CacheService.get_or_set(
+            InvalidacionService.namespace_para(periodo_id),
+            f"detalle_docente:{docente_id}",
+            lambda: DetalleDocenteService.calcular_desglose(docente_id, periodo_id),
+            InvalidacionService.TIMEOUT_PERIODO,
+        )
+
+    @staticmethod
+    def calcular_desglose(docente_id, periodo_id=None) -> Dict:
+        """
+        Calcula promedios y evaluadores únicos por curso, módulo y pregunta.
+
+        Las respuestas enviadas del docente se leen con una sola consulta y
+        se recorren una vez, acumulando suma, total y estudiantes de cada
+        curso, pregunta y módulo a la vez.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            periodo_id: ID del periodo (si es None, todos los periodos)
+
+        Returns:
+            Diccionario {"cursos": {...}, "preguntas": {...}, "modulos": {...}};
+            cada uno es {id: {"promedio": float, "respuestas": int,
+            "num_estudiantes": int}}
+        """
+        respuestas = Respuesta.objects.filter(
+            evaluacion__docente_id=docente_id, evaluacion__estado="enviada"
+        )
+        if periodo_id is not None:
+            respuestas = respuestas.filter(evaluacion__periodo_id=periodo_id)
+
+        filas = respuestas.values_list(
+            "evaluacion__curso_id",
+            "pregunta_id",
+            "pregunta__id_modulo_id",
+            "evaluacion__estudiante_id",
+            "puntuacion",
+        ).order_by()
+
+        # [suma, total, estudiantes] por ID
+        cursos = defaultdict(lambda: [0, 0, set()])
+        preguntas = defaultdict(lambda: [0, 0, set()])
+        modulos = defaultdict(lambda: [0, 0, set()])
+
+        for curso_id, pregunta_id, modulo_id, estudiante_id, puntuacion in filas.iterator(
+            chunk_size=2000
+        ):
+            for acumulado, clave in (
+                (cursos, curso_id),
+                (preguntas, pregunta_id),
+                (modulos, modulo_id),
+            ):
+                # Respuestas antiguas sin pregunta solo cuentan para el curso
+                if clave is None:
+                    continue
+                fila = acumulado[clave]
+                fila[0] += puntuacion
+                fila[1] += 1
+                fila[2].add(estudiante_id)
+
+        def resumir(acumulado):
+            return {
+                clave: {
+                    "promedio": suma / total,
+                    "respuestas": total,
+                    "num_estudiantes": len(estudiantes),
+                }
+                for clave, (suma, total, estudiantes) in acumulado.items()
+            }
+
+        return {
+            "cursos": resumir(cursos),
+            "preguntas": resumir(preguntas),
+            "modulos": resumir(modulos),
+        }
+
+    @staticmethod
+    def _consultas(docente_id, periodo_id=None) -> List:
+        """Consultas independientes del detalle, en el orden que espera _armar."""
+        return [
+            lambda: Docente.objects.select_related("usuario")
+            .filter(pk=docente_id)
+            .first(),
+            lambda: list(Curso.objects.filter(docente_id=docente_id)),
+            lambda: DetalleDocenteService.get_evaluaciones(docente_id, periodo_id),
+            CatalogoPreguntasService.get_catalogo,
+            # Resumen de comentarios precalculado, en lugar de todos los comentarios
+            lambda: AnalisisComentariosService.get_resumen(docente_id, periodo_id),
+        ]
+
+    @staticmethod
+    def _armar(
+        docente: Optional[Docente],
+        cursos: List[Curso],
+        evaluaciones: Dict,
+        catalogo: Dict,
+        resumen_comentarios: Optional[Dict],
+    ) -> Optional[Dict]:
+        if docente is None:
+            return None
+
+        cursos_info = []
+        total_puntuacion = 0
+        cursos_evaluados = 0
+
+        # Procesar los cursos y sus evaluaciones
+        for curso in cursos:
+            resumen_curso = evaluaciones["cursos"].get(curso.pk, {})
+            promedio = resumen_curso.get("promedio")
+
+            cursos_info.append(
+                {
+                    "curso": curso,
+                    "promedio": promedio,
+                    "num_estudiantes": resumen_curso.get("num_estudiantes", 0),
+                }
+            )
+
+            # Acumular para el promedio general
+            if promedio:
+                total_puntuacion += float(promedio)
+                cursos_evaluados += 1
+
+        promedio_general = (
+            round(total_puntuacion / cursos_evaluados, 2) if cursos_evaluados > 0 else None
+        )
+
+        # Puntuación por módulo y pregunta
+        modulos_puntuacion = {}
+        for modulo, preguntas in catalogo["modulos"].items():
+            preguntas_info = []
+            total_puntuacion_modulo = 0
+
+            for pregunta in preguntas:
+                resumen_pregunta = evaluaciones["preguntas"].get(pregunta.pk)
+                if resumen_pregunta:
+                    preguntas_info.append(
+                        {
+                            "pregunta": pregunta,
+                            "promedio": resumen_pregunta["promedio"],
+                            "num_estudiantes": resumen_pregunta["num_estudiantes"],
+                        }
+                    )
+                    total_puntuacion_modulo += float(resumen_pregunta["promedio"])
+
+            # Solo incluir el módulo si tiene preguntas con respuestas
+            if preguntas_info:
+                modulos_puntuacion[modulo] = {
+                    "preguntas": preguntas_info,
+                    "promedio_modulo": round(
+                        total_puntuacion_modulo / len(preguntas_info), 2
+                    ),
+                    "preguntas_con_respuestas": len(preguntas_info),
+                    "num_estudiantes": evaluaciones["modulos"]
+                    .get(modulo.pk, {})
+                    .get("num_estudiantes", 0),
+                }
+
+        return {
+            "docente": docente,
+            "cursos": cursos_info,
+            "promedio_general": promedio_general,
+            "cursos_evaluados": cursos_evaluados,
+            "total_cursos": len(cursos_info),
+            "modulos_puntuacion": modulos_puntuacion,
+            "resumen_comentarios": resumen_comentarios,
+        }
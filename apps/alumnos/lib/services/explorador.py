@@ -0,0 +1,234 @@
+"""
+Servicio de datos para la vista de exploración de docentes.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from django.core.paginator import Paginator
+from django.db.models import Count
+from apps.alumnos.models import Estudiante
+from apps.core.models import Curso, Matricula
+from apps.core.lib.utils.concurrencia import ejecutar_en_paralelo
+from apps.docentes.models import Docente
+from apps.evaluacion.models import Evaluacion
+from apps.evaluacion.lib.services.busqueda import BusquedaService
+from apps.evaluacion.lib.services.resumen import ResumenService
+
+
+class ExploradorService:
+    """Servicio para construir el listado paginado de docentes."""
+
+    DOCENTES_POR_PAGINA = 12
+
+    @staticmethod
+    def buscar_docentes(query: str = ""):
+        """
+        Obtiene los docentes que coinciden con la búsqueda.
+
+        Args:
+            query: Texto a buscar en el nombre o departamento del docente o
+                en el código o nombre de sus cursos
+
+        Returns:
+            Sin búsqueda, QuerySet de docentes ordenado por nombre; con
+            búsqueda, lista de IDs de docentes por relevancia
+        """
+        if query:
+            return BusquedaService.buscar_docentes(query)
+        return Docente.objects.select_related("usuario").order_by("usuario__nombre", "pk")
+
+    @staticmethod
+    def get_pagina(
+        alumno: Estudiante,
+        query: str = "",
+        numero_pagina: Optional[str] = None,
+        por_pagina: Optional[int] = None,
+    ) -> Dict:
+        """
+        Obtiene una página del explorador con las estadísticas de cada docente.
+
+        El número de consultas es constante: conteo y página de docentes,
+        cursos de la página, promedios agrupados por curso, estudiantes
+        distintos por curso y matrículas del alumno.
+
+        Args:
+            alumno: Estudiante que consulta el explorador
+            query: Texto de búsqueda
+            numero_pagina: Número de página solicitado
+            por_pagina: Cantidad de docentes por página
+
+        Returns:
+            Diccionario con la página y los datos de cada docente
+        """
+        pagina, docentes = ExploradorService._get_docentes(
+            query, numero_pagina, por_pagina
+        )
+        if not docentes:
+            return {"pagina": pagina, "data": []}
+
+        docentes_ids = [docente.pk for docente in docentes]
+        return {
+            "pagina": pagina,
+            "data": ExploradorService._armar(
+                docentes,
+                ExploradorService._get_cursos(docentes_ids),
+                ExploradorService._get_promedios(docentes_ids),
+                ExploradorService._get_num_estudiantes(docentes_ids),
+                ExploradorService._get_matriculas(alumno.pk),
+            ),
+        }
+
+    @staticmethod
+    async def aget_pagina(
+        alumno_id,
+        query: str = "",
+        numero_pagina: Optional[str] = None,
+        por_pagina: Optional[int] = None,
+    ) -> Dict:
+        """
+        Versión asíncrona de get_pagina para las vistas servidas por ASGI.
+
+        Las mismas consultas se ejecutan en dos rondas paralelas: la página
+        de docentes con las matrículas del alumno, y luego los cursos,
+        promedios y estudiantes de los docentes de la página.
+
+        Args:
+            alumno_id: ID del estudiante (su usuario)
+            query: Texto de búsqueda
+            numero_pagina: Número de página solicitado
+            por_pagina: Cantidad de docentes por página
+
+        Returns:
+            Diccionario con la página y los datos de cada docente
+        """
+        (pagina, docentes), matriculas = await ejecutar_en_paralelo(
+            lambda: ExploradorService._get_docentes(query, numero_pagina, por_pagina),
+            lambda: ExploradorService._get_matriculas(alumno_id),
+        )
+        if not docentes:
+            return {"pagina": pagina, "data": []}
+
+        docentes_ids = [docente.pk for docente in docentes]
+        cursos, promedios, num_estudiantes = await ejecutar_en_paralelo(
+            lambda: ExploradorService._get_cursos(docentes_ids),
+            lambda: ExploradorService._get_promedios(docentes_ids),
+            lambda: ExploradorService._get_num_estudiantes(docentes_ids),
+        )
+        return {
+            "pagina": pagina,
+            "data": ExploradorService._armar(
+                docentes, cursos, promedios, num_estudiantes, matriculas
+            ),
+        }
+
+    @staticmethod
+    def _get_docentes(
+        query: str, numero_pagina: Optional[str], por_pagina: Optional[int]
+    ) -> Tuple:
+        """Página solicitada y lista de sus docentes."""
+        paginator = Paginator(
+            ExploradorService.buscar_docentes(query),
+            por_pagina or ExploradorService.DOCENTES_POR_PAGINA,
+        )
+        pagina = paginator.get_page(numero_pagina)
+        if not query:
+            return pagina, list(pagina.object_list)
+
+        # La búsqueda pagina los IDs; los docentes se leen en su orden
+        docentes = Docente.objects.select_related("usuario").in_bulk(pagina.object_list)
+        return pagina, [docentes[pk] for pk in pagina.object_list if pk in docentes]
+
+    @staticmethod
+    def _get_cursos(docentes_ids: List) -> Dict:
+        """Cursos de los docentes de la página, por docente."""
+        cursos_por_docente = defaultdict(list)
+        for curso in Curso.objects.filter(docente_id__in=docentes_ids).order_by(
+            "nombre"
+        ):
+            cursos_por_docente[curso.docente_id].append(curso)
+        return cursos_por_docente
+
+    @staticmethod
+    def _get_promedios(docentes_ids: List) -> Dict:
+        """Promedio de respuestas por (curso, docente) desde el acumulado."""
+        return ResumenService.get_promedios(
+            ("curso", "docente"), docente_id__in=docentes_ids
+        )
+
+    @staticmethod
+    def _get_num_estudiantes(docentes_ids: List) -> Dict:
+        """Estudiantes distintos que evaluaron cada (curso, docente)."""
+        return {
+            (fila["curso"], fila["docente"]): fila["total"]
+            for fila in Evaluacion.objects.filter(
+                docente_id__in=docentes_ids, estado="enviada"
+            )
+            .values("curso", "docente")
+            .annotate(total=Count("estudiante", distinct=True))
+            .order_by()
+        }
+
+    @staticmethod
+    def _get_matriculas(alumno_id) -> Tuple[Set, Set]:
+        """Cursos matriculados y docentes evaluables según las matrículas activas."""
+        cursos_matriculados = set()
+        docentes_evaluables = set()
+        for curso_id, docente_id in Matricula.objects.filter(
+            estudiante_id=alumno_id, estado="activa"
+        ).values_list("curso_id", "curso__docente_id"):
+            cursos_matriculados.add(curso_id)
+            docentes_evaluables.add(docente_id)
+        return cursos_matriculados, docentes_evaluables
+
+    @staticmethod
+    def _armar(
+        docentes: List[Docente],
+        cursos_por_docente: Dict,
+        promedios: Dict,
+        num_estudiantes: Dict,
+        matriculas: Tuple[Set, Set],
+    ) -> List[Dict]:
+        """Combina los datos consultados en la lista que muestra la plantilla."""
+        cursos_matriculados, docentes_evaluables = matriculas
+
+        data = []
+        for docente in docentes:
+            cursos_info = []
+            total_puntuacion = 0
+            cursos_evaluados = 0
+
+            for curso in cursos_por_docente[docente.pk]:
+                clave = (curso.pk, docente.pk)
+                promedio = promedios.get(clave, {}).get("promedio")
+                curso.estudiante_matriculado = curso.pk in cursos_matriculados
+
+                cursos_info.append(
+                    {
+                        "curso": curso,
+                        "promedio": promedio,
+                        "num_estudiantes": num_estudiantes.get(clave, 0),
+                    }
+                )
+
+                if promedio:
+                    total_puntuacion += float(promedio)
+                    cursos_evaluados += 1
+
+            promedio_general = None
+            if cursos_evaluados > 0:
+                promedio_general = round(total_puntuacion / cursos_evaluados, 2)
+
+            docente.es_evaluable = docente.pk in docentes_evaluables
+
+            data.append(
+                {
+                    "docente": docente,
+                    "cursos": cursos_info,
+                    "promedio_general": promedio_general,
+                    "cursos_evaluados": cursos_evaluados,
+                    "total_cursos": len(cursos_info),
+                    "es_evaluable": docente.es_evaluable,
+                }
+            )
+
+        return data
@@ -1,3 +1,83 @@
+from unittest import mock
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db import DatabaseError
 from django.test import TestCase
+from django.urls import reverse
+from apps.core.models import Curso, Matricula
+from apps.evaluacion.lib.services.envio import EnvioEvaluacionService
+from apps.evaluacion.models import Evaluacion, Respuesta, ResumenPuntuacion
+from apps.evaluacion.tests import crear_datos_evaluacion
+from apps.usuarios.lib.services.sesion import SesionService
 
-# Create your tests here.
+
+class ProcesarEvaluacionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        crear_datos_evaluacion(cls)
+
+    def setUp(self):
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = SesionService.crear_sesion(
+            self.alumno.usuario
+        )
+        self.url = reverse("alumno:evaluaciones", args=[self.alumno.usuario_id])
+
+    def enviar(self, curso, *valores):
+        datos = {
+            "curso_id": str(curso.id),
+            "docente_id": str(curso.docente_id),
+            "comentario_general": "Explica con claridad",
+        }
+        for pregunta, valor in zip(self.preguntas, valores):
+            datos[f"pregunta_{pregunta.id_pregunta}"] = valor
+        return self.client.post(self.url, datos)
+
+    def test_envio_valido(self):
+        respuesta = self.enviar(self.curso, "5", "4", "3")
+
+        self.assertRedirects(respuesta, self.url, fetch_redirect_response=False)
+        evaluacion = Evaluacion.objects.get(estudiante=self.alumno, curso=self.curso)
+        self.assertEqual(evaluacion.periodo, self.periodo)
+        self.assertEqual(evaluacion.respuestas.count(), 3)
+
+    def test_una_puntuacion_invalida_rechaza_todo_el_envio(self):
+        self.enviar(self.curso, "5", "9", "3")
+
+        self.assertFalse(Evaluacion.objects.exists())
+        self.assertFalse(Respuesta.objects.exists())
+        self.assertFalse(ResumenPuntuacion.objects.exists())
+
+    def test_curso_sin_matricula_no_se_evalua(self):
+        otro_curso = Curso.objects.create(
+            nombre="Redes", codigo="RED", semestre="1", docente=self.docente
+        )
+
+        self.enviar(otro_curso, "5", "4", "3")
+
+        self.assertFalse(Evaluacion.objects.exists())
+
+    def test_matricula_retirada_no_se_evalua(self):
+        Matricula.objects.filter(estudiante=self.alumno).update(estado="retirada")
+
+        self.enviar(self.curso, "5", "4", "3")
+
+        self.assertFalse(Evaluacion.objects.exists())
+
+    def test_id_mal_formado_muestra_un_mensaje_generico(self):
+        with self.assertLogs("sed.alumnos", "ERROR"):
+            respuesta = self.client.post(
+                self.url, {"curso_id": "no-es-un-id", "docente_id": "no-es-un-id"}
+            )
+
+        self.assertRedirects(respuesta, self.url, fetch_redirect_response=False)
+        mensajes = [str(mensaje) for mensaje in get_messages(respuesta.wsgi_request)]
+        self.assertEqual(
+            mensajes, ["No se pudo procesar la evaluación. Revise los datos enviados."]
+        )
+
+    def test_otros_errores_no_se_ocultan(self):
+        with mock.patch.object(
+            EnvioEvaluacionService, "registrar", side_effect=DatabaseError("fallo")
+        ):
+            with self.assertRaises(DatabaseError):
+                self.enviar(self.curso, "5", "4", "3")
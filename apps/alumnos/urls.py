@@ -9,4 +9,5 @@ urlpatterns = [
     path("evaluaciones/<uuid:usuario_id>/",views.evaluar_docente,name="evaluaciones",),
     path("explorar/<uuid:usuario_id>/", views.explorar, name="explorar"),
     path("detalle_docente/<uuid:usuario_id>/<uuid:docente_id>/", views.detalle_docente, name="detalle_docente"),
+    path("docentes_curso/<uuid:curso_id>/", views.obtener_docentes_por_curso, name="docentes_por_curso"),
 ]
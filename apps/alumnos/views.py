@@ -1,50 +1,58 @@
-from collections import defaultdict
+import logging
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.http import JsonResponse
-from django.shortcuts import redirect, render, get_object_or_404
-from django.db.models import Avg, Q
+from django.core.exceptions import ValidationError
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404, redirect, render, get_object_or_404
 from apps.alumnos.models import Estudiante
 from apps.core.models import Curso , Matricula
+from apps.core.lib.utils.concurrencia import ejecutar_en_paralelo
 from apps.docentes.models import Docente
-from apps.evaluacion.models import (
-    Evaluacion,
-    ModuloPreguntas,
-    PreguntaModulo,
-    Respuesta,
-)
+from apps.evaluacion.models import Evaluacion
 from apps.evaluacion.models import PeriodoEvaluacion
+from apps.alumnos.lib.services.detalle_docente import DetalleDocenteService
+from apps.alumnos.lib.services.explorador import ExploradorService
+from apps.evaluacion.lib.services.catalogo import CatalogoPreguntasService
+from apps.evaluacion.lib.services.envio import EnvioEvaluacionService
+from apps.usuarios.lib.services.sesion import SesionService
+
+logger = logging.getLogger("sed.alumnos")
 
 
 def bienvenida_alumnos(request, usuario_id):
     print(f"Usuario recibido: {usuario_id}")
-    alumno = get_object_or_404(Estudiante, usuario__id=usuario_id)
+    alumno = SesionService.get_perfil_o_404(request, Estudiante, usuario_id)
     return render(request, "bienvenida_alumno.html",
                    {"alumno": alumno,
                      "usuario_id": usuario_id
                     })
 
 
-def perfil_alumno(request, usuario_id):
-    print(f"Usuario recibido: {usuario_id}")
+async def perfil_alumno(request, usuario_id):
+    """Perfil del alumno; las consultas independientes se ejecutan a la vez"""
+    alumno = await SesionService.aget_perfil_o_404(request, Estudiante, usuario_id)
+    cursos_matriculados, evaluaciones_count, cursos_evaluados = (
+        await ejecutar_en_paralelo(
+            # Obtener cursos matriculados
+            lambda: [
+                matricula.curso
+                for matricula in Matricula.objects.filter(
+                    estudiante_id=usuario_id
+                ).select_related("curso")
+            ],
+            # Obtener número de evaluaciones realizadas por el alumno
+            lambda: Evaluacion.objects.filter(estudiante_id=usuario_id).count(),
+            # Obtener número de cursos que ha evaluado (distintos)
+            lambda: Evaluacion.objects.filter(estudiante_id=usuario_id)
+            .values("curso")
+            .distinct()
+            .count(),
+        )
+    )
 
-    alumno = get_object_or_404(Estudiante, usuario__id=usuario_id)
-    cursos_matriculados = []
-    matriculas = Matricula.objects.filter(estudiante=alumno).select_related('curso')
-    
-    # Obtener cursos matriculados
-    for matricula in matriculas: 
-        cursos_matriculados.append(matricula.curso)
-    
-    # Obtener número de evaluaciones realizadas por el alumno
-    evaluaciones_count = Evaluacion.objects.filter(estudiante=alumno).count()
-    
-    # Obtener número de cursos que ha evaluado (distintos)
-    cursos_evaluados = Evaluacion.objects.filter(estudiante=alumno).values('curso').distinct().count()
-    
-    print(f"Alumno encontrado: {alumno} con {len(cursos_matriculados)} cursos")
-    return render(
+    return await sync_to_async(render)(
         request, "perfil_alumno.html", {
-            "usuario_id": usuario_id, 
+            "usuario_id": usuario_id,
             "alumno": alumno,
             "cursos": cursos_matriculados,
             "cursos_count": len(cursos_matriculados),
@@ -56,7 +64,7 @@ def perfil_alumno(request, usuario_id):
 
 def evaluar_docente(request, usuario_id):
     # Obtener el estudiante
-    alumno = get_object_or_404(Estudiante, usuario__id=usuario_id)
+    alumno = SesionService.get_perfil_o_404(request, Estudiante, usuario_id)
 
     if request.method == "POST":
         return procesar_evaluacion(request, alumno)
@@ -68,9 +76,8 @@ def evaluar_docente(request, usuario_id):
 def mostrar_formulario_evaluacion(request, alumno, usuario_id):
     """Mostrar el formulario de evaluación"""
 
-    # Obtener todas las preguntas organizadas por módulo
-    preguntas = PreguntaModulo.objects.select_related("id_modulo").all()
-    modulos = ModuloPreguntas.objects.all()
+    # Módulos y preguntas desde el catálogo en caché
+    catalogo = CatalogoPreguntasService.get_catalogo()
     
     # Obtener períodos de evaluación y la fecha actual
     from django.utils import timezone
@@ -84,11 +91,6 @@ def mostrar_formulario_evaluacion(request, alumno, usuario_id):
         estado='activo'
     ).exists()
 
-    # Organizar preguntas por módulo
-    modulo_dict = defaultdict(list)
-    for pregunta in preguntas:
-        modulo_dict[pregunta.id_modulo].append(pregunta)
-
     # Obtener solo los cursos en los que el estudiante está matriculado
     from apps.core.models import Matricula
     matriculas = Matricula.objects.filter(estudiante=alumno, estado='activa')
@@ -100,8 +102,8 @@ def mostrar_formulario_evaluacion(request, alumno, usuario_id):
     context = {
         "usuario_id": usuario_id,
         "alumno": alumno,
-        "modulos": modulos,
-        "modulo_dict": dict(modulo_dict),  # Convertir defaultdict a dict normal
+        "modulos": list(catalogo["modulos"]),
+        "modulo_dict": catalogo["modulos"],
         "cursos_disponibles": cursos_disponibles,
         "evaluaciones_existentes": evaluaciones_existentes,
         "periodo": periodo,
@@ -119,12 +121,6 @@ def procesar_evaluacion(request, alumno):
         from django.utils import timezone
         today = timezone.now().date()
         
-        # Buscar si hay algún periodo de evaluación configurado
-        periodos = PeriodoEvaluacion.objects.all()
-        if not periodos.exists():
-            messages.error(request, "No hay periodos de evaluación configurados en el sistema.")
-            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario.id)
-        
         # Verificar si hay un periodo activo actual
         periodo_activo = PeriodoEvaluacion.objects.filter(
             fecha_inicio__lte=today,
@@ -133,6 +129,11 @@ def procesar_evaluacion(request, alumno):
         ).first()
         
         if not periodo_activo:
+            # Buscar si hay algún periodo de evaluación configurado
+            if not PeriodoEvaluacion.objects.exists():
+                messages.error(request, "No hay periodos de evaluación configurados en el sistema.")
+                return redirect("alumno:evaluaciones", usuario_id=alumno.usuario_id)
+
             # Verificar si el periodo finalizó o aún no comienza
             periodo_pasado = PeriodoEvaluacion.objects.filter(
                 fecha_fin__lt=today
@@ -149,7 +150,7 @@ def procesar_evaluacion(request, alumno):
             else:
                 messages.error(request, "No hay un periodo de evaluación activo en este momento.")
                 
-            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario.id)
+            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario_id)
             
         # Obtener datos del formulario
         curso_id = request.POST.get("curso_id")
@@ -157,7 +158,7 @@ def procesar_evaluacion(request, alumno):
 
         if not curso_id or not docente_id:
             messages.error(request, "Debe seleccionar un curso y docente")
-            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario.id)
+            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario_id)
 
         curso = get_object_or_404(Curso, id=curso_id)
         docente = get_object_or_404(Docente, pk=docente_id)
@@ -172,95 +173,49 @@ def procesar_evaluacion(request, alumno):
         
         if not matricula_existe:
             messages.error(request, "No puede evaluar un curso en el que no está matriculado")
-            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario.id)
+            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario_id)
 
-        # Crear o obtener la evaluación principal
-        evaluacion, created = Evaluacion.objects.get_or_create(
-            estudiante=alumno,
-            curso=curso,
-            docente=docente,
-            defaults={
-                "estado": "enviada",
-                "comentario_general": request.POST.get("comentario_general", ""),
-            },
+        # Validar todas las respuestas antes de escribir
+        puntuaciones, errores = EnvioEvaluacionService.leer_puntuaciones(
+            request.POST, CatalogoPreguntasService.get_catalogo()["preguntas_ids"]
+        )
+        if errores:
+            for error in errores:
+                messages.error(request, error)
+            return redirect("alumno:evaluaciones", usuario_id=alumno.usuario_id)
+
+        # Guardar la evaluación y sus respuestas en una sola transacción
+        resultado = EnvioEvaluacionService.registrar(
+            alumno,
+            curso,
+            docente,
+            request.POST.get("comentario_general", ""),
+            puntuaciones,
+            periodo_activo,
         )
-
-        # Si la evaluación ya existía, actualizar el comentario general
-        if not created:
-            evaluacion.comentario_general = request.POST.get("comentario_general", "")
-            evaluacion.save()
-
-        # Obtener todas las preguntas
-        preguntas = PreguntaModulo.objects.all()
-        respuestas_creadas = 0
-        respuestas_actualizadas = 0
-
-        # Mapeo de valores numéricos a texto descriptivo
-        criterio_texto = {
-            "1": "Muy Deficiente",
-            "2": "Deficiente",
-            "3": "Regular",
-            "4": "Bueno",
-            "5": "Excelente",
-        }
-
-        for pregunta in preguntas:
-            criterio_valor = request.POST.get(f"pregunta_{pregunta.id_pregunta}")
-            print(
-                f"Procesando pregunta {pregunta.id_pregunta}, criterio recibido: {criterio_valor}"
-            )
-
-            if criterio_valor:
-                try:
-                    # Obtener el texto descriptivo del criterio
-                    criterio_texto_valor = criterio_texto.get(
-                        criterio_valor, "Sin calificar"
-                    )
-
-                    # Crear o actualizar la respuesta
-                    respuesta, created = evaluacion.respuestas.get_or_create(
-                        pregunta=pregunta,
-                        defaults={
-                            "criterio": criterio_texto_valor,
-                            "puntuacion": int(criterio_valor),
-                        },
-                    )
-
-                    if not created:
-                        respuesta.criterio = criterio_texto_valor
-                        respuesta.puntuacion = int(criterio_valor)
-                        respuesta.save()
-                        respuestas_actualizadas += 1
-                        print(
-                            f"Respuesta actualizada para pregunta {pregunta.id_pregunta}"
-                        )
-                    else:
-                        respuestas_creadas += 1
-                        print(
-                            f"Nueva respuesta creada para pregunta {pregunta.id_pregunta}"
-                        )
-                except Exception as e:
-                    print(f"Error procesando pregunta {pregunta.id_pregunta}: {str(e)}")
-                    messages.error(request, f"Error procesando la pregunta: {str(e)}")
 
         messages.success(
             request,
-            f"Evaluación completada exitosamente. Nuevas respuestas: {respuestas_creadas}, actualizadas: {respuestas_actualizadas}.",
+            f"Evaluación completada exitosamente. Nuevas respuestas: {resultado['creadas']}, actualizadas: {resultado['actualizadas']}.",
         )
-    except Exception as e:
-        print(f"Error general en procesar_evaluacion: {str(e)}")
-        messages.error(request, f"Error al procesar la evaluación: {str(e)}")
+    except ValidationError:
+        # IDs mal formados en el formulario; cualquier otro error se propaga
+        logger.exception("No se pudo procesar la evaluación")
+        messages.error(request, "No se pudo procesar la evaluación. Revise los datos enviados.")
 
-    return redirect("alumno:evaluaciones", usuario_id=alumno.usuario.id)
+    return redirect("alumno:evaluaciones", usuario_id=alumno.usuario_id)
 
 
 # Vista adicional para obtener docentes por curso (AJAX)
-def obtener_docentes_por_curso(request, curso_id):
+async def obtener_docentes_por_curso(request, curso_id):
     """Obtener docentes de un curso específico (para uso con AJAX)"""
+    await SesionService.aget_perfil_o_404(request, Estudiante)
 
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
         try:
-            curso = get_object_or_404(Curso, id=curso_id)
+            curso = await aget_object_or_404(
+                Curso.objects.select_related("docente__usuario"), id=curso_id
+            )
             docentes = [{"id": curso.docente.pk, "nombre": str(curso.docente)}]
             return JsonResponse({"docentes": docentes})
         except Exception as e:
@@ -269,217 +224,62 @@ def obtener_docentes_por_curso(request, curso_id):
     return JsonResponse({"error": "Petición no válida"}, status=400)
 
 
-def explorar(request, usuario_id):
+async def explorar(request, usuario_id):
     """Vista para explorar docentes con sus evaluaciones"""
     query = request.GET.get("q", "")
-    docentes = Docente.objects.all()
-
-    # Obtener el estudiante
-    alumno = get_object_or_404(Estudiante, usuario__id=usuario_id)
-    
-    # Obtener la lista de docentes que enseñan en cursos en los que el estudiante está matriculado
-    from apps.core.models import Matricula
-    docentes_evaluables_ids = Matricula.objects.filter(
-        estudiante=alumno, 
-        estado='activa'
-    ).values_list('curso__docente', flat=True).distinct()
-
-    if query:
-        docentes = docentes.filter(
-            Q(usuario__nombre__icontains=query) | Q(departamento__icontains=query)
-        )
-    data = []
-    for docente in docentes:
-        cursos = Curso.objects.filter(docente=docente)
-        cursos_info = []
-        total_puntuacion = 0
-        cursos_evaluados = 0
-        
-        # Verificar si el estudiante puede evaluar a este docente
-        docente.es_evaluable = docente.pk in docentes_evaluables_ids
-
-        for curso in cursos:
-            respuestas = Respuesta.objects.filter(
-                evaluacion__curso=curso,
-                evaluacion__docente=docente,
-                evaluacion__estado="enviada",  # Asegurar que solo se consideren evaluaciones enviadas
-            )
-            promedio = respuestas.aggregate(prom=Avg("puntuacion"))["prom"]            # Contar cuántos estudiantes han evaluado este curso
-            num_estudiantes = Evaluacion.objects.filter(
-                curso=curso,
-                docente=docente,
-                estado="enviada"
-            ).values('estudiante').distinct().count()
-            
-            # Determinar si el estudiante está matriculado en este curso específico
-            curso.estudiante_matriculado = Matricula.objects.filter(
-                estudiante=alumno,
-                curso=curso,
-                estado='activa'
-            ).exists()
-            
-            # Almacenar la información del curso
-            cursos_info.append(
-                {
-                    "curso": curso,
-                    "promedio": promedio,
-                    "respuestas": respuestas,
-                    "num_estudiantes": num_estudiantes
-                }
-            )
-
-            # Acumular para el promedio general si hay evaluaciones para este curso
-            if promedio:
-                total_puntuacion += float(promedio)
-                cursos_evaluados += 1
-
-        # Calcular el promedio general del docente
-        promedio_general = None
-        if cursos_evaluados > 0:
-            promedio_general = round(total_puntuacion / cursos_evaluados, 2)
-
-        # Preparar datos completos del docente
-        docente_info = {
-            "docente": docente,
-            "cursos": cursos_info,
-            "promedio_general": promedio_general,
-            "cursos_evaluados": cursos_evaluados,
-            "total_cursos": len(cursos_info),
-            "es_evaluable": docente.es_evaluable,
-        }
 
-        data.append(docente_info)
+    # El estudiante es el de la sesión; la página de docentes trae promedios,
+    # conteos y matrículas del alumno
+    alumno = await SesionService.aget_perfil_o_404(request, Estudiante, usuario_id)
+    resultado = await ExploradorService.aget_pagina(
+        alumno.pk, query, request.GET.get("page")
+    )
 
-    return render(
+    return await sync_to_async(render)(
         request,
         "explorar.html",
         {
             "usuario_id": usuario_id,
-            "data": data,
+            "data": resultado["data"],
+            "page_obj": resultado["pagina"],
             "query": query,
             "alumno": alumno
         },
     )
 
 
-def detalle_docente(request, usuario_id, docente_id):
-    """Vista detallada de un docente con todas sus evaluaciones"""
-
-    # Obtener el docente
-    docente = get_object_or_404(Docente, usuario__id=docente_id)
-
-    # Obtener todos los cursos impartidos por el docente
-    cursos = Curso.objects.filter(docente=docente)
+async def _aget_periodo_parametro(request):
+    """Periodo indicado en ?periodo= (None si no se indica, 404 si no existe)"""
+    periodo_id = request.GET.get("periodo")
+    if not periodo_id:
+        return None
+    try:
+        return await PeriodoEvaluacion.objects.aget(id=periodo_id)
+    except (PeriodoEvaluacion.DoesNotExist, ValidationError):
+        raise Http404("Periodo no encontrado")
 
-    cursos_info = []
-    total_puntuacion = 0
-    cursos_evaluados = 0
 
-    # Obtener todas las respuestas de las evaluaciones del docente
-    respuestas = Respuesta.objects.filter(
-        evaluacion__docente=docente,
-        evaluacion__estado="enviada",
-    ).select_related("pregunta", "pregunta__id_modulo", "evaluacion", "evaluacion__curso")    # Procesar los cursos y sus evaluaciones
-    for curso in cursos:
-        curso_respuestas = respuestas.filter(evaluacion__curso=curso)
-        promedio = curso_respuestas.aggregate(prom=Avg("puntuacion"))["prom"]
-        
-        # Contar cuántos estudiantes han evaluado este curso
-        num_estudiantes = Evaluacion.objects.filter(
-            curso=curso,
-            docente=docente,
-            estado="enviada"
-        ).values('estudiante').distinct().count()
-
-        cursos_info.append(
-            {
-                "curso": curso,
-                "promedio": promedio,
-                "respuestas": curso_respuestas,
-                "num_estudiantes": num_estudiantes
-            }
-        )
-
-        # Acumular para el promedio general
-        if promedio:
-            total_puntuacion += float(promedio)
-            cursos_evaluados += 1
-
-    # Calcular el promedio general
-    promedio_general = round(total_puntuacion / cursos_evaluados, 2) if cursos_evaluados > 0 else None
+async def detalle_docente(request, usuario_id, docente_id):
+    """Vista detallada de un docente con todas sus evaluaciones"""
+    await SesionService.aget_perfil_o_404(request, Estudiante, usuario_id)
 
-    # Obtener los módulos y sus preguntas
-    modulos = ModuloPreguntas.objects.all()
+    # Periodo opcional: sin él se muestran todos los periodos
+    periodo = await _aget_periodo_parametro(request)
 
-    # Diccionario para almacenar la puntuación por módulo y pregunta
-    modulos_puntuacion = {}    # Procesar cada módulo y sus preguntas
-    for modulo in modulos:
-        preguntas_modulo = PreguntaModulo.objects.filter(id_modulo=modulo)
-        preguntas_info = []
-        total_puntuacion_modulo = 0
-        preguntas_con_respuestas = 0
-        
-        for pregunta in preguntas_modulo:
-            # Obtener las respuestas para esta pregunta específica
-            pregunta_respuestas = respuestas.filter(pregunta=pregunta)
-            promedio_pregunta = pregunta_respuestas.aggregate(prom=Avg("puntuacion"))["prom"]
-            
-            # Contar cuántos estudiantes han respondido esta pregunta
-            num_estudiantes_pregunta = pregunta_respuestas.values('evaluacion__estudiante').distinct().count()
-
-            if promedio_pregunta:
-                preguntas_info.append(
-                    {
-                        "pregunta": pregunta,
-                        "promedio": promedio_pregunta,
-                        "respuestas": pregunta_respuestas,
-                        "num_estudiantes": num_estudiantes_pregunta
-                    }
-                )
-                total_puntuacion_modulo += float(promedio_pregunta)
-                preguntas_con_respuestas += 1        # Solo incluir el módulo si tiene preguntas con respuestas
-        if preguntas_con_respuestas > 0:
-            promedio_modulo = round(total_puntuacion_modulo / preguntas_con_respuestas, 2)
-            
-            # Calcular el número total de estudiantes únicos que han evaluado este módulo
-            estudiantes_modulo = set()
-            for info in preguntas_info:
-                for r in info["respuestas"]:
-                    estudiantes_modulo.add(r.evaluacion.estudiante_id)
-            
-            modulos_puntuacion[modulo] = {
-                "preguntas": preguntas_info,
-                "promedio_modulo": promedio_modulo,
-                "preguntas_con_respuestas": preguntas_con_respuestas,
-                "num_estudiantes": len(estudiantes_modulo)
-            }
-
-    # Obtener comentarios generales (si existen)
-    comentarios = Evaluacion.objects.filter(
-        docente=docente,
-        estado="enviada",
-        comentario_general__isnull=False,
-    ).exclude(comentario_general="").values("comentario_general", "fecha").order_by("-fecha")
-
-    # Preparar la lista de comentarios si existen
-    lista_comentarios = []
-    for c in comentarios:
-        lista_comentarios.append(
-            {
-                "texto": c["comentario_general"],
-                "fecha": c.get("fecha"),
-            }
-        )
-
-    context = {
-        "usuario_id": usuario_id,
-        "docente": docente,
-        "cursos": cursos_info,
-        "promedio_general": promedio_general,
-        "cursos_evaluados": cursos_evaluados,
-        "total_cursos": len(cursos_info),
-        "modulos_puntuacion": modulos_puntuacion,
-        "comentarios": lista_comentarios if lista_comentarios else None,
-    }
+    # Docente, cursos, desglose de respuestas (en caché) y cuestionario en paralelo
+    detalle = await DetalleDocenteService.aget_detalle(
+        docente_id, periodo.pk if periodo else None
+    )
+    if detalle is None:
+        raise Http404("Docente no encontrado")
 
-    return render(request, "detalle_docente.html", context)
+    return await sync_to_async(render)(
+        request,
+        "detalle_docente.html",
+        {
+            "usuario_id": usuario_id,
+            "periodo": periodo,
+            "periodos": [p async for p in PeriodoEvaluacion.objects.all()],
+            **detalle,
+        },
+    )
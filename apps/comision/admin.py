@@ -3,6 +3,11 @@ from django.contrib import admin
 # Register your models here.
 
 
-from apps.comision.models import Comision
+from apps.comision.models import Comision, TrabajoReporte
 
 admin.site.register(Comision)
+
+@admin.register(TrabajoReporte)
+class TrabajoReporteAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'formato', 'periodo', 'estado', 'progreso', 'fecha_creacion')
+    list_filter = ('estado', 'tipo')
@@ -6,7 +6,6 @@ from datetime import date
 from typing import Dict, Optional
 from apps.evaluacion.models import PeriodoEvaluacion
 from apps.comision.lib.utils.dias_habiles import get_informacion_dias_habiles
-from apps.comision.lib.utils.fechas import calcular_dias_restantes
 from apps.comision.lib.services.periodo_status import PeriodoStatusService
 from apps.comision.lib.services.estadisticas import EstadisticasService
 
@@ -31,7 +30,6 @@ class ContextHelper:
         fecha_actual = date.today()
 
         # Información básica del periodo
-        dias_restantes = calcular_dias_restantes(periodo.fecha_fin) if periodo else 0
         status_label, status_color = PeriodoStatusService.get_periodo_status(
             periodo, fecha_actual
         )
@@ -43,10 +41,13 @@ class ContextHelper:
         )
 
         # Información de días hábiles
-        info_dias_habiles = get_informacion_dias_habiles(periodo)
+        info_dias_habiles = get_informacion_dias_habiles(periodo, fecha_actual)
+        dias_restantes = info_dias_habiles["dias_restantes"]
 
         # Estadísticas del periodo
-        estadisticas = EstadisticasService.calcular_estadisticas_periodo(periodo)
+        estadisticas = EstadisticasService.calcular_estadisticas_periodo(
+            periodo, info_dias_habiles
+        )
 
         # Agregar progreso de días hábiles a las estadísticas
         if periodo:
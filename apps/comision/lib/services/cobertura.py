@@ -0,0 +1,187 @@
+"""
+Servicio para calcular la cobertura de evaluaciones a partir de las matrículas activas.
+"""
+
+from typing import Dict, List, Optional
+from django.db.models import Count, Exists, F, OuterRef, QuerySet
+from apps.core.models import Matricula
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion
+
+
+class CoberturaService:
+    """
+    Servicio para comparar las evaluaciones esperadas con las enviadas.
+
+    Cada matrícula activa es una evaluación esperada del estudiante al
+    docente del curso; se considera completada si el estudiante envió la
+    evaluación de ese curso en el periodo.
+    """
+
+    # Campos por los que se puede agrupar la cobertura
+    AGRUPACIONES = {
+        "curso": [
+            "curso",
+            "curso__codigo",
+            "curso__nombre",
+            "curso__docente__usuario__nombre",
+        ],
+        "docente": [
+            "curso__docente",
+            "curso__docente__usuario__nombre",
+            "curso__docente__departamento",
+        ],
+        "estudiante": [
+            "estudiante",
+            "estudiante__codigo",
+            "estudiante__usuario__nombre",
+        ],
+    }
+
+    TAMANO_PAGINA = 50
+
+    # Tiempo en caché de la cobertura de un periodo; las matrículas pueden
+    # cambiar sin pasar por el envío de evaluaciones
+    TIMEOUT = 120
+
+    @staticmethod
+    def _evaluada(periodo: PeriodoEvaluacion) -> Exists:
+        # La restricción única (estudiante, curso, periodo) de Evaluacion
+        # resuelve esta subconsulta con una búsqueda por índice
+        return Exists(
+            Evaluacion.objects.filter(
+                estudiante=OuterRef("estudiante"),
+                curso=OuterRef("curso"),
+                periodo=periodo,
+                estado="enviada",
+            )
+        )
+
+    @staticmethod
+    def get_matriculas_esperadas(**filtros) -> QuerySet:
+        """
+        Obtiene las matrículas activas que deben evaluarse.
+
+        Args:
+            **filtros: Filtros adicionales sobre las matrículas (ej. curso=...)
+
+        Returns:
+            QuerySet de matrículas activas
+        """
+        return Matricula.objects.filter(estado="activa", **filtros)
+
+    @staticmethod
+    def get_resumen(periodo: PeriodoEvaluacion, **filtros) -> Dict:
+        """
+        Calcula con una consulta las evaluaciones esperadas, completadas y pendientes.
+
+        Args:
+            periodo: Instancia del periodo de evaluación
+            **filtros: Filtros adicionales sobre las matrículas
+
+        Returns:
+            Diccionario con esperadas, completadas, pendientes y porcentaje
+        """
+        resumen = CoberturaService.get_matriculas_esperadas(**filtros).aggregate(
+            esperadas=Count("id"),
+            completadas=Count("id", filter=CoberturaService._evaluada(periodo)),
+        )
+        return CoberturaService._completar(resumen)
+
+    @staticmethod
+    def sumar(grupos: List[Dict]) -> Dict:
+        """
+        Obtiene el resumen total a partir de la cobertura agrupada, sin otra consulta.
+
+        Args:
+            grupos: Lista devuelta por get_cobertura_por
+
+        Returns:
+            Diccionario con esperadas, completadas, pendientes y porcentaje
+        """
+        return CoberturaService._completar(
+            {
+                "esperadas": sum(grupo["esperadas"] for grupo in grupos),
+                "completadas": sum(grupo["completadas"] for grupo in grupos),
+            }
+        )
+
+    @staticmethod
+    def get_cobertura_por(
+        periodo: PeriodoEvaluacion, agrupar_por: str, **filtros
+    ) -> List[Dict]:
+        """
+        Calcula la cobertura agrupada por curso, docente o estudiante.
+
+        Args:
+            periodo: Instancia del periodo de evaluación
+            agrupar_por: "curso", "docente" o "estudiante"
+            **filtros: Filtros adicionales sobre las matrículas
+
+        Returns:
+            Lista de diccionarios con los campos del grupo más esperadas,
+            completadas, pendientes y porcentaje, ordenada por pendientes
+        """
+        if agrupar_por not in CoberturaService.AGRUPACIONES:
+            raise ValueError(f"Agrupación no soportada: {agrupar_por}")
+
+        grupos = (
+            CoberturaService.get_matriculas_esperadas(**filtros)
+            .values(*CoberturaService.AGRUPACIONES[agrupar_por])
+            .annotate(
+                esperadas=Count("id"),
+                completadas=Count("id", filter=CoberturaService._evaluada(periodo)),
+            )
+            .annotate(pendientes=F("esperadas") - F("completadas"))
+            .order_by("-pendientes", CoberturaService.AGRUPACIONES[agrupar_por][1])
+        )
+        return [CoberturaService._completar(grupo) for grupo in grupos]
+
+    @staticmethod
+    def get_pendientes(
+        periodo: PeriodoEvaluacion,
+        despues: Optional[str] = None,
+        limite: int = TAMANO_PAGINA,
+        **filtros,
+    ) -> Dict:
+        """
+        Obtiene una página de las matrículas que aún no tienen evaluación.
+
+        Se pagina por clave (la última matrícula de la página anterior) en vez
+        de OFFSET, por lo que cada página cuesta lo mismo aunque haya decenas
+        de miles de matrículas.
+
+        Args:
+            periodo: Instancia del periodo de evaluación
+            despues: ID de la última matrícula de la página anterior
+            limite: Número de matrículas por página
+            **filtros: Filtros adicionales sobre las matrículas
+
+        Returns:
+            Diccionario con "matriculas" y "siguiente" (ID para la página
+            siguiente, o None si es la última)
+        """
+        matriculas = (
+            CoberturaService.get_matriculas_esperadas(**filtros)
+            .filter(~CoberturaService._evaluada(periodo))
+            .select_related("estudiante__usuario", "curso__docente__usuario")
+            .order_by("id")
+        )
+        if despues:
+            matriculas = matriculas.filter(id__gt=despues)
+
+        pagina = list(matriculas[: limite + 1])
+        siguiente = None
+        if len(pagina) > limite:
+            pagina = pagina[:limite]
+            siguiente = pagina[-1].id
+
+        return {"matriculas": pagina, "siguiente": siguiente}
+
+    @staticmethod
+    def _completar(conteo: Dict) -> Dict:
+        esperadas = conteo["esperadas"]
+        conteo["pendientes"] = esperadas - conteo["completadas"]
+        conteo["porcentaje"] = (
+            int((conteo["completadas"] / esperadas) * 100) if esperadas else 0
+        )
+        return conteo
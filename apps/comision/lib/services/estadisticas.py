@@ -3,29 +3,36 @@ Servicio para el cálculo de estadísticas de evaluación.
 """
 
 from typing import Dict, Optional
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from apps.evaluacion.models import (
     PeriodoEvaluacion,
     Evaluacion,
-    Respuesta,
     ModuloPreguntas,
 )
 from apps.docentes.models import Docente
 from apps.alumnos.models import Estudiante
 from apps.core.models import Curso
+from apps.core.lib.services.cache import CacheService
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+from apps.evaluacion.lib.services.resumen import ResumenService
+from apps.evaluacion.lib.services.snapshot import PeriodoSnapshotService
+from apps.comision.lib.services.cobertura import CoberturaService
 
 
 class EstadisticasService:
     """Servicio para calcular estadísticas de evaluación."""
 
     @staticmethod
-    def calcular_estadisticas_periodo(periodo: Optional[PeriodoEvaluacion]) -> Dict:
+    def calcular_estadisticas_periodo(
+        periodo: Optional[PeriodoEvaluacion], info_dias_habiles: Optional[Dict] = None
+    ) -> Dict:
         """
         Calcula las estadísticas completas para un periodo.
 
         Args:
             periodo: Instancia del periodo de evaluación
+            info_dias_habiles: Información sobre días hábiles (si es None, se calcula)
 
         Returns:
             Diccionario con estadísticas del periodo
@@ -41,52 +48,32 @@ class EstadisticasService:
                 "progreso_dias_habiles": 0,
             }
 
-        # Importar aquí para evitar importaciones circulares
-        from apps.comision.lib.utils.fechas import calcular_dias_restantes
-        from apps.comision.lib.utils.dias_habiles import calcular_dias_habiles_restantes
-
-        # Estudiantes totales (esto debería venir de la base de datos en un sistema real)
-        total_estudiantes = Estudiante.objects.count() or 320  # Valor por defecto
-
-        # Evaluaciones completadas en este periodo
-        evaluaciones = Evaluacion.objects.filter(
-            fecha__range=(periodo.fecha_inicio, periodo.fecha_fin), estado="enviada"
-        )
-        evaluaciones_completadas = evaluaciones.count()
-
-        # Días restantes
-        dias_restantes = calcular_dias_restantes(periodo.fecha_fin)
-        dias_habiles_restantes = calcular_dias_habiles_restantes(periodo.fecha_fin)
-
-        # Docentes evaluados
-        docentes_evaluados = evaluaciones.values("docente").distinct().count()
-        total_docentes = Docente.objects.count()
-        docentes_evaluados_str = f"{docentes_evaluados}/{total_docentes}"
-
-        # Calcular progreso
-        progreso = 0
-        if total_estudiantes > 0:
-            progreso = min(
-                100, int((evaluaciones_completadas / total_estudiantes) * 100)
+        if info_dias_habiles is None:
+            # Importar aquí para evitar importaciones circulares
+            from apps.comision.lib.utils.dias_habiles import (
+                get_informacion_dias_habiles,
             )
 
-        return {
-            "total_estudiantes": total_estudiantes,
-            "evaluaciones_completadas": evaluaciones_completadas,
-            "dias_restantes": dias_restantes,
-            "dias_habiles_restantes": dias_habiles_restantes,
-            "docentes_evaluados": docentes_evaluados_str,
-            "progreso": progreso,
-        }
+            info_dias_habiles = get_informacion_dias_habiles(periodo)
+
+        return EstadisticasService._construir_estadisticas(periodo, info_dias_habiles)
 
     @staticmethod
     def get_estadisticas_generales() -> Dict:
         """
-        Obtiene estadísticas generales del sistema.
+        Obtiene estadísticas generales del sistema desde caché.
 
         Returns:
             Diccionario con estadísticas generales
         """
+        return CacheService.get_or_set(
+            InvalidacionService.NAMESPACE_REPORTES,
+            "estadisticas_generales",
+            EstadisticasService._calcular_estadisticas_generales,
+        )
+
+    @staticmethod
+    def _calcular_estadisticas_generales() -> Dict:
         return {
             "total_docentes": Docente.objects.count(),
             "total_estudiantes": Estudiante.objects.count(),
@@ -100,27 +87,23 @@ class EstadisticasService:
         }
 
     @staticmethod
-    def get_estadisticas_periodos(periodos_activos, periodos_pasados, hoy) -> Dict:
+    def get_estadisticas_periodos(hoy) -> Dict:
         """
-        Obtiene estadísticas específicas de períodos.
+        Obtiene estadísticas específicas de períodos con una sola consulta.
 
         Args:
-            periodos_activos: QuerySet de períodos activos
-            periodos_pasados: QuerySet de períodos pasados
             hoy: Fecha actual
 
         Returns:
             Diccionario con estadísticas de períodos
         """
-        total_periodos = periodos_activos.count() + periodos_pasados.count()
-        proximos_periodos = periodos_activos.filter(fecha_inicio__gt=hoy).count()
-        periodos_en_curso = periodos_activos.filter(fecha_inicio__lte=hoy).count()
-
-        return {
-            "total_periodos": total_periodos,
-            "proximos_periodos": proximos_periodos,
-            "periodos_en_curso": periodos_en_curso,
-        }
+        return PeriodoEvaluacion.objects.aggregate(
+            total_periodos=Count("id"),
+            proximos_periodos=Count("id", filter=Q(fecha_inicio__gt=hoy)),
+            periodos_en_curso=Count(
+                "id", filter=Q(fecha_inicio__lte=hoy, fecha_fin__gte=hoy)
+            ),
+        )
 
     @staticmethod
     def get_estadisticas_evaluacion(
@@ -139,84 +122,72 @@ class EstadisticasService:
         if not periodo:
             return {}
 
-        # Estudiantes totales (estimado)
-        total_estudiantes = 320  # En un sistema real, esto vendría de la base de datos
-
-        # Evaluaciones completadas en este periodo
-        evaluaciones = Evaluacion.objects.filter(
-            fecha__range=(periodo.fecha_inicio, periodo.fecha_fin), estado="enviada"
+        estadisticas = EstadisticasService._construir_estadisticas(
+            periodo, info_dias_habiles
         )
-        evaluaciones_completadas = evaluaciones.count()
-
-        # Días restantes (calendario y hábiles)
-        from apps.comision.lib.utils.fechas import calcular_dias_restantes
-
-        dias_restantes = calcular_dias_restantes(periodo.fecha_fin)
-        dias_habiles_restantes = info_dias_habiles["dias_habiles_restantes"]
-
-        # Docentes evaluados
-        docentes_evaluados = evaluaciones.values("docente").distinct().count()
-        total_docentes = Docente.objects.count()
-        docentes_evaluados_str = f"{docentes_evaluados}/{total_docentes}"
-
-        # Calcular progreso (basado en días calendario y días hábiles)
-        progreso = 0
-        if total_estudiantes > 0:
-            progreso = min(
-                100, int((evaluaciones_completadas / total_estudiantes) * 100)
-            )
-
-        # Progreso basado en días hábiles
-        progreso_dias_habiles = info_dias_habiles["progreso_dias_habiles"]
+        estadisticas["progreso_dias_habiles"] = info_dias_habiles[
+            "progreso_dias_habiles"
+        ]
+        return estadisticas
 
+    @staticmethod
+    def _construir_estadisticas(
+        periodo: PeriodoEvaluacion, info_dias_habiles: Dict
+    ) -> Dict:
+        """Combina el resumen en caché del periodo con la información de días."""
+        snapshot = PeriodoSnapshotService.get_snapshot(periodo)
         return {
-            "total_estudiantes": total_estudiantes,
-            "evaluaciones_completadas": evaluaciones_completadas,
-            "dias_restantes": dias_restantes,
-            "dias_habiles_restantes": dias_habiles_restantes,
-            "docentes_evaluados": docentes_evaluados_str,
-            "progreso": progreso,
-            "progreso_dias_habiles": progreso_dias_habiles,
+            "total_estudiantes": snapshot["total_estudiantes"],
+            "evaluaciones_completadas": snapshot["evaluaciones_completadas"],
+            "dias_restantes": info_dias_habiles["dias_restantes"],
+            "dias_habiles_restantes": info_dias_habiles["dias_habiles_restantes"],
+            "docentes_evaluados": (
+                f"{snapshot['docentes_evaluados']}/{snapshot['total_docentes']}"
+            ),
+            "progreso": snapshot["progreso"],
         }
 
     @staticmethod
     def get_reporte_general() -> Dict:
         """
-        Obtiene datos para el reporte general.
+        Obtiene datos para el reporte general desde caché.
 
         Returns:
             Diccionario con datos del reporte general
         """
-        # Promedio general de calificaciones usando las respuestas
-        promedio_general = (
-            Evaluacion.objects.filter(estado="enviada")
-            .annotate(promedio_respuestas=Avg("respuestas__puntuacion"))
-            .aggregate(promedio=Avg("promedio_respuestas"))["promedio"]
-            or 0
+        return CacheService.get_or_set(
+            InvalidacionService.NAMESPACE_REPORTES,
+            "reporte_general",
+            EstadisticasService._calcular_reporte_general,
         )
+
+    @staticmethod
+    def _calcular_reporte_general() -> Dict:
+        # Promedio general de calificaciones desde el acumulado
+        promedio_general = ResumenService.get_promedio_general()
+
         # Top 5 docentes mejor calificados
-        mejores_docentes = Docente.objects.annotate(
-            promedio=Avg(
-                "evaluacion__respuestas__puntuacion",
-                filter=Q(evaluacion__estado="enviada"),
-            )
-        ).order_by("-promedio")[:5]
+        ranking_docentes = ResumenService.get_ranking("docente")
+        docentes = Docente.objects.select_related("usuario").in_bulk(
+            [fila["docente"] for fila in ranking_docentes]
+        )
+        mejores_docentes = []
+        for fila in ranking_docentes:
+            docente = docentes[fila["docente"]]
+            docente.promedio = fila["promedio"]
+            mejores_docentes.append(docente)
 
         # Top 5 cursos mejor calificados
-        mejores_cursos = Curso.objects.annotate(
-            promedio=Avg(
-                "evaluacion__respuestas__puntuacion",
-                filter=Q(evaluacion__estado="enviada"),
-            )
-        ).order_by("-promedio")[:5]
+        ranking_cursos = ResumenService.get_ranking("curso")
+        cursos = Curso.objects.in_bulk([fila["curso"] for fila in ranking_cursos])
+        mejores_cursos = []
+        for fila in ranking_cursos:
+            curso = cursos[fila["curso"]]
+            curso.promedio = fila["promedio"]
+            mejores_cursos.append(curso)
 
         # Distribución de calificaciones
-        distribucion = (
-            Respuesta.objects.filter(evaluacion__estado="enviada")
-            .values("puntuacion")
-            .annotate(total=Count("id"))
-            .order_by("puntuacion")
-        )
+        distribucion = ResumenService.get_distribucion()
 
         return {
             "promedio_general": promedio_general,
@@ -225,87 +196,15 @@ class EstadisticasService:
             "distribucion": distribucion,
         }
 
-    @staticmethod
-    def get_reporte_cursos():
-        """
-        Obtiene datos para el reporte de cursos.
-
-        Returns:
-            QuerySet de cursos con estadísticas calculadas
-        """
-        # Obtener todos los cursos con sus evaluaciones
-        cursos = (
-            Curso.objects.prefetch_related(
-                "evaluacion_set", "evaluacion_set__respuestas"
-            )
-            .select_related("docente")
-            .all()
-        )
-
-        # Para cada curso, calcular estadísticas
-        for curso in cursos:
-            # Obtener evaluaciones del curso
-            evaluaciones = curso.evaluacion_set.filter(estado="enviada")
-
-            # Calcular promedio de calificaciones usando las respuestas
-            curso.promedio_calificacion = (
-                evaluaciones.annotate(
-                    promedio_respuestas=Avg("respuestas__puntuacion")
-                ).aggregate(promedio=Avg("promedio_respuestas"))["promedio"]
-                or 0
-            )
-
-            # Contar total de evaluaciones
-            curso.total_evaluaciones = evaluaciones.count()
-
-            # Calcular calificación para cada evaluación
-            for evaluacion in evaluaciones:
-                evaluacion.calificacion = (
-                    evaluacion.respuestas.aggregate(promedio=Avg("puntuacion"))[
-                        "promedio"
-                    ]
-                    or 0
-                )
-
-        return cursos
-
-    @staticmethod
-    def get_reporte_docentes():
-        """
-        Obtiene datos para el reporte de docentes.
-
-        Returns:
-            QuerySet de docentes con estadísticas calculadas
-        """
-        # Obtener todos los docentes con sus evaluaciones y cursos
-        docentes = Docente.objects.prefetch_related("evaluacion_set", "curso_set").all()
-
-        # Para cada docente, calcular estadísticas
-        for docente in docentes:
-            # Obtener evaluaciones del docente
-            evaluaciones = docente.evaluacion_set.filter(estado="enviada")
-
-            # Calcular promedio de calificaciones usando las respuestas
-            docente.promedio_calificacion = (
-                evaluaciones.annotate(
-                    promedio_respuestas=Avg("respuestas__puntuacion")
-                ).aggregate(promedio=Avg("promedio_respuestas"))["promedio"]
-                or 0
-            )
-
-            # Contar total de evaluaciones
-            docente.total_evaluaciones = evaluaciones.count()
-
-            # Obtener cursos del docente
-            docente.cursos = docente.curso_set.all()
-
-        return docentes
-
     @staticmethod
     def calcular_progreso_evaluaciones(periodo: PeriodoEvaluacion) -> Dict:
         """
         Calcula el progreso detallado de evaluaciones.
 
+        Las evaluaciones posibles son las matrículas activas, por lo que el
+        progreso refleja cuántos estudiantes evaluaron cada curso en el que
+        están matriculados.
+
         Args:
             periodo: Instancia del periodo de evaluación
 
@@ -315,45 +214,10 @@ class EstadisticasService:
         if not periodo:
             return {"porcentaje": 0, "completadas": 0, "pendientes": 0}
 
-        evaluaciones = Evaluacion.objects.filter(
-            fecha__range=(periodo.fecha_inicio, periodo.fecha_fin)
-        )
-
-        completadas = evaluaciones.filter(estado="enviada").count()
-        total_posibles = EstadisticasService._calcular_evaluaciones_posibles(periodo)
-        pendientes = max(0, total_posibles - completadas)
-
-        porcentaje = 0
-        if total_posibles > 0:
-            porcentaje = int((completadas / total_posibles) * 100)
-
+        cobertura = CoberturaService.get_resumen(periodo)
         return {
-            "porcentaje": porcentaje,
-            "completadas": completadas,
-            "pendientes": pendientes,
-            "total_posibles": total_posibles,
+            "porcentaje": cobertura["porcentaje"],
+            "completadas": cobertura["completadas"],
+            "pendientes": cobertura["pendientes"],
+            "total_posibles": cobertura["esperadas"],
         }
-
-    @staticmethod
-    def _calcular_evaluaciones_posibles(periodo: PeriodoEvaluacion) -> int:
-        """
-        Calcula el número total de evaluaciones posibles para un periodo.
-
-        Args:
-            periodo: Instancia del periodo de evaluación
-
-        Returns:
-            Número total de evaluaciones posibles
-        """
-        # En un sistema real, esto sería más complejo
-        # considerando cursos activos, estudiantes matriculados, etc.
-        total_estudiantes = Estudiante.objects.count()
-        total_docentes = Docente.objects.count()
-
-        # Estimación simple: cada estudiante puede evaluar a cada docente
-        # En la realidad sería más específico por cursos
-        return (
-            total_estudiantes * total_docentes
-            if total_estudiantes and total_docentes
-            else 0
-        )
@@ -0,0 +1,307 @@
+"""
+Servicio para exportar resultados de evaluación en CSV o XLSX sin cargarlos en memoria.
+"""
+
+import csv
+import tempfile
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Sum
+from django.utils import timezone
+from django.utils.text import slugify
+from apps.evaluacion.models import (
+    Evaluacion,
+    PeriodoEvaluacion,
+    Respuesta,
+    ResumenPuntuacion,
+)
+from apps.evaluacion.lib.services.resumen import CAMPOS_CONTEO
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # openpyxl es opcional: sin él solo se exporta CSV
+    Workbook = None
+
+
+class _Eco:
+    """Pseudo-archivo que devuelve lo escrito, para que csv.writer genere texto."""
+
+    def write(self, valor):
+        return valor
+
+
+class ExportacionService:
+    """Servicio para generar las filas de cada exportación y serializarlas."""
+
+    TAMANO_LOTE = 2000
+
+    @staticmethod
+    def get_filas(tipo: str, periodo: Optional[PeriodoEvaluacion] = None) -> Iterator:
+        """
+        Obtiene un generador con el encabezado y las filas de una exportación.
+
+        Args:
+            tipo: Tipo de exportación ("respuestas", "general", "docentes" o "cursos")
+            periodo: Periodo a exportar (si es None, todos los periodos)
+
+        Returns:
+            Generador de listas; la primera es el encabezado
+        """
+        generadores = {
+            "respuestas": ExportacionService._filas_respuestas,
+            "general": ExportacionService._filas_general,
+            "docentes": ExportacionService._filas_docentes,
+            "cursos": ExportacionService._filas_cursos,
+        }
+        if tipo not in generadores:
+            raise ValueError(f"Tipo de exportación no soportado: {tipo}")
+        return generadores[tipo](periodo)
+
+    @staticmethod
+    def contar_filas(tipo: str, periodo: Optional[PeriodoEvaluacion] = None) -> int:
+        """
+        Cuenta las filas de datos (sin encabezado) que generará una exportación.
+
+        Args:
+            tipo: Tipo de exportación
+            periodo: Periodo a exportar (si es None, todos los periodos)
+
+        Returns:
+            Número de filas, para informar el progreso de los trabajos en segundo plano
+        """
+        if tipo == "respuestas":
+            consulta = Respuesta.objects.filter(evaluacion__estado="enviada")
+            filtro_periodo = "evaluacion__periodo"
+        elif tipo in ("general", "docentes", "cursos"):
+            consulta = ResumenPuntuacion.objects.filter(total__gt=0)
+            filtro_periodo = "periodo"
+        else:
+            raise ValueError(f"Tipo de exportación no soportado: {tipo}")
+
+        if periodo:
+            consulta = consulta.filter(**{filtro_periodo: periodo})
+        if tipo == "docentes":
+            consulta = consulta.values("docente").distinct()
+        elif tipo == "cursos":
+            consulta = consulta.values("curso").distinct()
+        return consulta.order_by().count()
+
+    @staticmethod
+    def get_nombre_archivo(
+        tipo: str, periodo: Optional[PeriodoEvaluacion], extension: str
+    ) -> str:
+        alcance = slugify(periodo.nombre) if periodo else "todos-los-periodos"
+        return f"{tipo}_{alcance}.{extension}"
+
+    @staticmethod
+    def generar_csv(filas: Iterator) -> Iterator[str]:
+        """
+        Serializa las filas como CSV, una línea a la vez.
+
+        Args:
+            filas: Generador de filas devuelto por get_filas
+
+        Returns:
+            Generador de líneas CSV, precedido de un BOM para que Excel
+            reconozca UTF-8
+        """
+        escritor = csv.writer(_Eco())
+        yield "\ufeff"
+        for fila in filas:
+            yield escritor.writerow(fila)
+
+    @staticmethod
+    async def agenerar_csv(filas: Iterator) -> AsyncIterator[str]:
+        """
+        Versión asíncrona de generar_csv para las respuestas servidas por ASGI.
+
+        Bajo ASGI, Django lee completo un iterador síncrono antes de enviar
+        la respuesta. Aquí cada lote de TAMANO_LOTE líneas se genera con
+        sync_to_async, en el hilo de la conexión de la petición, y se envía
+        antes de leer el siguiente, por lo que la memoria sigue constante.
+
+        Args:
+            filas: Generador de filas devuelto por get_filas
+
+        Returns:
+            Generador asíncrono de bloques de líneas CSV
+        """
+        lineas = ExportacionService.generar_csv(filas)
+        siguiente_lote = sync_to_async(
+            lambda: "".join(islice(lineas, ExportacionService.TAMANO_LOTE))
+        )
+        while True:
+            # Ninguna línea es vacía: un lote vacío indica el final
+            lote = await siguiente_lote()
+            if not lote:
+                return
+            yield lote
+
+    @staticmethod
+    def xlsx_disponible() -> bool:
+        return Workbook is not None
+
+    @staticmethod
+    def generar_xlsx(filas: Iterator, titulo: str):
+        """
+        Escribe las filas en un archivo XLSX temporal en modo de solo escritura.
+
+        El modo de solo escritura de openpyxl no conserva las filas en memoria;
+        el archivo se envía cuando está completo porque XLSX es un ZIP.
+
+        Args:
+            filas: Generador de filas devuelto por get_filas
+            titulo: Título de la hoja
+
+        Returns:
+            Archivo temporal abierto en modo binario, posicionado al inicio
+        """
+        libro = Workbook(write_only=True)
+        hoja = libro.create_sheet(title=titulo[:31])
+        for fila in filas:
+            hoja.append(fila)
+
+        archivo = tempfile.TemporaryFile()
+        libro.save(archivo)
+        archivo.seek(0)
+        return archivo
+
+    @staticmethod
+    def _filas_respuestas(periodo: Optional[PeriodoEvaluacion]) -> Iterator[List]:
+        yield [
+            "Periodo",
+            "Evaluación",
+            "Fecha",
+            "Docente",
+            "Código del curso",
+            "Curso",
+            "Módulo",
+            "Pregunta",
+            "Puntuación",
+            "Criterio",
+        ]
+
+        respuestas = Respuesta.objects.filter(evaluacion__estado="enviada")
+        if periodo:
+            respuestas = respuestas.filter(evaluacion__periodo=periodo)
+
+        # Ordenar por evaluación permite recorrer el índice y enviar filas de inmediato
+        filas = (
+            respuestas.order_by("evaluacion_id")
+            .values_list(
+                "evaluacion__periodo__nombre",
+                "evaluacion_id",
+                "evaluacion__fecha",
+                "evaluacion__docente__usuario__nombre",
+                "evaluacion__curso__codigo",
+                "evaluacion__curso__nombre",
+                "pregunta__id_modulo__nombre",
+                "pregunta__pregunta",
+                "puntuacion",
+                "criterio",
+            )
+            .iterator(chunk_size=ExportacionService.TAMANO_LOTE)
+        )
+        for fila in filas:
+            fila = list(fila)
+            fila[1] = str(fila[1])
+            fila[2] = timezone.localtime(fila[2]).strftime("%Y-%m-%d %H:%M")
+            yield fila
+
+    @staticmethod
+    def _filas_general(periodo: Optional[PeriodoEvaluacion]) -> Iterator[List]:
+        yield [
+            "Periodo",
+            "Docente",
+            "Código del curso",
+            "Curso",
+            "Módulo",
+            "Pregunta",
+            "Respuestas",
+            "Promedio",
+        ] + [f"Puntuación {i}" for i in range(1, 6)]
+
+        acumulado = ResumenPuntuacion.objects.filter(total__gt=0)
+        if periodo:
+            acumulado = acumulado.filter(periodo=periodo)
+
+        filas = (
+            acumulado.order_by("docente", "curso", "pregunta__id_modulo__nombre")
+            .values_list(
+                "periodo__nombre",
+                "docente__usuario__nombre",
+                "curso__codigo",
+                "curso__nombre",
+                "pregunta__id_modulo__nombre",
+                "pregunta__pregunta",
+                "total",
+                "suma",
+                *CAMPOS_CONTEO,
+            )
+            .iterator(chunk_size=ExportacionService.TAMANO_LOTE)
+        )
+        for fila in filas:
+            total, suma = fila[6], fila[7]
+            yield list(fila[:6]) + [total, round(suma / total, 2)] + list(fila[8:])
+
+    @staticmethod
+    def _filas_docentes(periodo: Optional[PeriodoEvaluacion]) -> Iterator[List]:
+        yield ExportacionService._encabezado_agrupado(["Docente", "Departamento"])
+        yield from ExportacionService._filas_agrupadas(
+            "docente",
+            ["docente__usuario__nombre", "docente__departamento"],
+            periodo,
+        )
+
+    @staticmethod
+    def _filas_cursos(periodo: Optional[PeriodoEvaluacion]) -> Iterator[List]:
+        yield ExportacionService._encabezado_agrupado(
+            ["Código del curso", "Curso", "Docente"]
+        )
+        yield from ExportacionService._filas_agrupadas(
+            "curso",
+            ["curso__codigo", "curso__nombre", "curso__docente__usuario__nombre"],
+            periodo,
+        )
+
+    @staticmethod
+    def _encabezado_agrupado(columnas: List[str]) -> List[str]:
+        return columnas + ["Evaluaciones", "Respuestas", "Promedio"] + [
+            f"Puntuación {i}" for i in range(1, 6)
+        ]
+
+    @staticmethod
+    def _filas_agrupadas(
+        campo: str, columnas: List[str], periodo: Optional[PeriodoEvaluacion]
+    ) -> Iterator[List]:
+        """Filas agregadas por docente o curso desde el acumulado de puntuaciones."""
+        evaluaciones = Evaluacion.objects.filter(estado="enviada")
+        acumulado = ResumenPuntuacion.objects.filter(total__gt=0)
+        if periodo:
+            evaluaciones = evaluaciones.filter(periodo=periodo)
+            acumulado = acumulado.filter(periodo=periodo)
+
+        totales_evaluaciones: Dict = dict(
+            evaluaciones.values(campo)
+            .annotate(total=Count("id"))
+            .values_list(campo, "total")
+            .order_by()
+        )
+
+        filas = (
+            acumulado.values(campo, *columnas)
+            .annotate(
+                respuestas=Sum("total"),
+                suma_total=Sum("suma"),
+                **{f"{c}_total": Sum(c) for c in CAMPOS_CONTEO},
+            )
+            .order_by(columnas[0])
+            .iterator(chunk_size=ExportacionService.TAMANO_LOTE)
+        )
+        for fila in filas:
+            yield [fila[columna] for columna in columnas] + [
+                totales_evaluaciones.get(fila[campo], 0),
+                fila["respuestas"],
+                round(fila["suma_total"] / fila["respuestas"], 2),
+            ] + [fila[f"{c}_total"] for c in CAMPOS_CONTEO]
@@ -0,0 +1,137 @@
+"""
+Servicio para calcular en bloque las evaluaciones recientes de los reportes por docente y curso.
+"""
+
+from array import array
+from typing import Dict, List
+from django.db.models import Count, Sum
+from apps.evaluacion.models import Evaluacion
+
+
+class TablaEvaluaciones:
+    """
+    Evaluaciones enviadas en formato columnar.
+
+    Docentes y cursos se codifican como enteros consecutivos; cada columna
+    tiene una posición por evaluación (docente -1 si no tiene docente).
+    """
+
+    def __init__(self):
+        # Valores originales (IDs) por código
+        self.docentes: List = []
+        self.cursos: List = []
+
+        # Columnas por evaluación
+        self.evaluaciones: List = []
+        self.fechas: List = []
+        self.docente = array("q")
+        self.curso = array("q")
+        self.suma = array("q")
+        self.respuestas = array("q")
+
+    def __len__(self):
+        return len(self.evaluaciones)
+
+
+class MotorReportesService:
+    """
+    Servicio para cargar las evaluaciones en columnas y elegir las recientes
+    de cada docente o curso.
+
+    Los promedios, totales y posiciones de los reportes no se calculan aquí:
+    están guardados en ResumenReporte.
+    """
+
+    TAMANO_LOTE = 5000
+
+    @staticmethod
+    def cargar(**filtros) -> TablaEvaluaciones:
+        """
+        Carga con una sola consulta las evaluaciones enviadas y sus puntuaciones.
+
+        La base de datos suma las puntuaciones de cada evaluación, por lo que se
+        transfiere una fila por evaluación y no una por respuesta. Las
+        evaluaciones sin respuestas también se cargan (con calificación 0).
+
+        Args:
+            **filtros: Filtros adicionales sobre las evaluaciones (ej. periodo=...)
+
+        Returns:
+            TablaEvaluaciones con las columnas cargadas
+        """
+        tabla = TablaEvaluaciones()
+        codigos_docente = {}
+        codigos_curso = {}
+
+        filas = (
+            Evaluacion.objects.filter(estado="enviada", **filtros)
+            .values_list("id", "docente_id", "curso_id", "fecha")
+            .annotate(
+                suma=Sum("respuestas__puntuacion"), respuestas=Count("respuestas")
+            )
+            .order_by()
+            .iterator(chunk_size=MotorReportesService.TAMANO_LOTE)
+        )
+
+        for evaluacion_id, docente_id, curso_id, fecha, suma, respuestas in filas:
+            docente = -1
+            if docente_id is not None:
+                docente = codigos_docente.get(docente_id)
+                if docente is None:
+                    docente = codigos_docente[docente_id] = len(tabla.docentes)
+                    tabla.docentes.append(docente_id)
+
+            curso = codigos_curso.get(curso_id)
+            if curso is None:
+                curso = codigos_curso[curso_id] = len(tabla.cursos)
+                tabla.cursos.append(curso_id)
+
+            tabla.evaluaciones.append(evaluacion_id)
+            tabla.fechas.append(fecha)
+            tabla.docente.append(docente)
+            tabla.curso.append(curso)
+            tabla.suma.append(suma or 0)
+            tabla.respuestas.append(respuestas)
+
+        return tabla
+
+    @staticmethod
+    def recientes(tabla: TablaEvaluaciones, agrupar_por: str, limite: int = 5) -> Dict:
+        """
+        Elige las evaluaciones más recientes de cada grupo con su calificación.
+
+        La calificación de una evaluación es el promedio de sus respuestas y
+        solo se calcula para las elegidas. El costo es el ordenamiento por
+        fecha más un recorrido de la tabla.
+
+        Args:
+            tabla: Tabla cargada con cargar()
+            agrupar_por: "docente" o "curso"
+            limite: Número máximo de evaluaciones por grupo
+
+        Returns:
+            Diccionario {id: [(evaluacion_id, calificacion), ...]}, de la más
+            reciente a la más antigua
+        """
+        if agrupar_por == "docente":
+            ids, grupo_evaluacion = tabla.docentes, tabla.docente
+        elif agrupar_por == "curso":
+            ids, grupo_evaluacion = tabla.cursos, tabla.curso
+        else:
+            raise ValueError(f"Agrupación no soportada: {agrupar_por}")
+
+        por_grupo = [[] for _ in ids]
+        for evaluacion in sorted(
+            range(len(tabla)), key=tabla.fechas.__getitem__, reverse=True
+        ):
+            grupo = grupo_evaluacion[evaluacion]
+            if grupo >= 0 and len(por_grupo[grupo]) < limite:
+                respuestas = tabla.respuestas[evaluacion]
+                por_grupo[grupo].append(
+                    (
+                        tabla.evaluaciones[evaluacion],
+                        tabla.suma[evaluacion] / respuestas if respuestas else 0.0,
+                    )
+                )
+
+        return {ids[grupo]: recientes for grupo, recientes in enumerate(por_grupo)}
@@ -0,0 +1,221 @@
+"""
+Servicio para las tablas paginadas de los reportes de docentes y cursos.
+"""
+
+from typing import Dict, List, Optional
+from django.db.models import Count, Exists, F, OuterRef, Q, QuerySet
+from apps.comision.lib.services.motor_reportes import MotorReportesService
+from apps.core.lib.utils.paginacion import PaginadorKeyset
+from apps.core.models import Curso
+from apps.docentes.models import Docente
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion, ResumenReporte
+
+
+class ReporteTablaService:
+    """
+    Servicio para filtrar, ordenar y paginar los reportes de docentes y cursos.
+
+    Los promedios y totales de cada docente y curso están guardados en
+    ResumenReporte, que ResumenService mantiene al enviar evaluaciones; las
+    páginas se obtienen con PaginadorKeyset sobre sus índices, por lo que
+    cada página cuesta lo mismo sin importar cuántos docentes o cursos haya.
+    Las evaluaciones recientes de la página se eligen en bloque con
+    MotorReportesService.
+    """
+
+    TAMANO_PAGINA = 20
+
+    # Evaluaciones recientes que se muestran de cada docente o curso
+    RECIENTES = 5
+
+    # Columnas de ResumenReporte por las que se puede ordenar: {parámetro: campo}
+    ORDENES = {
+        "promedio": "promedio",
+        "evaluaciones": "evaluaciones",
+        "nombre": "nombre",
+    }
+
+    @staticmethod
+    def get_filtros(parametros, periodo: Optional[PeriodoEvaluacion] = None) -> Dict:
+        """
+        Lee los filtros y el orden de los parámetros GET.
+
+        Args:
+            parametros: request.GET
+            periodo: Periodo ya validado del parámetro "periodo"
+
+        Returns:
+            Diccionario con periodo, departamento, semestre, orden y
+            descendente; los valores no válidos se reemplazan por los de
+            por defecto (promedio de mayor a menor)
+        """
+        orden = parametros.get("orden")
+        if orden not in ReporteTablaService.ORDENES:
+            orden = "promedio"
+        return {
+            "periodo": periodo,
+            "departamento": parametros.get("departamento", "").strip(),
+            "semestre": parametros.get("semestre", "").strip(),
+            "orden": orden,
+            "descendente": parametros.get("dir", "desc") != "asc",
+        }
+
+    @staticmethod
+    def get_opciones() -> Dict[str, List[str]]:
+        """Valores disponibles para los filtros de departamento y semestre."""
+        return {
+            "departamentos": list(
+                Docente.objects.order_by("departamento")
+                .values_list("departamento", flat=True)
+                .distinct()
+            ),
+            "semestres": list(
+                Curso.objects.order_by("semestre").values_list("semestre", flat=True).distinct()
+            ),
+        }
+
+    @staticmethod
+    def get_pagina_docentes(filtros: Dict, cursor: Optional[str] = None) -> Dict:
+        """
+        Obtiene una página del reporte de docentes.
+
+        Args:
+            filtros: Filtros de get_filtros
+            cursor: Cursor de otra página
+
+        Returns:
+            Página de PaginadorKeyset; cada docente trae promedio_calificacion,
+            total_evaluaciones, posicion, cursos y evaluaciones_recientes
+        """
+        filas = ResumenReporte.objects.filter(
+            docente__isnull=False, periodo=filtros["periodo"]
+        ).select_related("docente__usuario")
+        if filtros["departamento"]:
+            filas = filas.filter(docente__departamento=filtros["departamento"])
+        if filtros["semestre"]:
+            filas = filas.filter(
+                Exists(
+                    Curso.objects.filter(
+                        docente=OuterRef("docente"), semestre=filtros["semestre"]
+                    )
+                )
+            )
+        filas = filas.annotate(nombre=F("docente__usuario__nombre"))
+
+        pagina = ReporteTablaService._paginar(filas, "docente", filtros, cursor)
+        cursos = {}
+        for curso in Curso.objects.filter(docente__in=pagina["objetos"]).order_by("nombre"):
+            cursos.setdefault(curso.docente_id, []).append(curso)
+        for docente in pagina["objetos"]:
+            docente.cursos = cursos.get(docente.pk, [])
+        ReporteTablaService._asignar_recientes(
+            pagina["objetos"], "docente", filtros["periodo"]
+        )
+        return pagina
+
+    @staticmethod
+    def get_pagina_cursos(filtros: Dict, cursor: Optional[str] = None) -> Dict:
+        """
+        Obtiene una página del reporte de cursos.
+
+        Args:
+            filtros: Filtros de get_filtros
+            cursor: Cursor de otra página
+
+        Returns:
+            Página de PaginadorKeyset; cada curso trae promedio_calificacion,
+            total_evaluaciones, posicion y evaluaciones_recientes
+        """
+        filas = ResumenReporte.objects.filter(
+            curso__isnull=False, periodo=filtros["periodo"]
+        ).select_related("curso__docente__usuario")
+        if filtros["departamento"]:
+            filas = filas.filter(curso__docente__departamento=filtros["departamento"])
+        if filtros["semestre"]:
+            filas = filas.filter(curso__semestre=filtros["semestre"])
+        filas = filas.annotate(nombre=F("curso__nombre"))
+
+        pagina = ReporteTablaService._paginar(filas, "curso", filtros, cursor)
+        ReporteTablaService._asignar_recientes(
+            pagina["objetos"], "curso", filtros["periodo"]
+        )
+        return pagina
+
+    @staticmethod
+    def _paginar(
+        filas: QuerySet, grupo: str, filtros: Dict, cursor: Optional[str]
+    ) -> Dict:
+        """
+        Pagina las filas de totales y las reemplaza por sus docentes o cursos.
+
+        Cada objeto trae promedio_calificacion, total_respuestas,
+        total_evaluaciones y su posición en el ranking por promedio.
+        """
+        pagina = PaginadorKeyset(
+            filas,
+            ReporteTablaService.ORDENES[filtros["orden"]],
+            filtros["descendente"],
+            ReporteTablaService.TAMANO_PAGINA,
+        ).get_pagina(cursor)
+
+        # Posición por promedio entre los filtrados con respuestas: uno más
+        # los que tienen mejor promedio. Una sola consulta cuenta, sobre el
+        # promedio guardado, los mejores que cada promedio distinto de la página
+        promedios = sorted({fila.promedio for fila in pagina["objetos"] if fila.respuestas})
+        mejores = {}
+        if promedios:
+            conteos = filas.filter(respuestas__gt=0).aggregate(
+                **{
+                    f"mejores_{indice}": Count("pk", filter=Q(promedio__gt=promedio))
+                    for indice, promedio in enumerate(promedios)
+                }
+            )
+            mejores = {
+                promedio: conteos[f"mejores_{indice}"]
+                for indice, promedio in enumerate(promedios)
+            }
+
+        objetos = []
+        for fila in pagina["objetos"]:
+            objeto = getattr(fila, grupo)
+            objeto.promedio_calificacion = fila.promedio
+            objeto.total_respuestas = fila.respuestas
+            objeto.total_evaluaciones = fila.evaluaciones
+            objeto.posicion = mejores[fila.promedio] + 1 if fila.respuestas else None
+            objetos.append(objeto)
+        pagina["objetos"] = objetos
+        return pagina
+
+    @staticmethod
+    def _asignar_recientes(
+        objetos: List, grupo: str, periodo: Optional[PeriodoEvaluacion]
+    ) -> None:
+        """
+        Evaluaciones recientes de los objetos de la página con su calificación.
+
+        MotorReportesService carga en columnas solo las evaluaciones de los
+        objetos de la página (una fila por evaluación) y elige en bloque las
+        más recientes de cada grupo con su calificación; otra consulta trae
+        esas evaluaciones.
+        """
+        filtro_periodo = {"periodo": periodo} if periodo is not None else {}
+        recientes = MotorReportesService.recientes(
+            MotorReportesService.cargar(**{f"{grupo}__in": objetos}, **filtro_periodo),
+            grupo,
+            ReporteTablaService.RECIENTES,
+        )
+        evaluaciones = Evaluacion.objects.select_related(
+            "curso", "estudiante__usuario"
+        ).in_bulk(
+            [
+                evaluacion_id
+                for elegidas in recientes.values()
+                for evaluacion_id, _ in elegidas
+            ]
+        )
+        for objeto in objetos:
+            objeto.evaluaciones_recientes = []
+            for evaluacion_id, calificacion in recientes.get(objeto.pk, []):
+                evaluacion = evaluaciones[evaluacion_id]
+                evaluacion.calificacion = calificacion
+                objeto.evaluaciones_recientes.append(evaluacion)
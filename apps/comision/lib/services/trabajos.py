@@ -0,0 +1,271 @@
+"""
+Servicio para generar reportes en segundo plano con una cola en la base de datos.
+"""
+
+import tempfile
+from datetime import timedelta
+from typing import Iterator, Optional
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from apps.comision.models import Comision, TrabajoReporte
+from apps.comision.lib.services.exportacion import ExportacionService
+from apps.evaluacion.lib.services.tendencias import TendenciaService
+from apps.evaluacion.models import PeriodoEvaluacion
+
+
+class TrabajoReporteService:
+    """
+    Servicio para encolar, tomar y ejecutar trabajos de reporte.
+
+    Los trabajos se guardan en TrabajoReporte y los ejecuta el comando
+    procesar_reportes, por lo que no se necesita un broker externo. Varios
+    workers pueden leer la misma cola: cada uno toma un trabajo pendiente con
+    SELECT ... FOR UPDATE SKIP LOCKED y lo marca en proceso antes de soltarlo.
+
+    Además de las exportaciones, la cola ejecuta el cálculo de tendencias
+    que se encola al cerrar o reabrir un periodo, para no hacerlo durante la
+    petición que cambia el estado.
+    """
+
+    # Tipos que puede solicitar la comisión
+    TIPOS_EXPORTACION = ("respuestas", "general", "docentes", "cursos")
+
+    # Filas entre cada actualización del progreso
+    LOTE_PROGRESO = ExportacionService.TAMANO_LOTE
+
+    # Reintentos de un trabajo cuyo worker se detuvo sin terminarlo
+    MAX_INTENTOS = 3
+
+    @staticmethod
+    def encolar(
+        comision: Comision,
+        tipo: str,
+        formato: str = "csv",
+        periodo: Optional[PeriodoEvaluacion] = None,
+    ) -> TrabajoReporte:
+        """
+        Registra un trabajo pendiente.
+
+        Args:
+            comision: Comisión que solicita el reporte
+            tipo: Tipo de exportación ("respuestas", "general", "docentes" o "cursos")
+            formato: "csv" o "xlsx"
+            periodo: Periodo a exportar (si es None, todos los periodos)
+
+        Returns:
+            Trabajo creado
+        """
+        if tipo not in TrabajoReporteService.TIPOS_EXPORTACION:
+            raise ValueError("Tipo de reporte no válido")
+        if formato == "xlsx" and not ExportacionService.xlsx_disponible():
+            raise ValueError("La exportación a XLSX requiere openpyxl")
+        return TrabajoReporte.objects.create(
+            comision=comision, tipo=tipo, formato=formato, periodo=periodo
+        )
+
+    @staticmethod
+    def encolar_tendencias(periodo: PeriodoEvaluacion) -> TrabajoReporte:
+        """
+        Registra el cálculo de las tendencias de un periodo que se cerró o se reabrió.
+
+        Si ya hay uno pendiente para el periodo no se crea otro: el trabajo
+        lee el estado del periodo al ejecutarse.
+
+        Args:
+            periodo: Periodo que cambió de estado
+
+        Returns:
+            Trabajo pendiente del periodo
+        """
+        pendiente = TrabajoReporte.objects.filter(
+            tipo="tendencias", periodo=periodo, estado="pendiente"
+        ).first()
+        if pendiente is not None:
+            return pendiente
+        return TrabajoReporte.objects.create(tipo="tendencias", periodo=periodo)
+
+    @staticmethod
+    def tomar_siguiente(worker: str = "") -> Optional[TrabajoReporte]:
+        """
+        Toma el trabajo pendiente más antiguo y lo marca en proceso.
+
+        Args:
+            worker: Identificador del worker que lo toma
+
+        Returns:
+            Trabajo tomado o None si la cola está vacía
+        """
+        with transaction.atomic():
+            trabajo = (
+                TrabajoReporte.objects.select_for_update(skip_locked=True)
+                .filter(estado="pendiente")
+                .order_by("fecha_creacion")
+                .first()
+            )
+            if trabajo is None:
+                return None
+
+            trabajo.estado = "en_proceso"
+            trabajo.worker = worker
+            trabajo.intentos += 1
+            trabajo.fecha_inicio = timezone.now()
+            trabajo.save(update_fields=["estado", "worker", "intentos", "fecha_inicio"])
+        return trabajo
+
+    @staticmethod
+    def ejecutar(trabajo: TrabajoReporte) -> TrabajoReporte:
+        """
+        Genera el archivo del trabajo informando el progreso por lotes, o
+        calcula las tendencias si es un trabajo de tendencias.
+
+        Args:
+            trabajo: Trabajo en proceso (devuelto por tomar_siguiente)
+
+        Returns:
+            El mismo trabajo, completado o con el error registrado
+        """
+        try:
+            if trabajo.tipo == "tendencias":
+                TrabajoReporteService._calcular_tendencias(trabajo)
+            else:
+                TrabajoReporteService._generar_archivo(trabajo)
+            trabajo.estado = "completado"
+            trabajo.progreso = 100
+            trabajo.error = ""
+        except Exception as error:
+            trabajo.estado = "error"
+            trabajo.error = str(error) or error.__class__.__name__
+
+        trabajo.fecha_fin = timezone.now()
+        trabajo.save(
+            update_fields=[
+                "estado",
+                "progreso",
+                "filas_procesadas",
+                "total_filas",
+                "archivo",
+                "error",
+                "fecha_fin",
+            ]
+        )
+        return trabajo
+
+    @staticmethod
+    def _generar_archivo(trabajo: TrabajoReporte) -> None:
+        """Genera el archivo de una exportación informando el progreso por lotes."""
+        total = ExportacionService.contar_filas(trabajo.tipo, trabajo.periodo)
+        TrabajoReporte.objects.filter(pk=trabajo.pk).update(total_filas=total)
+        trabajo.total_filas = total
+
+        filas = TrabajoReporteService._con_progreso(
+            trabajo, ExportacionService.get_filas(trabajo.tipo, trabajo.periodo)
+        )
+        nombre = ExportacionService.get_nombre_archivo(
+            trabajo.tipo, trabajo.periodo, trabajo.formato
+        )
+        if trabajo.formato == "xlsx":
+            archivo = ExportacionService.generar_xlsx(filas, trabajo.tipo)
+        else:
+            archivo = tempfile.TemporaryFile()
+            for linea in ExportacionService.generar_csv(filas):
+                archivo.write(linea.encode("utf-8"))
+            archivo.seek(0)
+
+        with archivo:
+            trabajo.archivo.save(nombre, File(archivo), save=False)
+
+    @staticmethod
+    def _calcular_tendencias(trabajo: TrabajoReporte) -> None:
+        # Recalcula el periodo y los cerrados posteriores con su estado actual
+        filas = TendenciaService.actualizar(trabajo.periodo)
+        trabajo.total_filas = trabajo.filas_procesadas = filas
+
+    @staticmethod
+    def procesar_siguiente(worker: str = "") -> Optional[TrabajoReporte]:
+        """Toma y ejecuta un trabajo; devuelve None si no había pendientes."""
+        trabajo = TrabajoReporteService.tomar_siguiente(worker)
+        if trabajo is None:
+            return None
+        return TrabajoReporteService.ejecutar(trabajo)
+
+    @staticmethod
+    def recuperar_abandonados(minutos: int = 30) -> int:
+        """
+        Devuelve a la cola los trabajos en proceso de un worker que se detuvo.
+
+        Los que ya agotaron MAX_INTENTOS se marcan con error.
+
+        Args:
+            minutos: Tiempo en proceso a partir del cual se considera abandonado
+
+        Returns:
+            Número de trabajos recuperados o marcados con error
+        """
+        abandonados = TrabajoReporte.objects.filter(
+            estado="en_proceso",
+            fecha_inicio__lt=timezone.now() - timedelta(minutes=minutos),
+        )
+        agotados = abandonados.filter(
+            intentos__gte=TrabajoReporteService.MAX_INTENTOS
+        ).update(
+            estado="error",
+            error="El worker se detuvo sin terminar el trabajo",
+            fecha_fin=timezone.now(),
+        )
+        return agotados + abandonados.update(
+            estado="pendiente", progreso=0, filas_procesadas=0, worker=""
+        )
+
+    @staticmethod
+    def limpiar(dias: int = 7) -> int:
+        """
+        Elimina los trabajos terminados hace más de `dias` días y sus archivos.
+
+        Returns:
+            Número de trabajos eliminados
+        """
+        antiguos = TrabajoReporte.objects.filter(
+            estado__in=["completado", "error"],
+            fecha_fin__lt=timezone.now() - timedelta(days=dias),
+        )
+        eliminados = 0
+        for trabajo in antiguos.iterator():
+            if trabajo.archivo:
+                trabajo.archivo.delete(save=False)
+            trabajo.delete()
+            eliminados += 1
+        return eliminados
+
+    @staticmethod
+    def get_estado(trabajo: TrabajoReporte) -> dict:
+        """Datos del trabajo para la consulta periódica de progreso."""
+        return {
+            "id": str(trabajo.pk),
+            "estado": trabajo.estado,
+            "estado_display": trabajo.get_estado_display(),
+            "progreso": trabajo.progreso,
+            "filas_procesadas": trabajo.filas_procesadas,
+            "total_filas": trabajo.total_filas,
+            "error": trabajo.error,
+            "listo": trabajo.estado == "completado" and bool(trabajo.archivo),
+        }
+
+    @staticmethod
+    def _con_progreso(trabajo: TrabajoReporte, filas: Iterator) -> Iterator:
+        """Recorre las filas guardando el progreso cada LOTE_PROGRESO filas."""
+        procesadas = -1  # el encabezado no cuenta
+        for fila in filas:
+            yield fila
+            procesadas += 1
+            if procesadas and procesadas % TrabajoReporteService.LOTE_PROGRESO == 0:
+                TrabajoReporteService._guardar_progreso(trabajo, procesadas)
+        trabajo.filas_procesadas = max(procesadas, 0)
+
+    @staticmethod
+    def _guardar_progreso(trabajo: TrabajoReporte, procesadas: int) -> None:
+        # El total es aproximado si llegan evaluaciones durante el trabajo
+        progreso = min(99, procesadas * 100 // max(trabajo.total_filas, 1))
+        TrabajoReporte.objects.filter(pk=trabajo.pk).update(
+            filas_procesadas=procesadas, progreso=progreso
+        )
@@ -1,15 +1,190 @@
 """
 Utilidades para el cálculo y manejo de días hábiles en periodos de evaluación.
+
+Los días hábiles se cuentan en forma cerrada sobre el ordinal de cada fecha
+(el ordinal 1, 1 de enero del año 1, es lunes), de modo que contar, desplazar
+y calcular el progreso no recorre el periodo día por día. Los feriados
+registrados en configuración se descuentan con una búsqueda binaria.
 """
 
-from datetime import date, timedelta
-from typing import Dict, Optional
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, Optional
+from django.core.cache import cache
 from apps.evaluacion.models import PeriodoEvaluacion
 
+CLAVE_FERIADOS = "calendario_habil:feriados"
+
+# Tiempo máximo en caché por si los feriados se editan fuera del admin
+TIMEOUT_FERIADOS = 60 * 60 * 24
+
+DIAS_SEMANA = [
+    "Lunes",
+    "Martes",
+    "Miércoles",
+    "Jueves",
+    "Viernes",
+    "Sábado",
+    "Domingo",
+]
+
+
+class CalendarioHabil:
+    """
+    Calendario de días hábiles (lunes a viernes, sin feriados).
+
+    Args:
+        feriados: Fechas u ordinales de los días feriados
+    """
+
+    def __init__(self, feriados: Iterable = ()):
+        ordinales = {
+            f.toordinal() if isinstance(f, date) else f for f in feriados
+        }
+        # Los feriados en fin de semana no cambian el conteo
+        self.feriados = tuple(sorted(o for o in ordinales if (o - 1) % 7 < 5))
+
+    @staticmethod
+    def _dias_semana_hasta(ordinal: int) -> int:
+        """Días de lunes a viernes en los ordinales 1..ordinal."""
+        semanas, resto = divmod(ordinal, 7)
+        return semanas * 5 + min(resto, 5)
+
+    @staticmethod
+    def _dia_semana_numero(k: int) -> int:
+        """Ordinal del k-ésimo día de lunes a viernes (inversa de _dias_semana_hasta)."""
+        semanas, resto = divmod(k - 1, 5)
+        return semanas * 7 + resto + 1
+
+    def _feriados_hasta(self, ordinal: int) -> int:
+        return bisect_right(self.feriados, ordinal)
+
+    def _habiles_hasta(self, ordinal: int) -> int:
+        return self._dias_semana_hasta(ordinal) - self._feriados_hasta(ordinal)
+
+    def es_habil(self, fecha: date) -> bool:
+        """
+        Verifica si una fecha es día hábil.
+
+        Args:
+            fecha: Fecha a verificar
+
+        Returns:
+            True si es de lunes a viernes y no es feriado
+        """
+        return fecha.weekday() < 5 and not self.es_feriado(fecha)
+
+    def es_feriado(self, fecha: date) -> bool:
+        ordinal = fecha.toordinal()
+        posicion = bisect_right(self.feriados, ordinal)
+        return posicion > 0 and self.feriados[posicion - 1] == ordinal
+
+    def contar(self, fecha_inicio: date, fecha_fin: date) -> int:
+        """
+        Cuenta los días hábiles entre dos fechas, ambas incluidas.
+
+        Args:
+            fecha_inicio: Fecha de inicio
+            fecha_fin: Fecha de fin
+
+        Returns:
+            Número de días hábiles (0 si el rango está vacío)
+        """
+        if not fecha_inicio or not fecha_fin or fecha_fin < fecha_inicio:
+            return 0
+        return self._habiles_hasta(fecha_fin.toordinal()) - self._habiles_hasta(
+            fecha_inicio.toordinal() - 1
+        )
+
+    def contar_feriados(self, fecha_inicio: date, fecha_fin: date) -> int:
+        """Cuenta los feriados en días de semana entre dos fechas, ambas incluidas."""
+        if not fecha_inicio or not fecha_fin or fecha_fin < fecha_inicio:
+            return 0
+        return self._feriados_hasta(fecha_fin.toordinal()) - self._feriados_hasta(
+            fecha_inicio.toordinal() - 1
+        )
+
+    def agregar(self, fecha: date, dias_habiles: int) -> date:
+        """
+        Obtiene la fecha que está a cierta cantidad de días hábiles después.
+
+        Args:
+            fecha: Fecha de partida (no cuenta como día agregado)
+            dias_habiles: Número de días hábiles a agregar
+
+        Returns:
+            Fecha del último día hábil agregado (la misma fecha si es 0)
+        """
+        if dias_habiles <= 0:
+            return fecha
+
+        objetivo = self._habiles_hasta(fecha.toordinal()) + dias_habiles
+
+        # Se busca el primer día de semana con `objetivo` días hábiles hasta él;
+        # cada vuelta solo avanza por los feriados que quedan en el camino
+        feriados = 0
+        while True:
+            ordinal = self._dia_semana_numero(objetivo + feriados)
+            feriados_hasta = self._feriados_hasta(ordinal)
+            if feriados_hasta == feriados:
+                return date.fromordinal(ordinal)
+            feriados = feriados_hasta
+
+    def progreso(
+        self, fecha_inicio: date, fecha_fin: date, fecha_actual: date
+    ) -> int:
+        """
+        Calcula el progreso de un periodo basado en días hábiles.
+
+        Args:
+            fecha_inicio: Fecha de inicio del periodo
+            fecha_fin: Fecha de fin del periodo
+            fecha_actual: Fecha de referencia
+
+        Returns:
+            Porcentaje de progreso (0-100)
+        """
+        if fecha_actual < fecha_inicio:
+            return 0
+        if fecha_actual > fecha_fin:
+            return 100
+
+        total = self.contar(fecha_inicio, fecha_fin)
+        if total == 0:
+            return 100
+
+        transcurridos = self.contar(fecha_inicio, fecha_actual)
+        return min(100, int((transcurridos / total) * 100))
+
+
+def get_calendario() -> CalendarioHabil:
+    """
+    Obtiene el calendario con los feriados registrados en configuración.
+
+    Returns:
+        CalendarioHabil con los feriados guardados en caché
+    """
+    feriados = cache.get(CLAVE_FERIADOS)
+    if feriados is None:
+        # Importar aquí para evitar importaciones circulares
+        from apps.configuracion.models import DiaFeriado
+
+        feriados = [
+            fecha.toordinal()
+            for fecha in DiaFeriado.objects.values_list("fecha", flat=True)
+        ]
+        cache.set(CLAVE_FERIADOS, feriados, TIMEOUT_FERIADOS)
+    return CalendarioHabil(feriados)
+
+
+def invalidar_calendario() -> None:
+    """Descarta los feriados en caché para que se lean de nuevo."""
+    cache.delete(CLAVE_FERIADOS)
+
 
 def calcular_dias_habiles(fecha_inicio: date, fecha_fin: date) -> int:
     """
-    Calcula los días hábiles entre dos fechas (excluyendo fines de semana).
+    Calcula los días hábiles entre dos fechas (excluyendo fines de semana y feriados).
 
     Args:
         fecha_inicio: Fecha de inicio del periodo
@@ -18,19 +193,7 @@ def calcular_dias_habiles(fecha_inicio: date, fecha_fin: date) -> int:
     Returns:
         Número de días hábiles entre las fechas
     """
-    if not fecha_inicio or not fecha_fin:
-        return 0
-
-    current_date = fecha_inicio
-    dias_habiles = 0
-
-    while current_date <= fecha_fin:
-        # Monday = 0, Sunday = 6
-        if current_date.weekday() < 5:  # Monday to Friday
-            dias_habiles += 1
-        current_date += timedelta(days=1)
-
-    return dias_habiles
+    return get_calendario().contar(fecha_inicio, fecha_fin)
 
 
 def calcular_dias_habiles_restantes(fecha_fin: date) -> int:
@@ -43,10 +206,9 @@ def calcular_dias_habiles_restantes(fecha_fin: date) -> int:
     Returns:
         Número de días hábiles restantes
     """
-    if not fecha_fin or fecha_fin < date.today():
+    if not fecha_fin:
         return 0
-
-    return calcular_dias_habiles(date.today(), fecha_fin)
+    return get_calendario().contar(date.today(), fecha_fin)
 
 
 def calcular_progreso_dias_habiles(periodo: PeriodoEvaluacion) -> int:
@@ -62,67 +224,68 @@ def calcular_progreso_dias_habiles(periodo: PeriodoEvaluacion) -> int:
     if not periodo:
         return 0
 
-    total_dias_habiles = calcular_dias_habiles(periodo.fecha_inicio, periodo.fecha_fin)
-    if total_dias_habiles == 0:
-        return 100
+    return get_calendario().progreso(
+        periodo.fecha_inicio, periodo.fecha_fin, date.today()
+    )
 
-    hoy = date.today()
-    if hoy < periodo.fecha_inicio:
-        return 0
-    elif hoy > periodo.fecha_fin:
-        return 100
 
-    dias_habiles_transcurridos = calcular_dias_habiles(periodo.fecha_inicio, hoy)
-    return min(100, int((dias_habiles_transcurridos / total_dias_habiles) * 100))
+def agregar_dias_habiles(fecha_inicio: date, dias_habiles: int) -> date:
+    """
+    Agrega una cantidad específica de días hábiles a una fecha.
+
+    Args:
+        fecha_inicio: Fecha de inicio
+        dias_habiles: Número de días hábiles a agregar
+
+    Returns:
+        Nueva fecha después de agregar los días hábiles
+    """
+    return get_calendario().agregar(fecha_inicio, dias_habiles)
 
 
-def get_informacion_dias_habiles(periodo: Optional[PeriodoEvaluacion]) -> Dict:
+def get_informacion_dias_habiles(
+    periodo: Optional[PeriodoEvaluacion], hoy: Optional[date] = None
+) -> Dict:
     """
-    Obtiene información completa sobre días hábiles para un periodo.
+    Obtiene en una sola llamada las cifras de días del periodo para el panel de comisión.
 
     Args:
         periodo: Instancia del periodo de evaluación (puede ser None)
+        hoy: Fecha de referencia (si es None, usa la fecha actual)
 
     Returns:
-        Diccionario con información detallada sobre días hábiles
+        Diccionario con días calendario y hábiles (totales, transcurridos,
+        restantes), progreso, feriados del periodo y el estado del día actual
     """
+    if hoy is None:
+        hoy = date.today()
+
     if not periodo:
         return {
             "total_dias_habiles": 0,
             "dias_habiles_transcurridos": 0,
             "dias_habiles_restantes": 0,
             "progreso_dias_habiles": 0,
+            "dias_restantes": 0,
+            "feriados_periodo": 0,
             "es_dia_habil": False,
+            "es_feriado": False,
             "dia_semana": "N/A",
         }
 
-    hoy = date.today()
-    total_dias_habiles = calcular_dias_habiles(periodo.fecha_inicio, periodo.fecha_fin)
-    dias_habiles_transcurridos = calcular_dias_habiles(
-        periodo.fecha_inicio, min(hoy, periodo.fecha_fin)
-    )
-    dias_habiles_restantes = calcular_dias_habiles_restantes(periodo.fecha_fin)
-    progreso_dias_habiles = calcular_progreso_dias_habiles(periodo)
-    es_dia_habil = hoy.weekday() < 5  # Monday to Friday
-
-    dias_semana = [
-        "Lunes",
-        "Martes",
-        "Miércoles",
-        "Jueves",
-        "Viernes",
-        "Sábado",
-        "Domingo",
-    ]
-    dia_semana = dias_semana[hoy.weekday()]
+    calendario = get_calendario()
+    inicio, fin = periodo.fecha_inicio, periodo.fecha_fin
 
     return {
-        "total_dias_habiles": total_dias_habiles,
-        "dias_habiles_transcurridos": dias_habiles_transcurridos,
-        "dias_habiles_restantes": dias_habiles_restantes,
-        "progreso_dias_habiles": progreso_dias_habiles,
-        "es_dia_habil": es_dia_habil,
-        "dia_semana": dia_semana,
+        "total_dias_habiles": calendario.contar(inicio, fin),
+        "dias_habiles_transcurridos": calendario.contar(inicio, min(hoy, fin)),
+        "dias_habiles_restantes": calendario.contar(hoy, fin),
+        "progreso_dias_habiles": calendario.progreso(inicio, fin, hoy),
+        "dias_restantes": max(0, (fin - hoy).days),
+        "feriados_periodo": calendario.contar_feriados(inicio, fin),
+        "es_dia_habil": calendario.es_habil(hoy),
+        "es_feriado": calendario.es_feriado(hoy),
+        "dia_semana": DIAS_SEMANA[hoy.weekday()],
     }
 
 
@@ -134,9 +297,9 @@ def es_dia_habil(fecha: date = None) -> bool:
         fecha: Fecha a verificar (si es None, usa la fecha actual)
 
     Returns:
-        True si es día hábil (lunes a viernes), False si es fin de semana
+        True si es día hábil (lunes a viernes sin feriado), False en otro caso
     """
     if fecha is None:
         fecha = date.today()
 
-    return fecha.weekday() < 5
+    return get_calendario().es_habil(fecha)
@@ -2,7 +2,7 @@
 Utilidades para el manejo de fechas en el sistema de evaluación.
 """
 
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional
 
 
@@ -79,16 +79,12 @@ def agregar_dias_habiles(fecha_inicio: date, dias_habiles: int) -> date:
     Returns:
         Nueva fecha después de agregar los días hábiles
     """
-    fecha_actual = fecha_inicio
-    dias_agregados = 0
+    # Importar aquí para evitar importaciones circulares
+    from apps.comision.lib.utils.dias_habiles import (
+        agregar_dias_habiles as agregar_con_calendario,
+    )
 
-    while dias_agregados < dias_habiles:
-        fecha_actual += timedelta(days=1)
-        # Si es día hábil (lunes a viernes)
-        if fecha_actual.weekday() < 5:
-            dias_agregados += 1
-
-    return fecha_actual
+    return agregar_con_calendario(fecha_inicio, dias_habiles)
 
 
 def formatear_fecha_espanol(fecha: date) -> str:
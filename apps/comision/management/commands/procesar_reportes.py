@@ -0,0 +1,106 @@
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+from apps.comision.lib.services.trabajos import TrabajoReporteService
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta los trabajos de reporte encolados por la comisión y el cálculo "
+        "de tendencias de los periodos cerrados; puede haber varios procesos "
+        "leyendo la misma cola"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hilos",
+            type=int,
+            default=1,
+            help="Trabajos ejecutados en paralelo por este proceso",
+        )
+        parser.add_argument(
+            "--espera",
+            type=float,
+            default=2.0,
+            help="Segundos entre consultas a la cola cuando está vacía",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Procesa los trabajos pendientes y termina en lugar de esperar nuevos",
+        )
+        parser.add_argument(
+            "--abandonados",
+            type=int,
+            default=30,
+            help="Minutos en proceso tras los que un trabajo vuelve a la cola",
+        )
+        parser.add_argument(
+            "--limpiar-dias",
+            type=int,
+            default=7,
+            help="Elimina los trabajos terminados hace más de estos días",
+        )
+
+    def handle(self, *args, **options):
+        nombre = f"{socket.gethostname()}:{os.getpid()}"
+
+        recuperados = TrabajoReporteService.recuperar_abandonados(options["abandonados"])
+        eliminados = TrabajoReporteService.limpiar(options["limpiar_dias"])
+        if recuperados or eliminados:
+            self.stdout.write(
+                f"{recuperados} trabajos abandonados recuperados, "
+                f"{eliminados} trabajos antiguos eliminados"
+            )
+
+        hilos = max(1, options["hilos"])
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            procesados = sum(
+                ejecutor.map(
+                    lambda indice: self._atender_cola(
+                        f"{nombre}:{indice}", options["espera"], options["una_vez"]
+                    ),
+                    range(hilos),
+                )
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Trabajos procesados: {procesados}"))
+
+    def _atender_cola(self, worker, espera, una_vez):
+        """Ejecuta trabajos hasta vaciar la cola (o indefinidamente)."""
+        procesados = 0
+        try:
+            while True:
+                # Como al inicio de una petición: descarta conexiones vencidas
+                # (DB_CONN_MAX_AGE) o caídas antes de tomar el siguiente trabajo
+                close_old_connections()
+                try:
+                    trabajo = TrabajoReporteService.procesar_siguiente(worker)
+                except DatabaseError as error:
+                    # Error transitorio (bloqueo, conexión caída): se reintenta
+                    # con una conexión nueva; la toma del trabajo es atómica
+                    self.stderr.write(f"[{worker}] Error de base de datos: {error}")
+                    connection.close()
+                    time.sleep(espera)
+                    continue
+
+                if trabajo is None:
+                    if una_vez:
+                        return procesados
+                    time.sleep(espera)
+                    continue
+
+                procesados += 1
+                estilo = self.style.SUCCESS if trabajo.estado == "completado" else self.style.ERROR
+                self.stdout.write(
+                    estilo(
+                        f"[{worker}] {trabajo.get_tipo_display()} "
+                        f"({trabajo.filas_procesadas} filas): {trabajo.get_estado_display()}"
+                    )
+                )
+        finally:
+            # Cada hilo abre su propia conexión a la base de datos
+            connection.close()
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:31
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comision', '0001_initial'),
+        ('evaluacion', '0017_evaluacion_evaluacion_docente_estado_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoReporte',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('respuestas', 'Respuestas individuales'), ('general', 'Reporte general'), ('docentes', 'Reporte por docente'), ('cursos', 'Reporte por curso')], max_length=20)),
+                ('formato', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'XLSX')], default='csv', max_length=10)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En proceso'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', max_length=20)),
+                ('progreso', models.PositiveSmallIntegerField(default=0)),
+                ('filas_procesadas', models.PositiveIntegerField(default=0)),
+                ('total_filas', models.PositiveIntegerField(default=0)),
+                ('archivo', models.FileField(blank=True, upload_to='reportes/')),
+                ('error', models.TextField(blank=True)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+                ('comision', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trabajos_reporte', to='comision.comision')),
+                ('periodo', models.ForeignKey(blank=True, help_text='Periodo a exportar (vacío para todos los periodos)', null=True, on_delete=django.db.models.deletion.CASCADE, to='evaluacion.periodoevaluacion')),
+            ],
+            options={
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(condition=models.Q(('estado', 'pendiente')), fields=['fecha_creacion'], name='trabajo_reporte_pendiente_idx')],
+            },
+        ),
+    ]
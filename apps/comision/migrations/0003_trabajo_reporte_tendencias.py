@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comision', '0002_trabajo_reporte'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trabajoreporte',
+            name='comision',
+            field=models.ForeignKey(blank=True, help_text='Comisión que lo solicitó (vacío: trabajo del sistema)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='trabajos_reporte', to='comision.comision'),
+        ),
+        migrations.AlterField(
+            model_name='trabajoreporte',
+            name='tipo',
+            field=models.CharField(choices=[('respuestas', 'Respuestas individuales'), ('general', 'Reporte general'), ('docentes', 'Reporte por docente'), ('cursos', 'Reporte por curso'), ('tendencias', 'Tendencias del periodo')], max_length=20),
+        ),
+    ]
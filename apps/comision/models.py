@@ -1,5 +1,7 @@
 from django.db import models
 from apps.usuarios.models import Usuario
+from apps.evaluacion.models import PeriodoEvaluacion
+import uuid
 
 
 class Comision(models.Model):
@@ -8,3 +10,71 @@ class Comision(models.Model):
 
     def __str__(self):
         return f"Comisión de {self.usuario} ({self.facultad})"
+
+
+# Generación de un reporte en segundo plano (cola en la base de datos); la
+# misma cola ejecuta el cálculo de tendencias al cerrar o reabrir un periodo
+class TrabajoReporte(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    comision = models.ForeignKey(
+        Comision,
+        on_delete=models.CASCADE,
+        related_name="trabajos_reporte",
+        blank=True,
+        null=True,
+        help_text="Comisión que lo solicitó (vacío: trabajo del sistema)",
+    )
+    tipo = models.CharField(
+        max_length=20,
+        choices=[
+            ("respuestas", "Respuestas individuales"),
+            ("general", "Reporte general"),
+            ("docentes", "Reporte por docente"),
+            ("cursos", "Reporte por curso"),
+            ("tendencias", "Tendencias del periodo"),
+        ],
+    )
+    formato = models.CharField(
+        max_length=10, choices=[("csv", "CSV"), ("xlsx", "XLSX")], default="csv"
+    )
+    periodo = models.ForeignKey(
+        PeriodoEvaluacion,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        help_text="Periodo a exportar (vacío para todos los periodos)",
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=[
+            ("pendiente", "Pendiente"),
+            ("en_proceso", "En proceso"),
+            ("completado", "Completado"),
+            ("error", "Error"),
+        ],
+        default="pendiente",
+    )
+    progreso = models.PositiveSmallIntegerField(default=0)
+    filas_procesadas = models.PositiveIntegerField(default=0)
+    total_filas = models.PositiveIntegerField(default=0)
+    archivo = models.FileField(upload_to="reportes/", blank=True)
+    error = models.TextField(blank=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(blank=True, null=True)
+    fecha_fin = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-fecha_creacion"]
+        indexes = [
+            # Siguiente trabajo de la cola para los workers
+            models.Index(
+                fields=["fecha_creacion"],
+                name="trabajo_reporte_pendiente_idx",
+                condition=models.Q(estado="pendiente"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} ({self.get_estado_display()})"
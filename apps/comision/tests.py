@@ -1,3 +1,164 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from apps.comision.lib.services.reportes_tablas import ReporteTablaService
+from apps.comision.lib.utils.dias_habiles import CalendarioHabil
+from apps.core.models import Curso
+from apps.docentes.models import Docente
+from apps.evaluacion.lib.services.resumen import ResumenService
+from apps.evaluacion.models import (
+    ModuloPreguntas,
+    PeriodoEvaluacion,
+    PreguntaModulo,
+    ResumenPuntuacion,
+)
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.models import Usuario
 
-# Create your tests here.
+
+# Suma y total de respuestas de cada curso; None si no tiene respuestas
+PUNTUACIONES = [(9, 2), (8, 2), (9, 2), None, (3, 1), (15, 3), (4, 2), None, (5, 1)]
+
+
+class ReporteTablaServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre=ModosRoles.PROFESOR, permisos={})
+        pregunta = PreguntaModulo.objects.create(
+            id_modulo=ModuloPreguntas.objects.create(nombre="Metodología"), pregunta="Pregunta"
+        )
+        docentes = [
+            Docente.objects.create(
+                usuario=Usuario.objects.create(
+                    nombre=f"Docente {i}", correo=f"docente{i}@sed.test", rol=rol
+                ),
+                departamento=f"Departamento {i % 2}",
+            )
+            for i in range(3)
+        ]
+        for indice, puntuacion in enumerate(PUNTUACIONES):
+            curso = Curso.objects.create(
+                nombre=f"Curso {indice}",
+                codigo=f"C{indice}",
+                semestre="1",
+                docente=docentes[indice % 3],
+            )
+            if puntuacion is not None:
+                suma, total = puntuacion
+                ResumenPuntuacion.objects.create(
+                    docente=curso.docente, curso=curso, pregunta=pregunta, suma=suma, total=total
+                )
+        ResumenService.reconstruir_reportes()
+
+    def recorrer(self, pagina_de, parametros):
+        filtros = ReporteTablaService.get_filtros(QueryDict(parametros))
+        objetos = []
+        cursor = None
+        with mock.patch.object(ReporteTablaService, "TAMANO_PAGINA", 2):
+            while True:
+                pagina = pagina_de(filtros, cursor)
+                objetos.extend(pagina["objetos"])
+                cursor = pagina["siguiente"]
+                if cursor is None:
+                    return objetos
+
+    def assertPosiciones(self, objetos):
+        promedios = [objeto.promedio_calificacion for objeto in objetos if objeto.total_respuestas]
+        for objeto in objetos:
+            if not objeto.total_respuestas:
+                self.assertIsNone(objeto.posicion)
+                continue
+            mejores = sum(1 for promedio in promedios if promedio > objeto.promedio_calificacion)
+            self.assertEqual(objeto.posicion, mejores + 1, objeto)
+
+    def test_posicion_de_cursos_en_cada_orden(self):
+        for parametros in ("", "dir=asc", "orden=nombre", "orden=evaluaciones&dir=asc"):
+            cursos = self.recorrer(ReporteTablaService.get_pagina_cursos, parametros)
+
+            self.assertEqual(len(cursos), len(PUNTUACIONES))
+            self.assertPosiciones(cursos)
+
+    def test_empates_comparten_posicion(self):
+        cursos = self.recorrer(ReporteTablaService.get_pagina_cursos, "")
+
+        posiciones = [curso.posicion for curso in cursos]
+        self.assertEqual(posiciones, [1, 1, 3, 3, 5, 6, 7, None, None])
+
+    def test_orden_por_promedio(self):
+        cursos = self.recorrer(ReporteTablaService.get_pagina_cursos, "")
+
+        promedios = [curso.promedio_calificacion for curso in cursos]
+        self.assertEqual(promedios, sorted(promedios, reverse=True))
+
+    def test_lista_los_cursos_sin_respuestas_del_periodo(self):
+        hoy = timezone.now().date()
+        periodo = PeriodoEvaluacion.objects.create(
+            nombre="2026-I",
+            fecha_inicio=hoy,
+            fecha_fin=hoy,
+            fecha_comision=hoy,
+            fecha_cierre=hoy,
+        )
+        filtros = ReporteTablaService.get_filtros(QueryDict(""), periodo)
+
+        cursos = ReporteTablaService.get_pagina_cursos(filtros)["objetos"]
+
+        self.assertEqual(len(cursos), len(PUNTUACIONES))
+        self.assertEqual({curso.posicion for curso in cursos}, {None})
+
+    def test_posicion_de_docentes_con_filtro(self):
+        docentes = self.recorrer(
+            ReporteTablaService.get_pagina_docentes, "departamento=Departamento 0"
+        )
+
+        self.assertEqual(
+            {docente.departamento for docente in docentes}, {"Departamento 0"}
+        )
+        self.assertPosiciones(docentes)
+
+
+class CalendarioHabilTests(SimpleTestCase):
+    # Jueves y viernes santo, un sábado feriado y el 1 de mayo (viernes)
+    FERIADOS = [date(2026, 4, 2), date(2026, 4, 3), date(2026, 4, 4), date(2026, 5, 1)]
+
+    def setUp(self):
+        self.calendario = CalendarioHabil(self.FERIADOS)
+        inicio = date(2026, 3, 25)
+        self.dias = [inicio + timedelta(days=i) for i in range(45)]
+
+    def contar_dia_por_dia(self, fecha_inicio, fecha_fin):
+        dias = (fecha_fin - fecha_inicio).days + 1
+        return sum(
+            1
+            for i in range(dias)
+            if (fecha_inicio + timedelta(days=i)).weekday() < 5
+            and fecha_inicio + timedelta(days=i) not in self.FERIADOS
+        )
+
+    def test_contar_coincide_con_el_conteo_dia_por_dia(self):
+        # Todos los rangos de la ventana: empiezan y terminan en cualquier
+        # día de la semana y cruzan fines de semana y feriados
+        for posicion, fecha_inicio in enumerate(self.dias):
+            for fecha_fin in self.dias[posicion:]:
+                self.assertEqual(
+                    self.calendario.contar(fecha_inicio, fecha_fin),
+                    self.contar_dia_por_dia(fecha_inicio, fecha_fin),
+                    (fecha_inicio, fecha_fin),
+                )
+
+    def test_agregar_es_la_inversa_de_contar(self):
+        for fecha in self.dias[:10]:
+            for dias_habiles in range(1, 25):
+                destino = self.calendario.agregar(fecha, dias_habiles)
+
+                self.assertTrue(self.calendario.es_habil(destino), (fecha, dias_habiles))
+                self.assertEqual(
+                    self.contar_dia_por_dia(fecha + timedelta(days=1), destino),
+                    dias_habiles,
+                    (fecha, dias_habiles),
+                )
+
+    def test_rango_vacio(self):
+        self.assertEqual(self.calendario.contar(self.dias[5], self.dias[4]), 0)
@@ -72,4 +72,59 @@ urlpatterns = [
         views.reporte_docente,
         name="reporte_docente",
     ),
+    path(
+        "reporte_general/<uuid:usuario_id>/exportar/",
+        views.exportar_reporte,
+        {"tipo": "general"},
+        name="exportar_reporte_general",
+    ),
+    path(
+        "reporte_general/<uuid:usuario_id>/exportar/respuestas/",
+        views.exportar_reporte,
+        {"tipo": "respuestas"},
+        name="exportar_respuestas",
+    ),
+    path(
+        "reporte_curso/<uuid:usuario_id>/exportar/",
+        views.exportar_reporte,
+        {"tipo": "cursos"},
+        name="exportar_reporte_curso",
+    ),
+    path(
+        "reporte_docente/<uuid:usuario_id>/exportar/",
+        views.exportar_reporte,
+        {"tipo": "docentes"},
+        name="exportar_reporte_docente",
+    ),
+    path(
+        "reportes/trabajos/<uuid:usuario_id>/",
+        views.trabajos_reportes,
+        name="trabajos_reportes",
+    ),
+    path(
+        "reportes/trabajos/<uuid:usuario_id>/<uuid:trabajo_id>/estado/",
+        views.estado_trabajo,
+        name="estado_trabajo",
+    ),
+    path(
+        "reportes/trabajos/<uuid:usuario_id>/<uuid:trabajo_id>/descargar/",
+        views.descargar_trabajo,
+        name="descargar_trabajo",
+    ),
+    path(
+        "cobertura/<uuid:usuario_id>/",
+        views.cobertura_evaluaciones,
+        name="cobertura_evaluaciones",
+    ),
+    path(
+        "tendencias/<uuid:usuario_id>/",
+        views.tendencias_docentes,
+        name="tendencias_docentes",
+    ),
+    path("buscar/<uuid:usuario_id>/", views.buscar, name="buscar"),
+    path(
+        "rendimiento/<uuid:usuario_id>/",
+        views.rendimiento_vistas,
+        name="rendimiento_vistas",
+    ),
 ]
@@ -1,6 +1,10 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.core.exceptions import ValidationError
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.db.models import Count, Avg
-from apps.comision.models import Comision
+from apps.comision.models import Comision, TrabajoReporte
+from apps.docentes.models import Docente
 from apps.evaluacion.models import (
     ModuloPreguntas,
     Evaluacion,
@@ -16,24 +20,30 @@ from django.contrib import messages
 from django.utils import timezone
 
 # Import our new modularized helpers and services
-from apps.comision.lib.utils.dias_habiles import (
-    calcular_dias_habiles,
-    calcular_dias_habiles_restantes,
-    calcular_progreso_dias_habiles,
-    get_informacion_dias_habiles,
-)
-from apps.comision.lib.utils.fechas import calcular_dias_restantes
+from apps.comision.lib.utils.dias_habiles import get_informacion_dias_habiles
 from apps.comision.lib.services.periodo_status import PeriodoStatusService
 from apps.comision.lib.services.estadisticas import EstadisticasService
+from apps.comision.lib.services.cobertura import CoberturaService
+from apps.comision.lib.services.exportacion import ExportacionService
+from apps.comision.lib.services.reportes_tablas import ReporteTablaService
+from apps.comision.lib.services.trabajos import TrabajoReporteService
+from apps.evaluacion.lib.services.busqueda import BusquedaService
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+from apps.evaluacion.lib.services.snapshot import PeriodoSnapshotService
+from apps.evaluacion.lib.services.tendencias import TendenciaService
+from apps.core.lib.services.cache import CacheService
+from apps.core.lib.utils.paginacion import PaginadorKeyset
+from apps.core.lib.services.instrumentacion import InstrumentacionService
 from apps.comision.lib.helpers.context import ContextHelper
 from apps.comision.lib.helpers.validaciones import ValidacionHelper
+from apps.usuarios.lib.services.sesion import SesionService
 
 
 # Create your views here.
 
 
 def index(request, usuario_id):
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
 
     # Use statistics service
     estadisticas_service = EstadisticasService()
@@ -65,7 +75,7 @@ def index(request, usuario_id):
 
 
 def perfil_comision(request, usuario_id):
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
 
     # Obtener estadísticas de actividad
     evaluaciones_revisadas = Evaluacion.objects.filter(estado="enviada").count()
@@ -83,51 +93,54 @@ def perfil_comision(request, usuario_id):
     return render(request, "perfil_comision.html", context)
 
 
+PERIODOS_POR_PAGINA = 10
+
+
 # Nueva función para gestionar los periodos de evaluación
 def gestionar_periodos(request, usuario_id):
     """Vista para administrar los periodos de evaluación"""
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
 
     # Obtener periodos activos y pasados
     hoy = timezone.now().date()
     periodos_activos = PeriodoEvaluacion.objects.filter(fecha_fin__gte=hoy).order_by(
         "fecha_inicio"
     )
-    periodos_pasados = PeriodoEvaluacion.objects.filter(fecha_fin__lt=hoy).order_by(
-        "-fecha_inicio"
-    )
+    # Los periodos pasados crecen sin límite: se paginan por fecha de inicio
+    pagina_pasados = PaginadorKeyset(
+        PeriodoEvaluacion.objects.filter(fecha_fin__lt=hoy),
+        "fecha_inicio",
+        descendente=True,
+        tamano=PERIODOS_POR_PAGINA,
+    ).get_pagina(request.GET.get("cursor"))
+    periodos_pasados = pagina_pasados["objetos"]
 
     # Use statistics service for periods
     estadisticas_service = EstadisticasService()
-    estadisticas_periodos = estadisticas_service.get_estadisticas_periodos(
-        periodos_activos, periodos_pasados, hoy
-    )
+    estadisticas_periodos = estadisticas_service.get_estadisticas_periodos(hoy)
 
     # Obtener periodo actual (si existe)
-    periodo_actual = None
     info_dias_habiles_actual = None
-    if periodos_activos.filter(fecha_inicio__lte=hoy).exists():
-        periodo_actual = periodos_activos.filter(fecha_inicio__lte=hoy).first()
-
+    periodo_actual = periodos_activos.filter(fecha_inicio__lte=hoy).first()
+    if periodo_actual:
         # Use context helper to prepare period data
         context_helper = ContextHelper()
         periodo_actual = context_helper.preparar_datos_periodo(periodo_actual, hoy)
 
         # Información sobre días hábiles
-        info_dias_habiles_actual = get_informacion_dias_habiles(periodo_actual)
+        info_dias_habiles_actual = get_informacion_dias_habiles(periodo_actual, hoy)
 
-        # Obtener evaluaciones de este periodo
-        evaluaciones = Evaluacion.objects.filter(
-            fecha__range=(periodo_actual.fecha_inicio, periodo_actual.fecha_fin),
-            estado="enviada",
-        )
-        periodo_actual.total_evaluaciones = evaluaciones.count()
+        # Evaluaciones enviadas en este periodo
+        periodo_actual.total_evaluaciones = PeriodoSnapshotService.get_snapshot(
+            periodo_actual
+        )["evaluaciones_completadas"]
 
     context = {
         "usuario_id": usuario_id,
         "comision": comision,
         "periodos_activos": periodos_activos,
         "periodos_pasados": periodos_pasados,
+        "pagina_pasados": pagina_pasados,
         "total_periodos": estadisticas_periodos["total_periodos"],
         "proximos_periodos": estadisticas_periodos["proximos_periodos"],
         "periodos_en_curso": estadisticas_periodos["periodos_en_curso"],
@@ -142,7 +155,7 @@ def gestionar_periodos(request, usuario_id):
 # Nueva función para crear un periodo de evaluación
 def crear_periodo(request, usuario_id):
     """Vista para crear un nuevo periodo de evaluación"""
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
 
     if request.method == "POST":
         form = PeriodoEvaluacionForm(request.POST)
@@ -188,7 +201,7 @@ def crear_periodo(request, usuario_id):
 # Nueva función para configurar un periodo de evaluación existente
 def configurar_periodo(request, periodo_id, usuario_id):
     """Vista para configurar un periodo de evaluación existente"""
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
     periodo = get_object_or_404(PeriodoEvaluacion, id=periodo_id)
 
     if request.method == "POST":
@@ -232,7 +245,7 @@ def configurar_periodo(request, periodo_id, usuario_id):
 # Nueva función para seleccionar el tipo de encuesta
 def seleccionar_tipo_encuesta(request, periodo_id, usuario_id):
     """Vista para seleccionar si crear una encuesta nueva o usar una existente"""
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
     periodo = get_object_or_404(PeriodoEvaluacion, id=periodo_id)
 
     context = {
@@ -269,7 +282,6 @@ def realizar_encuesta(request, usuario_id, periodo_id=None):
     estadisticas_service = EstadisticasService()
 
     # Calculate status information using services
-    dias_restantes = calcular_dias_restantes(periodo.fecha_fin) if periodo else 0
     status_label, status_color = periodo_status_service.get_periodo_status(
         periodo, fecha_actual
     )
@@ -281,7 +293,8 @@ def realizar_encuesta(request, usuario_id, periodo_id=None):
     )
 
     # Obtener información detallada sobre días hábiles
-    info_dias_habiles = get_informacion_dias_habiles(periodo)
+    info_dias_habiles = get_informacion_dias_habiles(periodo, fecha_actual)
+    dias_restantes = info_dias_habiles["dias_restantes"]
 
     # Obtener los módulos disponibles
     modulos = ModuloPreguntas.objects.prefetch_related("preguntamodulo_set").all()
@@ -313,11 +326,12 @@ def realizar_encuesta(request, usuario_id, periodo_id=None):
 
 
 def editar_pregunta(request, id_pregunta, usuario_id):
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
     pregunta = get_object_or_404(PreguntaModulo, id_pregunta=id_pregunta)
     form = PreguntaModuloForm(request.POST or None, instance=pregunta)
     if form.is_valid():
         form.save()
+        InvalidacionService.cuestionario_modificado()
         return redirect("comision:realizar_encuesta", usuario_id=usuario_id)
     return render(
         request,
@@ -331,6 +345,7 @@ def eliminar_pregunta(request, id_pregunta, usuario_id):
 
     if request.method == "POST":
         pregunta.delete()
+        InvalidacionService.cuestionario_modificado()
         messages.success(request, "Pregunta eliminada exitosamente.")
     return redirect("comision:realizar_encuesta", usuario_id=usuario_id)
 
@@ -345,7 +360,7 @@ def eliminar_pregunta(request, id_pregunta, usuario_id):
 
 def agregar_pregunta(request, id_modulo, usuario_id):
     
-    comision = get_object_or_404(Comision, usuario__id=usuario_id)
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
     modulo = get_object_or_404(ModuloPreguntas, id_modulo=id_modulo)
 
     if request.method == "POST":
@@ -354,6 +369,7 @@ def agregar_pregunta(request, id_modulo, usuario_id):
             pregunta = form.save(commit=False)
             pregunta.id_modulo = modulo
             pregunta.save()
+            InvalidacionService.cuestionario_modificado()
             messages.success(request, "Pregunta agregada exitosamente.")
             return redirect("comision:realizar_encuesta", usuario_id=usuario_id)
     else:
@@ -388,29 +404,292 @@ def reporter_general(request, usuario_id):
         "mejores_docentes": reporte_data["mejores_docentes"],
         "mejores_cursos": reporte_data["mejores_cursos"],
         "distribucion": reporte_data["distribucion"],
+        "periodos": PeriodoEvaluacion.objects.all(),
+        "xlsx_disponible": ExportacionService.xlsx_disponible(),
     }
     return render(request, "reportes/reporte_general.html", context)
 
 
 def reporte_curso(request, usuario_id):
-    # Use statistics service for course reports
-    estadisticas_service = EstadisticasService()
-    cursos_con_estadisticas = estadisticas_service.get_reporte_cursos()
+    # Filtros, orden y paginación se resuelven en la base de datos
+    filtros = ReporteTablaService.get_filtros(request.GET, _get_periodo_parametro(request))
+    pagina = ReporteTablaService.get_pagina_cursos(filtros, request.GET.get("cursor"))
 
     context = {
         "usuario_id": usuario_id,
-        "cursos": cursos_con_estadisticas,
+        "cursos": pagina["objetos"],
+        "pagina": pagina,
+        "filtros": filtros,
+        **ReporteTablaService.get_opciones(),
+        "periodos": PeriodoEvaluacion.objects.all(),
+        "xlsx_disponible": ExportacionService.xlsx_disponible(),
     }
     return render(request, "reportes/reporte_curso.html", context)
 
 
 def reporte_docente(request, usuario_id):
-    # Use statistics service for teacher reports
-    estadisticas_service = EstadisticasService()
-    docentes_con_estadisticas = estadisticas_service.get_reporte_docentes()
+    # Filtros, orden y paginación se resuelven en la base de datos
+    filtros = ReporteTablaService.get_filtros(request.GET, _get_periodo_parametro(request))
+    pagina = ReporteTablaService.get_pagina_docentes(filtros, request.GET.get("cursor"))
 
     context = {
         "usuario_id": usuario_id,
-        "docentes": docentes_con_estadisticas,
+        "docentes": pagina["objetos"],
+        "pagina": pagina,
+        "filtros": filtros,
+        **ReporteTablaService.get_opciones(),
+        "periodos": PeriodoEvaluacion.objects.all(),
+        "xlsx_disponible": ExportacionService.xlsx_disponible(),
     }
     return render(request, "reportes/reporte_docente.html", context)
+
+
+def _get_periodo_parametro(request):
+    """Periodo indicado en ?periodo= (None si no se indica, 404 si no existe)"""
+    periodo_id = request.GET.get("periodo")
+    if not periodo_id:
+        return None
+    try:
+        return PeriodoEvaluacion.objects.get(id=periodo_id)
+    except (PeriodoEvaluacion.DoesNotExist, ValidationError):
+        raise Http404("Periodo no encontrado")
+
+
+def exportar_reporte(request, usuario_id, tipo):
+    """Exportar resultados de evaluación en CSV (por defecto) o XLSX"""
+    SesionService.get_perfil_o_404(request, Comision, usuario_id)
+
+    # Periodo opcional: sin él se exportan todos los periodos
+    periodo = _get_periodo_parametro(request)
+
+    filas = ExportacionService.get_filas(tipo, periodo)
+
+    if request.GET.get("formato") == "xlsx":
+        if not ExportacionService.xlsx_disponible():
+            raise Http404("La exportación a XLSX requiere openpyxl")
+        return FileResponse(
+            ExportacionService.generar_xlsx(filas, tipo),
+            as_attachment=True,
+            filename=ExportacionService.get_nombre_archivo(tipo, periodo, "xlsx"),
+        )
+
+    # Las filas se generan y envían mientras se leen de la base de datos; bajo
+    # ASGI el contenido debe ser asíncrono para no leerse completo antes de enviarse
+    if isinstance(request, ASGIRequest):
+        contenido = ExportacionService.agenerar_csv(filas)
+    else:
+        contenido = ExportacionService.generar_csv(filas)
+    response = StreamingHttpResponse(contenido, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = (
+        f'attachment; filename="{ExportacionService.get_nombre_archivo(tipo, periodo, "csv")}"'
+    )
+    return response
+
+
+def trabajos_reportes(request, usuario_id):
+    """Solicitar reportes en segundo plano y ver su progreso"""
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
+
+    if request.method == "POST":
+        tipo = request.POST.get("tipo")
+        formato = request.POST.get("formato", "csv")
+        periodo = None
+        if request.POST.get("periodo"):
+            try:
+                periodo = PeriodoEvaluacion.objects.get(id=request.POST["periodo"])
+            except (PeriodoEvaluacion.DoesNotExist, ValidationError):
+                raise Http404("Periodo no encontrado")
+
+        if tipo not in TrabajoReporteService.TIPOS_EXPORTACION:
+            messages.error(request, "Tipo de reporte no válido.")
+        elif formato not in ("csv", "xlsx"):
+            messages.error(request, "Formato no válido.")
+        else:
+            try:
+                TrabajoReporteService.encolar(comision, tipo, formato, periodo)
+                messages.success(
+                    request,
+                    "El reporte se está generando; podrá descargarlo cuando termine.",
+                )
+            except ValueError as e:
+                messages.error(request, str(e))
+        return redirect("comision:trabajos_reportes", usuario_id=usuario_id)
+
+    context = {
+        "usuario_id": usuario_id,
+        "comision": comision,
+        "trabajos": comision.trabajos_reporte.select_related("periodo")[:20],
+        "tipos": [
+            (valor, nombre)
+            for valor, nombre in TrabajoReporte._meta.get_field("tipo").choices
+            if valor in TrabajoReporteService.TIPOS_EXPORTACION
+        ],
+        "periodos": PeriodoEvaluacion.objects.all(),
+        "xlsx_disponible": ExportacionService.xlsx_disponible(),
+    }
+    return render(request, "reportes/trabajos.html", context)
+
+
+def estado_trabajo(request, usuario_id, trabajo_id):
+    """Progreso de un trabajo de reporte en JSON, para la consulta periódica"""
+    trabajo = get_object_or_404(
+        TrabajoReporte, id=trabajo_id, comision__usuario__id=usuario_id
+    )
+    return JsonResponse(TrabajoReporteService.get_estado(trabajo))
+
+
+def descargar_trabajo(request, usuario_id, trabajo_id):
+    """Descargar el archivo de un trabajo de reporte completado"""
+    trabajo = get_object_or_404(
+        TrabajoReporte,
+        id=trabajo_id,
+        comision__usuario__id=usuario_id,
+        estado="completado",
+    )
+    if not trabajo.archivo:
+        raise Http404("El reporte no tiene archivo")
+    return FileResponse(
+        trabajo.archivo.open("rb"),
+        as_attachment=True,
+        filename=ExportacionService.get_nombre_archivo(
+            trabajo.tipo, trabajo.periodo, trabajo.formato
+        ),
+    )
+
+
+RESULTADOS_BUSQUEDA = 50
+
+
+def buscar(request, usuario_id):
+    """Búsqueda de docentes, cursos y comentarios de las evaluaciones"""
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
+
+    consulta = request.GET.get("q", "").strip()
+    tipo = request.GET.get("tipo", "")
+    tipos = [tipo] if tipo in BusquedaService.TIPOS else None
+    resultados = (
+        BusquedaService.buscar(consulta, tipos, RESULTADOS_BUSQUEDA) if consulta else []
+    )
+
+    return render(
+        request,
+        "reportes/buscar.html",
+        {
+            "usuario_id": usuario_id,
+            "comision": comision,
+            "consulta": consulta,
+            "tipo": tipo if tipos else "",
+            "resultados": resultados,
+        },
+    )
+
+
+def rendimiento_vistas(request, usuario_id):
+    """Resumen de tiempos y consultas SQL por vista, solo para la comisión"""
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
+
+    if request.method == "POST":
+        InstrumentacionService.reiniciar()
+        messages.success(request, "Se reinició el resumen de rendimiento.")
+        return redirect("comision:rendimiento_vistas", usuario_id=usuario_id)
+
+    context = {
+        "usuario_id": usuario_id,
+        "comision": comision,
+        "vistas": InstrumentacionService.get_resumen(),
+        "configuracion": InstrumentacionService.get_configuracion(),
+    }
+    return render(request, "reportes/rendimiento_vistas.html", context)
+
+
+def cobertura_evaluaciones(request, usuario_id):
+    """Evaluaciones esperadas según matrículas activas frente a las enviadas"""
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
+
+    # Por defecto, el periodo en curso o el más reciente
+    periodo = _get_periodo_parametro(request)
+    if periodo is None:
+        hoy = timezone.now().date()
+        periodo = (
+            PeriodoEvaluacion.objects.filter(
+                fecha_inicio__lte=hoy, fecha_fin__gte=hoy
+            ).first()
+            or PeriodoEvaluacion.objects.first()
+        )
+
+    context = {
+        "usuario_id": usuario_id,
+        "comision": comision,
+        "periodo": periodo,
+        "periodos": PeriodoEvaluacion.objects.all(),
+    }
+    if periodo:
+        despues = request.GET.get("despues")
+        namespace = CacheService.namespace_periodo(periodo.pk)
+        try:
+            pendientes = CacheService.get_or_set(
+                namespace,
+                f"cobertura_pendientes:{despues or ''}",
+                lambda: CoberturaService.get_pendientes(periodo, despues=despues),
+                CoberturaService.TIMEOUT,
+            )
+        except ValidationError:
+            raise Http404("Página no encontrada")
+
+        por_docente = CacheService.get_or_set(
+            namespace,
+            "cobertura_docente",
+            lambda: CoberturaService.get_cobertura_por(periodo, "docente"),
+            CoberturaService.TIMEOUT,
+        )
+        por_curso = CacheService.get_or_set(
+            namespace,
+            "cobertura_curso",
+            lambda: CoberturaService.get_cobertura_por(periodo, "curso"),
+            CoberturaService.TIMEOUT,
+        )
+        context.update(
+            {
+                "resumen": CoberturaService.sumar(por_docente),
+                "por_docente": por_docente,
+                "por_curso": por_curso,
+                "pendientes": pendientes["matriculas"],
+                "siguiente": pendientes["siguiente"],
+            }
+        )
+    return render(request, "reportes/cobertura.html", context)
+
+
+def tendencias_docentes(request, usuario_id):
+    """Posición de los docentes en un periodo cerrado y evolución de uno de ellos"""
+    comision = SesionService.get_perfil_o_404(request, Comision, usuario_id)
+
+    # Por defecto, el periodo cerrado más reciente con tendencias
+    periodo = _get_periodo_parametro(request)
+    docentes = TendenciaService.get_docentes(periodo)
+
+    docente_id = request.GET.get("docente")
+    if docente_id:
+        try:
+            docente = Docente.objects.select_related("usuario").get(pk=docente_id)
+        except (Docente.DoesNotExist, ValidationError):
+            raise Http404("Docente no encontrado")
+    else:
+        docente = (
+            Docente.objects.select_related("usuario").get(pk=docentes[0]["docente"])
+            if docentes
+            else None
+        )
+
+    context = {
+        "usuario_id": usuario_id,
+        "comision": comision,
+        "periodo": periodo,
+        "periodos": PeriodoEvaluacion.objects.filter(estado="cerrado"),
+        "docentes": docentes,
+        "docente": docente,
+    }
+    if docente:
+        context["serie"] = TendenciaService.get_serie(docente.pk)
+        context["series_modulos"] = TendenciaService.get_series_modulos(docente.pk)
+    return render(request, "reportes/tendencias.html", context)
@@ -1,3 +1,12 @@
 from django.contrib import admin
+from apps.configuracion.models import DiaFeriado, Parametro
 
 # Register your models here.
+
+admin.site.register(Parametro)
+
+@admin.register(DiaFeriado)
+class DiaFeriadoAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'descripcion')
+    search_fields = ('descripcion',)
+    date_hierarchy = 'fecha'
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ConfiguracionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.configuracion'
+
+    def ready(self):
+        from apps.configuracion import signals  # noqa: F401
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:21
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configuracion', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaFeriado',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fecha', models.DateField(unique=True)),
+                ('descripcion', models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                'ordering': ['fecha'],
+            },
+        ),
+    ]
@@ -8,3 +8,16 @@ class Parametro(models.Model):
 
     def __str__(self):
         return f"{self.nombre}: {self.valor}"
+
+
+# Días feriados que no cuentan como hábiles en los periodos de evaluación
+class DiaFeriado(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    fecha = models.DateField(unique=True)
+    descripcion = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        ordering = ["fecha"]
+
+    def __str__(self):
+        return f"{self.fecha} - {self.descripcion}"
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.configuracion.models import DiaFeriado
+
+
+@receiver([post_save, post_delete], sender=DiaFeriado)
+def invalidar_calendario_habil(sender, **kwargs):
+    # Los conteos de días hábiles usan los feriados en caché
+    from apps.comision.lib.utils.dias_habiles import invalidar_calendario
+
+    invalidar_calendario()
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from apps.core.lib.services.instrumentacion import instalar_recolector
+
+        connection_created.connect(
+            instalar_recolector, dispatch_uid="sed_instrumentacion_recolector"
+        )
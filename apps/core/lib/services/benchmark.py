@@ -0,0 +1,218 @@
+"""
+Servicio para medir latencia, consultas y memoria de las vistas principales.
+"""
+
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from django.conf import settings
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+from apps.alumnos.models import Estudiante
+from apps.comision.models import Comision
+from apps.core.models import Matricula
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion
+from apps.evaluacion.lib.services.catalogo import CatalogoPreguntasService
+from apps.core.lib.services.instrumentacion import RecolectorConsultas
+from apps.usuarios.lib.services.sesion import SesionService
+from apps.usuarios.models import Usuario
+
+
+class BenchmarkService:
+    """Servicio para ejecutar peticiones contra las vistas y resumir sus métricas."""
+
+    @staticmethod
+    def ejecutar(repeticiones: int = 10, calentamiento: int = 1) -> List[Dict]:
+        """
+        Mide cada escenario con el cliente de pruebas de Django.
+
+        Cada escenario se ejecuta primero sin medir (calentamiento), luego
+        `repeticiones` veces midiendo tiempo y consultas, y una vez más con
+        tracemalloc para obtener el pico de memoria.
+
+        Args:
+            repeticiones: Número de peticiones medidas por escenario
+            calentamiento: Número de peticiones previas sin medir
+
+        Returns:
+            Lista de diccionarios con las métricas de cada escenario
+        """
+        cliente = Client()
+        escenarios = BenchmarkService.get_escenarios(repeticiones + calentamiento + 1)
+
+        resultados = []
+        for nombre, peticion in escenarios.items():
+            for _ in range(calentamiento):
+                peticion(cliente)
+
+            tiempos = []
+            consultas = []
+            tiempos_bd = []
+            for _ in range(repeticiones):
+                # El recolector incluye las consultas que las vistas asíncronas
+                # ejecutan en otros hilos
+                with RecolectorConsultas().activo() as recolector:
+                    inicio = time.perf_counter()
+                    respuesta = peticion(cliente)
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                consultas.append(len(recolector.consultas))
+                tiempos_bd.append(sum(t for _, t in recolector.consultas) * 1000)
+
+            tracemalloc.start()
+            peticion(cliente)
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            resultados.append(
+                {
+                    "vista": nombre,
+                    "estado_http": respuesta.status_code,
+                    "repeticiones": repeticiones,
+                    "latencia_ms": BenchmarkService._resumir(tiempos),
+                    "tiempo_bd_ms": round(statistics.median(tiempos_bd), 3),
+                    "consultas": max(consultas),
+                    "memoria_pico_kb": round(pico / 1024, 1),
+                }
+            )
+        return resultados
+
+    @staticmethod
+    def get_escenarios(envios: int) -> Dict[str, Callable]:
+        """
+        Construye las peticiones a medir a partir de los datos existentes.
+
+        Args:
+            envios: Número de evaluaciones nuevas que debe poder enviar
+                el escenario de procesar_evaluacion
+
+        Returns:
+            Diccionario {nombre: función que recibe el cliente y hace la petición}
+        """
+        docente_id = (
+            Evaluacion.objects.filter(estado="enviada")
+            .values("docente__usuario")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()["docente__usuario"]
+        )
+        alumno = (
+            Estudiante.objects.annotate(total=Count("evaluacion"))
+            .order_by("-total")
+            .first()
+        )
+        comision_id = Comision.objects.values_list("usuario", flat=True).first()
+
+        pendientes = BenchmarkService._get_matriculas_pendientes(envios)
+        preguntas_ids = CatalogoPreguntasService.get_catalogo()["preguntas_ids"]
+
+        # Las vistas exigen sesión: cada petición lleva la del usuario de la URL
+        sesiones = {}
+
+        def get_sesion(usuario_id):
+            if usuario_id not in sesiones:
+                usuario = Usuario.objects.select_related("rol").get(pk=usuario_id)
+                sesiones[usuario_id] = SesionService.crear_sesion(usuario)
+            return sesiones[usuario_id]
+
+        def iniciar_sesion(cliente, usuario_id):
+            cliente.cookies[settings.SESSION_COOKIE_NAME] = get_sesion(usuario_id)
+
+        def get(url, usuario_id):
+            def peticion(cliente):
+                iniciar_sesion(cliente, usuario_id)
+                return cliente.get(url)
+
+            return peticion
+
+        # Las sesiones de los envíos se crean antes de medir
+        for matricula in pendientes:
+            get_sesion(matricula.estudiante.usuario_id)
+
+        def enviar_evaluacion(cliente):
+            matricula = pendientes.pop()
+            iniciar_sesion(cliente, matricula.estudiante.usuario_id)
+            datos = {
+                "curso_id": str(matricula.curso_id),
+                "docente_id": str(matricula.curso.docente_id),
+                "comentario_general": "Explica con claridad y resuelve dudas",
+            }
+            for indice, pregunta_id in enumerate(preguntas_ids):
+                datos[f"pregunta_{pregunta_id}"] = str(indice % 5 + 1)
+            return cliente.post(
+                reverse(
+                    "alumno:evaluaciones",
+                    kwargs={"usuario_id": matricula.estudiante.usuario_id},
+                ),
+                datos,
+            )
+
+        return {
+            "explorar": get(
+                reverse("alumno:explorar", kwargs={"usuario_id": alumno.usuario_id}),
+                alumno.usuario_id,
+            ),
+            "detalle_docente": get(
+                reverse(
+                    "alumno:detalle_docente",
+                    kwargs={"usuario_id": alumno.usuario_id, "docente_id": docente_id},
+                ),
+                alumno.usuario_id,
+            ),
+            "ver_evaluacion": get(
+                reverse("docente:ver_evaluacion", kwargs={"usuario_id": docente_id}),
+                docente_id,
+            ),
+            "reporte_docente": get(
+                reverse("comision:reporte_docente", kwargs={"usuario_id": comision_id}),
+                comision_id,
+            ),
+            "reporte_curso": get(
+                reverse("comision:reporte_curso", kwargs={"usuario_id": comision_id}),
+                comision_id,
+            ),
+            "reporter_general": get(
+                reverse("comision:reporte_general", kwargs={"usuario_id": comision_id}),
+                comision_id,
+            ),
+            "cobertura_evaluaciones": get(
+                reverse(
+                    "comision:cobertura_evaluaciones",
+                    kwargs={"usuario_id": comision_id},
+                ),
+                comision_id,
+            ),
+            "procesar_evaluacion": enviar_evaluacion,
+        }
+
+    @staticmethod
+    def _get_matriculas_pendientes(cantidad: int) -> List[Matricula]:
+        """Matrículas activas cuyo curso aún no fue evaluado por el estudiante."""
+        if not PeriodoEvaluacion.objects.filter(estado="activo").exists():
+            raise ValueError("Se necesita un periodo activo para enviar evaluaciones")
+
+        evaluadas = set(Evaluacion.objects.values_list("estudiante", "curso"))
+        pendientes = []
+        matriculas = Matricula.objects.filter(
+            estado="activa", curso__docente__isnull=False
+        ).select_related("estudiante", "curso")
+        for matricula in matriculas.iterator(chunk_size=2000):
+            if (matricula.estudiante_id, matricula.curso_id) not in evaluadas:
+                pendientes.append(matricula)
+                if len(pendientes) == cantidad:
+                    return pendientes
+
+        raise ValueError(
+            f"Solo hay {len(pendientes)} matrículas sin evaluar; se necesitan {cantidad}"
+        )
+
+    @staticmethod
+    def _resumir(tiempos: List[float]) -> Dict:
+        ordenados = sorted(tiempos)
+        return {
+            "min": round(ordenados[0], 3),
+            "mediana": round(statistics.median(ordenados), 3),
+            "p95": round(ordenados[max(0, round(0.95 * len(ordenados)) - 1)], 3),
+            "max": round(ordenados[-1], 3),
+        }
@@ -0,0 +1,106 @@
+"""
+Servicio de caché con espacios de nombres versionados y recálculo de un solo proceso.
+"""
+
+import time
+from typing import Any, Callable, Optional
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+class CacheService:
+    """
+    Servicio para guardar resultados costosos en la caché configurada en CACHES.
+
+    Las claves se agrupan en espacios de nombres (ej. "reportes" o
+    "periodo:<id>") con un número de versión; invalidar un espacio solo
+    incrementa su versión, por lo que funciona igual con memoria local,
+    archivos o Redis, que no permiten borrar por prefijo de forma eficiente.
+    """
+
+    # Tiempo máximo que un proceso puede tener el recálculo de una clave
+    TIMEOUT_BLOQUEO = 30
+
+    # Espera de los procesos que encuentran la clave en recálculo
+    ESPERA_BLOQUEO = 0.05
+    INTENTOS_BLOQUEO = 100
+
+    @staticmethod
+    def namespace_periodo(periodo_id) -> str:
+        return f"periodo:{periodo_id}"
+
+    @staticmethod
+    def get_version(namespace: str) -> int:
+        """
+        Obtiene la versión actual de un espacio de nombres.
+
+        Args:
+            namespace: Nombre del espacio (ej. "reportes")
+
+        Returns:
+            Número de versión, que cambia cada vez que se invalida el espacio
+        """
+        clave = f"version:{namespace}"
+        version = cache.get(clave)
+        if version is None:
+            # Si la versión se perdió de la caché, se parte de un valor basado
+            # en la hora para no reutilizar claves de una versión anterior
+            cache.add(clave, time.time_ns(), timeout=None)
+            version = cache.get(clave, 0)
+        return version
+
+    @staticmethod
+    def invalidar(namespace: str) -> None:
+        """Invalida todas las claves de un espacio de nombres incrementando su versión."""
+        try:
+            cache.incr(f"version:{namespace}")
+        except ValueError:
+            CacheService.get_version(namespace)
+
+    @staticmethod
+    def get_clave(namespace: str, nombre: str) -> str:
+        return f"{namespace}:{CacheService.get_version(namespace)}:{nombre}"
+
+    @staticmethod
+    def get_or_set(
+        namespace: str,
+        nombre: str,
+        calcular: Callable[[], Any],
+        timeout: Optional[int] = DEFAULT_TIMEOUT,
+    ) -> Any:
+        """
+        Obtiene un valor de la caché o lo calcula una sola vez entre procesos.
+
+        Cuando la clave no está, el primer proceso toma un bloqueo con
+        cache.add (atómico en todos los backends) y recalcula; los demás
+        esperan a que el valor aparezca en vez de recalcularlo a la vez. Si
+        el bloqueo vence sin valor, el proceso que espera lo calcula.
+
+        Args:
+            namespace: Espacio de nombres de la clave
+            nombre: Nombre de la clave dentro del espacio
+            calcular: Función sin argumentos que obtiene el valor
+            timeout: Segundos en caché (por defecto, el TIMEOUT de CACHES)
+
+        Returns:
+            Valor en caché o recién calculado
+        """
+        clave = CacheService.get_clave(namespace, nombre)
+        valor = cache.get(clave)
+        if valor is not None:
+            return valor
+
+        clave_bloqueo = f"bloqueo:{clave}"
+        if not cache.add(clave_bloqueo, 1, CacheService.TIMEOUT_BLOQUEO):
+            for _ in range(CacheService.INTENTOS_BLOQUEO):
+                time.sleep(CacheService.ESPERA_BLOQUEO)
+                valor = cache.get(clave)
+                if valor is not None:
+                    return valor
+
+        try:
+            valor = calcular()
+            cache.set(clave, valor, timeout)
+        finally:
+            cache.delete(clave_bloqueo)
+        return valor
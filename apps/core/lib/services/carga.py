@@ -0,0 +1,273 @@
+"""
+Servicio para medir latencia y rendimiento de las vistas bajo peticiones concurrentes.
+"""
+
+import asyncio
+import io
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.middleware.csrf import CSRF_SECRET_LENGTH
+from django.utils.crypto import get_random_string
+
+
+class CargaService:
+    """
+    Servicio para enviar peticiones concurrentes a los manejadores WSGI y ASGI.
+
+    Las peticiones se envían directamente a los manejadores de Django, en el
+    mismo proceso: se mide el costo de Django, las vistas y la base de datos
+    sin el servidor HTTP (gunicorn, uvicorn) ni la red. WSGI atiende con un
+    pool de hilos como un servidor con hilos; ASGI con un bucle de eventos.
+    """
+
+    HOST = "localhost"
+
+    # Las peticiones se identifican como AJAX para que también respondan
+    # las vistas que solo aceptan ese tipo de petición
+    AJAX = "XMLHttpRequest"
+
+    @staticmethod
+    def medir_wsgi(
+        urls: List[str],
+        peticiones: int,
+        concurrencia: int,
+        formularios: Optional[List[Dict[str, str]]] = None,
+        sesion: Optional[str] = None,
+    ) -> Dict:
+        """
+        Envía las peticiones al manejador WSGI desde `concurrencia` hilos.
+
+        Args:
+            urls: Rutas a solicitar, en rotación
+            peticiones: Número total de peticiones
+            concurrencia: Peticiones simultáneas (hilos del pool)
+            formularios: Si se indican, las peticiones son POST con estos
+                datos, en rotación, y con un token CSRF válido
+            sesion: Clave de una sesión iniciada que se envía en la cookie
+
+        Returns:
+            Resumen de latencia, rendimiento y errores
+        """
+        manejador = WSGIHandler()
+        # El middleware CSRF acepta el secreto de la cookie sin enmascarar
+        secreto_csrf = get_random_string(CSRF_SECRET_LENGTH)
+        cookies = CargaService._get_cookies(sesion)
+        if formularios:
+            cookies = "; ".join(
+                filter(None, [cookies, f"{settings.CSRF_COOKIE_NAME}={secreto_csrf}"])
+            )
+
+        def solicitar(indice: int) -> Tuple[float, int]:
+            ruta = urlsplit(urls[indice % len(urls)])
+            estado = []
+            entorno = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": ruta.path,
+                "QUERY_STRING": ruta.query,
+                "SERVER_NAME": CargaService.HOST,
+                "SERVER_PORT": "80",
+                "HTTP_HOST": CargaService.HOST,
+                "HTTP_X_REQUESTED_WITH": CargaService.AJAX,
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": io.StringIO(),
+                "wsgi.url_scheme": "http",
+            }
+            if cookies:
+                entorno["HTTP_COOKIE"] = cookies
+            if formularios:
+                cuerpo = urlencode(
+                    {
+                        **formularios[indice % len(formularios)],
+                        "csrfmiddlewaretoken": secreto_csrf,
+                    }
+                ).encode()
+                entorno.update(
+                    {
+                        "REQUEST_METHOD": "POST",
+                        "CONTENT_TYPE": "application/x-www-form-urlencoded",
+                        "CONTENT_LENGTH": str(len(cuerpo)),
+                        "wsgi.input": io.BytesIO(cuerpo),
+                    }
+                )
+            inicio = time.perf_counter()
+            respuesta = manejador(
+                entorno, lambda status, headers: estado.append(int(status[:3]))
+            )
+            for _ in respuesta:
+                pass
+            respuesta.close()
+            return time.perf_counter() - inicio, estado[0]
+
+        with CargaService._contar_conexiones() as conexiones:
+            with ThreadPoolExecutor(max_workers=concurrencia) as ejecutor:
+                inicio = time.perf_counter()
+                resultados = list(ejecutor.map(solicitar, range(peticiones)))
+                duracion = time.perf_counter() - inicio
+        resumen = CargaService._resumir(resultados, duracion, concurrencia)
+        return {**resumen, "conexiones": len(conexiones)}
+
+    @staticmethod
+    def medir_asgi(
+        urls: List[str], peticiones: int, concurrencia: int, sesion: Optional[str] = None
+    ) -> Dict:
+        """
+        Envía las peticiones al manejador ASGI con `concurrencia` tareas a la vez.
+
+        Args:
+            urls: Rutas a solicitar, en rotación
+            peticiones: Número total de peticiones
+            concurrencia: Peticiones simultáneas
+            sesion: Clave de una sesión iniciada que se envía en la cookie
+
+        Returns:
+            Resumen de latencia, rendimiento y errores
+        """
+        with CargaService._contar_conexiones() as conexiones:
+            resultado = asyncio.run(
+                CargaService._medir_asgi(urls, peticiones, concurrencia, sesion)
+            )
+        return {**resultado, "conexiones": len(conexiones)}
+
+    @staticmethod
+    async def _medir_asgi(
+        urls: List[str], peticiones: int, concurrencia: int, sesion: Optional[str]
+    ) -> Dict:
+        manejador = ASGIHandler()
+        semaforo = asyncio.Semaphore(concurrencia)
+        cabeceras = [
+            (b"host", CargaService.HOST.encode()),
+            (b"x-requested-with", CargaService.AJAX.encode()),
+        ]
+        if sesion:
+            cabeceras.append((b"cookie", CargaService._get_cookies(sesion).encode()))
+
+        async def solicitar(indice: int) -> Tuple[float, int]:
+            ruta = urlsplit(urls[indice % len(urls)])
+            alcance = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": ruta.path,
+                "raw_path": ruta.path.encode(),
+                "query_string": ruta.query.encode(),
+                "root_path": "",
+                "headers": cabeceras,
+                "client": ("127.0.0.1", 50000),
+                "server": (CargaService.HOST, 80),
+            }
+            cuerpo_enviado = False
+            estado = []
+
+            async def recibir():
+                nonlocal cuerpo_enviado
+                if not cuerpo_enviado:
+                    cuerpo_enviado = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # El cliente no se desconecta: Django cancela esta espera al responder
+                await asyncio.Future()
+
+            async def enviar(mensaje):
+                if mensaje["type"] == "http.response.start":
+                    estado.append(mensaje["status"])
+
+            async with semaforo:
+                inicio = time.perf_counter()
+                await manejador(alcance, recibir, enviar)
+                return time.perf_counter() - inicio, estado[0]
+
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(solicitar(i) for i in range(peticiones)))
+        duracion = time.perf_counter() - inicio
+        return CargaService._resumir(resultados, duracion, concurrencia)
+
+    @staticmethod
+    def usar_modo_conexion(modo: str) -> None:
+        """
+        Aplica uno de los modos de DB_MODOS_CONEXION a la base de datos actual.
+
+        Los hilos comparten el diccionario de configuración de la conexión,
+        por lo que el cambio rige para todas las conexiones que se abran
+        después. Las conexiones abiertas y el pool anterior se cierran.
+
+        Args:
+            modo: Clave de settings.DB_MODOS_CONEXION (ej. "persistente")
+        """
+        configuracion = settings.DB_MODOS_CONEXION[modo]
+        opciones = configuracion.get("OPTIONS", {})
+        if opciones and connection.vendor != "postgresql":
+            raise ValueError(f"El modo de conexión {modo} requiere PostgreSQL")
+
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+        connection.close()
+
+        ajustes = connection.settings_dict
+        ajustes["CONN_MAX_AGE"] = configuracion.get("CONN_MAX_AGE", 0)
+        ajustes["CONN_HEALTH_CHECKS"] = configuracion.get("CONN_HEALTH_CHECKS", False)
+        ajustes["DISABLE_SERVER_SIDE_CURSORS"] = configuracion.get(
+            "DISABLE_SERVER_SIDE_CURSORS", False
+        )
+        ajustes["OPTIONS"] = {
+            **{clave: valor for clave, valor in ajustes["OPTIONS"].items() if clave != "pool"},
+            **opciones,
+        }
+
+    @staticmethod
+    def _get_cookies(sesion: Optional[str]) -> str:
+        return f"{settings.SESSION_COOKIE_NAME}={sesion}" if sesion else ""
+
+    @staticmethod
+    @contextmanager
+    def _contar_conexiones():
+        """
+        Registra las conexiones a la base de datos abiertas en cualquier hilo.
+
+        Con el pool de psycopg se cuentan las conexiones tomadas del pool.
+        """
+        conexiones = []
+        bloqueo = threading.Lock()
+
+        def registrar(sender, **kwargs):
+            with bloqueo:
+                conexiones.append(kwargs["connection"].alias)
+
+        connection_created.connect(registrar, weak=False)
+        try:
+            yield conexiones
+        finally:
+            connection_created.disconnect(registrar)
+
+    @staticmethod
+    def _resumir(
+        resultados: List[Tuple[float, int]], duracion: float, concurrencia: int
+    ) -> Dict:
+        tiempos = sorted(tiempo * 1000 for tiempo, _ in resultados)
+
+        def percentil(p: float) -> float:
+            return round(tiempos[max(0, round(p * len(tiempos)) - 1)], 3)
+
+        return {
+            "peticiones": len(resultados),
+            "concurrencia": concurrencia,
+            "errores": sum(1 for _, estado in resultados if estado >= 400),
+            "peticiones_por_segundo": round(len(resultados) / duracion, 2),
+            "latencia_ms": {
+                "mediana": round(statistics.median(tiempos), 3),
+                "p95": percentil(0.95),
+                "p99": percentil(0.99),
+                "max": round(tiempos[-1], 3),
+            },
+        }
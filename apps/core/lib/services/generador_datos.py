@@ -0,0 +1,313 @@
+"""
+Servicio para generar datos de prueba con volúmenes realistas.
+"""
+
+import random
+import uuid
+from datetime import datetime, time, timedelta
+from typing import Dict, List
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from apps.alumnos.models import Estudiante
+from apps.comision.models import Comision
+from apps.core.models import Curso, Matricula
+from apps.docentes.models import Docente
+from apps.evaluacion.models import (
+    Evaluacion,
+    ModuloPreguntas,
+    PeriodoEvaluacion,
+    PreguntaModulo,
+    Respuesta,
+)
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+from apps.evaluacion.lib.services.envio import EnvioEvaluacionService
+from apps.evaluacion.lib.services.busqueda import BusquedaService
+from apps.evaluacion.lib.services.comentarios import AnalisisComentariosService
+from apps.evaluacion.lib.services.resumen import ResumenService
+from apps.evaluacion.lib.services.tendencias import TendenciaService
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.models import Usuario
+
+
+class GeneradorDatosService:
+    """Servicio para poblar la base de datos con estudiantes, docentes y evaluaciones."""
+
+    DEPARTAMENTOS = [
+        "Ingeniería de Sistemas",
+        "Ingeniería Agronómica",
+        "Zootecnia",
+        "Ciencias Económicas",
+        "Ingeniería Forestal",
+        "Ingeniería Ambiental",
+    ]
+
+    MODULOS = {
+        "Metodología": 5,
+        "Dominio del curso": 5,
+        "Evaluación del aprendizaje": 4,
+        "Relación con los estudiantes": 4,
+    }
+
+    COMENTARIOS = [
+        "Explica muy bien los temas y resuelve dudas en clase",
+        "Las clases son ordenadas pero falta más práctica",
+        "Llega tarde con frecuencia y no respeta el horario",
+        "Excelente docente, domina el curso",
+        "Debería usar más ejemplos prácticos en las clases",
+        "Las evaluaciones no corresponden a lo visto en clase",
+        "",
+    ]
+
+    TAMANO_LOTE = 5000
+
+    @staticmethod
+    def generar(
+        estudiantes: int = 500,
+        docentes: int = 40,
+        cursos_por_docente: int = 3,
+        matriculas_por_estudiante: int = 5,
+        periodos: int = 3,
+        evaluaciones: int = 2000,
+        semilla: int = 42,
+    ) -> Dict:
+        """
+        Genera un conjunto de datos completo y reconstruye el acumulado.
+
+        Cada docente tiene una calidad base y las puntuaciones se distribuyen
+        alrededor de ella, de modo que los promedios y rankings no son
+        uniformes. El último periodo generado está activo en la fecha actual.
+
+        Args:
+            estudiantes: Número de estudiantes
+            docentes: Número de docentes
+            cursos_por_docente: Cursos que dicta cada docente
+            matriculas_por_estudiante: Cursos en los que se matricula cada estudiante
+            periodos: Número de periodos de evaluación
+            evaluaciones: Número de evaluaciones a generar (limitado por las matrículas)
+            semilla: Semilla para que los datos sean reproducibles
+
+        Returns:
+            Diccionario con la cantidad de registros creados por modelo y el ID
+            del usuario de comisión creado
+        """
+        aleatorio = random.Random(semilla)
+        prefijo = uuid.uuid4().hex[:6]
+
+        with transaction.atomic():
+            rol_alumno = GeneradorDatosService._get_rol(ModosRoles.ALUMNO)
+            rol_profesor = GeneradorDatosService._get_rol(ModosRoles.PROFESOR)
+            rol_comision = GeneradorDatosService._get_rol(ModosRoles.COMISION)
+
+            (usuario_comision,) = GeneradorDatosService._crear_usuarios(
+                1, rol_comision, prefijo, "comision"
+            )
+            Comision.objects.create(
+                usuario=usuario_comision,
+                facultad=aleatorio.choice(GeneradorDatosService.DEPARTAMENTOS),
+            )
+
+            lista_docentes = GeneradorDatosService._crear_docentes(
+                docentes, rol_profesor, prefijo, aleatorio
+            )
+            lista_estudiantes = GeneradorDatosService._crear_estudiantes(
+                estudiantes, rol_alumno, prefijo, aleatorio
+            )
+            lista_cursos = Curso.objects.bulk_create(
+                [
+                    Curso(
+                        nombre=f"Curso {i + 1} de {docente.usuario.nombre}",
+                        codigo=f"{prefijo}-{indice * cursos_por_docente + i}",
+                        semestre=str(aleatorio.randint(1, 10)),
+                        docente=docente,
+                    )
+                    for indice, docente in enumerate(lista_docentes)
+                    for i in range(cursos_por_docente)
+                ],
+                batch_size=GeneradorDatosService.TAMANO_LOTE,
+            )
+            preguntas = GeneradorDatosService._get_preguntas()
+            lista_periodos = GeneradorDatosService._crear_periodos(periodos, prefijo)
+
+            # Matrículas: cada estudiante en cursos distintos al azar
+            matriculas = []
+            por_estudiante = min(matriculas_por_estudiante, len(lista_cursos))
+            for estudiante in lista_estudiantes:
+                for curso in aleatorio.sample(lista_cursos, por_estudiante):
+                    matriculas.append(Matricula(estudiante=estudiante, curso=curso))
+            Matricula.objects.bulk_create(
+                matriculas, batch_size=GeneradorDatosService.TAMANO_LOTE
+            )
+
+            # Calidad base de cada docente para sesgar las puntuaciones
+            calidad = {
+                docente.pk: aleatorio.uniform(2.3, 4.7) for docente in lista_docentes
+            }
+
+            total_respuestas = 0
+            seleccion = aleatorio.sample(matriculas, min(evaluaciones, len(matriculas)))
+            for inicio in range(0, len(seleccion), GeneradorDatosService.TAMANO_LOTE):
+                lote = seleccion[inicio : inicio + GeneradorDatosService.TAMANO_LOTE]
+                lista_evaluaciones = Evaluacion.objects.bulk_create(
+                    [
+                        Evaluacion(
+                            estudiante=matricula.estudiante,
+                            curso=matricula.curso,
+                            docente=matricula.curso.docente,
+                            periodo=aleatorio.choice(lista_periodos),
+                            estado="enviada" if aleatorio.random() < 0.9 else "borrador",
+                            comentario_general=aleatorio.choice(
+                                GeneradorDatosService.COMENTARIOS
+                            ),
+                        )
+                        for matricula in lote
+                    ]
+                )
+
+                respuestas = []
+                for evaluacion in lista_evaluaciones:
+                    media = calidad[evaluacion.docente_id]
+                    for pregunta in preguntas:
+                        puntuacion = min(5, max(1, round(aleatorio.gauss(media, 0.9))))
+                        respuestas.append(
+                            Respuesta(
+                                evaluacion=evaluacion,
+                                pregunta=pregunta,
+                                criterio=EnvioEvaluacionService.CRITERIO_TEXTO[
+                                    puntuacion
+                                ],
+                                puntuacion=puntuacion,
+                            )
+                        )
+                Respuesta.objects.bulk_create(
+                    respuestas, batch_size=GeneradorDatosService.TAMANO_LOTE
+                )
+                total_respuestas += len(respuestas)
+
+            # La fecha de envío se fija dentro del rango de cada periodo
+            for periodo in lista_periodos:
+                Evaluacion.objects.filter(periodo=periodo).update(
+                    fecha=timezone.make_aware(
+                        datetime.combine(periodo.fecha_inicio, time(12))
+                    )
+                )
+
+            ResumenService.reconstruir()
+            # Los periodos anteriores se crean cerrados, sin pasar por las señales
+            TendenciaService.reconstruir()
+            # Los datos se insertan en bloque, sin las señales que los indexan
+            BusquedaService.reconstruir()
+            AnalisisComentariosService.analizar_todo()
+
+        # El catálogo y los reportes en caché no incluyen los datos generados
+        InvalidacionService.datos_regenerados()
+
+        return {
+            "comision": str(usuario_comision.pk),
+            "estudiantes": len(lista_estudiantes),
+            "docentes": len(lista_docentes),
+            "cursos": len(lista_cursos),
+            "matriculas": len(matriculas),
+            "periodos": len(lista_periodos),
+            "evaluaciones": len(seleccion),
+            "respuestas": total_respuestas,
+            "preguntas": len(preguntas),
+        }
+
+    @staticmethod
+    def _get_rol(nombre: str) -> Rol:
+        rol, _ = Rol.objects.get_or_create(nombre=nombre, defaults={"permisos": {}})
+        return rol
+
+    @staticmethod
+    def _crear_usuarios(
+        cantidad: int, rol: Rol, prefijo: str, etiqueta: str
+    ) -> List[Usuario]:
+        return Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    nombre=f"{etiqueta.capitalize()} {prefijo} {i + 1}",
+                    correo=f"{etiqueta}{i + 1}.{prefijo}@sed.test",
+                    # Sin contraseña utilizable: cifrar miles sería muy costoso
+                    password=make_password(None),
+                    rol=rol,
+                )
+                for i in range(cantidad)
+            ],
+            batch_size=GeneradorDatosService.TAMANO_LOTE,
+        )
+
+    @staticmethod
+    def _crear_docentes(
+        cantidad: int, rol: Rol, prefijo: str, aleatorio: random.Random
+    ) -> List[Docente]:
+        usuarios = GeneradorDatosService._crear_usuarios(
+            cantidad, rol, prefijo, "docente"
+        )
+        return Docente.objects.bulk_create(
+            [
+                Docente(
+                    usuario=usuario,
+                    departamento=aleatorio.choice(GeneradorDatosService.DEPARTAMENTOS),
+                )
+                for usuario in usuarios
+            ],
+            batch_size=GeneradorDatosService.TAMANO_LOTE,
+        )
+
+    @staticmethod
+    def _crear_estudiantes(
+        cantidad: int, rol: Rol, prefijo: str, aleatorio: random.Random
+    ) -> List[Estudiante]:
+        usuarios = GeneradorDatosService._crear_usuarios(
+            cantidad, rol, prefijo, "estudiante"
+        )
+        return Estudiante.objects.bulk_create(
+            [
+                Estudiante(
+                    usuario=usuario,
+                    semestre=str(aleatorio.randint(1, 10)),
+                    carrera=aleatorio.choice(GeneradorDatosService.DEPARTAMENTOS),
+                    codigo=f"{prefijo}{i + 1}",
+                )
+                for i, usuario in enumerate(usuarios)
+            ],
+            batch_size=GeneradorDatosService.TAMANO_LOTE,
+        )
+
+    @staticmethod
+    def _get_preguntas() -> List[PreguntaModulo]:
+        """Usa el cuestionario existente o crea uno si no hay preguntas."""
+        preguntas = list(PreguntaModulo.objects.all())
+        if preguntas:
+            return preguntas
+
+        for nombre, cantidad in GeneradorDatosService.MODULOS.items():
+            modulo = ModuloPreguntas.objects.create(nombre=nombre)
+            PreguntaModulo.objects.bulk_create(
+                [
+                    PreguntaModulo(id_modulo=modulo, pregunta=f"{nombre}: pregunta {i + 1}")
+                    for i in range(cantidad)
+                ]
+            )
+        return list(PreguntaModulo.objects.all())
+
+    @staticmethod
+    def _crear_periodos(cantidad: int, prefijo: str) -> List[PeriodoEvaluacion]:
+        """Crea periodos consecutivos de 15 días; el último contiene la fecha actual."""
+        hoy = timezone.localdate()
+        periodos = []
+        for i in range(cantidad):
+            fecha_inicio = hoy - timedelta(days=7 + 120 * (cantidad - 1 - i))
+            fecha_fin = fecha_inicio + timedelta(days=15)
+            periodos.append(
+                PeriodoEvaluacion(
+                    nombre=f"Periodo {prefijo} {i + 1}",
+                    fecha_inicio=fecha_inicio,
+                    fecha_fin=fecha_fin,
+                    fecha_comision=fecha_fin + timedelta(days=3),
+                    fecha_cierre=fecha_fin + timedelta(days=5),
+                    estado="activo" if i == cantidad - 1 else "cerrado",
+                )
+            )
+        return PeriodoEvaluacion.objects.bulk_create(periodos)
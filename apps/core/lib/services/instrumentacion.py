@@ -0,0 +1,347 @@
+"""
+Servicio para medir el tiempo y las consultas SQL de cada vista y acumular los resultados.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("sed.instrumentacion")
+
+CONFIGURACION_POR_DEFECTO = {
+    "ACTIVA": True,
+    "MUESTREO": 0.05,
+    "UMBRAL_LENTO_MS": 500,
+    "CABECERAS": False,
+    "MAX_DUPLICADAS": 5,
+}
+
+# Lista de vistas medidas; los datos de cada vista van en claves propias
+CLAVE_RESUMEN = "instrumentacion:vistas"
+CAMPOS_RESUMEN = (
+    "peticiones",
+    "lentas",
+    "tiempo_total_us",
+    "tiempo_max_ms",
+    "tiempo_bd_total_us",
+    "consultas_total",
+    "consultas_max",
+    "duplicadas",
+)
+
+# Listas de parámetros y literales que no cambian la forma de la consulta
+PATRON_LISTA_IN = re.compile(r"IN \((?:%s, )*%s\)")
+PATRON_TEXTO = re.compile(r"'(?:[^']|'')*'")
+PATRON_NUMERO = re.compile(r"\b\d+\b")
+
+
+# Recolector de la petición en curso. Una variable de contexto, a diferencia de
+# connection.execute_wrapper (que es por hilo), sigue a la petición en los hilos
+# que abren las vistas asíncronas con sync_to_async
+_recolector_actual: ContextVar[Optional["RecolectorConsultas"]] = ContextVar(
+    "sed_recolector_consultas", default=None
+)
+
+
+class RecolectorConsultas:
+    """Recolecta SQL y duración de cada consulta; se usa con connection.execute_wrapper."""
+
+    def __init__(self):
+        self.consultas = []
+        self.padre = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.agregar(sql, time.perf_counter() - inicio)
+
+    def agregar(self, sql: str, duracion: float) -> None:
+        """Registra una consulta en este recolector y en los que lo contienen."""
+        recolector = self
+        while recolector is not None:
+            recolector.consultas.append((sql, duracion))
+            recolector = recolector.padre
+
+    @contextmanager
+    def activo(self):
+        """
+        Recolecta las consultas del contexto actual, en cualquier hilo o conexión.
+
+        Si ya había un recolector activo (por ejemplo, el de un benchmark
+        alrededor del middleware), las consultas se registran en ambos.
+        """
+        self.padre = _recolector_actual.get()
+        token = _recolector_actual.set(self)
+        try:
+            yield self
+        finally:
+            _recolector_actual.reset(token)
+            self.padre = None
+
+
+def _recolectar_consulta(execute, sql, params, many, context):
+    recolector = _recolector_actual.get()
+    if recolector is None:
+        return execute(sql, params, many, context)
+    return recolector(execute, sql, params, many, context)
+
+
+def instalar_recolector(sender, connection, **kwargs):
+    """Receptor de connection_created: agrega el recolector a cada conexión nueva."""
+    if _recolectar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_recolectar_consulta)
+
+
+class InstrumentacionService:
+    """Servicio para registrar mediciones por vista y consultar su resumen."""
+
+    @staticmethod
+    def get_configuracion() -> Dict:
+        """
+        Obtiene la configuración de instrumentación desde settings.
+
+        Returns:
+            Diccionario con los valores de SED_INSTRUMENTACION completados
+            con los valores por defecto
+        """
+        return {
+            **CONFIGURACION_POR_DEFECTO,
+            **getattr(settings, "SED_INSTRUMENTACION", {}),
+        }
+
+    @staticmethod
+    def debe_medir() -> bool:
+        """Decide si se mide la petición actual según la tasa de muestreo."""
+        configuracion = InstrumentacionService.get_configuracion()
+        return configuracion["ACTIVA"] and random.random() < configuracion["MUESTREO"]
+
+    @staticmethod
+    def get_huella(sql: str) -> str:
+        """
+        Obtiene una huella de la consulta que ignora parámetros y literales.
+
+        Dos consultas con la misma huella ejecutadas en una petición suelen
+        indicar un patrón N+1.
+
+        Args:
+            sql: Texto SQL de la consulta
+
+        Returns:
+            Huella corta en hexadecimal
+        """
+        normalizada = PATRON_LISTA_IN.sub("IN (...)", sql)
+        normalizada = PATRON_TEXTO.sub("?", normalizada)
+        normalizada = PATRON_NUMERO.sub("?", normalizada)
+        return hashlib.md5(normalizada.encode()).hexdigest()[:12]
+
+    @staticmethod
+    def construir_medicion(
+        vista: str,
+        metodo: str,
+        ruta: str,
+        estado: int,
+        tiempo_total: float,
+        consultas: List,
+    ) -> Dict:
+        """
+        Construye la medición de una petición.
+
+        Args:
+            vista: Nombre de la vista (ej. "comision:reporte_curso")
+            metodo: Método HTTP
+            ruta: Ruta solicitada
+            estado: Código de estado de la respuesta
+            tiempo_total: Tiempo total de la petición en segundos
+            consultas: Lista de tuplas (sql, duración en segundos)
+
+        Returns:
+            Diccionario con tiempos en milisegundos, número de consultas y
+            las consultas repetidas agrupadas por huella
+        """
+        configuracion = InstrumentacionService.get_configuracion()
+
+        ejemplos = {}
+        conteo = Counter()
+        for sql, _ in consultas:
+            huella = InstrumentacionService.get_huella(sql)
+            conteo[huella] += 1
+            ejemplos.setdefault(huella, sql)
+
+        duplicadas = [
+            {"huella": huella, "veces": veces, "sql": ejemplos[huella][:300]}
+            for huella, veces in conteo.most_common(configuracion["MAX_DUPLICADAS"])
+            if veces > 1
+        ]
+
+        return {
+            "vista": vista,
+            "metodo": metodo,
+            "ruta": ruta,
+            "estado": estado,
+            "tiempo_ms": round(tiempo_total * 1000, 2),
+            "tiempo_bd_ms": round(sum(duracion for _, duracion in consultas) * 1000, 2),
+            "consultas": len(consultas),
+            "consultas_duplicadas": sum(veces - 1 for veces in conteo.values()),
+            "duplicadas": duplicadas,
+        }
+
+    @staticmethod
+    def registrar(medicion: Dict) -> None:
+        """
+        Escribe la medición en el log y la suma al resumen por vista.
+
+        Cada dato de cada vista tiene su propia clave en la caché: las sumas
+        se actualizan con cache.incr, que es atómico, por lo que los procesos
+        no pierden las muestras de otros. Los máximos y las consultas
+        duplicadas (solo las MAX_DUPLICADAS más repetidas de cada vista) se
+        leen y escriben por vista; con concurrencia se puede perder alguna
+        actualización de esos datos, pero no las sumas.
+
+        Args:
+            medicion: Diccionario devuelto por construir_medicion
+        """
+        configuracion = InstrumentacionService.get_configuracion()
+        lenta = medicion["tiempo_ms"] >= configuracion["UMBRAL_LENTO_MS"]
+
+        logger.log(
+            logging.WARNING if lenta else logging.INFO,
+            json.dumps(medicion, ensure_ascii=False),
+        )
+
+        nombre = medicion["vista"]
+        vistas = cache.get(CLAVE_RESUMEN) or []
+        if nombre not in vistas:
+            # Si dos procesos agregan una vista a la vez, la siguiente muestra
+            # vuelve a agregar la que se perdió
+            cache.set(CLAVE_RESUMEN, sorted({*vistas, nombre}), timeout=None)
+
+        # Los tiempos se suman en microsegundos: cache.incr solo admite enteros
+        sumas = {
+            "peticiones": 1,
+            "lentas": int(lenta),
+            "tiempo_total_us": round(medicion["tiempo_ms"] * 1000),
+            "tiempo_bd_total_us": round(medicion["tiempo_bd_ms"] * 1000),
+            "consultas_total": medicion["consultas"],
+        }
+        for campo, valor in sumas.items():
+            if valor:
+                InstrumentacionService._incrementar(
+                    InstrumentacionService._clave(nombre, campo), valor
+                )
+
+        maximos = {
+            InstrumentacionService._clave(nombre, "tiempo_max_ms"): medicion["tiempo_ms"],
+            InstrumentacionService._clave(nombre, "consultas_max"): medicion["consultas"],
+        }
+        actuales = cache.get_many(list(maximos))
+        nuevos = {
+            clave: valor
+            for clave, valor in maximos.items()
+            if valor > actuales.get(clave, -1)
+        }
+        if nuevos:
+            cache.set_many(nuevos, timeout=None)
+
+        if medicion["duplicadas"]:
+            clave = InstrumentacionService._clave(nombre, "duplicadas")
+            duplicadas = cache.get(clave) or {}
+            for duplicada in medicion["duplicadas"]:
+                anterior = duplicadas.get(duplicada["huella"])
+                if anterior is None or duplicada["veces"] > anterior["veces"]:
+                    duplicadas[duplicada["huella"]] = {
+                        "sql": duplicada["sql"],
+                        "veces": duplicada["veces"],
+                    }
+            mas_repetidas = sorted(
+                duplicadas.items(), key=lambda item: item[1]["veces"], reverse=True
+            )[: configuracion["MAX_DUPLICADAS"]]
+            cache.set(clave, dict(mas_repetidas), timeout=None)
+
+    @staticmethod
+    def get_resumen() -> List[Dict]:
+        """
+        Obtiene el resumen acumulado por vista.
+
+        Returns:
+            Lista de diccionarios por vista con promedios y máximos, ordenada
+            por tiempo promedio de mayor a menor
+        """
+        vistas = cache.get(CLAVE_RESUMEN) or []
+        valores = cache.get_many(
+            [
+                InstrumentacionService._clave(nombre, campo)
+                for nombre in vistas
+                for campo in CAMPOS_RESUMEN
+            ]
+        )
+
+        filas = []
+        for nombre in vistas:
+            vista = {
+                campo: valores.get(InstrumentacionService._clave(nombre, campo))
+                for campo in CAMPOS_RESUMEN
+            }
+            peticiones = vista["peticiones"]
+            if not peticiones:
+                continue
+            filas.append(
+                {
+                    "vista": nombre,
+                    "peticiones": peticiones,
+                    "lentas": vista["lentas"] or 0,
+                    "tiempo_promedio_ms": round(
+                        (vista["tiempo_total_us"] or 0) / peticiones / 1000, 2
+                    ),
+                    "tiempo_max_ms": vista["tiempo_max_ms"] or 0,
+                    "tiempo_bd_promedio_ms": round(
+                        (vista["tiempo_bd_total_us"] or 0) / peticiones / 1000, 2
+                    ),
+                    "consultas_promedio": round(
+                        (vista["consultas_total"] or 0) / peticiones, 1
+                    ),
+                    "consultas_max": vista["consultas_max"] or 0,
+                    "duplicadas": sorted(
+                        (vista["duplicadas"] or {}).values(),
+                        key=lambda duplicada: duplicada["veces"],
+                        reverse=True,
+                    ),
+                }
+            )
+        return sorted(filas, key=lambda fila: fila["tiempo_promedio_ms"], reverse=True)
+
+    @staticmethod
+    def reiniciar() -> None:
+        """Elimina el resumen acumulado."""
+        vistas = cache.get(CLAVE_RESUMEN) or []
+        cache.delete_many(
+            [CLAVE_RESUMEN]
+            + [
+                InstrumentacionService._clave(nombre, campo)
+                for nombre in vistas
+                for campo in CAMPOS_RESUMEN
+            ]
+        )
+
+    @staticmethod
+    def _clave(vista: str, campo: str) -> str:
+        return f"{CLAVE_RESUMEN}:{vista}:{campo}"
+
+    @staticmethod
+    def _incrementar(clave: str, valor: int) -> None:
+        """Suma a una clave de la caché de forma atómica, creándola si no existe."""
+        try:
+            cache.incr(clave, valor)
+        except ValueError:
+            cache.add(clave, 0, timeout=None)
+            cache.incr(clave, valor)
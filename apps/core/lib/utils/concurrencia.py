@@ -0,0 +1,92 @@
+"""
+Utilidades para ejecutar consultas independientes en paralelo desde vistas asíncronas.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+_ejecutor = None
+_bloqueo_ejecutor = threading.Lock()
+
+
+def consultas_paralelas_activas() -> bool:
+    """Indica si SED_CONSULTAS_PARALELAS permite usar una conexión por consulta."""
+    return getattr(settings, "SED_CONSULTAS_PARALELAS", True)
+
+
+def get_ejecutor() -> ThreadPoolExecutor:
+    """
+    Pool de hilos compartido por todas las peticiones del proceso.
+
+    Cada hilo conserva su conexión según el modo de DB_CONEXIONES, por lo
+    que el tamaño del pool (SED_CONSULTAS_PARALELAS_HILOS) limita las
+    conexiones que abren las consultas en paralelo. Con WSGI, cada vista
+    asíncrona usa un bucle de eventos nuevo y su pool por defecto se
+    descartaría junto con sus conexiones.
+    """
+    global _ejecutor
+    if _ejecutor is None:
+        with _bloqueo_ejecutor:
+            if _ejecutor is None:
+                _ejecutor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "SED_CONSULTAS_PARALELAS_HILOS", 16),
+                    thread_name_prefix="sed-consultas",
+                )
+    return _ejecutor
+
+
+def _en_hilo_propio(funcion: Callable[[], Any]) -> Callable[[], Any]:
+    def ejecutar():
+        try:
+            return funcion()
+        finally:
+            # Cada hilo usa su propia conexión; se cierra o se conserva
+            # según CONN_MAX_AGE, igual que al terminar una petición
+            close_old_connections()
+
+    return ejecutar
+
+
+async def ejecutar_en_paralelo(*funciones: Callable[[], Any]) -> List[Any]:
+    """
+    Ejecuta funciones síncronas con consultas al ORM de forma concurrente.
+
+    El ORM de Django es síncrono: sus métodos asíncronos (aget, acount...)
+    pasan todos por un mismo hilo, por lo que las consultas de una petición
+    se ejecutan una tras otra. Aquí cada función corre en un hilo de
+    get_ejecutor() con su propia conexión, de modo que las consultas
+    independientes se esperan a la vez. Solo deben usarse para lecturas:
+    cada hilo tiene su propia transacción.
+
+    Si SED_CONSULTAS_PARALELAS es False (por ejemplo, con un pool de
+    conexiones pequeño o SQLite en memoria), las funciones se ejecutan en
+    orden en el hilo del ORM.
+
+    Args:
+        funciones: Funciones sin argumentos que devuelven datos ya evaluados
+            (listas, diccionarios o instancias, no QuerySets perezosos)
+
+    Returns:
+        Lista con el resultado de cada función, en el mismo orden
+    """
+    if not consultas_paralelas_activas():
+        return await sync_to_async(lambda: [funcion() for funcion in funciones])()
+
+    return list(
+        await asyncio.gather(
+            *(
+                sync_to_async(
+                    _en_hilo_propio(funcion),
+                    thread_sensitive=False,
+                    executor=get_ejecutor(),
+                )()
+                for funcion in funciones
+            )
+        )
+    )
@@ -0,0 +1,25 @@
+"""
+Índices propios de PostgreSQL que se declaran en Meta.indexes.
+"""
+
+from django.contrib.postgres.indexes import GinIndex
+
+
+class GinIndexPostgres(GinIndex):
+    """
+    Índice GIN que solo se crea en PostgreSQL.
+
+    Se declara en Meta.indexes para que el estado de las migraciones lo
+    conozca, pero en otros motores (SQLite en desarrollo, base temporal del
+    benchmark) no genera SQL: allí la búsqueda usa su propio índice.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return ""
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return ""
+        return super().remove_sql(model, schema_editor, **kwargs)
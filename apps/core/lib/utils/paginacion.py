@@ -0,0 +1,122 @@
+"""
+Paginación por cursor (keyset) para listados que se ordenan por una columna.
+"""
+
+from typing import Dict, Optional
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+
+class PaginadorKeyset:
+    """
+    Pagina un queryset filtrando a partir del último elemento visto.
+
+    A diferencia de OFFSET, que lee y descarta todas las filas anteriores, la
+    página se obtiene con una condición (orden, pk) > (valor, id), por lo que
+    cuesta lo mismo en cualquier profundidad y no repite ni salta filas
+    cuando se insertan datos entre dos páginas. La clave primaria desempata
+    los valores iguales. Los cursores van firmados: no se pueden alterar ni
+    usar con otro orden.
+
+    El campo de orden puede ser un campo del modelo o una anotación del
+    queryset, y no debe ser nulo.
+    """
+
+    SALT = "sed.paginacion"
+
+    def __init__(self, queryset: QuerySet, orden: str, descendente: bool = False, tamano: int = 20):
+        """
+        Args:
+            queryset: Queryset a paginar (sin ordenar)
+            orden: Campo o anotación por el que se ordena
+            descendente: Si el orden es de mayor a menor
+            tamano: Elementos por página
+        """
+        self.queryset = queryset
+        self.orden = orden
+        self.descendente = descendente
+        self.tamano = tamano
+
+    def get_pagina(self, cursor: Optional[str] = None) -> Dict:
+        """
+        Obtiene la página que indica el cursor, o la primera.
+
+        Un cursor inválido, alterado o de otro orden devuelve la primera página.
+
+        Args:
+            cursor: Cursor de "siguiente" o "anterior" de otra página
+
+        Returns:
+            Diccionario con "objetos" (lista), "siguiente" y "anterior"
+            (cursores, o None si no hay más páginas en esa dirección)
+        """
+        posicion = self._leer_cursor(cursor)
+        hacia_atras = posicion is not None and posicion["direccion"] == "anterior"
+
+        # Hacia atrás se recorre el orden inverso y luego se invierte la página
+        descendente = self.descendente != hacia_atras
+        signo = "-" if descendente else ""
+        queryset = self.queryset.order_by(f"{signo}{self.orden}", f"{signo}pk")
+        if posicion is not None:
+            comparacion = "lt" if descendente else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.orden}__{comparacion}": posicion["valor"]})
+                | Q(**{self.orden: posicion["valor"], f"pk__{comparacion}": posicion["pk"]})
+            )
+
+        objetos = list(queryset[: self.tamano + 1])
+        hay_mas = len(objetos) > self.tamano
+        objetos = objetos[: self.tamano]
+        if hacia_atras:
+            objetos.reverse()
+
+        # Al llegar con un cursor siempre hay página en la dirección de origen
+        hay_siguiente = hay_mas if not hacia_atras else True
+        hay_anterior = hay_mas if hacia_atras else posicion is not None
+        return {
+            "objetos": objetos,
+            "siguiente": (
+                self._crear_cursor(objetos[-1], "siguiente")
+                if objetos and hay_siguiente
+                else None
+            ),
+            "anterior": (
+                self._crear_cursor(objetos[0], "anterior")
+                if objetos and hay_anterior
+                else None
+            ),
+        }
+
+    def _crear_cursor(self, objeto, direccion: str) -> str:
+        valor = getattr(objeto, self.orden)
+        return signing.dumps(
+            {
+                "orden": self.orden,
+                "descendente": self.descendente,
+                "direccion": direccion,
+                "valor": str(valor),
+                "pk": str(objeto.pk),
+            },
+            salt=self.SALT,
+            compress=True,
+        )
+
+    def _leer_cursor(self, cursor: Optional[str]) -> Optional[Dict]:
+        if not cursor:
+            return None
+        try:
+            datos = signing.loads(cursor, salt=self.SALT)
+        except signing.BadSignature:
+            return None
+        if datos.get("orden") != self.orden or datos.get("descendente") != self.descendente:
+            return None
+
+        # Los valores viajan como texto: se convierten con el tipo del campo
+        modelo = self.queryset.model
+        anotacion = self.queryset.query.annotations.get(self.orden)
+        campo = anotacion.output_field if anotacion is not None else modelo._meta.get_field(self.orden)
+        return {
+            "direccion": datos["direccion"],
+            "valor": campo.to_python(datos["valor"]),
+            "pk": modelo._meta.pk.to_python(datos["pk"]),
+        }
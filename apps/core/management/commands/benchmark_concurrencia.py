@@ -0,0 +1,187 @@
+import json
+import os
+import tempfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apps.alumnos.models import Estudiante
+from apps.core.models import Curso
+from apps.core.lib.services.carga import CargaService
+from apps.core.lib.services.generador_datos import GeneradorDatosService
+from apps.evaluacion.models import Evaluacion
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+from apps.usuarios.lib.services.sesion import SesionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara latencia (p95, p99) y peticiones por segundo de las vistas de "
+        "consulta de alumnos servidas por WSGI y por ASGI con peticiones "
+        "concurrentes, y opcionalmente entre modos de conexión a la base de datos"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--estudiantes", type=int, default=500)
+        parser.add_argument("--docentes", type=int, default=40)
+        parser.add_argument("--evaluaciones", type=int, default=2000)
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument(
+            "--concurrencia",
+            default="1,8,32",
+            help="Niveles de peticiones simultáneas, separados por comas",
+        )
+        parser.add_argument(
+            "--peticiones",
+            type=int,
+            default=200,
+            help="Peticiones por modo y nivel de concurrencia",
+        )
+        parser.add_argument(
+            "--conexiones",
+            help=(
+                "Modos de DB_MODOS_CONEXION a comparar, separados por comas "
+                "(ej. por_peticion,persistente,pool); por defecto, la "
+                "configuración actual"
+            ),
+        )
+        parser.add_argument(
+            "--salida",
+            default="benchmark_concurrencia.json",
+            help="Archivo JSON con los resultados",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            niveles = [int(n) for n in options["concurrencia"].split(",") if n.strip()]
+        except ValueError:
+            raise CommandError("--concurrencia debe ser una lista de enteros")
+        if not niveles or min(niveles) < 1:
+            raise CommandError("--concurrencia debe ser una lista de enteros")
+
+        modos_conexion = [None]
+        if options["conexiones"]:
+            modos_conexion = [m.strip() for m in options["conexiones"].split(",") if m.strip()]
+            desconocidos = set(modos_conexion) - set(settings.DB_MODOS_CONEXION)
+            if desconocidos:
+                raise CommandError(
+                    f"Modos de conexión desconocidos: {', '.join(sorted(desconocidos))}"
+                )
+
+        # Los hilos del servidor usan sus propias conexiones, por lo que los
+        # datos deben estar confirmados: se usa una base de datos temporal
+        connection.settings_dict["TEST"]["MIGRATE"] = False
+        if connection.vendor == "sqlite":
+            # SQLite en memoria nunca cierra sus conexiones; con un archivo, los
+            # modos de conexión se comportan como en un servidor
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                tempfile.gettempdir(), "sed_benchmark_concurrencia.sqlite3"
+            )
+        nombre_original = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            datos = GeneradorDatosService.generar(
+                estudiantes=options["estudiantes"],
+                docentes=options["docentes"],
+                evaluaciones=options["evaluaciones"],
+                semilla=options["semilla"],
+            )
+            self.stdout.write(f"Datos generados: {datos}")
+
+            urls, alumno = self._get_urls()
+            # Las vistas de alumnos exigen la sesión del alumno
+            sesion = SesionService.crear_sesion(alumno.usuario)
+            # Sin instrumentación, para medir solo las vistas en ambos modos
+            with override_settings(SED_INSTRUMENTACION={"ACTIVA": False}):
+                resultados = self._medir(
+                    urls, sesion, niveles, options["peticiones"], modos_conexion
+                )
+        finally:
+            InvalidacionService.datos_regenerados()
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+        reporte = {
+            "fecha": timezone.now().isoformat(),
+            "motor": connection.vendor,
+            "parametros": {
+                campo: options[campo]
+                for campo in ("estudiantes", "docentes", "evaluaciones", "semilla", "peticiones")
+            },
+            "datos": datos,
+            "urls": urls,
+            "resultados": resultados,
+        }
+        with open(options["salida"], "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Resultados guardados en {options['salida']}")
+        )
+
+    def _medir(self, urls, sesion, niveles, peticiones, modos_conexion):
+        resultados = []
+        for modo_conexion in modos_conexion:
+            if modo_conexion:
+                try:
+                    CargaService.usar_modo_conexion(modo_conexion)
+                except ValueError as error:
+                    raise CommandError(str(error))
+
+            for concurrencia in niveles:
+                for servidor, medir in (
+                    ("wsgi", CargaService.medir_wsgi),
+                    ("asgi", CargaService.medir_asgi),
+                ):
+                    # Calentamiento: plantillas, caché y conexiones
+                    medir(urls, len(urls), concurrencia, sesion=sesion)
+                    resultado = {
+                        "servidor": servidor,
+                        "modo_conexion": modo_conexion or "actual",
+                        **medir(urls, peticiones, concurrencia, sesion=sesion),
+                    }
+                    resultados.append(resultado)
+                    self._mostrar(resultado)
+        return resultados
+
+    def _get_urls(self):
+        """Vistas de consulta de alumnos con los datos más representativos, y su alumno."""
+        alumno = (
+            Estudiante.objects.select_related("usuario__rol")
+            .annotate(total=Count("evaluacion"))
+            .order_by("-total")
+            .first()
+        )
+        docente_id = (
+            Evaluacion.objects.filter(estado="enviada")
+            .values("docente__usuario")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()["docente__usuario"]
+        )
+        curso_id = Curso.objects.filter(docente_id=docente_id).values_list("id", flat=True)[0]
+        urls = [
+            reverse("alumno:explorar", kwargs={"usuario_id": alumno.usuario_id}),
+            reverse(
+                "alumno:detalle_docente",
+                kwargs={"usuario_id": alumno.usuario_id, "docente_id": docente_id},
+            ),
+            reverse("alumno:perfil_alumno", kwargs={"usuario_id": alumno.usuario_id}),
+            reverse("alumno:docentes_por_curso", kwargs={"curso_id": curso_id}),
+        ]
+        return urls, alumno
+
+    def _mostrar(self, resultado):
+        latencia = resultado["latencia_ms"]
+        self.stdout.write(
+            f"{resultado['servidor']:<5} {resultado['modo_conexion']:<13} "
+            f"concurrencia: {resultado['concurrencia']:>3}  "
+            f"pet/s: {resultado['peticiones_por_segundo']:>8.2f}  "
+            f"mediana: {latencia['mediana']:>8.2f} ms  "
+            f"p95: {latencia['p95']:>8.2f} ms  "
+            f"p99: {latencia['p99']:>8.2f} ms  "
+            f"conexiones: {resultado['conexiones']:>4}  "
+            f"errores: {resultado['errores']}"
+        )
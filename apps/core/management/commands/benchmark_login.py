@@ -0,0 +1,156 @@
+import json
+import os
+import tempfile
+import time
+from django.contrib.auth.hashers import make_password
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apps.core.lib.services.carga import CargaService
+from apps.core.lib.services.generador_datos import GeneradorDatosService
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+from apps.roles.models import ModosRoles
+from apps.usuarios.models import Usuario
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide inicios de sesión por segundo y su latencia (p95, p99) con "
+        "peticiones concurrentes de muchos estudiantes, para distintos "
+        "factores de trabajo del cifrado de contraseñas"
+    )
+
+    PASSWORD = "benchmark-sed-2024"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--estudiantes", type=int, default=2000)
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument(
+            "--iteraciones",
+            default="100000,600000,1000000",
+            help="Factores de trabajo (iteraciones de PBKDF2) a comparar, separados por comas",
+        )
+        parser.add_argument(
+            "--concurrencia",
+            default="1,8,32",
+            help="Niveles de inicios de sesión simultáneos, separados por comas",
+        )
+        parser.add_argument(
+            "--peticiones",
+            type=int,
+            default=200,
+            help="Inicios de sesión por factor de trabajo y nivel de concurrencia",
+        )
+        parser.add_argument(
+            "--salida",
+            default="benchmark_login.json",
+            help="Archivo JSON con los resultados",
+        )
+
+    def handle(self, *args, **options):
+        niveles = self._get_enteros(options, "concurrencia")
+        factores = self._get_enteros(options, "iteraciones")
+
+        # Los hilos del servidor usan sus propias conexiones, por lo que los
+        # datos deben estar confirmados: se usa una base de datos temporal
+        connection.settings_dict["TEST"]["MIGRATE"] = False
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                tempfile.gettempdir(), "sed_benchmark_login.sqlite3"
+            )
+        nombre_original = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            datos = GeneradorDatosService.generar(
+                estudiantes=options["estudiantes"],
+                docentes=10,
+                evaluaciones=0,
+                semilla=options["semilla"],
+            )
+            self.stdout.write(f"Datos generados: {datos}")
+
+            correos = list(
+                Usuario.objects.filter(rol__nombre=ModosRoles.ALUMNO)
+                .order_by("correo")
+                .values_list("correo", flat=True)
+            )
+            formularios = [{"correo": correo, "password": self.PASSWORD} for correo in correos]
+            with override_settings(SED_INSTRUMENTACION={"ACTIVA": False}):
+                resultados = self._medir(
+                    formularios, factores, niveles, options["peticiones"]
+                )
+        finally:
+            InvalidacionService.datos_regenerados()
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+        reporte = {
+            "fecha": timezone.now().isoformat(),
+            "motor": connection.vendor,
+            "parametros": {
+                campo: options[campo] for campo in ("estudiantes", "semilla", "peticiones")
+            },
+            "datos": datos,
+            "resultados": resultados,
+        }
+        with open(options["salida"], "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Resultados guardados en {options['salida']}")
+        )
+
+    def _get_enteros(self, options, campo):
+        try:
+            valores = [int(n) for n in options[campo].split(",") if n.strip()]
+        except ValueError:
+            raise CommandError(f"--{campo} debe ser una lista de enteros")
+        if not valores or min(valores) < 1:
+            raise CommandError(f"--{campo} debe ser una lista de enteros")
+        return valores
+
+    def _medir(self, formularios, factores, niveles, peticiones):
+        url = reverse("core:login")
+        resultados = []
+        for iteraciones in factores:
+            with override_settings(SED_PASSWORD_ITERACIONES=iteraciones):
+                # Todos los estudiantes comparten la contraseña: basta cifrarla
+                # una vez por factor (cada cifrado usa su propia sal)
+                inicio = time.perf_counter()
+                cifrada = make_password(self.PASSWORD)
+                cifrado_ms = round((time.perf_counter() - inicio) * 1000, 3)
+                Usuario.objects.filter(rol__nombre=ModosRoles.ALUMNO).update(
+                    password=cifrada
+                )
+
+                for concurrencia in niveles:
+                    # Calentamiento: plantillas, caché y conexiones
+                    CargaService.medir_wsgi([url], concurrencia, concurrencia, formularios)
+                    Session.objects.all().delete()
+                    resultado = {
+                        "iteraciones": iteraciones,
+                        "cifrado_ms": cifrado_ms,
+                        **CargaService.medir_wsgi(
+                            [url], peticiones, concurrencia, formularios
+                        ),
+                        # Cada inicio de sesión correcto crea una sesión
+                        "sesiones": Session.objects.count(),
+                    }
+                    resultados.append(resultado)
+                    self._mostrar(resultado)
+        return resultados
+
+    def _mostrar(self, resultado):
+        latencia = resultado["latencia_ms"]
+        self.stdout.write(
+            f"iteraciones: {resultado['iteraciones']:>8}  "
+            f"concurrencia: {resultado['concurrencia']:>3}  "
+            f"inicios/s: {resultado['peticiones_por_segundo']:>8.2f}  "
+            f"mediana: {latencia['mediana']:>8.2f} ms  "
+            f"p95: {latencia['p95']:>8.2f} ms  "
+            f"p99: {latencia['p99']:>8.2f} ms  "
+            f"sesiones: {resultado['sesiones']:>4}  "
+            f"errores: {resultado['errores']}"
+        )
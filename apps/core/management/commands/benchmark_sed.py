@@ -0,0 +1,151 @@
+import json
+import subprocess
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from apps.core.lib.services.benchmark import BenchmarkService
+from apps.core.lib.services.generador_datos import GeneradorDatosService
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos de prueba y mide latencia, consultas y memoria de las "
+        "vistas principales del flujo de evaluación"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--estudiantes", type=int, default=500)
+        parser.add_argument("--docentes", type=int, default=40)
+        parser.add_argument("--cursos-por-docente", type=int, default=3)
+        parser.add_argument("--matriculas-por-estudiante", type=int, default=5)
+        parser.add_argument("--periodos", type=int, default=3)
+        parser.add_argument("--evaluaciones", type=int, default=2000)
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument("--repeticiones", type=int, default=10)
+        parser.add_argument(
+            "--salida",
+            default="benchmark_sed.json",
+            help="Archivo JSON con los resultados de esta ejecución",
+        )
+        parser.add_argument(
+            "--historial",
+            help="Archivo JSON Lines al que se agrega una línea por ejecución",
+        )
+        parser.add_argument(
+            "--base-temporal",
+            action="store_true",
+            help=(
+                "Usa una base de datos de pruebas creada desde los modelos y "
+                "eliminada al terminar (en SQLite, en memoria)"
+            ),
+        )
+        parser.add_argument(
+            "--conservar",
+            action="store_true",
+            help="Conserva los datos generados en lugar de deshacerlos al terminar",
+        )
+
+    def handle(self, *args, **options):
+        if options["base_temporal"] and options["conservar"]:
+            raise CommandError("--conservar no se puede usar con --base-temporal")
+
+        nombre_original = None
+        if options["base_temporal"]:
+            connection.settings_dict["TEST"]["MIGRATE"] = False
+            nombre_original = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                datos = GeneradorDatosService.generar(
+                    estudiantes=options["estudiantes"],
+                    docentes=options["docentes"],
+                    cursos_por_docente=options["cursos_por_docente"],
+                    matriculas_por_estudiante=options["matriculas_por_estudiante"],
+                    periodos=options["periodos"],
+                    evaluaciones=options["evaluaciones"],
+                    semilla=options["semilla"],
+                )
+                self.stdout.write(f"Datos generados: {datos}")
+
+                # Los datos no se confirman, por lo que las vistas asíncronas deben
+                # consultar con la conexión de esta transacción (benchmark_concurrencia
+                # mide las consultas en paralelo)
+                try:
+                    with override_settings(SED_CONSULTAS_PARALELAS=False):
+                        resultados = BenchmarkService.ejecutar(options["repeticiones"])
+                except ValueError as error:
+                    raise CommandError(str(error))
+
+                if not options["conservar"]:
+                    transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+            if not options["conservar"]:
+                # La caché puede incluir preguntas y reportes que se deshicieron
+                InvalidacionService.datos_regenerados()
+            if nombre_original is not None:
+                connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+        for resultado in resultados:
+            latencia = resultado["latencia_ms"]
+            self.stdout.write(
+                f"{resultado['vista']:<22} {resultado['estado_http']}  "
+                f"mediana: {latencia['mediana']:>8.2f} ms  "
+                f"p95: {latencia['p95']:>8.2f} ms  "
+                f"consultas: {resultado['consultas']:>4}  "
+                f"memoria: {resultado['memoria_pico_kb']:>8.1f} KB"
+            )
+
+        reporte = {
+            "fecha": timezone.now().isoformat(),
+            "commit": self._get_commit(),
+            "motor": connection.vendor,
+            "parametros": {
+                campo: options[campo]
+                for campo in (
+                    "estudiantes",
+                    "docentes",
+                    "cursos_por_docente",
+                    "matriculas_por_estudiante",
+                    "periodos",
+                    "evaluaciones",
+                    "semilla",
+                    "repeticiones",
+                )
+            },
+            "datos": datos,
+            "resultados": resultados,
+        }
+
+        with open(options["salida"], "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+        if options["historial"]:
+            with open(options["historial"], "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps(reporte, ensure_ascii=False) + "\n")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Resultados guardados en {options['salida']}")
+        )
+
+    def _get_commit(self):
+        """Commit actual del repositorio, si está disponible."""
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,83 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from apps.core.lib.services.instrumentacion import (
+    InstrumentacionService,
+    RecolectorConsultas,
+)
+
+
+class InstrumentacionMiddleware:
+    """
+    Mide tiempo total, tiempo en base de datos y consultas SQL de cada vista.
+
+    Solo se mide la fracción de peticiones indicada en
+    SED_INSTRUMENTACION["MUESTREO"]; el resto pasa sin costo adicional.
+    Funciona con WSGI y ASGI: en ASGI no obliga a Django a ejecutar la
+    cadena de middleware en un hilo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.asincrono = iscoroutinefunction(get_response)
+        if self.asincrono:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.asincrono:
+            return self.__acall__(request)
+
+        if not InstrumentacionService.debe_medir():
+            return self.get_response(request)
+
+        recolector = RecolectorConsultas()
+        inicio = time.perf_counter()
+        with recolector.activo():
+            response = self.get_response(request)
+        tiempo_total = time.perf_counter() - inicio
+
+        medicion = self._medir(request, response, tiempo_total, recolector)
+        if medicion:
+            InstrumentacionService.registrar(medicion)
+        return response
+
+    async def __acall__(self, request):
+        if not InstrumentacionService.debe_medir():
+            return await self.get_response(request)
+
+        recolector = RecolectorConsultas()
+        inicio = time.perf_counter()
+        with recolector.activo():
+            response = await self.get_response(request)
+        tiempo_total = time.perf_counter() - inicio
+
+        medicion = self._medir(request, response, tiempo_total, recolector)
+        if medicion:
+            # El resumen se guarda en la caché, que puede hacer E/S bloqueante
+            await sync_to_async(InstrumentacionService.registrar)(medicion)
+        return response
+
+    def _medir(self, request, response, tiempo_total, recolector):
+        # Peticiones que no resolvieron a una vista (404, archivos estáticos)
+        if request.resolver_match is None:
+            return None
+
+        medicion = InstrumentacionService.construir_medicion(
+            request.resolver_match.view_name,
+            request.method,
+            request.path,
+            response.status_code,
+            tiempo_total,
+            recolector.consultas,
+        )
+
+        if InstrumentacionService.get_configuracion()["CABECERAS"]:
+            response["Server-Timing"] = (
+                f"app;dur={medicion['tiempo_ms']}, db;dur={medicion['tiempo_bd_ms']}"
+            )
+            response["X-SED-Consultas"] = medicion["consultas"]
+            response["X-SED-Consultas-Duplicadas"] = medicion["consultas_duplicadas"]
+
+        return medicion
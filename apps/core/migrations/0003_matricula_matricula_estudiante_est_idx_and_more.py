@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumnos', '0002_estudiante_codigo'),
+        ('core', '0002_matricula'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['estudiante', 'estado'], name='matricula_estudiante_est_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(condition=models.Q(('estado', 'activa')), fields=['estudiante', 'curso'], name='matricula_activa_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='matricula',
+            name='matricula_activa_idx',
+        ),
+    ]
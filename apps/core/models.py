@@ -30,6 +30,11 @@ class Matricula(models.Model):
     
     class Meta:
         unique_together = ('estudiante', 'curso')  # Un estudiante solo puede matricularse una vez en cada curso
+        indexes = [
+            # Matrículas de un estudiante por estado; la búsqueda por
+            # estudiante y curso ya usa el índice de unique_together
+            models.Index(fields=['estudiante', 'estado'], name='matricula_estudiante_est_idx'),
+        ]
         
     def __str__(self):
         return f"{self.estudiante} en {self.curso}"
@@ -1,3 +1,120 @@
+from django.core import signing
+from django.db.models import Count
 from django.test import TestCase
+from apps.alumnos.models import Estudiante
+from apps.core.lib.utils.paginacion import PaginadorKeyset
+from apps.core.models import Curso, Matricula
+from apps.docentes.models import Docente
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.models import Usuario
 
-# Create your tests here.
+
+class PaginadorKeysetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre=ModosRoles.PROFESOR, permisos={})
+        docente = Docente.objects.create(
+            usuario=Usuario.objects.create(nombre="Docente", correo="docente@sed.test", rol=rol),
+            departamento="Sistemas",
+        )
+        # Nombres repetidos para que la clave primaria tenga que desempatar
+        for indice, nombre in enumerate("ABBBCDDEFG"):
+            Curso.objects.create(
+                nombre=nombre, codigo=f"C{indice}", semestre="1", docente=docente
+            )
+
+    def esperado(self, descendente=False):
+        signo = "-" if descendente else ""
+        return list(Curso.objects.order_by(f"{signo}nombre", f"{signo}pk"))
+
+    def recorrer(self, paginador, direccion="siguiente", cursor=None):
+        paginas = []
+        while True:
+            pagina = paginador.get_pagina(cursor)
+            paginas.append(pagina["objetos"])
+            cursor = pagina[direccion]
+            if cursor is None:
+                return paginas, pagina
+
+    def test_recorre_todas_las_filas_hacia_adelante(self):
+        for descendente in (False, True):
+            paginador = PaginadorKeyset(Curso.objects.all(), "nombre", descendente, tamano=3)
+
+            paginas, ultima = self.recorrer(paginador)
+
+            self.assertEqual([len(pagina) for pagina in paginas], [3, 3, 3, 1])
+            self.assertEqual(sum(paginas, []), self.esperado(descendente))
+            self.assertIsNotNone(ultima["anterior"])
+
+    def test_recorre_hacia_atras_desde_la_ultima_pagina(self):
+        paginador = PaginadorKeyset(Curso.objects.all(), "nombre", tamano=3)
+        paginas, ultima = self.recorrer(paginador)
+
+        hacia_atras, primera = self.recorrer(paginador, "anterior", ultima["anterior"])
+
+        self.assertEqual(hacia_atras, paginas[-2::-1])
+        self.assertIsNone(primera["anterior"])
+        self.assertIsNotNone(primera["siguiente"])
+
+    def test_primera_pagina(self):
+        pagina = PaginadorKeyset(Curso.objects.all(), "nombre", tamano=3).get_pagina()
+
+        self.assertEqual(pagina["objetos"], self.esperado()[:3])
+        self.assertIsNone(pagina["anterior"])
+
+    def test_ordena_por_anotacion(self):
+        estudiante = Estudiante.objects.create(
+            usuario=Usuario.objects.create(
+                nombre="Alumno",
+                correo="alumno@sed.test",
+                rol=Rol.objects.create(nombre=ModosRoles.ALUMNO, permisos={}),
+            ),
+            semestre="1",
+            carrera="Sistemas",
+        )
+        for curso in Curso.objects.filter(nombre__in=["B", "D"]):
+            Matricula.objects.create(estudiante=estudiante, curso=curso)
+        cursos = Curso.objects.annotate(matriculas=Count("matricula"))
+        paginador = PaginadorKeyset(cursos, "matriculas", descendente=True, tamano=4)
+
+        paginas, _ = self.recorrer(paginador)
+
+        self.assertEqual(
+            sum(paginas, []), list(cursos.order_by("-matriculas", "-pk"))
+        )
+
+    def test_no_repite_filas_si_se_insertan_entre_paginas(self):
+        paginador = PaginadorKeyset(Curso.objects.all(), "nombre", tamano=3)
+        primera = paginador.get_pagina()
+        Curso.objects.create(
+            nombre="A", codigo="NUEVO", semestre="1", docente=primera["objetos"][0].docente
+        )
+
+        segunda = paginador.get_pagina(primera["siguiente"])
+
+        self.assertEqual(segunda["objetos"], self.esperado()[4:7])
+
+    def test_cursor_alterado_devuelve_la_primera_pagina(self):
+        paginador = PaginadorKeyset(Curso.objects.all(), "nombre", tamano=3)
+        siguiente = paginador.get_pagina()["siguiente"]
+        datos = signing.loads(siguiente, salt=PaginadorKeyset.SALT)
+        datos["valor"] = "Z"
+        sin_firma = signing.dumps(datos, salt="otra", compress=True)
+
+        for cursor in (siguiente[:-2] + "xx", sin_firma, "basura"):
+            pagina = paginador.get_pagina(cursor)
+            self.assertEqual(pagina["objetos"], self.esperado()[:3])
+            self.assertIsNone(pagina["anterior"])
+
+    def test_cursor_de_otro_orden_devuelve_la_primera_pagina(self):
+        siguiente = PaginadorKeyset(Curso.objects.all(), "nombre", tamano=3).get_pagina()[
+            "siguiente"
+        ]
+
+        for paginador in (
+            PaginadorKeyset(Curso.objects.all(), "nombre", descendente=True, tamano=3),
+            PaginadorKeyset(Curso.objects.all(), "codigo", tamano=3),
+        ):
+            pagina = paginador.get_pagina(siguiente)
+            self.assertIsNone(pagina["anterior"])
+            self.assertEqual(pagina["objetos"][0], paginador.get_pagina()["objetos"][0])
@@ -1,56 +1,25 @@
-from django.http import HttpResponseRedirect
+from django.contrib.auth import authenticate
 from django.shortcuts import render, redirect
-from django.urls import reverse
-from apps.usuarios.models import Usuario
+from apps.usuarios.lib.services.sesion import SesionService
 
 
 def login_view(request):
     
     if request.method == "POST":
-        correo = request.POST.get("correo")
-        password = request.POST.get("password")
-
-        print(f"Correo recibido: {correo}")
-        print(f"Password recibido: {password}")
-
-        error = None  # Inicializa el error
-        try:
-
-            usuario = Usuario.objects.get(correo=correo)
-            print(f"Usuario encontrado: {usuario}")
-            print(f"Usuario ID: {usuario.password}")
-            print(f"Usuario Rol: {type(usuario.rol)} {usuario.rol}")
-            if usuario.password == password:
-                # Login exitoso
-                print(f"Usuario ID: {usuario.id}")
-
-                if str(usuario.rol) == "comision":
-                    url = reverse(
-                        "comision:bienvenida_comision",
-                        kwargs={"usuario_id": usuario.id },
-                    )
-                    return redirect(url)
-                elif str(usuario.rol) == "profesor":
-                    url = reverse(
-                        "docente:bienvenido_docente",
-                        kwargs={"usuario_id": usuario.id},
-                    )
-                    return redirect(url)
-                elif str(usuario.rol) == "alumno":
-                    url = reverse(
-                        "alumno:bienvenida_alumno",
-                        kwargs={"usuario_id": usuario.id},
-                    )
-                    
-
-                    return redirect(url)
-                else:
-                    error = "Rol no reconocido. Contacta con el administrador."
-            else:
-                error = "Contraseña incorrecta"
-
-        except Usuario.DoesNotExist:
-            error = "Usuario no encontrado"
+        usuario = authenticate(
+            request,
+            correo=request.POST.get("correo"),
+            password=request.POST.get("password"),
+        )
+
+        # El mismo mensaje para correo y contraseña: no revela qué correos existen
+        error = "Correo o contraseña incorrectos"
+        if usuario is not None:
+            url = SesionService.get_url_inicio(usuario)
+            if url is not None:
+                SesionService.iniciar(request, usuario)
+                return redirect(url)
+            error = "Rol no reconocido. Contacta con el administrador."
 
         return render(request, "login.html", {"form": {}, "error": error})
 
@@ -59,15 +28,11 @@ def login_view(request):
 
 
 def logout_view(request):
-    print("Cerrando sesión")
-    # Aquí deberías implementar la lógica para cerrar sesión
-    # Por ejemplo, limpiar la sesión del usuario
-    request.session.flush()  # Limpia la sesión actual
-    print("Sesión cerrada correctamente")
+    SesionService.cerrar(request)
     # Puedes redirigir a una página de inicio o login después de cerrar sesión
     return redirect("core:dashboard")  # Redirige a la página de login o inicio
 
 
 
 def dashboard_view(request):
-    return render(request, "dashboard_main.html")
\ No newline at end of file
+    return render(request, "dashboard_main.html")
@@ -0,0 +1,140 @@
+"""
+Servicio para el perfil de puntuaciones por pregunta y módulo de un docente.
+"""
+
+from typing import Dict, List
+from django.db.models import Avg, Count
+from apps.core.lib.services.cache import CacheService
+from apps.evaluacion.models import Respuesta
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+
+
+class PerfilPuntuacionService:
+    """
+    Servicio para calcular y guardar en caché el perfil de puntuaciones de un docente.
+
+    El perfil es la base común de las páginas de evaluaciones y
+    recomendaciones del docente.
+    """
+
+    @staticmethod
+    def get_perfil(docente_id, periodo_id=None, curso_id=None) -> Dict:
+        """
+        Obtiene el perfil de puntuaciones de un docente desde caché.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            periodo_id: ID del periodo (si es None, todos los periodos)
+            curso_id: ID del curso (si es None, todos los cursos del docente)
+
+        Returns:
+            Diccionario con "preguntas" y "modulos" (ver calcular)
+        """
+        return CacheService.get_or_set(
+            InvalidacionService.namespace_para(periodo_id),
+            f"perfil_docente:{docente_id}:{curso_id or 'todos'}",
+            lambda: PerfilPuntuacionService.calcular(docente_id, periodo_id, curso_id),
+            InvalidacionService.TIMEOUT_PERIODO,
+        )
+
+    @staticmethod
+    def calcular(docente_id, periodo_id=None, curso_id=None) -> Dict:
+        """
+        Calcula el perfil con una sola consulta agrupada por pregunta y módulo.
+
+        Los valores de cada módulo se derivan de los de sus preguntas: el
+        promedio se pondera por número de respuestas y los estudiantes son
+        el máximo de cualquier pregunta del módulo.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            periodo_id: ID del periodo (si es None, todos los periodos)
+            curso_id: ID del curso (si es None, todos los cursos del docente)
+
+        Returns:
+            Diccionario {"preguntas": {...}, "modulos": {...}}; cada uno es
+            {id: {"promedio": float, "respuestas": int, "num_estudiantes": int}}
+        """
+        respuestas = Respuesta.objects.filter(
+            evaluacion__docente_id=docente_id,
+            evaluacion__estado="enviada",
+            pregunta__isnull=False,
+        )
+        if periodo_id is not None:
+            respuestas = respuestas.filter(evaluacion__periodo_id=periodo_id)
+        if curso_id is not None:
+            respuestas = respuestas.filter(evaluacion__curso_id=curso_id)
+
+        filas = (
+            respuestas.values("pregunta", "pregunta__id_modulo")
+            .annotate(
+                promedio=Avg("puntuacion"),
+                respuestas=Count("id"),
+                num_estudiantes=Count("evaluacion__estudiante", distinct=True),
+            )
+            .order_by()
+        )
+
+        preguntas = {}
+        sumas_modulo = {}
+        modulos = {}
+        for fila in filas:
+            preguntas[fila["pregunta"]] = {
+                campo: fila[campo] for campo in ("promedio", "respuestas", "num_estudiantes")
+            }
+
+            modulo_id = fila["pregunta__id_modulo"]
+            modulo = modulos.setdefault(
+                modulo_id, {"promedio": 0, "respuestas": 0, "num_estudiantes": 0}
+            )
+            sumas_modulo[modulo_id] = (
+                sumas_modulo.get(modulo_id, 0) + fila["promedio"] * fila["respuestas"]
+            )
+            modulo["respuestas"] += fila["respuestas"]
+            modulo["num_estudiantes"] = max(
+                modulo["num_estudiantes"], fila["num_estudiantes"]
+            )
+
+        for modulo_id, modulo in modulos.items():
+            modulo["promedio"] = sumas_modulo[modulo_id] / modulo["respuestas"]
+
+        return {"preguntas": preguntas, "modulos": modulos}
+
+    @staticmethod
+    def get_modulos(perfil: Dict, catalogo: Dict) -> List[Dict]:
+        """
+        Combina el perfil con el cuestionario, incluidas las preguntas sin respuestas.
+
+        Args:
+            perfil: Perfil obtenido con get_perfil
+            catalogo: Catálogo de CatalogoPreguntasService.get_catalogo
+
+        Returns:
+            Lista de módulos en el orden del cuestionario, cada uno con modulo,
+            promedio, num_estudiantes y la lista de sus preguntas (pregunta,
+            promedio, num_estudiantes); los valores sin respuestas son 0
+        """
+        vacio = {"promedio": 0, "respuestas": 0, "num_estudiantes": 0}
+        modulos = []
+        for modulo, preguntas in catalogo["modulos"].items():
+            preguntas_info = []
+            for pregunta in preguntas:
+                resumen_pregunta = perfil["preguntas"].get(pregunta.pk, vacio)
+                preguntas_info.append(
+                    {
+                        "pregunta": pregunta,
+                        "promedio": resumen_pregunta["promedio"],
+                        "num_estudiantes": resumen_pregunta["num_estudiantes"],
+                    }
+                )
+
+            resumen_modulo = perfil["modulos"].get(modulo.pk, vacio)
+            modulos.append(
+                {
+                    "modulo": modulo,
+                    "promedio": resumen_modulo["promedio"],
+                    "num_estudiantes": resumen_modulo["num_estudiantes"],
+                    "preguntas": preguntas_info,
+                }
+            )
+        return modulos
@@ -0,0 +1,85 @@
+"""
+Servicio para generar las recomendaciones del docente a partir de su perfil de puntuaciones.
+"""
+
+from typing import Dict, List
+
+
+class RecomendacionService:
+    """Servicio para asignar a cada módulo un nivel y sus recomendaciones."""
+
+    # Niveles de menor a mayor: a cada módulo le corresponde el primero cuyo
+    # límite ("hasta", exclusivo) supera su promedio; el último no tiene límite
+    NIVELES = [
+        {
+            "nivel": "Bajo",
+            "hasta": 3,
+            "recomendaciones": [
+                "Considerar revisar y actualizar el material didáctico",
+                "Implementar más ejercicios prácticos",
+                "Solicitar retroalimentación específica a los estudiantes",
+                "Participar en talleres de desarrollo docente",
+            ],
+        },
+        {
+            "nivel": "Medio",
+            "hasta": 4,
+            "recomendaciones": [
+                "Mantener las buenas prácticas actuales",
+                "Identificar áreas específicas de mejora",
+                "Compartir experiencias con otros docentes",
+                "Actualizar el material de estudio",
+            ],
+        },
+        {
+            "nivel": "Alto",
+            "hasta": None,
+            "recomendaciones": [
+                "Compartir las mejores prácticas con otros docentes",
+                "Mantener el nivel de excelencia",
+                "Explorar nuevas metodologías de enseñanza",
+                "Mentorear a otros docentes",
+            ],
+        },
+    ]
+
+    @staticmethod
+    def get_nivel(promedio: float) -> Dict:
+        """
+        Obtiene el nivel de la tabla NIVELES que corresponde a un promedio.
+
+        Args:
+            promedio: Promedio de puntuación de 0 a 5
+
+        Returns:
+            Entrada de NIVELES con nivel, hasta y recomendaciones
+        """
+        for nivel in RecomendacionService.NIVELES:
+            if nivel["hasta"] is None or promedio < nivel["hasta"]:
+                return nivel
+        return RecomendacionService.NIVELES[-1]
+
+    @staticmethod
+    def get_recomendaciones(modulos: List[Dict]) -> List[Dict]:
+        """
+        Genera las recomendaciones de cada módulo según su promedio.
+
+        Args:
+            modulos: Módulos de PerfilPuntuacionService.get_modulos
+
+        Returns:
+            Lista de diccionarios con modulo (nombre), puntuacion, nivel y
+            recomendaciones
+        """
+        recomendaciones = []
+        for info in modulos:
+            nivel = RecomendacionService.get_nivel(info["promedio"])
+            recomendaciones.append(
+                {
+                    "modulo": info["modulo"].nombre,
+                    "puntuacion": round(info["promedio"], 1),
+                    "nivel": nivel["nivel"],
+                    "recomendaciones": nivel["recomendaciones"],
+                }
+            )
+        return recomendaciones
@@ -1,8 +1,16 @@
-from django.shortcuts import get_object_or_404, render
+from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.http import Http404
+from django.shortcuts import render
 from apps.core.models import Curso
 from apps.docentes.models import Docente
-from apps.evaluacion.models import Evaluacion, Respuesta, ModuloPreguntas
-from django.db.models import Avg
+from apps.docentes.lib.services.perfil_puntuacion import PerfilPuntuacionService
+from apps.docentes.lib.services.recomendaciones import RecomendacionService
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion
+from apps.evaluacion.lib.services.catalogo import CatalogoPreguntasService
+from apps.evaluacion.lib.services.comentarios import AnalisisComentariosService
+from apps.evaluacion.lib.services.tendencias import TendenciaService
+from apps.usuarios.lib.services.sesion import SesionService
 
 # Create your views here.
 
@@ -11,7 +19,7 @@ def bienvenido_docente(request, usuario_id):
     return render(request, 'bienvenido_docente.html', {'usuario_id': usuario_id })
 
 def perfil_docente(request ,usuario_id):
-    docente = get_object_or_404(Docente, usuario__id= usuario_id)
+    docente = SesionService.get_perfil_o_404(request, Docente, usuario_id)
     
     curso = Curso.objects.filter(docente = docente)
     print(curso)
@@ -19,133 +27,129 @@ def perfil_docente(request ,usuario_id):
     
     return render(request, 'perfil_docente.html', {'usuario_id': usuario_id , "docente":docente , "curso": curso})
 
+def _get_filtros(request, docente):
+    """Periodo y curso opcionales (?periodo=, ?curso=); 404 si no existen o el curso no es del docente"""
+    periodo = curso = None
+    try:
+        if request.GET.get("periodo"):
+            periodo = PeriodoEvaluacion.objects.get(id=request.GET["periodo"])
+        if request.GET.get("curso"):
+            curso = Curso.objects.get(id=request.GET["curso"], docente=docente)
+    except (PeriodoEvaluacion.DoesNotExist, Curso.DoesNotExist, ValidationError):
+        raise Http404("Filtro no encontrado")
+    return periodo, curso
+
+
+def _get_contexto_filtros(docente, periodo, curso):
+    """Filtros seleccionados y opciones de los selectores de periodo y curso"""
+    return {
+        "periodo": periodo,
+        "curso": curso,
+        "periodos": PeriodoEvaluacion.objects.all(),
+        "cursos": Curso.objects.filter(docente=docente),
+    }
+
+
+def _get_modulos(docente, periodo, curso):
+    """Perfil de puntuaciones del docente (en caché) combinado con el cuestionario"""
+    perfil = PerfilPuntuacionService.get_perfil(
+        docente.pk,
+        periodo.pk if periodo else None,
+        curso.pk if curso else None,
+    )
+    return PerfilPuntuacionService.get_modulos(
+        perfil, CatalogoPreguntasService.get_catalogo()
+    )
+
+
 def ver_recomendaciones(request, usuario_id):
-    docente = get_object_or_404(Docente, usuario__id=usuario_id)
-    
-    # Obtener evaluaciones y módulos
-    evaluaciones = Evaluacion.objects.filter(docente=docente, estado='enviada')
-    modulos = ModuloPreguntas.objects.all()
-    
-    # Obtener puntuaciones por módulo
-    recomendaciones = []
-    for modulo in modulos:
-        promedio = Respuesta.objects.filter(
-            evaluacion__docente=docente,
-            evaluacion__estado='enviada',
-            pregunta__id_modulo=modulo
-        ).aggregate(promedio=Avg('puntuacion'))['promedio'] or 0
-        
-        # Generar recomendaciones basadas en el promedio
-        if promedio < 3:
-            recomendaciones.append({
-                'modulo': modulo.nombre,
-                'puntuacion': round(promedio, 1),
-                'nivel': 'Bajo',
-                'recomendaciones': [
-                    'Considerar revisar y actualizar el material didáctico',
-                    'Implementar más ejercicios prácticos',
-                    'Solicitar retroalimentación específica a los estudiantes',
-                    'Participar en talleres de desarrollo docente'
-                ]
-            })
-        elif promedio < 4:
-            recomendaciones.append({
-                'modulo': modulo.nombre,
-                'puntuacion': round(promedio, 1),
-                'nivel': 'Medio',
-                'recomendaciones': [
-                    'Mantener las buenas prácticas actuales',
-                    'Identificar áreas específicas de mejora',
-                    'Compartir experiencias con otros docentes',
-                    'Actualizar el material de estudio'
-                ]
-            })
-        else:
-            recomendaciones.append({
-                'modulo': modulo.nombre,
-                'puntuacion': round(promedio, 1),
-                'nivel': 'Alto',
-                'recomendaciones': [
-                    'Compartir las mejores prácticas con otros docentes',
-                    'Mantener el nivel de excelencia',
-                    'Explorar nuevas metodologías de enseñanza',
-                    'Mentorear a otros docentes'
-                ]
-            })
-    
+    docente = SesionService.get_perfil_o_404(request, Docente, usuario_id)
+    periodo, curso = _get_filtros(request, docente)
+
+    # Nivel y recomendaciones de cada módulo según la tabla de niveles
+    recomendaciones = RecomendacionService.get_recomendaciones(
+        _get_modulos(docente, periodo, curso)
+    )
+
     context = {
         'usuario_id': usuario_id,
         'docente': docente,
         'recomendaciones': recomendaciones,
+        **_get_contexto_filtros(docente, periodo, curso),
     }
-    
+
     return render(request, 'ver_recomendaciones.html', context)
 
 def ver_evaluacion(request, usuario_id):
-    docente = get_object_or_404(Docente, usuario__id=usuario_id)
-    
-    # Obtener evaluaciones y módulos
+    docente = SesionService.get_perfil_o_404(request, Docente, usuario_id)
+    periodo, curso = _get_filtros(request, docente)
+
     evaluaciones = Evaluacion.objects.filter(docente=docente, estado='enviada')
-    modulos = ModuloPreguntas.objects.all()
-    
-    # Contar estudiantes únicos que evaluaron al docente
-    total_estudiantes = evaluaciones.values('estudiante').distinct().count()
-    
-    # Obtener puntuaciones por pregunta
+    if periodo:
+        evaluaciones = evaluaciones.filter(periodo=periodo)
+    if curso:
+        evaluaciones = evaluaciones.filter(curso=curso)
+
+    # Evaluaciones y estudiantes únicos que evaluaron al docente
+    totales = evaluaciones.aggregate(
+        evaluaciones=Count('id'), estudiantes=Count('estudiante', distinct=True)
+    )
+
+    # Puntuaciones por módulo y pregunta desde el perfil del docente
     preguntas_con_puntuacion = []
-    for modulo in modulos:
-        for pregunta in modulo.preguntamodulo_set.all():
-            respuestas = Respuesta.objects.filter(
-                evaluacion__docente=docente,
-                evaluacion__estado='enviada',
-                pregunta=pregunta
-            )
-            promedio = respuestas.aggregate(promedio=Avg('puntuacion'))['promedio'] or 0
-            
-            # Contar estudiantes únicos que evaluaron esta pregunta
-            num_estudiantes = respuestas.values('evaluacion__estudiante').distinct().count()
-            
-            preguntas_con_puntuacion.append({
-                'modulo': modulo,
-                'pregunta': pregunta,
-                'puntuacion': round(promedio, 1),
-                'num_estudiantes': num_estudiantes
-            })
-    
-    # Agrupar preguntas por módulo para una mejor visualización
     modulos_con_preguntas = {}
-    for item in preguntas_con_puntuacion:
-        modulo_id = str(item['modulo'].id_modulo)
-        if modulo_id not in modulos_con_preguntas:
-            modulos_con_preguntas[modulo_id] = {
-                'modulo': item['modulo'],
-                'preguntas': [],
-                'promedio_modulo': 0,
-                'num_estudiantes_modulo': 0
+    for info in _get_modulos(docente, periodo, curso):
+        modulo = info['modulo']
+        preguntas = [
+            {
+                'modulo': modulo,
+                'pregunta': pregunta_info['pregunta'],
+                'puntuacion': round(pregunta_info['promedio'], 1),
+                'num_estudiantes': pregunta_info['num_estudiantes'],
             }
-        modulos_con_preguntas[modulo_id]['preguntas'].append(item)
-        
-    # Calcular promedio por módulo
-    for modulo_id, datos in modulos_con_preguntas.items():
-        if datos['preguntas']:
-            # Calcular promedio del módulo
-            suma_puntuaciones = sum(pregunta['puntuacion'] for pregunta in datos['preguntas'])
-            datos['promedio_modulo'] = round(suma_puntuaciones / len(datos['preguntas']), 1)
-            
-            # Encontrar el máximo número de estudiantes que evaluaron cualquier pregunta del módulo
-            datos['num_estudiantes_modulo'] = max(pregunta['num_estudiantes'] for pregunta in datos['preguntas'])
-    
-    # Obtener comentarios
-    comentarios = evaluaciones.filter(comentario_general__isnull=False).values_list('comentario_general', flat=True)
-    
+            for pregunta_info in info['preguntas']
+        ]
+        preguntas_con_puntuacion.extend(preguntas)
+        modulos_con_preguntas[str(modulo.id_modulo)] = {
+            'modulo': modulo,
+            'preguntas': preguntas,
+            'promedio_modulo': round(info['promedio'], 1),
+            'num_estudiantes_modulo': info['num_estudiantes'],
+        }
+
+    # Resumen de comentarios precalculado por el análisis de comentarios
+    resumen_comentarios = AnalisisComentariosService.get_resumen(
+        docente.pk, periodo.pk if periodo else None, curso.pk if curso else None
+    )
+
     context = {
         'usuario_id': usuario_id,
         'docente': docente,
-        'evaluaciones': evaluaciones,
+        'total_evaluaciones': totales['evaluaciones'],
         'preguntas_con_puntuacion': preguntas_con_puntuacion,
         'modulos_con_preguntas': modulos_con_preguntas,
-        'comentarios': comentarios,
-        'total_estudiantes': total_estudiantes,
+        'resumen_comentarios': resumen_comentarios,
+        'total_estudiantes': totales['estudiantes'],
+        **_get_contexto_filtros(docente, periodo, curso),
     }
-    
-    return render(request, 'ver_evaluacion.html', context)
\ No newline at end of file
+
+    return render(request, 'ver_evaluacion.html', context)
+
+
+def ver_tendencias(request, usuario_id):
+    """Evolución de las puntuaciones del docente entre periodos cerrados"""
+    docente = SesionService.get_perfil_o_404(request, Docente, usuario_id)
+    _, curso = _get_filtros(request, docente)
+    curso_id = curso.pk if curso else None
+
+    # Series precalculadas al cerrar cada periodo
+    context = {
+        'usuario_id': usuario_id,
+        'docente': docente,
+        'curso': curso,
+        'cursos': Curso.objects.filter(docente=docente),
+        'serie': TendenciaService.get_serie(docente.pk, curso_id),
+        'series_modulos': TendenciaService.get_series_modulos(docente.pk, curso_id),
+    }
+
+    return render(request, 'ver_tendencias.html', context)
@@ -9,8 +9,18 @@ from apps.evaluacion.models import (
     ModuloPreguntas,
     PreguntaModulo,
     PeriodoEvaluacion,
+    ResumenPuntuacion,
+    TendenciaPeriodo,
 )
 
 admin.site.register(
-    [Evaluacion, Respuesta, ModuloPreguntas, PreguntaModulo, PeriodoEvaluacion]
+    [
+        Evaluacion,
+        Respuesta,
+        ModuloPreguntas,
+        PreguntaModulo,
+        PeriodoEvaluacion,
+        ResumenPuntuacion,
+        TendenciaPeriodo,
+    ]
 )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EvaluacionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.evaluacion'
+
+    def ready(self):
+        from apps.evaluacion import signals  # noqa: F401
@@ -0,0 +1,383 @@
+"""
+Servicio para indexar y buscar docentes, cursos y comentarios.
+"""
+
+import re
+from typing import Iterable, List, Optional
+from django.db import connection, transaction
+from django.db.models import F, Q, QuerySet
+from apps.core.models import Curso
+from apps.docentes.models import Docente
+from apps.evaluacion.models import DocumentoBusqueda, Evaluacion
+from apps.evaluacion.lib.utils.texto import normalizar
+
+
+class BusquedaService:
+    """
+    Servicio para la búsqueda de texto sobre DocumentoBusqueda.
+
+    Cada docente (nombre y departamento), curso (código, nombre, semestre y
+    docente) y comentario de una evaluación enviada tiene un documento con
+    su texto normalizado, que se actualiza al guardar el objeto. La consulta
+    depende del motor: en PostgreSQL, búsqueda de texto en español con
+    índice GIN más similitud de trigramas para errores de escritura; en
+    SQLite, la tabla FTS5 con ranking BM25 (se crea si falta, por ejemplo
+    en bases creadas sin migraciones); en otros motores, coincidencia de
+    todas las palabras sin ranking.
+    """
+
+    TIPOS = ("docente", "curso", "comentario")
+
+    # Resultados que devuelve buscar si no se indica otro límite
+    LIMITE = 200
+
+    TAMANO_LOTE = 1000
+
+    # Configuración de texto de PostgreSQL y tablas de SQLite (migración 0019):
+    # la tabla FTS5 y el número estable de cada documento en ella
+    CONFIGURACION = "spanish"
+    TABLA_FTS = "evaluacion_documentobusqueda_fts"
+    TABLA_FTS_IDS = "evaluacion_documentobusqueda_fts_ids"
+
+    @staticmethod
+    def buscar(
+        consulta: str, tipos: Optional[Iterable[str]] = None, limite: Optional[int] = LIMITE
+    ) -> List[DocumentoBusqueda]:
+        """
+        Busca documentos que coinciden con la consulta, de más a menos relevante.
+
+        Args:
+            consulta: Texto a buscar
+            tipos: Tipos de documento a incluir (por defecto, todos)
+            limite: Máximo de resultados (None: todos)
+
+        Returns:
+            Lista de documentos con su docente, curso y evaluación; cada uno
+            trae rango (mayor es más relevante)
+        """
+        texto = normalizar(consulta)
+        if not re.findall(r"\w+", texto):
+            return []
+
+        tipos = list(tipos or BusquedaService.TIPOS)
+        documentos = DocumentoBusqueda.objects.filter(tipo__in=tipos).select_related(
+            "docente__usuario", "curso", "evaluacion"
+        )
+
+        if connection.vendor == "postgresql":
+            return BusquedaService._buscar_postgresql(documentos, texto, limite)
+        if connection.vendor == "sqlite":
+            return BusquedaService._buscar_sqlite(documentos, tipos, texto, limite)
+        return BusquedaService._buscar_simple(documentos, texto, limite)
+
+    @staticmethod
+    def buscar_docentes(consulta: str) -> List:
+        """
+        Busca docentes por su nombre y departamento o por sus cursos.
+
+        No se limita el número de resultados: el explorador los pagina.
+
+        Args:
+            consulta: Texto a buscar
+
+        Returns:
+            Lista de IDs de docentes, del más relevante al menos relevante
+        """
+        docentes_ids = []
+        for documento in BusquedaService.buscar(consulta, ("docente", "curso"), None):
+            if documento.docente_id not in docentes_ids:
+                docentes_ids.append(documento.docente_id)
+        return docentes_ids
+
+    @staticmethod
+    def _buscar_postgresql(documentos: QuerySet, texto: str, limite: Optional[int]) -> List:
+        """Búsqueda de texto en español más similitud de trigramas por palabra."""
+        from django.contrib.postgres.lookups import TrigramWordSimilar
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+            TrigramWordSimilarity,
+        )
+
+        # El vector debe coincidir con la expresión del índice GIN
+        vector = SearchVector("texto", config=BusquedaService.CONFIGURACION)
+        consulta = SearchQuery(
+            texto, config=BusquedaService.CONFIGURACION, search_type="websearch"
+        )
+        return list(
+            documentos.annotate(
+                vector=vector,
+                rango=SearchRank(vector, consulta) + TrigramWordSimilarity(texto, "texto"),
+            )
+            .filter(Q(vector=consulta) | TrigramWordSimilar(F("texto"), texto))
+            .order_by("-rango", "pk")[:limite]
+        )
+
+    @staticmethod
+    def _buscar_sqlite(
+        documentos: QuerySet, tipos: List[str], texto: str, limite: Optional[int]
+    ) -> List:
+        """Búsqueda en la tabla FTS5 con ranking BM25; cada palabra puede ser un prefijo."""
+        BusquedaService.crear_tabla_fts()
+        expresion = " ".join(f'"{palabra}"*' for palabra in re.findall(r"\w+", texto))
+        fts = BusquedaService.TABLA_FTS
+        ids = BusquedaService.TABLA_FTS_IDS
+        tabla = DocumentoBusqueda._meta.db_table
+        marcadores = ", ".join(["%s"] * len(tipos))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {tabla}.id, -bm25({fts}) FROM {fts} "
+                f"JOIN {ids} ON {ids}.id = {fts}.rowid "
+                f"JOIN {tabla} ON {tabla}.id = {ids}.documento_id "
+                f"WHERE {fts} MATCH %s AND {tabla}.tipo IN ({marcadores}) "
+                f"ORDER BY bm25({fts}) LIMIT %s",
+                # En SQLite, LIMIT -1 no limita
+                [expresion, *tipos, -1 if limite is None else limite],
+            )
+            rangos = {
+                DocumentoBusqueda._meta.pk.to_python(documento_id): rango
+                for documento_id, rango in cursor.fetchall()
+            }
+
+        resultados = list(documentos.filter(pk__in=rangos))
+        for documento in resultados:
+            documento.rango = rangos[documento.pk]
+        resultados.sort(key=lambda documento: (-documento.rango, str(documento.pk)))
+        return resultados
+
+    @staticmethod
+    def _buscar_simple(documentos: QuerySet, texto: str, limite: Optional[int]) -> List:
+        """Documentos que contienen todas las palabras, los más recientes primero."""
+        for palabra in re.findall(r"\w+", texto):
+            documentos = documentos.filter(texto__contains=palabra)
+        resultados = list(documentos.order_by("-actualizado", "pk")[:limite])
+        for documento in resultados:
+            documento.rango = 1.0
+        return resultados
+
+    @staticmethod
+    def indexar_docentes(docentes_ids: Iterable) -> None:
+        """
+        Actualiza los documentos de los docentes y de sus cursos.
+
+        Args:
+            docentes_ids: IDs de los docentes (sus usuarios)
+        """
+        docentes_ids = list(docentes_ids)
+        BusquedaService._reemplazar(
+            "docente",
+            docentes_ids,
+            [
+                BusquedaService._documento_docente(docente)
+                for docente in BusquedaService._get_docentes().filter(pk__in=docentes_ids)
+            ],
+        )
+        # El texto de los cursos incluye el nombre del docente
+        BusquedaService.indexar_cursos(
+            Curso.objects.filter(docente_id__in=docentes_ids).values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def indexar_cursos(cursos_ids: Iterable) -> None:
+        """
+        Actualiza los documentos de los cursos.
+
+        Args:
+            cursos_ids: IDs de los cursos
+        """
+        cursos_ids = list(cursos_ids)
+        BusquedaService._reemplazar(
+            "curso",
+            cursos_ids,
+            [
+                BusquedaService._documento_curso(curso)
+                for curso in BusquedaService._get_cursos().filter(pk__in=cursos_ids)
+            ],
+        )
+
+    @staticmethod
+    def indexar_evaluaciones(evaluaciones_ids: Iterable) -> None:
+        """
+        Actualiza los documentos de los comentarios de las evaluaciones.
+
+        Las evaluaciones en borrador o sin comentario quedan sin documento.
+
+        Args:
+            evaluaciones_ids: IDs de las evaluaciones
+        """
+        evaluaciones_ids = list(evaluaciones_ids)
+        BusquedaService._reemplazar(
+            "comentario",
+            evaluaciones_ids,
+            [
+                BusquedaService._documento_comentario(evaluacion)
+                for evaluacion in BusquedaService._get_comentarios().filter(
+                    pk__in=evaluaciones_ids
+                )
+            ],
+        )
+
+    @staticmethod
+    def reconstruir() -> int:
+        """
+        Vuelve a crear todos los documentos de búsqueda.
+
+        Returns:
+            Número de documentos creados
+        """
+        total = 0
+        with transaction.atomic():
+            BusquedaService.crear_tabla_fts()
+            DocumentoBusqueda.objects.all().delete()
+            for consulta, crear in (
+                (BusquedaService._get_docentes(), BusquedaService._documento_docente),
+                (BusquedaService._get_cursos(), BusquedaService._documento_curso),
+                (BusquedaService._get_comentarios(), BusquedaService._documento_comentario),
+            ):
+                lote = []
+                for objeto in consulta.iterator(chunk_size=BusquedaService.TAMANO_LOTE):
+                    lote.append(crear(objeto))
+                    if len(lote) == BusquedaService.TAMANO_LOTE:
+                        DocumentoBusqueda.objects.bulk_create(lote)
+                        total += len(lote)
+                        lote = []
+                DocumentoBusqueda.objects.bulk_create(lote)
+                total += len(lote)
+        return total
+
+    @staticmethod
+    def crear_tabla_fts() -> bool:
+        """
+        Crea las tablas de búsqueda de SQLite y sus triggers si aún no existen.
+
+        La migración 0019 las crea, pero las bases construidas desde los
+        modelos (base temporal del benchmark, bases de pruebas) no ejecutan
+        migraciones. También sustituye la tabla FTS5 anterior, que se
+        enlazaba por el rowid implícito de los documentos: VACUUM puede
+        renumerarlo y el índice devolvía documentos equivocados. Las tablas
+        nuevas se llenan con los documentos existentes.
+
+        Returns:
+            True si se crearon las tablas
+        """
+        if connection.vendor != "sqlite":
+            return False
+        fts = BusquedaService.TABLA_FTS
+        ids = BusquedaService.TABLA_FTS_IDS
+        tabla = DocumentoBusqueda._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [ids]
+            )
+            if cursor.fetchone():
+                return False
+
+            for nombre in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{nombre}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+            # Mismo esquema que la migración 0019
+            cursor.execute(
+                f"CREATE TABLE {ids} (id INTEGER PRIMARY KEY, "
+                "documento_id char(32) NOT NULL UNIQUE)"
+            )
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5(texto, "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            fila = f"(SELECT id FROM {ids} WHERE documento_id = old.id)"
+            for nombre, evento, cuerpo in (
+                (
+                    "ai",
+                    "INSERT",
+                    f"INSERT INTO {ids}(documento_id) VALUES (new.id); "
+                    f"INSERT INTO {fts}(rowid, texto) "
+                    f"SELECT id, new.texto FROM {ids} WHERE documento_id = new.id;",
+                ),
+                (
+                    "ad",
+                    "DELETE",
+                    f"DELETE FROM {fts} WHERE rowid = {fila}; "
+                    f"DELETE FROM {ids} WHERE documento_id = old.id;",
+                ),
+                (
+                    "au",
+                    "UPDATE OF id, texto",
+                    f"UPDATE {fts} SET texto = new.texto WHERE rowid = {fila}; "
+                    f"UPDATE {ids} SET documento_id = new.id WHERE documento_id = old.id;",
+                ),
+            ):
+                cursor.execute(
+                    f"CREATE TRIGGER {fts}_{nombre} AFTER {evento} ON {tabla} "
+                    f"BEGIN {cuerpo} END"
+                )
+
+            cursor.execute(f"INSERT INTO {ids}(documento_id) SELECT id FROM {tabla}")
+            cursor.execute(
+                f"INSERT INTO {fts}(rowid, texto) SELECT {ids}.id, {tabla}.texto "
+                f"FROM {ids} JOIN {tabla} ON {tabla}.id = {ids}.documento_id"
+            )
+        return True
+
+    @staticmethod
+    def _reemplazar(tipo: str, objetos_ids: List, documentos: List[DocumentoBusqueda]) -> None:
+        """Sustituye los documentos de un tipo para los objetos indicados."""
+        if not objetos_ids:
+            return
+        with transaction.atomic():
+            DocumentoBusqueda.objects.filter(tipo=tipo, objeto_id__in=objetos_ids).delete()
+            DocumentoBusqueda.objects.bulk_create(
+                documentos, batch_size=BusquedaService.TAMANO_LOTE
+            )
+
+    @staticmethod
+    def _get_docentes() -> QuerySet:
+        return Docente.objects.select_related("usuario").order_by()
+
+    @staticmethod
+    def _get_cursos() -> QuerySet:
+        return Curso.objects.select_related("docente__usuario").order_by()
+
+    @staticmethod
+    def _get_comentarios() -> QuerySet:
+        return (
+            Evaluacion.objects.filter(estado="enviada", comentario_general__isnull=False)
+            .exclude(comentario_general="")
+            .only("id", "docente_id", "curso_id", "comentario_general")
+            .order_by()
+        )
+
+    @staticmethod
+    def _documento_docente(docente: Docente) -> DocumentoBusqueda:
+        return DocumentoBusqueda(
+            tipo="docente",
+            objeto_id=docente.pk,
+            docente=docente,
+            texto=normalizar(
+                f"{docente.usuario.nombre} {docente.departamento}"
+            ),
+        )
+
+    @staticmethod
+    def _documento_curso(curso: Curso) -> DocumentoBusqueda:
+        return DocumentoBusqueda(
+            tipo="curso",
+            objeto_id=curso.pk,
+            docente_id=curso.docente_id,
+            curso=curso,
+            texto=normalizar(
+                f"{curso.codigo} {curso.nombre} {curso.semestre} {curso.docente.usuario.nombre}"
+            ),
+        )
+
+    @staticmethod
+    def _documento_comentario(evaluacion: Evaluacion) -> DocumentoBusqueda:
+        return DocumentoBusqueda(
+            tipo="comentario",
+            objeto_id=evaluacion.pk,
+            docente_id=evaluacion.docente_id,
+            curso_id=evaluacion.curso_id,
+            evaluacion=evaluacion,
+            texto=normalizar(evaluacion.comentario_general),
+        )
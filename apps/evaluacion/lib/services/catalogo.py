@@ -0,0 +1,69 @@
+"""
+Servicio para el catálogo de módulos y preguntas del cuestionario.
+"""
+
+from typing import Dict
+from apps.core.lib.services.cache import CacheService
+from apps.evaluacion.models import ModuloPreguntas
+
+
+class CatalogoPreguntasService:
+    """Servicio para obtener el cuestionario desde caché e invalidarlo al editarlo."""
+
+    NAMESPACE = "catalogo_preguntas"
+
+    # Tiempo máximo en caché por si el cuestionario se edita fuera de la comisión
+    TIMEOUT = 60 * 60
+
+    @staticmethod
+    def get_version() -> int:
+        """
+        Obtiene la versión actual del catálogo.
+
+        Returns:
+            Número de versión, que cambia cada vez que se edita el cuestionario
+        """
+        return CacheService.get_version(CatalogoPreguntasService.NAMESPACE)
+
+    @staticmethod
+    def get_catalogo() -> Dict:
+        """
+        Obtiene los módulos ordenados con sus preguntas.
+
+        Returns:
+            Diccionario con la versión, los módulos {modulo: [preguntas]} y
+            la lista de IDs de todas las preguntas
+        """
+        version = CatalogoPreguntasService.get_version()
+        return CacheService.get_or_set(
+            CatalogoPreguntasService.NAMESPACE,
+            "catalogo",
+            lambda: CatalogoPreguntasService._construir(version),
+            CatalogoPreguntasService.TIMEOUT,
+        )
+
+    @staticmethod
+    def invalidar() -> None:
+        """Invalida el catálogo en caché incrementando su versión."""
+        CacheService.invalidar(CatalogoPreguntasService.NAMESPACE)
+
+    @staticmethod
+    def _construir(version: int) -> Dict:
+        modulos = ModuloPreguntas.objects.prefetch_related(
+            "preguntamodulo_set"
+        ).order_by("nombre")
+
+        catalogo = {}
+        preguntas_ids = []
+        for modulo in modulos:
+            preguntas = list(modulo.preguntamodulo_set.all())
+            if not preguntas:
+                continue
+            catalogo[modulo] = preguntas
+            preguntas_ids.extend(pregunta.pk for pregunta in preguntas)
+
+        return {
+            "version": version,
+            "modulos": catalogo,
+            "preguntas_ids": preguntas_ids,
+        }
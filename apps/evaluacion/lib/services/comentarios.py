@@ -0,0 +1,238 @@
+"""
+Servicio para analizar los comentarios de las evaluaciones y consultar su resumen.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Optional
+from django.db import transaction
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion, ResumenComentarios
+from apps.evaluacion.lib.utils.texto import (
+    agrupar_similares,
+    coeficientes_minhash,
+    firma_minhash,
+    frases,
+    palabras_clave,
+    tokenizar,
+)
+
+
+class AnalisisComentariosService:
+    """
+    Servicio para el resumen de comentarios de cada docente y curso.
+
+    El análisis se ejecuta fuera de las peticiones (comando
+    analizar_comentarios), por periodo y para todos los periodos: tokeniza
+    cada comentario, cuenta en cuántos comentarios aparece cada palabra y
+    frase, y agrupa los comentarios casi idénticos de un mismo docente con
+    MinHash. Las páginas leen solo ResumenComentarios, con una consulta.
+    """
+
+    # Elementos que guarda cada resumen
+    PALABRAS = 15
+    FRASES = 10
+    RECIENTES = 5
+    GRUPOS = 5
+
+    # Comentarios en que debe aparecer una frase para incluirla
+    MIN_FRASE = 2
+
+    # MinHash sobre pares de palabras: 32 permutaciones en 8 bandas de 4.
+    # Los comentarios muy cortos ("Muy bueno") se repiten sin ser copias
+    PERMUTACIONES = 32
+    BANDAS = 8
+    UMBRAL_DUPLICADO = 0.8
+    MIN_PALABRAS_DUPLICADO = 4
+
+    TAMANO_LOTE = 2000
+
+    @staticmethod
+    def analizar_todo() -> int:
+        """
+        Recalcula los resúmenes de cada periodo y el de todos los periodos.
+
+        Returns:
+            Número de resúmenes creados
+        """
+        total = 0
+        for periodo in PeriodoEvaluacion.objects.all():
+            total += AnalisisComentariosService.analizar(periodo)
+        return total + AnalisisComentariosService.analizar()
+
+    @staticmethod
+    def analizar(periodo: Optional[PeriodoEvaluacion] = None) -> int:
+        """
+        Recalcula los resúmenes de comentarios de un periodo.
+
+        Por cada docente con comentarios se guarda un resumen de todos sus
+        cursos y uno por curso.
+
+        Args:
+            periodo: Periodo a analizar (si es None, todos los periodos,
+                incluidas las evaluaciones sin periodo)
+
+        Returns:
+            Número de resúmenes creados
+        """
+        evaluaciones = Evaluacion.objects.filter(
+            estado="enviada", docente__isnull=False, comentario_general__isnull=False
+        ).exclude(comentario_general="")
+        if periodo is not None:
+            evaluaciones = evaluaciones.filter(periodo=periodo)
+
+        # Del más reciente al más antiguo: el primero de cada grupo de
+        # duplicados es el que se muestra
+        filas = evaluaciones.values_list(
+            "docente_id", "curso_id", "comentario_general", "fecha"
+        ).order_by("docente_id", "-fecha", "-id")
+
+        coeficientes = coeficientes_minhash(AnalisisComentariosService.PERMUTACIONES)
+        resumenes = []
+        for docente_id, comentarios in groupby(
+            filas.iterator(chunk_size=AnalisisComentariosService.TAMANO_LOTE),
+            key=itemgetter(0),
+        ):
+            resumenes.extend(
+                AnalisisComentariosService._analizar_docente(
+                    periodo, docente_id, list(comentarios), coeficientes
+                )
+            )
+
+        with transaction.atomic():
+            ResumenComentarios.objects.filter(periodo=periodo).delete()
+            ResumenComentarios.objects.bulk_create(
+                resumenes, batch_size=AnalisisComentariosService.TAMANO_LOTE
+            )
+        return len(resumenes)
+
+    @staticmethod
+    def get_resumen(docente_id, periodo_id=None, curso_id=None) -> Optional[Dict]:
+        """
+        Obtiene el resumen de comentarios de un docente.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            periodo_id: ID del periodo (si es None, todos los periodos)
+            curso_id: ID del curso (si es None, todos los cursos)
+
+        Returns:
+            Diccionario con comentarios, duplicados, palabras, frases,
+            grupos_duplicados, recientes y calculado, o None si aún no se
+            analizaron comentarios del docente
+        """
+        resumen = (
+            ResumenComentarios.objects.filter(
+                docente_id=docente_id, periodo_id=periodo_id, curso_id=curso_id
+            )
+            .values(
+                "comentarios",
+                "duplicados",
+                "palabras",
+                "frases",
+                "grupos_duplicados",
+                "recientes",
+                "calculado",
+            )
+            .first()
+        )
+        if resumen is not None:
+            for comentario in resumen["recientes"]:
+                comentario["fecha"] = datetime.fromisoformat(comentario["fecha"])
+        return resumen
+
+    @staticmethod
+    def _analizar_docente(
+        periodo: Optional[PeriodoEvaluacion],
+        docente_id,
+        filas: List,
+        coeficientes: List,
+    ) -> List[ResumenComentarios]:
+        """Resúmenes de un docente: todos sus cursos y cada curso por separado."""
+        tokens = [tokenizar(texto) for _, _, texto, _ in filas]
+
+        # Las firmas se reutilizan entre los comentarios del docente con las
+        # mismas palabras; el caché no pasa de un docente a otro
+        firmas = {}
+        firmas_docente = []
+        for palabras in tokens:
+            clave = tuple(palabras)
+            if len(clave) < AnalisisComentariosService.MIN_PALABRAS_DUPLICADO:
+                firmas_docente.append(None)
+                continue
+            if clave not in firmas:
+                firmas[clave] = firma_minhash(
+                    (f"{a} {b}" for a, b in zip(clave, clave[1:])), coeficientes
+                )
+            firmas_docente.append(firmas[clave])
+        grupos = agrupar_similares(
+            firmas_docente,
+            AnalisisComentariosService.BANDAS,
+            AnalisisComentariosService.UMBRAL_DUPLICADO,
+        )
+
+        por_curso = defaultdict(list)
+        for indice, (_, curso_id, _, _) in enumerate(filas):
+            por_curso[curso_id].append(indice)
+
+        return [
+            AnalisisComentariosService._resumir(
+                periodo, docente_id, curso_id, indices, filas, tokens, grupos
+            )
+            for curso_id, indices in [(None, list(range(len(filas)))), *por_curso.items()]
+        ]
+
+    @staticmethod
+    def _resumir(
+        periodo: Optional[PeriodoEvaluacion],
+        docente_id,
+        curso_id,
+        indices: List[int],
+        filas: List,
+        tokens: List[List[str]],
+        grupos: List[int],
+    ) -> ResumenComentarios:
+        """Resumen de los comentarios indicados (en orden, del más reciente)."""
+        conteo_palabras = Counter()
+        conteo_frases = Counter()
+        miembros = defaultdict(list)
+        for indice in indices:
+            conteo_palabras.update(palabras_clave(tokens[indice]))
+            conteo_frases.update(frases(tokens[indice]))
+            miembros[grupos[indice]].append(indice)
+
+        def mas_frecuentes(conteo, cantidad, minimo=1):
+            return [
+                [elemento, total]
+                for elemento, total in sorted(conteo.items(), key=lambda e: (-e[1], e[0]))
+                if total >= minimo
+            ][:cantidad]
+
+        # Cada grupo se representa por su comentario más reciente
+        representantes = [grupo[0] for grupo in miembros.values()]
+        repetidos = sorted(
+            (grupo for grupo in miembros.values() if len(grupo) > 1),
+            key=lambda grupo: (-len(grupo), grupo[0]),
+        )
+        return ResumenComentarios(
+            periodo=periodo,
+            docente_id=docente_id,
+            curso_id=curso_id,
+            comentarios=len(indices),
+            duplicados=len(indices) - len(representantes),
+            palabras=mas_frecuentes(conteo_palabras, AnalisisComentariosService.PALABRAS),
+            frases=mas_frecuentes(
+                conteo_frases,
+                AnalisisComentariosService.FRASES,
+                AnalisisComentariosService.MIN_FRASE,
+            ),
+            grupos_duplicados=[
+                {"texto": filas[grupo[0]][2], "total": len(grupo)}
+                for grupo in repetidos[: AnalisisComentariosService.GRUPOS]
+            ],
+            recientes=[
+                {"texto": filas[indice][2], "fecha": filas[indice][3].isoformat()}
+                for indice in sorted(representantes)[: AnalisisComentariosService.RECIENTES]
+            ],
+        )
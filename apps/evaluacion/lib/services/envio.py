@@ -0,0 +1,161 @@
+"""
+Servicio para registrar el envío de una evaluación y sus respuestas.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from django.db import transaction
+from apps.alumnos.models import Estudiante
+from apps.core.models import Curso
+from apps.docentes.models import Docente
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion, Respuesta
+from apps.evaluacion.lib.services.resumen import ResumenService
+from apps.evaluacion.lib.services.invalidacion import InvalidacionService
+
+
+class EnvioEvaluacionService:
+    """Servicio para validar y guardar en bloque las respuestas de una evaluación."""
+
+    # Mapeo de valores numéricos a texto descriptivo
+    CRITERIO_TEXTO = {
+        1: "Muy Deficiente",
+        2: "Deficiente",
+        3: "Regular",
+        4: "Bueno",
+        5: "Excelente",
+    }
+
+    @staticmethod
+    def leer_puntuaciones(
+        datos: Mapping, preguntas_ids: Iterable
+    ) -> Tuple[Dict, List[str]]:
+        """
+        Lee y valida las puntuaciones enviadas para cada pregunta.
+
+        Args:
+            datos: Datos del formulario (request.POST)
+            preguntas_ids: IDs de las preguntas del cuestionario
+
+        Returns:
+            Tupla con ({pregunta_id: puntuacion}, lista de errores)
+        """
+        puntuaciones = {}
+        errores = []
+
+        for pregunta_id in preguntas_ids:
+            valor = datos.get(f"pregunta_{pregunta_id}")
+            if not valor:
+                continue
+
+            try:
+                puntuacion = int(valor)
+            except (TypeError, ValueError):
+                puntuacion = None
+
+            if puntuacion not in EnvioEvaluacionService.CRITERIO_TEXTO:
+                errores.append(f"Puntuación no válida para una pregunta: {valor}")
+                continue
+
+            puntuaciones[pregunta_id] = puntuacion
+
+        return puntuaciones, errores
+
+    @staticmethod
+    def registrar(
+        alumno: Estudiante,
+        curso: Curso,
+        docente: Docente,
+        comentario_general: str,
+        puntuaciones: Dict,
+        periodo: Optional[PeriodoEvaluacion] = None,
+    ) -> Dict:
+        """
+        Guarda la evaluación y todas sus respuestas en una sola transacción.
+
+        Las respuestas nuevas se insertan con bulk_create y las que cambian de
+        puntuación con bulk_update, por lo que el número de consultas no
+        depende de la cantidad de preguntas.
+
+        Args:
+            alumno: Estudiante que envía la evaluación
+            curso: Curso evaluado
+            docente: Docente evaluado
+            comentario_general: Comentario general de la evaluación
+            puntuaciones: Diccionario {pregunta_id: puntuacion} ya validado
+            periodo: Periodo activo; si el alumno ya evaluó el curso en este
+                periodo se actualiza esa evaluación, si no se crea una nueva
+
+        Returns:
+            Diccionario con la evaluación y los conteos de respuestas
+            creadas, actualizadas y sin cambios
+        """
+        with transaction.atomic():
+            # Crear o obtener la evaluación del curso en el periodo: una
+            # evaluación de un periodo anterior no se modifica
+            evaluacion, creada = Evaluacion.objects.get_or_create(
+                estudiante=alumno,
+                curso=curso,
+                periodo=periodo,
+                defaults={
+                    "docente": docente,
+                    "estado": "enviada",
+                    "comentario_general": comentario_general,
+                },
+            )
+
+            # Si la evaluación ya existía, actualizar el comentario general
+            if not creada:
+                evaluacion.comentario_general = comentario_general
+                evaluacion.save(update_fields=["comentario_general"])
+
+            existentes = {}
+            if not creada:
+                existentes = {
+                    respuesta.pregunta_id: respuesta
+                    for respuesta in evaluacion.respuestas.select_for_update().filter(
+                        pregunta_id__in=puntuaciones.keys()
+                    )
+                }
+
+            nuevas = []
+            modificadas = []
+            cambios = []
+            for pregunta_id, puntuacion in puntuaciones.items():
+                criterio = EnvioEvaluacionService.CRITERIO_TEXTO[puntuacion]
+                respuesta = existentes.get(pregunta_id)
+
+                if respuesta is None:
+                    nuevas.append(
+                        Respuesta(
+                            evaluacion=evaluacion,
+                            pregunta_id=pregunta_id,
+                            criterio=criterio,
+                            puntuacion=puntuacion,
+                        )
+                    )
+                    cambios.append((pregunta_id, None, puntuacion))
+                elif respuesta.puntuacion != puntuacion:
+                    cambios.append((pregunta_id, respuesta.puntuacion, puntuacion))
+                    respuesta.criterio = criterio
+                    respuesta.puntuacion = puntuacion
+                    modificadas.append(respuesta)
+
+            Respuesta.objects.bulk_create(nuevas)
+            Respuesta.objects.bulk_update(modificadas, ["criterio", "puntuacion"])
+
+            # Actualizar el acumulado de puntuaciones y los totales de los reportes
+            ResumenService.aplicar_cambios(evaluacion, cambios, evaluacion_nueva=creada)
+
+            # Invalidar reportes y cifras del periodo cuando se confirme el envío
+            if creada or cambios:
+                periodo_id = evaluacion.periodo_id
+                transaction.on_commit(
+                    lambda: InvalidacionService.evaluacion_enviada(periodo_id)
+                )
+
+        return {
+            "evaluacion": evaluacion,
+            "evaluacion_creada": creada,
+            "creadas": len(nuevas),
+            "actualizadas": len(modificadas),
+            "sin_cambios": len(puntuaciones) - len(nuevas) - len(modificadas),
+        }
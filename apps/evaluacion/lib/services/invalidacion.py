@@ -0,0 +1,61 @@
+"""
+Servicio con los puntos de invalidación de la caché de evaluaciones y reportes.
+"""
+
+from typing import Optional
+from apps.core.lib.services.cache import CacheService
+from apps.evaluacion.lib.services.catalogo import CatalogoPreguntasService
+
+
+class InvalidacionService:
+    """Servicio para invalidar la caché cuando cambian evaluaciones o preguntas."""
+
+    # Reportes y estadísticas globales (todos los periodos)
+    NAMESPACE_REPORTES = "reportes"
+
+    # Tiempo de vida de lo guardado en namespace_para: cada envío invalida el
+    # espacio del periodo y el de reportes; el tiempo de vida solo acota las
+    # cargas masivas, que no invalidan los periodos
+    TIMEOUT_PERIODO = 5 * 60
+
+    @staticmethod
+    def namespace_para(periodo_id=None) -> str:
+        """
+        Espacio de caché de los datos de un periodo o de todos los periodos.
+
+        Args:
+            periodo_id: ID del periodo (si es None, todos los periodos)
+
+        Returns:
+            Espacio que invalida evaluacion_enviada al enviar en ese periodo
+        """
+        if periodo_id is None:
+            return InvalidacionService.NAMESPACE_REPORTES
+        return CacheService.namespace_periodo(periodo_id)
+
+    @staticmethod
+    def evaluacion_enviada(periodo_id: Optional[str] = None) -> None:
+        """
+        Invalida los reportes y las cifras del periodo tras enviar una evaluación.
+
+        Args:
+            periodo_id: ID del periodo de la evaluación (puede ser None)
+        """
+        CacheService.invalidar(InvalidacionService.NAMESPACE_REPORTES)
+        if periodo_id is not None:
+            CacheService.invalidar(CacheService.namespace_periodo(periodo_id))
+
+    @staticmethod
+    def cuestionario_modificado() -> None:
+        """Invalida el catálogo de preguntas y los reportes que lo usan."""
+        CatalogoPreguntasService.invalidar()
+        CacheService.invalidar(InvalidacionService.NAMESPACE_REPORTES)
+
+    @staticmethod
+    def datos_regenerados() -> None:
+        """
+        Invalida el catálogo y los reportes tras cargas o reversiones masivas.
+
+        Las cifras por periodo vencen solas por su tiempo de vida corto.
+        """
+        InvalidacionService.cuestionario_modificado()
@@ -0,0 +1,408 @@
+"""
+Servicio para mantener y consultar el acumulado de puntuaciones.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from apps.core.models import Curso
+from apps.docentes.models import Docente
+from apps.evaluacion.models import (
+    Evaluacion,
+    PeriodoEvaluacion,
+    Respuesta,
+    ResumenPuntuacion,
+    ResumenReporte,
+)
+
+
+CAMPOS_CONTEO = [f"conteo_{i}" for i in range(1, 6)]
+
+
+class ResumenService:
+    """
+    Servicio para el acumulado de puntuaciones por docente, curso y pregunta.
+
+    Mantiene también los totales por docente y por curso (ResumenReporte)
+    con los que se ordenan y paginan las tablas de reportes.
+    """
+
+    @staticmethod
+    def aplicar_cambios(
+        evaluacion: Evaluacion, cambios: List[Tuple], evaluacion_nueva: bool = False
+    ) -> None:
+        """
+        Aplica al acumulado las respuestas creadas o modificadas de una evaluación.
+
+        También actualiza los totales de las tablas de reportes del docente y
+        del curso, en el periodo y en la fila de todos los periodos.
+
+        Args:
+            evaluacion: Evaluación a la que pertenecen las respuestas
+            cambios: Lista de tuplas (pregunta_id, puntuacion_anterior, puntuacion_nueva);
+                puntuacion_anterior es None para respuestas nuevas
+            evaluacion_nueva: Si la evaluación se acaba de crear (cuenta en el
+                total de evaluaciones aunque no tenga respuestas)
+        """
+        if evaluacion.estado != "enviada" or not evaluacion.docente_id:
+            return
+        if not cambios and not evaluacion_nueva:
+            return
+
+        with transaction.atomic():
+            if cambios:
+                ResumenService._aplicar_puntuaciones(evaluacion, cambios)
+            ResumenService._aplicar_reportes(evaluacion, cambios, evaluacion_nueva)
+
+    @staticmethod
+    def _aplicar_puntuaciones(evaluacion: Evaluacion, cambios: List[Tuple]) -> None:
+        claves = {
+            "periodo_id": evaluacion.periodo_id,
+            "docente_id": evaluacion.docente_id,
+            "curso_id": evaluacion.curso_id,
+        }
+        preguntas_ids = {pregunta_id for pregunta_id, _, _ in cambios}
+
+        filas = {
+            fila.pregunta_id: fila
+            for fila in ResumenPuntuacion.objects.select_for_update().filter(
+                pregunta_id__in=preguntas_ids, **claves
+            )
+        }
+
+        # Crear las filas que aún no existen y bloquearlas
+        faltantes = preguntas_ids - filas.keys()
+        if faltantes:
+            ResumenPuntuacion.objects.bulk_create(
+                [
+                    ResumenPuntuacion(pregunta_id=pregunta_id, **claves)
+                    for pregunta_id in faltantes
+                ],
+                ignore_conflicts=True,
+            )
+            filas.update(
+                {
+                    fila.pregunta_id: fila
+                    for fila in ResumenPuntuacion.objects.select_for_update().filter(
+                        pregunta_id__in=faltantes, **claves
+                    )
+                }
+            )
+
+        for pregunta_id, anterior, nueva in cambios:
+            fila = filas[pregunta_id]
+            if anterior is not None:
+                fila.suma -= anterior
+                fila.total -= 1
+                campo = f"conteo_{anterior}"
+                setattr(fila, campo, getattr(fila, campo) - 1)
+            fila.suma += nueva
+            fila.total += 1
+            campo = f"conteo_{nueva}"
+            setattr(fila, campo, getattr(fila, campo) + 1)
+
+        ResumenPuntuacion.objects.bulk_update(
+            filas.values(), ["suma", "total"] + CAMPOS_CONTEO
+        )
+
+    @staticmethod
+    def _aplicar_reportes(
+        evaluacion: Evaluacion, cambios: List[Tuple], evaluacion_nueva: bool
+    ) -> None:
+        # Las filas se crean en cero con el docente, el curso o el periodo;
+        # por si faltan, se crean aquí sin chocar con las existentes
+        periodos = [None] if evaluacion.periodo_id is None else [evaluacion.periodo_id, None]
+        ResumenReporte.objects.bulk_create(
+            [
+                ResumenReporte(periodo_id=periodo_id, **grupo)
+                for periodo_id in periodos
+                for grupo in (
+                    {"docente_id": evaluacion.docente_id},
+                    {"curso_id": evaluacion.curso_id},
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+        # Un solo UPDATE con los incrementos: el promedio se calcula con los
+        # valores nuevos, igual que en reconstruir_reportes
+        suma = F("suma") + sum(nueva - (anterior or 0) for _, anterior, nueva in cambios)
+        respuestas = F("respuestas") + sum(
+            1 for _, anterior, _ in cambios if anterior is None
+        )
+        ResumenReporte.objects.filter(
+            Q(docente_id=evaluacion.docente_id) | Q(curso_id=evaluacion.curso_id),
+            Q(periodo_id=evaluacion.periodo_id) | Q(periodo__isnull=True),
+        ).update(
+            suma=suma,
+            respuestas=respuestas,
+            evaluaciones=F("evaluaciones") + int(evaluacion_nueva),
+            promedio=Coalesce(
+                Cast(suma, FloatField()) / NullIf(respuestas, 0),
+                Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+
+    @staticmethod
+    def reconstruir(periodo: Optional[PeriodoEvaluacion] = None) -> int:
+        """
+        Reconstruye el acumulado a partir de las respuestas existentes.
+
+        Después reconstruye todos los totales de las tablas de reportes, que
+        incluyen la fila de todos los periodos.
+
+        Args:
+            periodo: Periodo a reconstruir (si es None, reconstruye todo)
+
+        Returns:
+            Número de filas de acumulado creadas
+        """
+        respuestas = Respuesta.objects.filter(
+            evaluacion__estado="enviada",
+            evaluacion__docente__isnull=False,
+            pregunta__isnull=False,
+        )
+        if periodo:
+            respuestas = respuestas.filter(evaluacion__periodo=periodo)
+
+        filas = (
+            respuestas.values(
+                "evaluacion__periodo",
+                "evaluacion__docente",
+                "evaluacion__curso",
+                "pregunta",
+            )
+            .annotate(
+                suma=Sum("puntuacion"),
+                total=Count("id"),
+                **{
+                    f"conteo_{i}": Count("id", filter=Q(puntuacion=i))
+                    for i in range(1, 6)
+                },
+            )
+            .order_by()
+        )
+
+        acumulado = [
+            ResumenPuntuacion(
+                periodo_id=fila["evaluacion__periodo"],
+                docente_id=fila["evaluacion__docente"],
+                curso_id=fila["evaluacion__curso"],
+                pregunta_id=fila["pregunta"],
+                **{campo: fila[campo] for campo in ["suma", "total"] + CAMPOS_CONTEO},
+            )
+            for fila in filas.iterator(chunk_size=2000)
+        ]
+
+        with transaction.atomic():
+            existentes = ResumenPuntuacion.objects.all()
+            if periodo:
+                existentes = existentes.filter(periodo=periodo)
+            existentes.delete()
+            ResumenPuntuacion.objects.bulk_create(acumulado, batch_size=1000)
+            ResumenService.reconstruir_reportes()
+
+        return len(acumulado)
+
+    @staticmethod
+    def reconstruir_reportes() -> int:
+        """
+        Reconstruye los totales de las tablas de reportes desde el acumulado.
+
+        Hay una fila por docente y por curso en cada periodo y otra para
+        todos los periodos, aunque no tengan evaluaciones, para que las
+        tablas los listen a todos. Las respuestas salen del acumulado de
+        puntuaciones y las evaluaciones de las enviadas con docente.
+
+        Returns:
+            Número de filas creadas
+        """
+        periodos = [None, *PeriodoEvaluacion.objects.values_list("pk", flat=True)]
+        totales = {}
+        for grupo, modelo in (("docente", Docente), ("curso", Curso)):
+            for objeto_id in modelo.objects.values_list("pk", flat=True).iterator():
+                for periodo_id in periodos:
+                    totales[(grupo, objeto_id, periodo_id)] = {
+                        "suma": 0,
+                        "respuestas": 0,
+                        "evaluaciones": 0,
+                    }
+
+            filas = [
+                (fila, "suma", "respuestas")
+                for fila in ResumenPuntuacion.objects.values(grupo, "periodo")
+                .annotate(suma=Sum("suma"), respuestas=Sum("total"))
+                .order_by()
+            ] + [
+                (fila, "evaluaciones")
+                for fila in Evaluacion.objects.filter(
+                    estado="enviada", docente__isnull=False
+                )
+                .values(grupo, "periodo")
+                .annotate(evaluaciones=Count("id"))
+                .order_by()
+            ]
+            for fila, *campos in filas:
+                # Cada fila suma a su periodo y a la de todos los periodos
+                for periodo_id in {fila["periodo"], None}:
+                    total = totales[(grupo, fila[grupo], periodo_id)]
+                    for campo in campos:
+                        total[campo] += fila[campo]
+
+        reportes = [
+            ResumenReporte(
+                periodo_id=periodo_id,
+                **{f"{grupo}_id": objeto_id},
+                **total,
+                promedio=(
+                    total["suma"] / total["respuestas"] if total["respuestas"] else 0
+                ),
+            )
+            for (grupo, objeto_id, periodo_id), total in totales.items()
+        ]
+
+        with transaction.atomic():
+            ResumenReporte.objects.all().delete()
+            ResumenReporte.objects.bulk_create(reportes, batch_size=1000)
+
+        return len(reportes)
+
+    @staticmethod
+    def crear_filas_reporte(
+        docentes: Optional[Iterable] = None,
+        cursos: Optional[Iterable] = None,
+        periodos: Optional[Iterable] = None,
+    ) -> None:
+        """
+        Crea en cero las filas de las tablas de reportes que falten.
+
+        Args:
+            docentes: IDs de docentes (si es None, todos)
+            cursos: IDs de cursos (si es None, todos)
+            periodos: IDs de periodos (si es None, todos más la fila de
+                todos los periodos)
+        """
+        if docentes is None:
+            docentes = Docente.objects.values_list("pk", flat=True)
+        if cursos is None:
+            cursos = Curso.objects.values_list("pk", flat=True)
+        if periodos is None:
+            periodos = [None, *PeriodoEvaluacion.objects.values_list("pk", flat=True)]
+        periodos = list(periodos)
+
+        ResumenReporte.objects.bulk_create(
+            [
+                ResumenReporte(periodo_id=periodo_id, docente_id=docente_id)
+                for docente_id in docentes
+                for periodo_id in periodos
+            ]
+            + [
+                ResumenReporte(periodo_id=periodo_id, curso_id=curso_id)
+                for curso_id in cursos
+                for periodo_id in periodos
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def _expresion_promedio():
+        return Cast(Sum("suma"), FloatField()) / Sum("total")
+
+    @staticmethod
+    def get_promedios(agrupar_por: Tuple[str, ...], **filtros) -> Dict:
+        """
+        Obtiene promedio y número de respuestas agrupados por los campos indicados.
+
+        Args:
+            agrupar_por: Campos del acumulado por los que agrupar (ej. ("curso",))
+            **filtros: Filtros adicionales sobre el acumulado
+
+        Returns:
+            Diccionario {clave: {"promedio": float, "total": int}}; la clave es el
+            valor del campo si se agrupa por uno solo o una tupla en otro caso
+        """
+        filas = (
+            ResumenPuntuacion.objects.filter(total__gt=0, **filtros)
+            .values(*agrupar_por)
+            .annotate(
+                promedio=ResumenService._expresion_promedio(), respuestas=Sum("total")
+            )
+            .order_by()
+        )
+
+        resultado = {}
+        for fila in filas:
+            if len(agrupar_por) == 1:
+                clave = fila[agrupar_por[0]]
+            else:
+                clave = tuple(fila[campo] for campo in agrupar_por)
+            resultado[clave] = {
+                "promedio": fila["promedio"],
+                "total": fila["respuestas"],
+            }
+        return resultado
+
+    @staticmethod
+    def get_ranking(campo: str, limite: int = 5, **filtros) -> List[Dict]:
+        """
+        Obtiene los mejores promedios agrupados por un campo.
+
+        Args:
+            campo: Campo por el que agrupar ("docente" o "curso")
+            limite: Número máximo de resultados
+            **filtros: Filtros adicionales sobre el acumulado
+
+        Returns:
+            Lista de diccionarios con el campo y su promedio, de mayor a menor
+        """
+        return list(
+            ResumenPuntuacion.objects.filter(total__gt=0, **filtros)
+            .values(campo)
+            .annotate(promedio=ResumenService._expresion_promedio())
+            .order_by("-promedio")[:limite]
+        )
+
+    @staticmethod
+    def get_promedio_general(**filtros) -> float:
+        """
+        Obtiene el promedio de todas las respuestas acumuladas.
+
+        Args:
+            **filtros: Filtros adicionales sobre el acumulado
+
+        Returns:
+            Promedio general (0 si no hay respuestas)
+        """
+        totales = ResumenPuntuacion.objects.filter(**filtros).aggregate(
+            suma=Sum("suma"), total=Sum("total")
+        )
+        if not totales["total"]:
+            return 0
+        return totales["suma"] / totales["total"]
+
+    @staticmethod
+    def get_distribucion(**filtros) -> List[Dict]:
+        """
+        Obtiene la distribución de puntuaciones de 1 a 5.
+
+        Args:
+            **filtros: Filtros adicionales sobre el acumulado
+
+        Returns:
+            Lista de diccionarios con puntuación y total de respuestas
+        """
+        conteos = ResumenPuntuacion.objects.filter(**filtros).aggregate(
+            **{campo: Sum(campo) for campo in CAMPOS_CONTEO}
+        )
+        return [
+            {
+                "puntuacion": i,
+                "calificacion": i,
+                "total": conteos[f"conteo_{i}"],
+            }
+            for i in range(1, 6)
+            if conteos[f"conteo_{i}"]
+        ]
@@ -0,0 +1,97 @@
+"""
+Servicio para obtener en bloque las cifras del panel de un periodo.
+"""
+
+from typing import Dict
+from django.db.models import Count, F, Func, IntegerField, Q, Subquery
+from apps.alumnos.models import Estudiante
+from apps.comision.lib.services.cobertura import CoberturaService
+from apps.core.lib.services.cache import CacheService
+from apps.docentes.models import Docente
+from apps.evaluacion.models import PeriodoEvaluacion
+
+
+class PeriodoSnapshotService:
+    """Servicio para calcular y guardar en caché el resumen de un periodo."""
+
+    CAMPOS = (
+        "evaluaciones_completadas",
+        "estudiantes_participantes",
+        "docentes_evaluados",
+        "total_estudiantes",
+        "total_docentes",
+    )
+
+    # Vida corta: además de invalidarse con el periodo en cada envío, las
+    # altas de estudiantes o docentes se reflejan en poco tiempo
+    TIMEOUT = 60
+
+    @staticmethod
+    def get_snapshot(periodo: PeriodoEvaluacion) -> Dict:
+        """
+        Obtiene las cifras del panel de un periodo desde caché.
+
+        Args:
+            periodo: Instancia del periodo de evaluación
+
+        Returns:
+            Diccionario con total_estudiantes, total_docentes,
+            evaluaciones_completadas, estudiantes_participantes,
+            docentes_evaluados y progreso
+        """
+        return CacheService.get_or_set(
+            CacheService.namespace_periodo(periodo.pk),
+            "snapshot",
+            lambda: PeriodoSnapshotService.calcular(periodo),
+            PeriodoSnapshotService.TIMEOUT,
+        )
+
+    @staticmethod
+    def calcular(periodo: PeriodoEvaluacion) -> Dict:
+        """
+        Calcula las cifras del panel de un periodo con dos consultas.
+
+        Los conteos de evaluaciones se agregan sobre el periodo y los totales
+        de estudiantes y docentes se obtienen como subconsultas escalares. El
+        progreso es la cobertura de las matrículas activas de CoberturaService,
+        el mismo porcentaje que muestra la página de cobertura.
+
+        Args:
+            periodo: Instancia del periodo de evaluación
+
+        Returns:
+            Diccionario con las cifras del periodo (ver get_snapshot)
+        """
+        enviadas = Q(evaluaciones__estado="enviada")
+        snapshot = (
+            PeriodoEvaluacion.objects.filter(pk=periodo.pk)
+            .annotate(
+                evaluaciones_completadas=Count("evaluaciones", filter=enviadas),
+                estudiantes_participantes=Count(
+                    "evaluaciones__estudiante", filter=enviadas, distinct=True
+                ),
+                docentes_evaluados=Count(
+                    "evaluaciones__docente", filter=enviadas, distinct=True
+                ),
+                total_estudiantes=PeriodoSnapshotService._contar(Estudiante),
+                total_docentes=PeriodoSnapshotService._contar(Docente),
+            )
+            .values(*PeriodoSnapshotService.CAMPOS)
+            .first()
+        )
+        if snapshot is None:
+            snapshot = dict.fromkeys(PeriodoSnapshotService.CAMPOS, 0)
+
+        snapshot["progreso"] = CoberturaService.get_resumen(periodo)["porcentaje"]
+        return snapshot
+
+    @staticmethod
+    def _contar(modelo) -> Subquery:
+        # COUNT(*) escalar de toda la tabla, sin GROUP BY
+        return Subquery(
+            modelo.objects.order_by()
+            .annotate(
+                total=Func(F("pk"), function="COUNT", output_field=IntegerField())
+            )
+            .values("total")
+        )
@@ -0,0 +1,310 @@
+"""
+Servicio para calcular y consultar las tendencias de puntuación entre periodos cerrados.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, List, Optional
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from apps.core.lib.services.cache import CacheService
+from apps.evaluacion.models import (
+    Evaluacion,
+    PeriodoEvaluacion,
+    ResumenPuntuacion,
+    TendenciaPeriodo,
+)
+
+
+class TendenciaService:
+    """
+    Servicio para las cifras por periodo de cada docente, curso y módulo.
+
+    Las cifras se calculan en bloque cuando un periodo se cierra, a partir
+    del acumulado de puntuaciones y de las tendencias de los periodos
+    anteriores; las series se leen solo de TendenciaPeriodo.
+    """
+
+    NAMESPACE = "tendencias"
+
+    # Periodos cerrados que promedia la media móvil, incluido el actual
+    VENTANA_MEDIA_MOVIL = 3
+
+    # Campos de cada punto de una serie
+    CAMPOS_SERIE = (
+        "periodo",
+        "periodo__nombre",
+        "fecha_inicio",
+        "promedio",
+        "delta",
+        "media_movil",
+        "percentil",
+        "evaluaciones",
+    )
+
+    @staticmethod
+    def actualizar(periodo: PeriodoEvaluacion) -> int:
+        """
+        Recalcula un periodo y los periodos cerrados posteriores, que dependen de él.
+
+        Args:
+            periodo: Periodo que se cerró (o se reabrió)
+
+        Returns:
+            Número de filas de tendencia creadas
+        """
+        filas = TendenciaService.calcular_periodo(periodo)
+        posteriores = PeriodoEvaluacion.objects.filter(
+            estado="cerrado", fecha_inicio__gt=periodo.fecha_inicio
+        ).order_by("fecha_inicio")
+        for posterior in posteriores:
+            filas += TendenciaService.calcular_periodo(posterior)
+        return filas
+
+    @staticmethod
+    def reconstruir() -> int:
+        """
+        Recalcula las tendencias de todos los periodos cerrados, del más antiguo al más reciente.
+
+        Returns:
+            Número de filas de tendencia creadas
+        """
+        with transaction.atomic():
+            TendenciaPeriodo.objects.exclude(periodo__estado="cerrado").delete()
+            filas = 0
+            for periodo in PeriodoEvaluacion.objects.filter(estado="cerrado").order_by(
+                "fecha_inicio"
+            ):
+                filas += TendenciaService.calcular_periodo(periodo)
+        return filas
+
+    @staticmethod
+    def calcular_periodo(periodo: PeriodoEvaluacion) -> int:
+        """
+        Calcula las cifras de un periodo cerrado por docente, curso y módulo.
+
+        Por cada docente se guardan cuatro niveles: curso y módulo, solo
+        curso, solo módulo y total. Un periodo que no está cerrado queda
+        sin tendencias.
+
+        Args:
+            periodo: Instancia del periodo de evaluación
+
+        Returns:
+            Número de filas de tendencia creadas
+        """
+        tendencias = []
+        if periodo.estado == "cerrado":
+            acumulado = TendenciaService._agrupar(periodo)
+            anteriores = TendenciaService._get_anteriores(periodo)
+            for clave, datos in acumulado.items():
+                docente_id, curso_id, modulo_id = clave
+                promedio = datos["suma"] / datos["respuestas"]
+                historial = [
+                    promedios[clave] for promedios in anteriores if clave in promedios
+                ]
+                # El periodo anterior es el primero de la lista
+                delta = (
+                    promedio - anteriores[0][clave]
+                    if anteriores and clave in anteriores[0]
+                    else None
+                )
+                tendencias.append(
+                    TendenciaPeriodo(
+                        periodo=periodo,
+                        docente_id=docente_id,
+                        curso_id=curso_id,
+                        modulo_id=modulo_id,
+                        fecha_inicio=periodo.fecha_inicio,
+                        evaluaciones=datos["evaluaciones"],
+                        respuestas=datos["respuestas"],
+                        suma=datos["suma"],
+                        promedio=promedio,
+                        delta=delta,
+                        media_movil=(promedio + sum(historial)) / (len(historial) + 1),
+                        percentil=0,
+                    )
+                )
+            TendenciaService._asignar_percentiles(tendencias)
+
+        with transaction.atomic():
+            TendenciaPeriodo.objects.filter(periodo=periodo).delete()
+            TendenciaPeriodo.objects.bulk_create(tendencias, batch_size=1000)
+        CacheService.invalidar(TendenciaService.NAMESPACE)
+        return len(tendencias)
+
+    @staticmethod
+    def _agrupar(periodo: PeriodoEvaluacion) -> Dict:
+        """Suma y respuestas por (docente, curso, módulo) en los cuatro niveles."""
+        acumulado = defaultdict(lambda: {"suma": 0, "respuestas": 0, "evaluaciones": 0})
+
+        filas = (
+            ResumenPuntuacion.objects.filter(periodo=periodo, total__gt=0)
+            .values("docente", "curso", "pregunta__id_modulo")
+            .annotate(suma_total=Sum("suma"), respuestas=Sum("total"))
+            .order_by()
+        )
+        for fila in filas:
+            docente_id, curso_id = fila["docente"], fila["curso"]
+            modulo_id = fila["pregunta__id_modulo"]
+            for clave in (
+                (docente_id, curso_id, modulo_id),
+                (docente_id, curso_id, None),
+                (docente_id, None, modulo_id),
+                (docente_id, None, None),
+            ):
+                acumulado[clave]["suma"] += fila["suma_total"]
+                acumulado[clave]["respuestas"] += fila["respuestas"]
+
+        # Cada evaluación responde todos los módulos: el número de
+        # evaluaciones de un módulo es el de su curso (o del docente)
+        evaluaciones = (
+            Evaluacion.objects.filter(
+                periodo=periodo, estado="enviada", docente__isnull=False
+            )
+            .values("docente", "curso")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        por_curso = defaultdict(int)
+        for fila in evaluaciones:
+            por_curso[(fila["docente"], fila["curso"])] += fila["total"]
+            por_curso[(fila["docente"], None)] += fila["total"]
+
+        for (docente_id, curso_id, _), datos in acumulado.items():
+            datos["evaluaciones"] = por_curso.get((docente_id, curso_id), 0)
+        return acumulado
+
+    @staticmethod
+    def _get_anteriores(periodo: PeriodoEvaluacion) -> List[Dict]:
+        """
+        Promedios de los periodos cerrados anteriores dentro de la ventana.
+
+        Returns:
+            Lista del más reciente al más antiguo de {(docente, curso, módulo): promedio}
+        """
+        periodos = list(
+            PeriodoEvaluacion.objects.filter(
+                estado="cerrado", fecha_inicio__lt=periodo.fecha_inicio
+            )
+            .order_by("-fecha_inicio")
+            .values_list("id", flat=True)[: TendenciaService.VENTANA_MEDIA_MOVIL - 1]
+        )
+        anteriores = {periodo_id: {} for periodo_id in periodos}
+        filas = TendenciaPeriodo.objects.filter(periodo_id__in=periodos).values_list(
+            "periodo", "docente", "curso", "modulo", "promedio"
+        )
+        for periodo_id, docente_id, curso_id, modulo_id, promedio in filas:
+            anteriores[periodo_id][(docente_id, curso_id, modulo_id)] = promedio
+        return [anteriores[periodo_id] for periodo_id in periodos]
+
+    @staticmethod
+    def _asignar_percentiles(tendencias: List[TendenciaPeriodo]) -> None:
+        """
+        Asigna el rango percentil (0-100) de cada fila entre las comparables.
+
+        Se comparan las filas del mismo módulo y nivel: los totales de cada
+        docente entre sí y los de cada curso entre sí. Los empates cuentan
+        la mitad.
+        """
+        grupos = defaultdict(list)
+        for tendencia in tendencias:
+            grupos[(tendencia.modulo_id, tendencia.curso_id is None)].append(tendencia)
+
+        for grupo in grupos.values():
+            promedios = sorted(tendencia.promedio for tendencia in grupo)
+            for tendencia in grupo:
+                menores = bisect_left(promedios, tendencia.promedio)
+                iguales = bisect_right(promedios, tendencia.promedio) - menores
+                tendencia.percentil = round(
+                    100 * (menores + iguales / 2) / len(promedios), 1
+                )
+
+    @staticmethod
+    def get_serie(docente_id, curso_id=None, modulo_id=None) -> List[Dict]:
+        """
+        Obtiene desde caché la serie de periodos cerrados de un docente.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            curso_id: ID del curso (si es None, todos los cursos)
+            modulo_id: ID del módulo (si es None, todos los módulos)
+
+        Returns:
+            Lista ordenada por periodo de diccionarios con periodo, fecha_inicio,
+            promedio, delta, media_movil, percentil y evaluaciones
+        """
+        return CacheService.get_or_set(
+            TendenciaService.NAMESPACE,
+            f"serie:{docente_id}:{curso_id or 'todos'}:{modulo_id or 'todos'}",
+            lambda: list(
+                TendenciaPeriodo.objects.filter(
+                    docente_id=docente_id, curso_id=curso_id, modulo_id=modulo_id
+                )
+                .order_by("fecha_inicio")
+                .values(*TendenciaService.CAMPOS_SERIE)
+            ),
+        )
+
+    @staticmethod
+    def get_series_modulos(docente_id, curso_id=None) -> Dict[str, List[Dict]]:
+        """
+        Obtiene desde caché las series de todos los módulos de un docente.
+
+        Args:
+            docente_id: ID del docente (su usuario)
+            curso_id: ID del curso (si es None, todos los cursos)
+
+        Returns:
+            Diccionario {nombre del módulo: serie} con el formato de get_serie
+        """
+
+        def calcular():
+            series = defaultdict(list)
+            filas = (
+                TendenciaPeriodo.objects.filter(
+                    docente_id=docente_id, curso_id=curso_id, modulo__isnull=False
+                )
+                .order_by("modulo__nombre", "fecha_inicio")
+                .values("modulo__nombre", *TendenciaService.CAMPOS_SERIE)
+            )
+            for fila in filas:
+                series[fila.pop("modulo__nombre")].append(fila)
+            return dict(series)
+
+        return CacheService.get_or_set(
+            TendenciaService.NAMESPACE,
+            f"series_modulos:{docente_id}:{curso_id or 'todos'}",
+            calcular,
+        )
+
+    @staticmethod
+    def get_docentes(periodo: Optional[PeriodoEvaluacion] = None) -> List[Dict]:
+        """
+        Obtiene los docentes con tendencias y su última posición.
+
+        Args:
+            periodo: Periodo cerrado a consultar (por defecto, el más reciente
+                con tendencias)
+
+        Returns:
+            Lista de diccionarios con docente, nombre, promedio, delta y
+            percentil, de mayor a menor percentil
+        """
+        if periodo is None:
+            periodo = (
+                PeriodoEvaluacion.objects.filter(tendencias__isnull=False)
+                .order_by("-fecha_inicio")
+                .first()
+            )
+            if periodo is None:
+                return []
+
+        return list(
+            TendenciaPeriodo.objects.filter(
+                periodo=periodo, curso__isnull=True, modulo__isnull=True
+            )
+            .annotate(nombre=F("docente__usuario__nombre"))
+            .order_by("-percentil", "nombre")
+            .values("docente", "nombre", "promedio", "delta", "percentil")
+        )
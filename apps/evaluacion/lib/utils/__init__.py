@@ -0,0 +1 @@
+# Utils package for helper functions
@@ -0,0 +1,153 @@
+"""
+Utilidades para normalizar y analizar textos en español (comentarios y búsqueda).
+"""
+
+import hashlib
+import random
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+
+# Palabras vacías en español, ya normalizadas (minúsculas y sin tildes)
+PALABRAS_VACIAS = frozenset(
+    """
+    a al algo algunas algunos ante antes aqui asi aun cada como con contra cual
+    cuando de del desde donde durante e el ella ellas ellos en entre era eran es
+    esa esas ese eso esos esta estaba estan estar estas este esto estos fue fueron
+    ha hace hacen han hasta hay he la las le les lo los mas me mi mis mucho muchos
+    muy ni no nos nosotros nunca o os otra otras otro otros para pero poco por
+    porque que quien quienes se sea ser si sin sobre son su sus tambien tan tanto
+    te tiene tienen todo todos tu tus un una unas uno unos y ya yo
+    """.split()
+)
+
+# Palabras vacías que sí pueden iniciar una frase ("no explica")
+NEGACIONES = frozenset({"no", "nunca", "sin"})
+
+# Módulo de las permutaciones de MinHash (primo de Mersenne 2^61 - 1)
+_PRIMO = (1 << 61) - 1
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """
+    Normaliza un texto para compararlo, indexarlo o buscarlo.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Texto en minúsculas, sin tildes y con los espacios simplificados
+    """
+    descompuesto = unicodedata.normalize("NFKD", (texto or "").lower())
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.split())
+
+
+def tokenizar(texto: Optional[str]) -> List[str]:
+    """Palabras normalizadas del texto, en orden y sin números ni signos."""
+    return re.findall(r"[^\W\d_]+", normalizar(texto))
+
+
+def palabras_clave(tokens: Sequence[str]) -> Set[str]:
+    """Palabras de tres o más letras que no son palabras vacías."""
+    return {
+        token for token in tokens if len(token) > 2 and token not in PALABRAS_VACIAS
+    }
+
+
+def frases(tokens: Sequence[str], tamanos: Iterable[int] = (2, 3)) -> Set[str]:
+    """
+    N-gramas de palabras consecutivas que no empiezan ni terminan en una
+    palabra vacía (salvo las negaciones al inicio).
+    """
+    resultado = set()
+    for n in tamanos:
+        for i in range(len(tokens) - n + 1):
+            primera, ultima = tokens[i], tokens[i + n - 1]
+            if (primera in PALABRAS_VACIAS and primera not in NEGACIONES) or (
+                ultima in PALABRAS_VACIAS
+            ):
+                continue
+            resultado.add(" ".join(tokens[i : i + n]))
+    return resultado
+
+
+def coeficientes_minhash(permutaciones: int, semilla: int = 0) -> List[Tuple[int, int]]:
+    """Coeficientes (a, b) de las permutaciones h(x) = (a·x + b) mod p."""
+    aleatorio = random.Random(semilla)
+    return [
+        (aleatorio.randrange(1, _PRIMO), aleatorio.randrange(0, _PRIMO))
+        for _ in range(permutaciones)
+    ]
+
+
+def firma_minhash(elementos: Iterable[str], coeficientes: Sequence[Tuple[int, int]]) -> Tuple:
+    """
+    Firma MinHash de un conjunto: el mínimo de cada permutación.
+
+    La fracción de posiciones iguales entre dos firmas estima la similitud
+    de Jaccard de los conjuntos.
+
+    Args:
+        elementos: Elementos del conjunto (por ejemplo, pares de palabras)
+        coeficientes: Coeficientes de coeficientes_minhash
+
+    Returns:
+        Tupla con un valor por permutación
+    """
+    valores = [
+        int.from_bytes(hashlib.blake2b(elemento.encode(), digest_size=8).digest(), "big")
+        for elemento in set(elementos)
+    ]
+    return tuple(min((a * x + b) % _PRIMO for x in valores) for a, b in coeficientes)
+
+
+def agrupar_similares(
+    firmas: Sequence[Optional[Tuple]], bandas: int, umbral: float
+) -> List[int]:
+    """
+    Agrupa las firmas MinHash con similitud estimada mayor o igual al umbral.
+
+    Las firmas se dividen en bandas (LSH): solo se comparan las que
+    coinciden por completo en alguna banda, por lo que no se evalúan todos
+    los pares.
+
+    Args:
+        firmas: Firmas de firma_minhash; None para los elementos que no se comparan
+        bandas: Número de bandas en que se divide cada firma
+        umbral: Fracción mínima de posiciones iguales (0 a 1)
+
+    Returns:
+        Para cada elemento, el índice del primer elemento de su grupo
+    """
+    grupo = list(range(len(firmas)))
+
+    def raiz(i):
+        while grupo[i] != i:
+            grupo[i] = grupo[grupo[i]]
+            i = grupo[i]
+        return i
+
+    candidatos = defaultdict(list)
+    for i, firma in enumerate(firmas):
+        if firma is None:
+            continue
+        filas = len(firma) // bandas
+        for banda in range(bandas):
+            candidatos[(banda, firma[banda * filas : (banda + 1) * filas])].append(i)
+
+    comparados = set()
+    for indices in candidatos.values():
+        for posicion, i in enumerate(indices):
+            for j in indices[posicion + 1 :]:
+                if (i, j) in comparados or raiz(i) == raiz(j):
+                    continue
+                comparados.add((i, j))
+                iguales = sum(x == y for x, y in zip(firmas[i], firmas[j]))
+                if iguales >= umbral * len(firmas[i]):
+                    ri, rj = raiz(i), raiz(j)
+                    grupo[max(ri, rj)] = min(ri, rj)
+
+    return [raiz(i) for i in range(len(firmas))]
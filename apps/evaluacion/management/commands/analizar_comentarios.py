@@ -0,0 +1,30 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from apps.evaluacion.models import PeriodoEvaluacion
+from apps.evaluacion.lib.services.comentarios import AnalisisComentariosService
+
+
+class Command(BaseCommand):
+    help = "Analiza los comentarios de las evaluaciones y guarda su resumen por docente y curso"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--periodo",
+            help="ID del periodo a analizar (por defecto, cada periodo y todos los periodos)",
+        )
+
+    def handle(self, *args, **options):
+        if options["periodo"]:
+            try:
+                periodo = PeriodoEvaluacion.objects.get(id=options["periodo"])
+            except (PeriodoEvaluacion.DoesNotExist, ValidationError):
+                raise CommandError(f"Periodo no encontrado: {options['periodo']}")
+            resumenes = AnalisisComentariosService.analizar(periodo)
+            alcance = f"el periodo {periodo.nombre}"
+        else:
+            resumenes = AnalisisComentariosService.analizar_todo()
+            alcance = "todos los periodos"
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Comentarios analizados para {alcance}: {resumenes} resúmenes")
+        )
@@ -0,0 +1,159 @@
+import json
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from apps.core.lib.services.generador_datos import GeneradorDatosService
+from apps.core.models import Matricula
+from apps.evaluacion.models import Evaluacion, Respuesta
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el tiempo y el plan de las consultas principales con y sin los "
+        "índices declarados, sobre datos generados que se descartan al terminar"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--estudiantes", type=int, default=2000)
+        parser.add_argument("--docentes", type=int, default=150)
+        parser.add_argument("--evaluaciones", type=int, default=8000)
+        parser.add_argument("--repeticiones", type=int, default=7)
+        parser.add_argument(
+            "--salida", help="Archivo JSON donde guardar los resultados"
+        )
+
+    def handle(self, *args, **options):
+        # El editor de esquema de SQLite necesita las claves foráneas
+        # desactivadas, y dentro de la transacción ya no se pueden desactivar
+        desactivadas = connection.disable_constraint_checking()
+        try:
+            resultados, datos = self._comparar(options)
+        finally:
+            if desactivadas:
+                connection.enable_constraint_checking()
+
+        if options["salida"]:
+            with open(options["salida"], "w", encoding="utf-8") as archivo:
+                json.dump(
+                    {
+                        "motor": connection.vendor,
+                        "datos": datos,
+                        "resultados": resultados,
+                    },
+                    archivo,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            self.stdout.write(
+                self.style.SUCCESS(f"Resultados guardados en {options['salida']}")
+            )
+
+    def _comparar(self, options):
+        """Mide las consultas con y sin índices sobre datos que se descartan."""
+        with transaction.atomic():
+            datos = GeneradorDatosService.generar(
+                estudiantes=options["estudiantes"],
+                docentes=options["docentes"],
+                evaluaciones=options["evaluaciones"],
+            )
+            self.stdout.write(f"Datos generados: {datos}")
+
+            # Analizar las tablas para que el planificador use estadísticas reales
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            consultas = self._get_consultas()
+            con_indices = self._medir(consultas, options["repeticiones"])
+            self._eliminar_indices()
+            sin_indices = self._medir(consultas, options["repeticiones"])
+
+            # Descartar los datos generados y restaurar los índices
+            transaction.set_rollback(True)
+
+        resultados = []
+        for nombre in consultas:
+            con, sin = con_indices[nombre], sin_indices[nombre]
+            resultados.append(
+                {
+                    "consulta": nombre,
+                    "con_indices_ms": con["ms"],
+                    "sin_indices_ms": sin["ms"],
+                    "mejora": round(sin["ms"] / con["ms"], 2) if con["ms"] else None,
+                    "plan_con_indices": con["plan"],
+                    "plan_sin_indices": sin["plan"],
+                }
+            )
+            self.stdout.write(
+                f"{nombre:<32} con índices: {con['ms']:>8.2f} ms   "
+                f"sin índices: {sin['ms']:>8.2f} ms"
+            )
+        return resultados, datos
+
+    def _get_consultas(self):
+        """Consultas con los mismos filtros que usan las vistas y servicios."""
+        evaluacion = Evaluacion.objects.filter(estado="enviada").first()
+        docentes_ids = list(
+            Evaluacion.objects.values_list("docente", flat=True).distinct()[:12]
+        )
+        evaluaciones_ids = list(
+            Evaluacion.objects.filter(docente=evaluacion.docente_id).values_list(
+                "id", flat=True
+            )[:50]
+        )
+
+        return {
+            "evaluaciones_por_docente": Evaluacion.objects.filter(
+                docente=evaluacion.docente_id, estado="enviada"
+            ),
+            "estudiantes_por_curso_docente": Evaluacion.objects.filter(
+                docente_id__in=docentes_ids, estado="enviada"
+            )
+            .values("curso", "docente")
+            .annotate(total=Count("estudiante", distinct=True))
+            .order_by(),
+            "evaluaciones_curso_docente": Evaluacion.objects.filter(
+                curso=evaluacion.curso_id,
+                docente=evaluacion.docente_id,
+                estado="enviada",
+            ),
+            "evaluaciones_del_estudiante": Evaluacion.objects.filter(
+                estudiante=evaluacion.estudiante_id
+            ),
+            "evaluaciones_recientes": Evaluacion.objects.filter(
+                estado="enviada"
+            ).order_by("-fecha")[:5],
+            "docentes_evaluados_periodo": Evaluacion.objects.filter(
+                periodo=evaluacion.periodo_id, estado="enviada"
+            )
+            .values("docente")
+            .distinct(),
+            "respuestas_de_evaluaciones": Respuesta.objects.filter(
+                evaluacion_id__in=evaluaciones_ids
+            ),
+            "matriculas_activas": Matricula.objects.filter(
+                estudiante=evaluacion.estudiante_id, estado="activa"
+            ).values_list("curso_id", flat=True),
+        }
+
+    def _medir(self, consultas, repeticiones):
+        resultados = {}
+        for nombre, consulta in consultas.items():
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                list(consulta.all())
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados[nombre] = {
+                "ms": round(statistics.median(tiempos), 3),
+                "plan": consulta.explain(),
+            }
+        return resultados
+
+    def _eliminar_indices(self):
+        """Elimina dentro de la transacción los índices declarados en Meta.indexes."""
+        with connection.schema_editor() as editor:
+            for modelo in (Evaluacion, Respuesta, Matricula):
+                for indice in modelo._meta.indexes:
+                    editor.remove_index(modelo, indice)
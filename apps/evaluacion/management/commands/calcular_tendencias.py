@@ -0,0 +1,35 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from apps.evaluacion.models import PeriodoEvaluacion
+from apps.evaluacion.lib.services.tendencias import TendenciaService
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula las tendencias por docente, curso y módulo de los periodos "
+        "cerrados (al cerrar un periodo las calcula el worker de procesar_reportes)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--periodo",
+            help="ID del periodo a calcular, junto con los posteriores (por defecto, todos)",
+        )
+
+    def handle(self, *args, **options):
+        if options["periodo"]:
+            try:
+                periodo = PeriodoEvaluacion.objects.get(id=options["periodo"])
+            except (PeriodoEvaluacion.DoesNotExist, ValidationError):
+                raise CommandError(f"Periodo no encontrado: {options['periodo']}")
+            if periodo.estado != "cerrado":
+                raise CommandError(f"El periodo {periodo.nombre} no está cerrado")
+            filas = TendenciaService.actualizar(periodo)
+            alcance = f"el periodo {periodo.nombre} y los posteriores"
+        else:
+            filas = TendenciaService.reconstruir()
+            alcance = "todos los periodos cerrados"
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Tendencias calculadas para {alcance}: {filas} filas")
+        )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from apps.evaluacion.lib.services.busqueda import BusquedaService
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de docentes, cursos y comentarios"
+
+    def handle(self, *args, **options):
+        documentos = BusquedaService.reconstruir()
+        self.stdout.write(
+            self.style.SUCCESS(f"Índice de búsqueda reconstruido: {documentos} documentos")
+        )
@@ -0,0 +1,32 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from apps.evaluacion.models import PeriodoEvaluacion
+from apps.evaluacion.lib.services.resumen import ResumenService
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el acumulado de puntuaciones a partir de las respuestas "
+        "y los totales de las tablas de reportes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--periodo",
+            help="ID del periodo a reconstruir (por defecto, todos)",
+        )
+
+    def handle(self, *args, **options):
+        periodo = None
+        if options["periodo"]:
+            try:
+                periodo = PeriodoEvaluacion.objects.get(id=options["periodo"])
+            except (PeriodoEvaluacion.DoesNotExist, ValidationError):
+                raise CommandError(f"Periodo no encontrado: {options['periodo']}")
+
+        filas = ResumenService.reconstruir(periodo)
+
+        alcance = f"el periodo {periodo.nombre}" if periodo else "todos los periodos"
+        self.stdout.write(
+            self.style.SUCCESS(f"Acumulado reconstruido para {alcance}: {filas} filas")
+        )
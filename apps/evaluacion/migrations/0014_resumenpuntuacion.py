@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:06
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_matricula'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0013_periodoevaluacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenPuntuacion',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('suma', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('conteo_1', models.PositiveIntegerField(default=0)),
+                ('conteo_2', models.PositiveIntegerField(default=0)),
+                ('conteo_3', models.PositiveIntegerField(default=0)),
+                ('conteo_4', models.PositiveIntegerField(default=0)),
+                ('conteo_5', models.PositiveIntegerField(default=0)),
+                ('curso', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.curso')),
+                ('docente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='docentes.docente')),
+                ('periodo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='evaluacion.periodoevaluacion')),
+                ('pregunta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='evaluacion.preguntamodulo')),
+            ],
+            options={
+                'unique_together': {('periodo', 'docente', 'curso', 'pregunta')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluacion', '0014_resumenpuntuacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluacion',
+            name='periodo',
+            field=models.ForeignKey(blank=True, help_text='Periodo de evaluación en el que se envió', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='evaluaciones', to='evaluacion.periodoevaluacion'),
+        ),
+    ]
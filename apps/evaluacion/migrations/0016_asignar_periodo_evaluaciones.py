@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def asignar_periodos(apps, schema_editor):
+    """Asigna a cada evaluación existente el periodo que contiene su fecha."""
+    PeriodoEvaluacion = apps.get_model("evaluacion", "PeriodoEvaluacion")
+    Evaluacion = apps.get_model("evaluacion", "Evaluacion")
+
+    # Si los periodos se solapan, gana el de inicio más reciente
+    for periodo in PeriodoEvaluacion.objects.order_by("-fecha_inicio"):
+        Evaluacion.objects.filter(
+            periodo__isnull=True,
+            fecha__date__range=(periodo.fecha_inicio, periodo.fecha_fin),
+        ).update(periodo=periodo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluacion', '0015_evaluacion_periodo'),
+    ]
+
+    operations = [
+        migrations.RunPython(asignar_periodos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumnos', '0002_estudiante_codigo'),
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0016_asignar_periodo_evaluaciones'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(fields=['docente', 'estado'], name='evaluacion_docente_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(fields=['curso', 'docente', 'estado'], name='evaluacion_curso_docente_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(condition=models.Q(('estado', 'enviada')), fields=['-fecha'], name='evaluacion_enviada_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(condition=models.Q(('estado', 'enviada')), fields=['periodo', 'docente'], name='evaluacion_enviada_per_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='respuesta',
+            index=models.Index(fields=['evaluacion', 'pregunta'], name='respuesta_eval_pregunta_idx'),
+        ),
+    ]
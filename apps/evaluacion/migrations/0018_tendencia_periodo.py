@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:50
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0017_evaluacion_evaluacion_docente_estado_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TendenciaPeriodo',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fecha_inicio', models.DateField(help_text='Fecha de inicio del periodo, para ordenar la serie')),
+                ('evaluaciones', models.PositiveIntegerField(default=0)),
+                ('respuestas', models.PositiveIntegerField(default=0)),
+                ('suma', models.PositiveIntegerField(default=0)),
+                ('promedio', models.FloatField()),
+                ('delta', models.FloatField(blank=True, help_text='Diferencia con el periodo cerrado anterior', null=True)),
+                ('media_movil', models.FloatField(help_text='Promedio de los últimos periodos cerrados, incluido este')),
+                ('percentil', models.FloatField(help_text='Rango percentil entre los docentes (o cursos) del periodo')),
+                ('curso', models.ForeignKey(blank=True, help_text='Curso (vacío: todos los cursos del docente)', null=True, on_delete=django.db.models.deletion.CASCADE, to='core.curso')),
+                ('docente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='docentes.docente')),
+                ('modulo', models.ForeignKey(blank=True, help_text='Módulo (vacío: todos los módulos)', null=True, on_delete=django.db.models.deletion.CASCADE, to='evaluacion.modulopreguntas')),
+                ('periodo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tendencias', to='evaluacion.periodoevaluacion')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['docente', 'curso', 'modulo', 'fecha_inicio'], name='tendencia_docente_serie_idx')],
+            },
+        ),
+    ]
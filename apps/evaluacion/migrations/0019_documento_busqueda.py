@@ -0,0 +1,103 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:09
+
+import apps.core.lib.utils.indices
+import django.contrib.postgres.search
+import django.db.models.deletion
+import uuid
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+FTS = "evaluacion_documentobusqueda_fts"
+IDS = "evaluacion_documentobusqueda_fts_ids"
+
+
+def crear_tabla_fts(apps, schema_editor):
+    """
+    Crea en SQLite la tabla FTS5 de los documentos, sincronizada por triggers.
+
+    FTS5 identifica sus filas por un rowid entero; el rowid implícito de la
+    tabla de documentos (con clave UUID) puede cambiar con VACUUM, por lo
+    que cada documento recibe un número estable en una tabla con INTEGER
+    PRIMARY KEY. En PostgreSQL los índices están en Meta.indexes.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    tabla = apps.get_model("evaluacion", "DocumentoBusqueda")._meta.db_table
+    schema_editor.execute(
+        f"CREATE TABLE {IDS} (id INTEGER PRIMARY KEY, "
+        "documento_id char(32) NOT NULL UNIQUE)"
+    )
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS} USING fts5(texto, "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    fila = f"(SELECT id FROM {IDS} WHERE documento_id = old.id)"
+    for nombre, evento, cuerpo in (
+        (
+            "ai",
+            "INSERT",
+            f"INSERT INTO {IDS}(documento_id) VALUES (new.id); "
+            f"INSERT INTO {FTS}(rowid, texto) "
+            f"SELECT id, new.texto FROM {IDS} WHERE documento_id = new.id;",
+        ),
+        (
+            "ad",
+            "DELETE",
+            f"DELETE FROM {FTS} WHERE rowid = {fila}; "
+            f"DELETE FROM {IDS} WHERE documento_id = old.id;",
+        ),
+        (
+            "au",
+            "UPDATE OF id, texto",
+            f"UPDATE {FTS} SET texto = new.texto WHERE rowid = {fila}; "
+            f"UPDATE {IDS} SET documento_id = new.id WHERE documento_id = old.id;",
+        ),
+    ):
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS}_{nombre} AFTER {evento} ON {tabla} "
+            f"BEGIN {cuerpo} END"
+        )
+
+
+def borrar_tabla_fts(apps, schema_editor):
+    """Elimina la tabla FTS5 de SQLite y sus triggers."""
+    if schema_editor.connection.vendor == "sqlite":
+        for nombre in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS}_{nombre}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {IDS}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0018_tendencia_periodo'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='DocumentoBusqueda',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('docente', 'Docente'), ('curso', 'Curso'), ('comentario', 'Comentario')], max_length=20)),
+                ('objeto_id', models.UUIDField(help_text='ID del docente, curso o evaluación indexado')),
+                ('texto', models.TextField(help_text='Texto indexado, en minúsculas y sin tildes')),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+                ('curso', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.curso')),
+                ('docente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='docentes.docente')),
+                ('evaluacion', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='evaluacion.evaluacion')),
+            ],
+            options={
+                'unique_together': {('tipo', 'objeto_id')},
+                'indexes': [
+                    apps.core.lib.utils.indices.GinIndexPostgres(django.contrib.postgres.search.SearchVector('texto', config='spanish'), name='documento_busqueda_vector_idx'),
+                    apps.core.lib.utils.indices.GinIndexPostgres(fields=['texto'], name='documento_busqueda_trgm_idx', opclasses=['gin_trgm_ops']),
+                ],
+            },
+        ),
+        migrations.RunPython(crear_tabla_fts, borrar_tabla_fts),
+    ]
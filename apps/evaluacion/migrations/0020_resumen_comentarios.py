@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0019_documento_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenComentarios',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('comentarios', models.PositiveIntegerField(default=0)),
+                ('duplicados', models.PositiveIntegerField(default=0, help_text='Comentarios casi idénticos a otro más reciente')),
+                ('palabras', models.JSONField(default=list, help_text='Palabras más frecuentes: [[palabra, comentarios]]')),
+                ('frases', models.JSONField(default=list, help_text='Frases de dos y tres palabras más frecuentes: [[frase, comentarios]]')),
+                ('grupos_duplicados', models.JSONField(default=list, help_text='Comentarios casi idénticos: [{texto, total}]')),
+                ('recientes', models.JSONField(default=list, help_text='Comentarios más recientes sin duplicados: [{texto, fecha}]')),
+                ('calculado', models.DateTimeField(auto_now=True)),
+                ('curso', models.ForeignKey(blank=True, help_text='Curso (vacío: todos los cursos del docente)', null=True, on_delete=django.db.models.deletion.CASCADE, to='core.curso')),
+                ('docente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='docentes.docente')),
+                ('periodo', models.ForeignKey(blank=True, help_text='Periodo (vacío: todos los periodos)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_comentarios', to='evaluacion.periodoevaluacion')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['docente', 'periodo', 'curso'], name='resumen_comentarios_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:28
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def reconstruir_resumen(apps, schema_editor):
+    """
+    Reconstruye el acumulado de puntuaciones desde las respuestas.
+
+    El acumulado nunca se llenó al crearse (0014) ni se recalculó al asignar
+    periodos a las evaluaciones (0016), y sin restricción para las filas sin
+    periodo pudo acumular filas duplicadas; se reconstruye antes de crear
+    las restricciones de la 0022. Es lo mismo que ResumenService.reconstruir.
+    """
+    Respuesta = apps.get_model("evaluacion", "Respuesta")
+    ResumenPuntuacion = apps.get_model("evaluacion", "ResumenPuntuacion")
+    campos = ["suma", "total"] + [f"conteo_{i}" for i in range(1, 6)]
+
+    filas = (
+        Respuesta.objects.filter(
+            evaluacion__estado="enviada",
+            evaluacion__docente__isnull=False,
+            pregunta__isnull=False,
+        )
+        .values(
+            "evaluacion__periodo",
+            "evaluacion__docente",
+            "evaluacion__curso",
+            "pregunta",
+        )
+        .annotate(
+            suma=Sum("puntuacion"),
+            total=Count("id"),
+            **{f"conteo_{i}": Count("id", filter=Q(puntuacion=i)) for i in range(1, 6)},
+        )
+        .order_by()
+    )
+
+    ResumenPuntuacion.objects.all().delete()
+    ResumenPuntuacion.objects.bulk_create(
+        (
+            ResumenPuntuacion(
+                periodo_id=fila["evaluacion__periodo"],
+                docente_id=fila["evaluacion__docente"],
+                curso_id=fila["evaluacion__curso"],
+                pregunta_id=fila["pregunta"],
+                **{campo: fila[campo] for campo in campos},
+            )
+            for fila in filas.iterator(chunk_size=2000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0020_resumen_comentarios'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='resumenpuntuacion',
+            unique_together=set(),
+        ),
+        migrations.RunPython(reconstruir_resumen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Separada de la 0021: en PostgreSQL no se puede alterar una tabla en la
+    # misma transacción en que se insertaron filas con claves foráneas diferidas
+    dependencies = [
+        ('evaluacion', '0021_reconstruir_resumen_puntuacion'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='resumenpuntuacion',
+            constraint=models.UniqueConstraint(fields=('periodo', 'docente', 'curso', 'pregunta'), name='resumen_puntuacion_unico'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumenpuntuacion',
+            constraint=models.UniqueConstraint(condition=models.Q(('periodo__isnull', True)), fields=('docente', 'curso', 'pregunta'), name='resumen_puntuacion_sin_periodo_unico'),
+        ),
+    ]
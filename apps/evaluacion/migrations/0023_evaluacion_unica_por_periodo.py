@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumnos', '0002_estudiante_codigo'),
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0022_resumen_puntuacion_restricciones'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='evaluacion',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='evaluacion',
+            constraint=models.UniqueConstraint(fields=('estudiante', 'curso', 'periodo'), name='evaluacion_periodo_unica'),
+        ),
+        migrations.AddConstraint(
+            model_name='evaluacion',
+            constraint=models.UniqueConstraint(condition=models.Q(('periodo__isnull', True)), fields=('estudiante', 'curso'), name='evaluacion_sin_periodo_unica'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:49
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def llenar_resumen_reporte(apps, schema_editor):
+    """
+    Calcula los totales de las tablas de reportes desde el acumulado de
+    puntuaciones y las evaluaciones enviadas. Es lo mismo que
+    ResumenService.reconstruir_reportes.
+    """
+    Curso = apps.get_model("core", "Curso")
+    Docente = apps.get_model("docentes", "Docente")
+    Evaluacion = apps.get_model("evaluacion", "Evaluacion")
+    PeriodoEvaluacion = apps.get_model("evaluacion", "PeriodoEvaluacion")
+    ResumenPuntuacion = apps.get_model("evaluacion", "ResumenPuntuacion")
+    ResumenReporte = apps.get_model("evaluacion", "ResumenReporte")
+
+    periodos = [None, *PeriodoEvaluacion.objects.values_list("pk", flat=True)]
+    totales = {}
+    for grupo, modelo in (("docente", Docente), ("curso", Curso)):
+        for objeto_id in modelo.objects.values_list("pk", flat=True).iterator():
+            for periodo_id in periodos:
+                totales[(grupo, objeto_id, periodo_id)] = {
+                    "suma": 0,
+                    "respuestas": 0,
+                    "evaluaciones": 0,
+                }
+
+        filas = [
+            (fila, "suma", "respuestas")
+            for fila in ResumenPuntuacion.objects.values(grupo, "periodo")
+            .annotate(suma=Sum("suma"), respuestas=Sum("total"))
+            .order_by()
+        ] + [
+            (fila, "evaluaciones")
+            for fila in Evaluacion.objects.filter(estado="enviada", docente__isnull=False)
+            .values(grupo, "periodo")
+            .annotate(evaluaciones=Count("id"))
+            .order_by()
+        ]
+        for fila, *campos in filas:
+            for periodo_id in {fila["periodo"], None}:
+                total = totales[(grupo, fila[grupo], periodo_id)]
+                for campo in campos:
+                    total[campo] += fila[campo]
+
+    ResumenReporte.objects.bulk_create(
+        (
+            ResumenReporte(
+                periodo_id=periodo_id,
+                **{f"{grupo}_id": objeto_id},
+                **total,
+                promedio=total["suma"] / total["respuestas"] if total["respuestas"] else 0,
+            )
+            for (grupo, objeto_id, periodo_id), total in totales.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_matricula_matricula_estudiante_est_idx_and_more'),
+        ('docentes', '0001_initial'),
+        ('evaluacion', '0023_evaluacion_unica_por_periodo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenReporte',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('suma', models.PositiveIntegerField(default=0)),
+                ('respuestas', models.PositiveIntegerField(default=0)),
+                ('evaluaciones', models.PositiveIntegerField(default=0)),
+                ('promedio', models.FloatField(default=0, help_text='suma / respuestas, o 0 sin respuestas')),
+                ('curso', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.curso')),
+                ('docente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='docentes.docente')),
+                ('periodo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='evaluacion.periodoevaluacion')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('docente__isnull', False)), fields=['periodo', 'promedio', 'id'], name='resumen_reporte_doc_prom_idx'), models.Index(condition=models.Q(('docente__isnull', False)), fields=['periodo', 'evaluaciones', 'id'], name='resumen_reporte_doc_eval_idx'), models.Index(condition=models.Q(('curso__isnull', False)), fields=['periodo', 'promedio', 'id'], name='resumen_reporte_cur_prom_idx'), models.Index(condition=models.Q(('curso__isnull', False)), fields=['periodo', 'evaluaciones', 'id'], name='resumen_reporte_cur_eval_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('curso__isnull', True), ('docente__isnull', False)), models.Q(('curso__isnull', False), ('docente__isnull', True)), _connector='OR'), name='resumen_reporte_docente_o_curso'), models.UniqueConstraint(condition=models.Q(('docente__isnull', False)), fields=('periodo', 'docente'), name='resumen_reporte_docente_unico'), models.UniqueConstraint(condition=models.Q(('docente__isnull', False), ('periodo__isnull', True)), fields=('docente',), name='resumen_reporte_docente_total_unico'), models.UniqueConstraint(condition=models.Q(('curso__isnull', False)), fields=('periodo', 'curso'), name='resumen_reporte_curso_unico'), models.UniqueConstraint(condition=models.Q(('curso__isnull', False), ('periodo__isnull', True)), fields=('curso',), name='resumen_reporte_curso_total_unico')],
+            },
+        ),
+        migrations.RunPython(llenar_resumen_reporte, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from apps.alumnos.models import Estudiante
 from apps.docentes.models import Docente
 from apps.core.models import Curso
+from apps.core.lib.utils.indices import GinIndexPostgres
 import uuid
 
 
@@ -62,12 +64,54 @@ class Evaluacion(models.Model):
     comentario_general = models.TextField(
         blank=True, null=True, help_text="Comentario general sobre la evaluación"
     )
+    periodo = models.ForeignKey(
+        PeriodoEvaluacion,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="evaluaciones",
+        help_text="Periodo de evaluación en el que se envió",
+    )
 
     class Meta:
-        unique_together = (
-            "estudiante",
-            "curso",
-        )  # Evita que se evalúe más de una vez por curso
+        constraints = [
+            # Una evaluación por curso en cada periodo: si el alumno vuelve a
+            # evaluar el curso en otro periodo, se crea una evaluación nueva
+            models.UniqueConstraint(
+                fields=["estudiante", "curso", "periodo"],
+                name="evaluacion_periodo_unica",
+            ),
+            # Las evaluaciones sin periodo (anteriores a los periodos) siguen
+            # siendo una por curso; en la restricción anterior NULL no se repite
+            models.UniqueConstraint(
+                fields=["estudiante", "curso"],
+                name="evaluacion_sin_periodo_unica",
+                condition=models.Q(periodo__isnull=True),
+            ),
+        ]
+        indexes = [
+            # Evaluaciones de un docente por estado (reportes, perfil docente)
+            models.Index(
+                fields=["docente", "estado"], name="evaluacion_docente_estado_idx"
+            ),
+            # Evaluaciones de un curso y docente por estado (explorar, detalle)
+            models.Index(
+                fields=["curso", "docente", "estado"],
+                name="evaluacion_curso_docente_idx",
+            ),
+            # Evaluaciones enviadas más recientes (bienvenida de comisión)
+            models.Index(
+                fields=["-fecha"],
+                name="evaluacion_enviada_fecha_idx",
+                condition=models.Q(estado="enviada"),
+            ),
+            # Evaluaciones enviadas de un periodo (estadísticas del periodo)
+            models.Index(
+                fields=["periodo", "docente"],
+                name="evaluacion_enviada_per_idx",
+                condition=models.Q(estado="enviada"),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.estudiante.usuario.nombre} → {self.docente.usuario.nombre} ({self.curso.nombre})"
@@ -91,6 +135,15 @@ class Respuesta(models.Model):
         choices=[(i, f"{i} estrella{'s' if i > 1 else ''}") for i in range(1, 6)]
     )
 
+    class Meta:
+        indexes = [
+            # Respuesta de una evaluación a una pregunta (envío de evaluaciones)
+            models.Index(
+                fields=["evaluacion", "pregunta"],
+                name="respuesta_eval_pregunta_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.criterio} - {self.puntuacion}★"
 
@@ -114,3 +167,269 @@ class PreguntaModulo(models.Model):
             + self.pregunta
             + f" ({self.id_modulo.nombre})"
         )
+
+
+# Acumulado de puntuaciones por periodo, docente, curso y pregunta
+class ResumenPuntuacion(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    periodo = models.ForeignKey(
+        PeriodoEvaluacion, on_delete=models.CASCADE, blank=True, null=True
+    )
+    docente = models.ForeignKey(Docente, on_delete=models.CASCADE)
+    curso = models.ForeignKey(Curso, on_delete=models.CASCADE)
+    pregunta = models.ForeignKey(PreguntaModulo, on_delete=models.CASCADE)
+    suma = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    conteo_1 = models.PositiveIntegerField(default=0)
+    conteo_2 = models.PositiveIntegerField(default=0)
+    conteo_3 = models.PositiveIntegerField(default=0)
+    conteo_4 = models.PositiveIntegerField(default=0)
+    conteo_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # Una fila por combinación. Los NULL no chocan en un índice único, por
+        # lo que las filas sin periodo necesitan su propia restricción
+        constraints = [
+            models.UniqueConstraint(
+                fields=["periodo", "docente", "curso", "pregunta"],
+                name="resumen_puntuacion_unico",
+            ),
+            models.UniqueConstraint(
+                fields=["docente", "curso", "pregunta"],
+                name="resumen_puntuacion_sin_periodo_unico",
+                condition=models.Q(periodo__isnull=True),
+            ),
+        ]
+
+    @property
+    def promedio(self):
+        return self.suma / self.total if self.total else None
+
+    def __str__(self):
+        return f"{self.docente} - {self.curso} ({self.total} respuestas)"
+
+
+# Cifras de cada periodo cerrado por docente, curso y módulo, para las tendencias
+class TendenciaPeriodo(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    periodo = models.ForeignKey(
+        PeriodoEvaluacion, on_delete=models.CASCADE, related_name="tendencias"
+    )
+    docente = models.ForeignKey(Docente, on_delete=models.CASCADE)
+    curso = models.ForeignKey(
+        Curso,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        help_text="Curso (vacío: todos los cursos del docente)",
+    )
+    modulo = models.ForeignKey(
+        ModuloPreguntas,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        help_text="Módulo (vacío: todos los módulos)",
+    )
+    fecha_inicio = models.DateField(
+        help_text="Fecha de inicio del periodo, para ordenar la serie"
+    )
+    evaluaciones = models.PositiveIntegerField(default=0)
+    respuestas = models.PositiveIntegerField(default=0)
+    suma = models.PositiveIntegerField(default=0)
+    promedio = models.FloatField()
+    delta = models.FloatField(
+        blank=True,
+        null=True,
+        help_text="Diferencia con el periodo cerrado anterior",
+    )
+    media_movil = models.FloatField(
+        help_text="Promedio de los últimos periodos cerrados, incluido este"
+    )
+    percentil = models.FloatField(
+        help_text="Rango percentil entre los docentes (o cursos) del periodo"
+    )
+
+    class Meta:
+        indexes = [
+            # Serie de un docente (por curso y módulo) ordenada por periodo
+            models.Index(
+                fields=["docente", "curso", "modulo", "fecha_inicio"],
+                name="tendencia_docente_serie_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.docente} - {self.periodo.nombre} ({self.promedio:.2f})"
+
+
+# Textos de docentes, cursos y comentarios para la búsqueda, uno por objeto
+class DocumentoBusqueda(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tipo = models.CharField(
+        max_length=20,
+        choices=[
+            ("docente", "Docente"),
+            ("curso", "Curso"),
+            ("comentario", "Comentario"),
+        ],
+    )
+    objeto_id = models.UUIDField(
+        help_text="ID del docente, curso o evaluación indexado"
+    )
+    docente = models.ForeignKey(
+        Docente, on_delete=models.CASCADE, blank=True, null=True
+    )
+    curso = models.ForeignKey(
+        Curso, on_delete=models.CASCADE, blank=True, null=True
+    )
+    evaluacion = models.ForeignKey(
+        Evaluacion, on_delete=models.CASCADE, blank=True, null=True
+    )
+    texto = models.TextField(
+        help_text="Texto indexado, en minúsculas y sin tildes"
+    )
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("tipo", "objeto_id")
+        indexes = [
+            # Búsqueda de texto en español; la expresión debe coincidir con
+            # la de BusquedaService._buscar_postgresql
+            GinIndexPostgres(
+                SearchVector("texto", config="spanish"),
+                name="documento_busqueda_vector_idx",
+            ),
+            # Similitud de trigramas para errores de escritura (pg_trgm)
+            GinIndexPostgres(
+                fields=["texto"],
+                opclasses=["gin_trgm_ops"],
+                name="documento_busqueda_trgm_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo}: {self.texto[:50]}"
+
+
+# Totales de cada docente y de cada curso por periodo para las tablas de
+# reportes de la comisión; la fila sin periodo suma todos los periodos
+class ResumenReporte(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    periodo = models.ForeignKey(
+        PeriodoEvaluacion, on_delete=models.CASCADE, blank=True, null=True
+    )
+    docente = models.ForeignKey(
+        Docente, on_delete=models.CASCADE, blank=True, null=True
+    )
+    curso = models.ForeignKey(Curso, on_delete=models.CASCADE, blank=True, null=True)
+    suma = models.PositiveIntegerField(default=0)
+    respuestas = models.PositiveIntegerField(default=0)
+    evaluaciones = models.PositiveIntegerField(default=0)
+    promedio = models.FloatField(
+        default=0, help_text="suma / respuestas, o 0 sin respuestas"
+    )
+
+    class Meta:
+        constraints = [
+            # Cada fila es de un docente o de un curso
+            models.CheckConstraint(
+                condition=models.Q(docente__isnull=False, curso__isnull=True)
+                | models.Q(docente__isnull=True, curso__isnull=False),
+                name="resumen_reporte_docente_o_curso",
+            ),
+            # Los NULL no chocan en un índice único: la fila de todos los
+            # periodos necesita su propia restricción
+            models.UniqueConstraint(
+                fields=["periodo", "docente"],
+                name="resumen_reporte_docente_unico",
+                condition=models.Q(docente__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=["docente"],
+                name="resumen_reporte_docente_total_unico",
+                condition=models.Q(docente__isnull=False, periodo__isnull=True),
+            ),
+            models.UniqueConstraint(
+                fields=["periodo", "curso"],
+                name="resumen_reporte_curso_unico",
+                condition=models.Q(curso__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=["curso"],
+                name="resumen_reporte_curso_total_unico",
+                condition=models.Q(curso__isnull=False, periodo__isnull=True),
+            ),
+        ]
+        # Orden de las páginas de los reportes (PaginadorKeyset desempata por id)
+        indexes = [
+            models.Index(
+                fields=["periodo", "promedio", "id"],
+                name="resumen_reporte_doc_prom_idx",
+                condition=models.Q(docente__isnull=False),
+            ),
+            models.Index(
+                fields=["periodo", "evaluaciones", "id"],
+                name="resumen_reporte_doc_eval_idx",
+                condition=models.Q(docente__isnull=False),
+            ),
+            models.Index(
+                fields=["periodo", "promedio", "id"],
+                name="resumen_reporte_cur_prom_idx",
+                condition=models.Q(curso__isnull=False),
+            ),
+            models.Index(
+                fields=["periodo", "evaluaciones", "id"],
+                name="resumen_reporte_cur_eval_idx",
+                condition=models.Q(curso__isnull=False),
+            ),
+        ]
+
+
+# Análisis de los comentarios de cada docente (y curso) por periodo
+class ResumenComentarios(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    periodo = models.ForeignKey(
+        PeriodoEvaluacion,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="resumenes_comentarios",
+        help_text="Periodo (vacío: todos los periodos)",
+    )
+    docente = models.ForeignKey(Docente, on_delete=models.CASCADE)
+    curso = models.ForeignKey(
+        Curso,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        help_text="Curso (vacío: todos los cursos del docente)",
+    )
+    comentarios = models.PositiveIntegerField(default=0)
+    duplicados = models.PositiveIntegerField(
+        default=0, help_text="Comentarios casi idénticos a otro más reciente"
+    )
+    palabras = models.JSONField(
+        default=list, help_text="Palabras más frecuentes: [[palabra, comentarios]]"
+    )
+    frases = models.JSONField(
+        default=list, help_text="Frases de dos y tres palabras más frecuentes: [[frase, comentarios]]"
+    )
+    grupos_duplicados = models.JSONField(
+        default=list, help_text="Comentarios casi idénticos: [{texto, total}]"
+    )
+    recientes = models.JSONField(
+        default=list, help_text="Comentarios más recientes sin duplicados: [{texto, fecha}]"
+    )
+    calculado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Resumen de un docente por periodo y curso (una fila por página)
+            models.Index(
+                fields=["docente", "periodo", "curso"],
+                name="resumen_comentarios_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.docente} ({self.comentarios} comentarios)"
@@ -0,0 +1,78 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+from apps.core.models import Curso
+from apps.docentes.models import Docente
+from apps.evaluacion.lib.services.busqueda import BusquedaService
+from apps.evaluacion.lib.services.resumen import ResumenService
+from apps.evaluacion.models import Evaluacion, PeriodoEvaluacion
+from apps.usuarios.models import Usuario
+
+
+@receiver(pre_save, sender=PeriodoEvaluacion)
+def guardar_estado_anterior(sender, instance, **kwargs):
+    instance._estado_anterior = (
+        None
+        if instance._state.adding
+        else sender.objects.filter(pk=instance.pk).values_list("estado", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=PeriodoEvaluacion)
+def calcular_tendencias(sender, instance, **kwargs):
+    # Las tendencias se calculan en bloque al cerrar un periodo (o se
+    # descartan si se reabre) en un trabajo de la cola de procesar_reportes,
+    # fuera de la petición; se encola en la misma transacción del cambio
+    anterior = getattr(instance, "_estado_anterior", None)
+    if anterior != instance.estado and "cerrado" in (anterior, instance.estado):
+        from apps.comision.lib.services.trabajos import TrabajoReporteService
+
+        TrabajoReporteService.encolar_tendencias(instance)
+
+
+# Las tablas de reportes listan a todos los docentes y cursos en cada
+# periodo, así que sus filas de totales se crean en cero con cada uno
+@receiver(post_save, sender=PeriodoEvaluacion)
+def crear_filas_reporte_periodo(sender, instance, created, **kwargs):
+    if created:
+        ResumenService.crear_filas_reporte(periodos=[instance.pk])
+
+
+@receiver(post_save, sender=Docente)
+def crear_filas_reporte_docente(sender, instance, created, **kwargs):
+    if created:
+        ResumenService.crear_filas_reporte(docentes=[instance.pk], cursos=[])
+
+
+@receiver(post_save, sender=Curso)
+def crear_filas_reporte_curso(sender, instance, created, **kwargs):
+    if created:
+        ResumenService.crear_filas_reporte(docentes=[], cursos=[instance.pk])
+
+
+# Los documentos de búsqueda se actualizan en la misma transacción que el
+# objeto; los borrados se propagan por las claves foráneas
+def _cambia(update_fields, campos):
+    return update_fields is None or bool(campos & set(update_fields))
+
+
+@receiver(post_save, sender=Usuario)
+def indexar_usuario(sender, instance, update_fields=None, **kwargs):
+    # Solo el nombre de los docentes forma parte del índice
+    if _cambia(update_fields, {"nombre"}):
+        BusquedaService.indexar_docentes([instance.pk])
+
+
+@receiver(post_save, sender=Docente)
+def indexar_docente(sender, instance, **kwargs):
+    BusquedaService.indexar_docentes([instance.pk])
+
+
+@receiver(post_save, sender=Curso)
+def indexar_curso(sender, instance, **kwargs):
+    BusquedaService.indexar_cursos([instance.pk])
+
+
+@receiver(post_save, sender=Evaluacion)
+def indexar_evaluacion(sender, instance, update_fields=None, **kwargs):
+    if _cambia(update_fields, {"comentario_general", "estado", "docente", "curso"}):
+        BusquedaService.indexar_evaluaciones([instance.pk])
@@ -1,3 +1,511 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock, skipUnless
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from apps.alumnos.models import Estudiante
+from apps.comision.lib.services.cobertura import CoberturaService
+from apps.comision.lib.services.trabajos import TrabajoReporteService
+from apps.comision.models import TrabajoReporte
+from apps.core.models import Curso, Matricula
+from apps.docentes.models import Docente
+from apps.evaluacion.lib.services.busqueda import BusquedaService
+from apps.evaluacion.lib.services.comentarios import AnalisisComentariosService
+from apps.evaluacion.lib.services.envio import EnvioEvaluacionService
+from apps.evaluacion.lib.services.resumen import ResumenService
+from apps.evaluacion.lib.services.snapshot import PeriodoSnapshotService
+from apps.evaluacion.lib.services.tendencias import TendenciaService
+from apps.evaluacion.models import (
+    DocumentoBusqueda,
+    Evaluacion,
+    ModuloPreguntas,
+    PeriodoEvaluacion,
+    PreguntaModulo,
+    Respuesta,
+    ResumenPuntuacion,
+    ResumenReporte,
+    TendenciaPeriodo,
+)
+from apps.evaluacion.lib.utils.texto import (
+    agrupar_similares,
+    coeficientes_minhash,
+    firma_minhash,
+    frases,
+    tokenizar,
+)
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.models import Usuario
 
-# Create your tests here.
+
+def crear_datos_evaluacion(test_case):
+    """Crea un alumno matriculado, su curso, el periodo activo y tres preguntas."""
+    roles = {
+        nombre: Rol.objects.create(nombre=nombre, permisos={})
+        for nombre in (ModosRoles.ALUMNO, ModosRoles.PROFESOR)
+    }
+    test_case.docente = Docente.objects.create(
+        usuario=Usuario.objects.create(
+            nombre="Docente", correo="docente@sed.test", rol=roles[ModosRoles.PROFESOR]
+        ),
+        departamento="Sistemas",
+    )
+    test_case.alumno = Estudiante.objects.create(
+        usuario=Usuario.objects.create(
+            nombre="Alumno", correo="alumno@sed.test", rol=roles[ModosRoles.ALUMNO]
+        ),
+        semestre="1",
+        carrera="Sistemas",
+        codigo="A1",
+    )
+    test_case.curso = Curso.objects.create(
+        nombre="Algoritmos", codigo="ALG", semestre="1", docente=test_case.docente
+    )
+    Matricula.objects.create(estudiante=test_case.alumno, curso=test_case.curso)
+
+    hoy = timezone.now().date()
+    test_case.periodo = PeriodoEvaluacion.objects.create(
+        nombre="2026-I",
+        fecha_inicio=hoy - timedelta(days=5),
+        fecha_fin=hoy + timedelta(days=5),
+        fecha_comision=hoy + timedelta(days=8),
+        fecha_cierre=hoy + timedelta(days=10),
+        estado="activo",
+    )
+    modulo = ModuloPreguntas.objects.create(nombre="Metodología")
+    test_case.preguntas = [
+        PreguntaModulo.objects.create(id_modulo=modulo, pregunta=f"Pregunta {i}")
+        for i in range(3)
+    ]
+
+
+class EnvioEvaluacionServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        crear_datos_evaluacion(cls)
+
+    def registrar(self, puntuaciones, comentario="Buen docente"):
+        return EnvioEvaluacionService.registrar(
+            self.alumno, self.curso, self.docente, comentario, puntuaciones, self.periodo
+        )
+
+    def puntuaciones(self, *valores):
+        return {
+            pregunta.id_pregunta: valor
+            for pregunta, valor in zip(self.preguntas, valores)
+        }
+
+    def resumen(self):
+        return {
+            fila.pregunta_id: fila
+            for fila in ResumenPuntuacion.objects.filter(
+                periodo=self.periodo, docente=self.docente, curso=self.curso
+            )
+        }
+
+    def test_leer_puntuaciones_valida_cada_respuesta(self):
+        ids = [pregunta.id_pregunta for pregunta in self.preguntas]
+        datos = {f"pregunta_{ids[0]}": "4", f"pregunta_{ids[1]}": "7", f"pregunta_{ids[2]}": "abc"}
+
+        puntuaciones, errores = EnvioEvaluacionService.leer_puntuaciones(datos, ids)
+
+        self.assertEqual(puntuaciones, {ids[0]: 4})
+        self.assertEqual(len(errores), 2)
+
+    def test_leer_puntuaciones_omite_preguntas_sin_respuesta(self):
+        ids = [pregunta.id_pregunta for pregunta in self.preguntas]
+
+        puntuaciones, errores = EnvioEvaluacionService.leer_puntuaciones(
+            {f"pregunta_{ids[0]}": "", f"pregunta_{ids[1]}": "5"}, ids
+        )
+
+        self.assertEqual(puntuaciones, {ids[1]: 5})
+        self.assertEqual(errores, [])
+
+    def test_registrar_crea_evaluacion_y_respuestas(self):
+        resultado = self.registrar(self.puntuaciones(5, 3, 1))
+
+        self.assertTrue(resultado["evaluacion_creada"])
+        self.assertEqual(resultado["creadas"], 3)
+        evaluacion = resultado["evaluacion"]
+        self.assertEqual(evaluacion.periodo, self.periodo)
+        self.assertEqual(
+            {
+                respuesta.pregunta_id: (respuesta.puntuacion, respuesta.criterio)
+                for respuesta in evaluacion.respuestas.all()
+            },
+            {
+                self.preguntas[0].id_pregunta: (5, "Excelente"),
+                self.preguntas[1].id_pregunta: (3, "Regular"),
+                self.preguntas[2].id_pregunta: (1, "Muy Deficiente"),
+            },
+        )
+
+    def test_registrar_de_nuevo_actualiza_solo_lo_que_cambia(self):
+        self.registrar(self.puntuaciones(5, 3, 1))
+
+        resultado = self.registrar(self.puntuaciones(5, 4, 1), comentario="Mejoró")
+
+        self.assertFalse(resultado["evaluacion_creada"])
+        self.assertEqual(
+            (resultado["creadas"], resultado["actualizadas"], resultado["sin_cambios"]),
+            (0, 1, 2),
+        )
+        self.assertEqual(Evaluacion.objects.count(), 1)
+        self.assertEqual(Respuesta.objects.count(), 3)
+        self.assertEqual(resultado["evaluacion"].comentario_general, "Mejoró")
+
+    def test_reenviar_en_otro_periodo_crea_una_evaluacion_nueva(self):
+        hoy = timezone.now().date()
+        anterior = PeriodoEvaluacion.objects.create(
+            nombre="2025-II",
+            fecha_inicio=hoy - timedelta(days=200),
+            fecha_fin=hoy - timedelta(days=150),
+            fecha_comision=hoy - timedelta(days=145),
+            fecha_cierre=hoy - timedelta(days=140),
+            estado="cerrado",
+        )
+        primera = EnvioEvaluacionService.registrar(
+            self.alumno, self.curso, self.docente, "", self.puntuaciones(5, 5, 5), anterior
+        )["evaluacion"]
+
+        resultado = self.registrar(self.puntuaciones(1, 1, 1))
+
+        self.assertTrue(resultado["evaluacion_creada"])
+        self.assertEqual(resultado["evaluacion"].periodo, self.periodo)
+        self.assertEqual(
+            sorted(primera.respuestas.values_list("puntuacion", flat=True)), [5, 5, 5]
+        )
+        self.assertEqual(
+            {
+                periodo_id: (suma, total)
+                for periodo_id, suma, total in ResumenPuntuacion.objects.filter(
+                    pregunta=self.preguntas[0]
+                ).values_list("periodo_id", "suma", "total")
+            },
+            {anterior.pk: (5, 1), self.periodo.pk: (1, 1)},
+        )
+
+    def test_registrar_es_atomico(self):
+        with mock.patch.object(
+            ResumenService, "aplicar_cambios", side_effect=DatabaseError("fallo")
+        ):
+            with self.assertRaises(DatabaseError):
+                self.registrar(self.puntuaciones(5, 3, 1))
+
+        self.assertFalse(Evaluacion.objects.exists())
+        self.assertFalse(Respuesta.objects.exists())
+        self.assertFalse(ResumenPuntuacion.objects.exists())
+
+    def test_resumen_tras_enviar(self):
+        self.registrar(self.puntuaciones(5, 3, 1))
+
+        resumen = self.resumen()
+        fila = resumen[self.preguntas[0].id_pregunta]
+        self.assertEqual((fila.suma, fila.total, fila.conteo_5), (5, 1, 1))
+        fila = resumen[self.preguntas[2].id_pregunta]
+        self.assertEqual((fila.suma, fila.total, fila.conteo_1), (1, 1, 1))
+
+    def test_resumen_tras_editar(self):
+        self.registrar(self.puntuaciones(5, 3, 1))
+        self.registrar(self.puntuaciones(2, 3, 1))
+
+        fila = self.resumen()[self.preguntas[0].id_pregunta]
+        self.assertEqual((fila.suma, fila.total), (2, 1))
+        self.assertEqual((fila.conteo_2, fila.conteo_5), (1, 0))
+
+    def test_resumen_coincide_con_reconstruir(self):
+        self.registrar(self.puntuaciones(5, 3, 1))
+        self.registrar(self.puntuaciones(4, 4, 2))
+
+        def valores():
+            return sorted(
+                ResumenPuntuacion.objects.values_list(
+                    "pregunta_id", "suma", "total", "conteo_1", "conteo_2",
+                    "conteo_3", "conteo_4", "conteo_5",
+                )
+            )
+
+        incremental = valores()
+        ResumenService.reconstruir()
+        self.assertEqual(valores(), incremental)
+
+    def test_totales_de_reportes_coinciden_con_reconstruir(self):
+        self.registrar(self.puntuaciones(5, 3, 1))
+        self.registrar(self.puntuaciones(4, 4, 2))
+        otro = Estudiante.objects.create(
+            usuario=Usuario.objects.create(
+                nombre="Otro", correo="otro@sed.test", rol=self.alumno.usuario.rol
+            ),
+            semestre="1",
+            carrera="Sistemas",
+            codigo="A2",
+        )
+        # Una evaluación sin respuestas cuenta en el total de evaluaciones
+        EnvioEvaluacionService.registrar(otro, self.curso, self.docente, "", {}, self.periodo)
+
+        def valores():
+            return sorted(
+                ResumenReporte.objects.values_list(
+                    "periodo_id", "docente_id", "curso_id", "suma", "respuestas",
+                    "evaluaciones", "promedio",
+                ),
+                key=str,
+            )
+
+        incremental = valores()
+        self.assertIn(
+            (self.periodo.pk, self.docente.pk, None, 10, 3, 2, 10 / 3), incremental
+        )
+        self.assertIn((None, None, self.curso.pk, 10, 3, 2, 10 / 3), incremental)
+        ResumenService.reconstruir_reportes()
+        self.assertEqual(valores(), incremental)
+
+
+class PeriodoSnapshotServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        crear_datos_evaluacion(cls)
+
+    def test_progreso_es_la_cobertura_de_las_matriculas(self):
+        otro_curso = Curso.objects.create(
+            nombre="Redes", codigo="RED", semestre="1", docente=self.docente
+        )
+        Matricula.objects.create(estudiante=self.alumno, curso=otro_curso)
+        EnvioEvaluacionService.registrar(
+            self.alumno, self.curso, self.docente, "", {}, self.periodo
+        )
+
+        snapshot = PeriodoSnapshotService.calcular(self.periodo)
+
+        self.assertEqual(snapshot["evaluaciones_completadas"], 1)
+        self.assertEqual(snapshot["total_estudiantes"], 1)
+        self.assertEqual(snapshot["progreso"], 50)
+        self.assertEqual(
+            snapshot["progreso"], CoberturaService.get_resumen(self.periodo)["porcentaje"]
+        )
+
+
+class TendenciaServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre=ModosRoles.PROFESOR, permisos={})
+        cls.docentes = []
+        cls.cursos = []
+        for indice in range(3):
+            docente = Docente.objects.create(
+                usuario=Usuario.objects.create(
+                    nombre=f"Docente {indice}", correo=f"docente{indice}@sed.test", rol=rol
+                ),
+                departamento="Sistemas",
+            )
+            cls.docentes.append(docente)
+            cls.cursos.append(
+                Curso.objects.create(
+                    nombre=f"Curso {indice}", codigo=f"C{indice}", semestre="1", docente=docente
+                )
+            )
+        cls.pregunta = PreguntaModulo.objects.create(
+            id_modulo=ModuloPreguntas.objects.create(nombre="Metodología"), pregunta="Pregunta"
+        )
+
+    def crear_periodo(self, nombre, inicio, puntuaciones, estado="cerrado"):
+        """Periodo con el acumulado {índice del docente: (suma, total)}."""
+        fecha = timezone.now().date() + timedelta(days=inicio)
+        periodo = PeriodoEvaluacion.objects.create(
+            nombre=nombre,
+            fecha_inicio=fecha,
+            fecha_fin=fecha + timedelta(days=10),
+            fecha_comision=fecha + timedelta(days=12),
+            fecha_cierre=fecha + timedelta(days=15),
+            estado=estado,
+        )
+        for indice, (suma, total) in puntuaciones.items():
+            ResumenPuntuacion.objects.create(
+                periodo=periodo,
+                docente=self.docentes[indice],
+                curso=self.cursos[indice],
+                pregunta=self.pregunta,
+                suma=suma,
+                total=total,
+            )
+        return periodo
+
+    def total(self, periodo, indice):
+        return TendenciaPeriodo.objects.get(
+            periodo=periodo, docente=self.docentes[indice], curso=None, modulo=None
+        )
+
+    def procesar_cola(self):
+        while TrabajoReporteService.procesar_siguiente() is not None:
+            pass
+
+    def test_delta_y_media_movil(self):
+        periodos = [
+            self.crear_periodo(f"P{promedio}", promedio * 30, {0: (promedio * 2, 2)})
+            for promedio in (2, 3, 4, 5)
+        ]
+        TendenciaService.reconstruir()
+
+        primero = self.total(periodos[0], 0)
+        self.assertIsNone(primero.delta)
+        self.assertEqual(primero.media_movil, 2)
+        self.assertEqual(self.total(periodos[1], 0).media_movil, 2.5)
+        # La media móvil solo promedia los tres últimos periodos cerrados
+        ultimo = self.total(periodos[3], 0)
+        self.assertEqual((ultimo.promedio, ultimo.delta, ultimo.media_movil), (5, 1, 4))
+
+    def test_percentil_con_empates(self):
+        periodo = self.crear_periodo("P1", 0, {0: (8, 2), 1: (4, 1), 2: (2, 1)})
+        TendenciaService.reconstruir()
+
+        # Los empates cuentan la mitad: (1 menor + 2 iguales / 2) / 3
+        self.assertEqual(self.total(periodo, 0).percentil, 66.7)
+        self.assertEqual(self.total(periodo, 1).percentil, 66.7)
+        self.assertEqual(self.total(periodo, 2).percentil, 16.7)
+
+    def test_cerrar_encola_el_calculo(self):
+        periodo = self.crear_periodo("P1", 0, {0: (4, 1)}, estado="activo")
+        periodo.estado = "cerrado"
+        periodo.save()
+
+        self.assertFalse(TendenciaPeriodo.objects.exists())
+        self.assertEqual(
+            TrabajoReporte.objects.filter(tipo="tendencias", periodo=periodo).count(), 1
+        )
+        self.procesar_cola()
+        self.assertEqual(self.total(periodo, 0).promedio, 4)
+
+    def test_reabrir_recalcula_los_periodos_posteriores(self):
+        anterior = self.crear_periodo("P1", 0, {0: (2, 1)})
+        posterior = self.crear_periodo("P2", 30, {0: (5, 1)})
+        self.procesar_cola()
+        self.assertEqual(self.total(posterior, 0).delta, 3)
+
+        anterior.estado = "activo"
+        anterior.save()
+        self.procesar_cola()
+
+        self.assertFalse(TendenciaPeriodo.objects.filter(periodo=anterior).exists())
+        recalculado = self.total(posterior, 0)
+        self.assertIsNone(recalculado.delta)
+        self.assertEqual(recalculado.media_movil, 5)
+
+
+class TextoTests(SimpleTestCase):
+    LARGO = (
+        "El profesor explica con mucha claridad los temas del curso y siempre "
+        "responde las preguntas de los alumnos en clase"
+    )
+
+    def firma(self, texto):
+        tokens = tokenizar(texto)
+        return firma_minhash(
+            (f"{a} {b}" for a, b in zip(tokens, tokens[1:])),
+            coeficientes_minhash(AnalisisComentariosService.PERMUTACIONES),
+        )
+
+    def test_tokenizar_normaliza_y_quita_numeros_y_signos(self):
+        self.assertEqual(
+            tokenizar("¡Explicó MUY bien! 10/10, la Física"),
+            ["explico", "muy", "bien", "la", "fisica"],
+        )
+        self.assertEqual(tokenizar(None), [])
+
+    def test_frases_no_empiezan_ni_terminan_en_palabras_vacias(self):
+        self.assertEqual(
+            frases(tokenizar("No explica bien la materia")),
+            {"no explica", "no explica bien", "explica bien", "bien la materia"},
+        )
+
+    def test_agrupa_comentarios_casi_identicos(self):
+        firmas = [
+            self.firma(self.LARGO),
+            self.firma(self.LARGO.replace("en clase", "en clases")),
+            self.firma(
+                "Las tareas llegan tarde y el material del curso no está "
+                "disponible en la plataforma virtual"
+            ),
+        ]
+
+        self.assertEqual(
+            agrupar_similares(
+                firmas,
+                AnalisisComentariosService.BANDAS,
+                AnalisisComentariosService.UMBRAL_DUPLICADO,
+            ),
+            [0, 0, 2],
+        )
+
+    def test_no_agrupa_comentarios_cortos(self):
+        fecha = timezone.now()
+        filas = [
+            ("docente", "curso", "Muy bueno", fecha),
+            ("docente", "curso", "Muy bueno", fecha),
+            ("docente", "curso", self.LARGO, fecha),
+            ("docente", "curso", self.LARGO, fecha),
+        ]
+
+        resumen = AnalisisComentariosService._analizar_docente(
+            None,
+            "docente",
+            filas,
+            coeficientes_minhash(AnalisisComentariosService.PERMUTACIONES),
+        )[0]
+
+        self.assertEqual((resumen.comentarios, resumen.duplicados), (4, 1))
+        self.assertEqual(resumen.grupos_duplicados, [{"texto": self.LARGO, "total": 2}])
+
+
+class BusquedaServiceTests(TransactionTestCase):
+    def setUp(self):
+        rol = Rol.objects.create(nombre=ModosRoles.PROFESOR, permisos={})
+        self.docentes = {
+            nombre: Docente.objects.create(
+                usuario=Usuario.objects.create(
+                    nombre=nombre, correo=f"docente{indice}@sed.test", rol=rol
+                ),
+                departamento=departamento,
+            )
+            for indice, (nombre, departamento) in enumerate(
+                [
+                    ("Ana Torres", "Matemáticas"),
+                    ("Luis Pérez", "Física"),
+                    ("Rosa Núñez", "Química"),
+                    ("Jorge Díaz", "Sistemas"),
+                ]
+            )
+        }
+        BusquedaService.reconstruir()
+
+    def buscar_docentes(self, consulta):
+        return [
+            documento.docente_id
+            for documento in BusquedaService.buscar(consulta, ("docente",))
+        ]
+
+    def test_busca_sin_tildes_y_por_prefijo(self):
+        self.assertEqual(self.buscar_docentes("NUNEZ"), [self.docentes["Rosa Núñez"].pk])
+        self.assertEqual(self.buscar_docentes("fisi"), [self.docentes["Luis Pérez"].pk])
+
+    def test_actualiza_el_indice_al_renombrar(self):
+        usuario = self.docentes["Ana Torres"].usuario
+        usuario.nombre = "Ana Quintanilla"
+        usuario.save()
+
+        self.assertEqual(self.buscar_docentes("quintanilla"), [usuario.pk])
+        self.assertEqual(self.buscar_docentes("torres"), [])
+
+    @skipUnless(connection.vendor == "sqlite", "El índice FTS5 es de SQLite")
+    def test_indice_no_depende_del_rowid_de_los_documentos(self):
+        # VACUUM puede renumerar el rowid implícito de la tabla de documentos;
+        # aquí se renumera directamente, sin que cambie ningún campo
+        for nombre in ("Ana Torres", "Luis Pérez"):
+            self.docentes[nombre].delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {DocumentoBusqueda._meta.db_table} SET rowid = 1000 - rowid"
+            )
+            cursor.execute("VACUUM")
+
+        self.assertEqual(self.buscar_docentes("nunez"), [self.docentes["Rosa Núñez"].pk])
+        self.assertEqual(self.buscar_docentes("sistemas"), [self.docentes["Jorge Díaz"].pk])
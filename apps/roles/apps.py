@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RolesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.roles'
+
+    def ready(self):
+        from apps.roles import signals  # noqa: F401
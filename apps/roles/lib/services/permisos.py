@@ -0,0 +1,151 @@
+"""
+Servicio para resolver los permisos de cada rol a partir de Rol.permisos.
+"""
+
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable
+from apps.core.lib.services.cache import CacheService
+from apps.roles.models import ModosRoles, Rol
+
+
+class PermisosRol:
+    """
+    Permisos compilados de un rol: conjuntos inmutables de permisos concedidos y denegados.
+
+    Un permiso es "<espacio de URLs>.<nombre de la URL>" (ej.
+    "comision.reporte_docente"); "<espacio>.*" abarca todo un espacio y "*"
+    todos. Lo denegado prevalece sobre lo concedido.
+    """
+
+    __slots__ = ("permitidos", "denegados")
+
+    def __init__(self, permitidos: Iterable[str], denegados: Iterable[str]):
+        self.permitidos: FrozenSet[str] = frozenset(permitidos)
+        self.denegados: FrozenSet[str] = frozenset(denegados)
+
+    def tiene(self, permiso: str) -> bool:
+        espacio = permiso.split(".", 1)[0]
+        candidatos = (permiso, f"{espacio}.*", "*")
+        if any(candidato in self.denegados for candidato in candidatos):
+            return False
+        return any(candidato in self.permitidos for candidato in candidatos)
+
+
+class PermisoService:
+    """
+    Servicio para compilar y consultar los permisos de los roles.
+
+    Los permisos compilados se guardan en memoria del proceso junto con la
+    versión del espacio de caché "permisos"; guardar o eliminar un rol
+    incrementa la versión y, con una caché compartida (redis o file), cada
+    proceso los vuelve a compilar en su siguiente consulta. Con locmem la
+    versión solo cambia en el proceso que guardó el rol, por lo que además
+    se recompilan cada VIGENCIA segundos. Con la versión vigente, consultar
+    un permiso no accede a la base de datos.
+    """
+
+    NAMESPACE = "permisos"
+
+    # Segundos que se usan los permisos compilados sin volver a leer los roles
+    VIGENCIA = 60
+
+    # Espacios de URLs que exigen sesión iniciada y permiso
+    ESPACIOS_PROTEGIDOS = ("alumno", "docente", "comision")
+
+    # Permisos de cada rol aunque Rol.permisos esté vacío
+    PERMISOS_BASE = {
+        ModosRoles.ALUMNO: ("alumno.*",),
+        ModosRoles.PROFESOR: ("docente.*",),
+        ModosRoles.COMISION: ("comision.*",),
+        ModosRoles.ADMIN: ("*",),
+    }
+
+    _compilados: Dict = {"version": None, "compilado": 0.0, "roles": {}}
+    _bloqueo = threading.Lock()
+
+    @staticmethod
+    def compilar(rol: Rol) -> PermisosRol:
+        """
+        Compila los permisos de un rol.
+
+        Rol.permisos admite una lista de permisos concedidos o un
+        diccionario {"permitir": [...], "denegar": [...]}; ambos se suman a
+        PERMISOS_BASE. Las entradas que no son texto se ignoran.
+
+        Args:
+            rol: Instancia del rol
+
+        Returns:
+            Permisos compilados del rol
+        """
+        permisos = rol.permisos or {}
+        if isinstance(permisos, list):
+            permisos = {"permitir": permisos}
+        elif not isinstance(permisos, dict):
+            permisos = {}
+
+        def textos(valores):
+            return [valor for valor in valores or [] if isinstance(valor, str)]
+
+        return PermisosRol(
+            [*PermisoService.PERMISOS_BASE.get(rol.nombre, ()), *textos(permisos.get("permitir"))],
+            textos(permisos.get("denegar")),
+        )
+
+    @staticmethod
+    def get_permisos(rol_id) -> PermisosRol:
+        """
+        Obtiene los permisos compilados de un rol desde la memoria del proceso.
+
+        Args:
+            rol_id: ID del rol
+
+        Returns:
+            Permisos compilados (vacíos si el rol no existe)
+        """
+        version = CacheService.get_version(PermisoService.NAMESPACE)
+        ahora = time.monotonic()
+
+        def vigentes(compilados):
+            return (
+                compilados["version"] == version
+                and ahora - compilados["compilado"] < PermisoService.VIGENCIA
+            )
+
+        compilados = PermisoService._compilados
+        if vigentes(compilados) and rol_id in compilados["roles"]:
+            return compilados["roles"][rol_id]
+
+        with PermisoService._bloqueo:
+            if not vigentes(PermisoService._compilados):
+                # Se compilan todos los roles a la vez: son pocos
+                PermisoService._compilados = {
+                    "version": version,
+                    "compilado": ahora,
+                    "roles": {rol.pk: PermisoService.compilar(rol) for rol in Rol.objects.all()},
+                }
+            roles = PermisoService._compilados["roles"]
+            if rol_id not in roles:
+                rol = Rol.objects.filter(pk=rol_id).first()
+                roles[rol_id] = PermisoService.compilar(rol) if rol else PermisosRol((), ())
+            return roles[rol_id]
+
+    @staticmethod
+    def tiene_permiso(rol_id, permiso: str) -> bool:
+        """
+        Verifica si un rol tiene un permiso.
+
+        Args:
+            rol_id: ID del rol
+            permiso: Permiso a verificar (ej. "comision.exportar_reporte_general")
+
+        Returns:
+            True si el rol tiene el permiso
+        """
+        return PermisoService.get_permisos(rol_id).tiene(permiso)
+
+    @staticmethod
+    def invalidar() -> None:
+        """Obliga a todos los procesos a volver a compilar los permisos."""
+        CacheService.invalidar(PermisoService.NAMESPACE)
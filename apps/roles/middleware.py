@@ -0,0 +1,70 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.urls import Resolver404, resolve
+from apps.roles.lib.services.permisos import PermisoService
+from apps.usuarios.lib.services.sesion import SesionService
+
+
+class PermisosMiddleware:
+    """
+    Exige sesión iniciada y permiso para las URLs de los espacios protegidos.
+
+    El permiso de cada URL es "<espacio>.<nombre>" (ej. "alumno.explorar").
+    Sin sesión se redirige al inicio de sesión; sin permiso, o si el
+    usuario_id de la URL no es el de la sesión, se responde 403.
+    El usuario y su rol se leen de la sesión y los permisos de la memoria
+    del proceso (ver PermisoService), sin consultar la base de datos.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.asincrono = iscoroutinefunction(get_response)
+        if self.asincrono:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.asincrono:
+            return self.__acall__(request)
+
+        coincidencia = self._get_coincidencia(request)
+        if coincidencia is not None:
+            respuesta = self._verificar(request, coincidencia)
+            if respuesta is not None:
+                return respuesta
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        coincidencia = self._get_coincidencia(request)
+        if coincidencia is not None:
+            # La sesión y la versión de los permisos pueden hacer E/S bloqueante
+            respuesta = await sync_to_async(self._verificar)(request, coincidencia)
+            if respuesta is not None:
+                return respuesta
+        return await self.get_response(request)
+
+    def _get_coincidencia(self, request):
+        """URL resuelta, o None si no es de un espacio protegido."""
+        try:
+            coincidencia = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if coincidencia.namespace not in PermisoService.ESPACIOS_PROTEGIDOS:
+            return None
+        return coincidencia
+
+    def _verificar(self, request, coincidencia):
+        usuario = SesionService.get_usuario(request)
+        if usuario is None:
+            return redirect("core:login")
+        permiso = f"{coincidencia.namespace}.{coincidencia.url_name}"
+        if not PermisoService.tiene_permiso(usuario.rol_id, permiso):
+            raise PermissionDenied
+        # Las páginas de cada rol son del usuario de la URL: solo él puede verlas
+        usuario_id = coincidencia.kwargs.get("usuario_id")
+        if usuario_id is not None and str(usuario_id) != str(usuario.id):
+            raise PermissionDenied
+        return None
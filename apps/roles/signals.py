@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.roles.models import Rol
+
+
+@receiver(post_save, sender=Rol)
+@receiver(post_delete, sender=Rol)
+def invalidar_permisos(sender, instance, **kwargs):
+    from apps.roles.lib.services.permisos import PermisoService
+
+    PermisoService.invalidar()
@@ -1,3 +1,118 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from apps.alumnos.models import Estudiante
+from apps.comision.models import Comision
+from apps.roles.lib.services.permisos import PermisoService, PermisosRol
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.lib.services.sesion import SesionService
+from apps.usuarios.models import Usuario
 
-# Create your tests here.
+
+class PermisosRolTests(TestCase):
+    def test_comodines_y_denegados(self):
+        permisos = PermisosRol(["alumno.*", "comision.reporte_general"], ["alumno.explorar"])
+
+        self.assertTrue(permisos.tiene("alumno.perfil_alumno"))
+        self.assertTrue(permisos.tiene("comision.reporte_general"))
+        self.assertFalse(permisos.tiene("alumno.explorar"))
+        self.assertFalse(permisos.tiene("comision.reporte_curso"))
+
+    def test_compilar_suma_permisos_base(self):
+        rol = Rol(nombre=ModosRoles.PROFESOR, permisos={"permitir": ["comision.reporte_general", 3]})
+
+        permisos = PermisoService.compilar(rol)
+
+        self.assertTrue(permisos.tiene("docente.ver_evaluacion"))
+        self.assertTrue(permisos.tiene("comision.reporte_general"))
+        self.assertFalse(permisos.tiene("comision.reporte_curso"))
+
+
+class PermisosMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.rol_alumno = Rol.objects.create(nombre=ModosRoles.ALUMNO, permisos={})
+        rol_comision = Rol.objects.create(nombre=ModosRoles.COMISION, permisos={})
+        cls.alumnos = [
+            Estudiante.objects.create(
+                usuario=Usuario.objects.create(
+                    nombre=f"Alumno {i}", correo=f"alumno{i}@sed.test", rol=cls.rol_alumno
+                ),
+                semestre="1",
+                carrera="Sistemas",
+            )
+            for i in range(2)
+        ]
+        cls.comision = Comision.objects.create(
+            usuario=Usuario.objects.create(
+                nombre="Comisión", correo="comision@sed.test", rol=rol_comision
+            ),
+            facultad="Ingeniería",
+        )
+
+    def setUp(self):
+        # Los permisos compilados viven en la memoria del proceso
+        PermisoService.invalidar()
+
+    def iniciar_sesion(self, cliente, usuario):
+        cliente.cookies[settings.SESSION_COOKIE_NAME] = SesionService.crear_sesion(usuario)
+
+    def url_alumno(self, alumno, nombre="bienvenida_alumno"):
+        return reverse(f"alumno:{nombre}", args=[alumno.usuario_id])
+
+    def test_sin_sesion_redirige_al_inicio_de_sesion(self):
+        respuesta = self.client.get(self.url_alumno(self.alumnos[0]))
+
+        self.assertRedirects(respuesta, reverse("core:login"), fetch_redirect_response=False)
+
+    def test_pagina_propia(self):
+        self.iniciar_sesion(self.client, self.alumnos[0].usuario)
+
+        respuesta = self.client.get(self.url_alumno(self.alumnos[0]))
+
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_pagina_de_otro_usuario(self):
+        self.iniciar_sesion(self.client, self.alumnos[0].usuario)
+
+        respuesta = self.client.get(self.url_alumno(self.alumnos[1]))
+
+        self.assertEqual(respuesta.status_code, 403)
+
+    def test_pagina_de_otro_rol(self):
+        self.iniciar_sesion(self.client, self.alumnos[0].usuario)
+
+        respuesta = self.client.get(
+            reverse("comision:reporte_general", args=[self.comision.usuario_id])
+        )
+
+        self.assertEqual(respuesta.status_code, 403)
+
+    def test_la_comision_no_entra_a_paginas_de_alumnos(self):
+        self.iniciar_sesion(self.client, self.comision.usuario)
+
+        respuesta = self.client.get(self.url_alumno(self.alumnos[0]))
+
+        self.assertEqual(respuesta.status_code, 403)
+
+    def test_permiso_denegado_en_el_rol(self):
+        self.iniciar_sesion(self.client, self.alumnos[0].usuario)
+        self.rol_alumno.permisos = {"denegar": ["alumno.bienvenida_alumno"]}
+        self.rol_alumno.save()
+        PermisoService.invalidar()
+
+        respuesta = self.client.get(self.url_alumno(self.alumnos[0]))
+
+        self.assertEqual(respuesta.status_code, 403)
+
+    async def test_vista_asincrona_de_otro_usuario(self):
+        cliente = AsyncClient()
+        alumno, otro = self.alumnos
+        cliente.cookies[settings.SESSION_COOKIE_NAME] = await sync_to_async(
+            SesionService.crear_sesion
+        )(alumno.usuario)
+
+        respuesta = await cliente.get(self.url_alumno(otro, "perfil_alumno"))
+
+        self.assertEqual(respuesta.status_code, 403)
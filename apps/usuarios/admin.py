@@ -3,6 +3,13 @@ from django.contrib import admin
 # Register your models here.
 
 
+from apps.usuarios.forms import UsuarioAdminForm
 from apps.usuarios.models import Usuario
 
-admin.site.register(Usuario)
+@admin.register(Usuario)
+class UsuarioAdmin(admin.ModelAdmin):
+    form = UsuarioAdminForm
+    list_display = ('nombre', 'correo', 'rol')
+    list_filter = ('rol',)
+    search_fields = ('nombre', 'correo')
+    list_select_related = ('rol',)
@@ -0,0 +1,25 @@
+from django.contrib.auth.hashers import make_password
+from apps.usuarios.models import Usuario
+
+
+class UsuarioBackend:
+    """
+    Autentica usuarios.Usuario por correo y contraseña cifrada.
+
+    Se usa con django.contrib.auth.authenticate(request, correo=..., password=...).
+    """
+
+    def authenticate(self, request, correo=None, password=None, **kwargs):
+        if correo is None or password is None:
+            return None
+        try:
+            usuario = Usuario.objects.select_related("rol").get(correo=correo)
+        except Usuario.DoesNotExist:
+            # Se cifra igual la contraseña para que el tiempo de respuesta no
+            # revele si el correo existe
+            make_password(password)
+            return None
+        return usuario if usuario.check_password(password) else None
+
+    def get_user(self, user_id):
+        return Usuario.objects.select_related("rol").filter(pk=user_id).first()
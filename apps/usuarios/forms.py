@@ -0,0 +1,54 @@
+from django import forms
+from apps.usuarios.models import Usuario
+
+
+class UsuarioAdminForm(forms.ModelForm):
+    """
+    Formulario del admin para crear y editar usuarios.
+
+    La contraseña nunca se edita directamente: se escribe en texto plano en
+    estos campos y se guarda cifrada con Usuario.set_password. Al editar, si
+    se dejan vacíos, se conserva la contraseña actual.
+    """
+
+    nueva_password = forms.CharField(
+        label="Contraseña",
+        required=False,
+        strip=False,
+        widget=forms.PasswordInput(render_value=False),
+    )
+    confirmar_password = forms.CharField(
+        label="Confirmar contraseña",
+        required=False,
+        strip=False,
+        widget=forms.PasswordInput(render_value=False),
+    )
+
+    class Meta:
+        model = Usuario
+        fields = ("nombre", "correo", "rol")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Un usuario nuevo debe tener contraseña
+        if self.instance._state.adding:
+            self.fields["nueva_password"].required = True
+            self.fields["confirmar_password"].required = True
+        else:
+            self.fields["nueva_password"].help_text = (
+                "Déjela vacía para conservar la contraseña actual."
+            )
+
+    def clean(self):
+        datos = super().clean()
+        if datos.get("nueva_password") != datos.get("confirmar_password"):
+            self.add_error("confirmar_password", "Las contraseñas no coinciden.")
+        return datos
+
+    def save(self, commit=True):
+        usuario = super().save(commit=False)
+        if self.cleaned_data.get("nueva_password"):
+            usuario.set_password(self.cleaned_data["nueva_password"])
+        if commit:
+            usuario.save()
+        return usuario
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PBKDF2IteracionesPasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 con el factor de trabajo de settings.SED_PASSWORD_ITERACIONES.
+
+    Usa el mismo algoritmo que el hasher de Django ("pbkdf2_sha256"), por lo
+    que verifica sus contraseñas; las que tienen otro número de iteraciones
+    se re-cifran al iniciar sesión.
+    """
+
+    @property
+    def iterations(self):
+        return settings.SED_PASSWORD_ITERACIONES
@@ -0,0 +1,217 @@
+"""
+Servicio para guardar en la sesión el usuario autenticado, su rol y su perfil.
+"""
+
+from importlib import import_module
+from typing import Dict, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import models
+from django.http import Http404
+from django.urls import reverse
+from apps.alumnos.models import Estudiante
+from apps.comision.models import Comision
+from apps.docentes.models import Docente
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.models import Usuario
+
+
+class SesionService:
+    """
+    Servicio para iniciar, leer y cerrar la sesión de un usuario.
+
+    Al iniciar sesión se copian a la sesión los campos del usuario, del rol
+    y del perfil (Estudiante, Docente o Comision); las páginas de cada rol
+    reconstruyen esas instancias sin consultar la base de datos.
+    """
+
+    CLAVE = "sed_usuario"
+
+    # Modelo de perfil y página de inicio de cada rol
+    PERFILES = {
+        ModosRoles.ALUMNO: Estudiante,
+        ModosRoles.PROFESOR: Docente,
+        ModosRoles.COMISION: Comision,
+    }
+    INICIO = {
+        ModosRoles.ALUMNO: "alumno:bienvenida_alumno",
+        ModosRoles.PROFESOR: "docente:bienvenido_docente",
+        ModosRoles.COMISION: "comision:bienvenida_comision",
+    }
+
+    # Campos que no se copian a la sesión
+    EXCLUIDOS = {"password"}
+
+    @staticmethod
+    def get_url_inicio(usuario: Usuario) -> Optional[str]:
+        """
+        Obtiene la página de inicio del rol del usuario.
+
+        Args:
+            usuario: Usuario autenticado
+
+        Returns:
+            URL de inicio, o None si el rol no tiene página
+        """
+        nombre = SesionService.INICIO.get(usuario.rol.nombre)
+        if nombre is None:
+            return None
+        return reverse(nombre, kwargs={"usuario_id": usuario.id})
+
+    @staticmethod
+    def iniciar(request, usuario: Usuario) -> None:
+        """
+        Inicia la sesión del usuario con una clave de sesión nueva.
+
+        Args:
+            request: Petición del inicio de sesión
+            usuario: Usuario autenticado, con su rol
+        """
+        # Una clave nueva evita la fijación de sesión
+        request.session.cycle_key()
+        request.session[SesionService.CLAVE] = SesionService._get_datos(usuario)
+        request._sesion_usuario = None
+
+    @staticmethod
+    def crear_sesion(usuario: Usuario) -> str:
+        """
+        Crea una sesión iniciada para el usuario sin pasar por el inicio de sesión.
+
+        Sirve a los benchmarks y pruebas de carga, que envían la clave en la
+        cookie de sesión.
+
+        Args:
+            usuario: Usuario con su rol
+
+        Returns:
+            Clave de la sesión creada
+        """
+        sesion = import_module(settings.SESSION_ENGINE).SessionStore()
+        sesion[SesionService.CLAVE] = SesionService._get_datos(usuario)
+        sesion.save()
+        return sesion.session_key
+
+    @staticmethod
+    def cerrar(request) -> None:
+        """Elimina la sesión y sus datos."""
+        request.session.flush()
+        request._sesion_usuario = None
+
+    @staticmethod
+    def get_usuario(request) -> Optional[Usuario]:
+        """
+        Obtiene el usuario de la sesión, con su rol, sin consultar la base de datos.
+
+        La contraseña no se guarda en la sesión: queda como campo diferido.
+
+        Args:
+            request: Petición actual
+
+        Returns:
+            Instancia de Usuario, o None si no hay sesión iniciada
+        """
+        usuario = getattr(request, "_sesion_usuario", None)
+        if usuario is None:
+            datos = request.session.get(SesionService.CLAVE)
+            if datos is None:
+                return None
+            usuario = SesionService._deserializar(Usuario, datos["usuario"])
+            usuario.rol = SesionService._deserializar(Rol, datos["rol"])
+            request._sesion_usuario = usuario
+        return usuario
+
+    @staticmethod
+    def get_perfil(request, modelo) -> Optional[models.Model]:
+        """
+        Obtiene el perfil de la sesión si es del modelo indicado.
+
+        Args:
+            request: Petición actual
+            modelo: Estudiante, Docente o Comision
+
+        Returns:
+            Instancia del perfil con su usuario, o None
+        """
+        usuario = SesionService.get_usuario(request)
+        datos = request.session[SesionService.CLAVE]["perfil"] if usuario else None
+        if datos is None or SesionService.PERFILES.get(usuario.rol.nombre) is not modelo:
+            return None
+        perfil = SesionService._deserializar(modelo, datos)
+        perfil.usuario = usuario
+        return perfil
+
+    @staticmethod
+    def get_perfil_o_404(request, modelo, usuario_id=None) -> models.Model:
+        """
+        Obtiene el perfil del usuario de la sesión, sin consultar la base de datos.
+
+        Solo se devuelve el perfil del usuario autenticado: si usuario_id es
+        de otro usuario, se responde 404 aunque ese usuario exista.
+
+        Args:
+            request: Petición actual
+            modelo: Estudiante, Docente o Comision
+            usuario_id: ID del usuario indicado en la URL (si es None, no se compara)
+
+        Returns:
+            Instancia del perfil
+
+        Raises:
+            Http404: Si no hay sesión con un perfil del modelo indicado o el
+                usuario no es el de la sesión
+        """
+        perfil = SesionService.get_perfil(request, modelo)
+        if perfil is None or (usuario_id is not None and str(perfil.pk) != str(usuario_id)):
+            raise Http404(f"{str(modelo._meta.verbose_name).capitalize()} no encontrado")
+        return perfil
+
+    @staticmethod
+    async def aget_perfil_o_404(request, modelo, usuario_id=None) -> models.Model:
+        """
+        Versión asíncrona de get_perfil_o_404 para las vistas servidas por ASGI.
+
+        La sesión puede leerse de la base de datos, por lo que se consulta
+        fuera del bucle de eventos.
+        """
+        return await sync_to_async(SesionService.get_perfil_o_404)(
+            request, modelo, usuario_id
+        )
+
+    @staticmethod
+    def _get_datos(usuario: Usuario) -> Dict:
+        """Datos de la sesión: usuario, rol y perfil del rol."""
+        modelo = SesionService.PERFILES.get(usuario.rol.nombre)
+        perfil = modelo.objects.filter(usuario=usuario).first() if modelo else None
+        return {
+            "usuario": SesionService._serializar(usuario),
+            "rol": SesionService._serializar(usuario.rol),
+            "perfil": SesionService._serializar(perfil) if perfil else None,
+        }
+
+    @staticmethod
+    def _serializar(instancia: models.Model) -> Dict:
+        """Campos concretos de la instancia como valores aptos para JSON."""
+        datos = {}
+        for campo in instancia._meta.concrete_fields:
+            if campo.name in SesionService.EXCLUIDOS:
+                continue
+            valor = campo.value_from_object(instancia)
+            datos[campo.attname] = (
+                None if valor is None else campo.value_to_string(instancia)
+            )
+        return datos
+
+    @staticmethod
+    def _deserializar(modelo, datos: Dict) -> models.Model:
+        """Reconstruye una instancia como si se hubiera leído de la base de datos."""
+        campos = [
+            campo for campo in modelo._meta.concrete_fields if campo.attname in datos
+        ]
+        return modelo.from_db(
+            "default",
+            [campo.attname for campo in campos],
+            [
+                None if datos[campo.attname] is None else campo.to_python(datos[campo.attname])
+                for campo in campos
+            ],
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from apps.usuarios.models import Usuario
+
+
+class Command(BaseCommand):
+    help = (
+        "Cifra las contraseñas guardadas en texto plano (por ejemplo, cargadas "
+        "con fixtures o scripts); sin cifrar no permiten iniciar sesión"
+    )
+
+    TAMANO_LOTE = 200
+
+    def handle(self, *args, **options):
+        lote = []
+        cifradas = 0
+        for usuario in Usuario.objects.only("id", "password").iterator():
+            if not usuario.password_plana():
+                continue
+            usuario.set_password(usuario.password)
+            lote.append(usuario)
+            if len(lote) == self.TAMANO_LOTE:
+                cifradas += self._guardar(lote)
+                lote = []
+        cifradas += self._guardar(lote)
+        self.stdout.write(self.style.SUCCESS(f"Contraseñas cifradas: {cifradas}"))
+
+    def _guardar(self, lote):
+        Usuario.objects.bulk_update(lote, ["password"])
+        if lote:
+            self.stdout.write(f"  {len(lote)} contraseñas cifradas")
+        return len(lote)
@@ -0,0 +1,46 @@
+from django.contrib.auth.hashers import identify_hasher, is_password_usable, make_password
+from django.db import migrations
+
+
+TAMANO_LOTE = 200
+
+
+def hashear_passwords(apps, schema_editor):
+    """
+    Cifra las contraseñas que siguen guardadas en texto plano.
+
+    Desde esta migración el inicio de sesión ya no acepta contraseñas sin
+    cifrar; es lo mismo que hace el comando hashear_passwords.
+    """
+    Usuario = apps.get_model("usuarios", "Usuario")
+
+    def plana(password):
+        if not password or not is_password_usable(password):
+            return False
+        try:
+            identify_hasher(password)
+        except ValueError:
+            return True
+        return False
+
+    lote = []
+    for usuario in Usuario.objects.only("id", "password").iterator():
+        if not plana(usuario.password):
+            continue
+        usuario.password = make_password(usuario.password)
+        lote.append(usuario)
+        if len(lote) == TAMANO_LOTE:
+            Usuario.objects.bulk_update(lote, ["password"])
+            lote = []
+    Usuario.objects.bulk_update(lote, ["password"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0004_remove_usuario_last_login_alter_usuario_password'),
+    ]
+
+    operations = [
+        migrations.RunPython(hashear_passwords, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,9 @@
+from django.contrib.auth.hashers import (
+    check_password,
+    identify_hasher,
+    is_password_usable,
+    make_password,
+)
 from django.db import models
 from apps.roles.models import Rol
 import uuid
@@ -12,3 +18,40 @@ class Usuario(models.Model):
 
     def __str__(self):
         return self.nombre + f"{self.rol.nombre}" + f" {self.correo}"
+
+    def set_password(self, password):
+        """Guarda la contraseña cifrada con el hasher por defecto (PASSWORD_HASHERS)."""
+        self.password = make_password(password)
+
+    def check_password(self, password) -> bool:
+        """
+        Verifica una contraseña y la vuelve a cifrar si hace falta.
+
+        Se re-cifran las contraseñas cifradas con otro hasher o factor de
+        trabajo. Las guardadas en texto plano no se aceptan: la migración
+        0005 y el comando hashear_passwords las cifran.
+
+        Args:
+            password: Contraseña recibida en texto plano
+
+        Returns:
+            True si la contraseña es correcta
+        """
+
+        def actualizar(password):
+            self.set_password(password)
+            Usuario.objects.filter(pk=self.pk).update(password=self.password)
+
+        if self.password_plana():
+            return False
+        return check_password(password, self.password, actualizar)
+
+    def password_plana(self) -> bool:
+        """Indica si la contraseña está guardada sin cifrar (formato anterior)."""
+        if not self.password or not is_password_usable(self.password):
+            return False
+        try:
+            identify_hasher(self.password)
+        except ValueError:
+            return True
+        return False
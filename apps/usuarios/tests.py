@@ -1,3 +1,186 @@
-from django.test import TestCase
+from importlib import import_module
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from apps.alumnos.models import Estudiante
+from apps.docentes.models import Docente
+from apps.roles.models import ModosRoles, Rol
+from apps.usuarios.forms import UsuarioAdminForm
+from apps.usuarios.lib.services.sesion import SesionService
+from apps.usuarios.models import Usuario
 
-# Create your tests here.
+
+# Pocas iteraciones para que las pruebas no tarden
+@override_settings(SED_PASSWORD_ITERACIONES=1000)
+class PasswordTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.rol = Rol.objects.create(nombre=ModosRoles.ALUMNO, permisos={})
+
+    def crear_usuario(self, password, correo="alumno@sed.test"):
+        usuario = Usuario.objects.create(
+            nombre="Alumno", correo=correo, password=password, rol=self.rol
+        )
+        Estudiante.objects.create(usuario=usuario, semestre="1", carrera="Sistemas")
+        return usuario
+
+    def iniciar_sesion(self, password, correo="alumno@sed.test"):
+        return self.client.post(reverse("core:login"), {"correo": correo, "password": password})
+
+    def test_set_password_cifra(self):
+        usuario = Usuario(nombre="Alumno", correo="alumno@sed.test", rol=self.rol)
+        usuario.set_password("secreta")
+
+        self.assertNotEqual(usuario.password, "secreta")
+        self.assertEqual(identify_hasher(usuario.password).algorithm, "pbkdf2_sha256")
+        self.assertTrue(usuario.check_password("secreta"))
+        self.assertFalse(usuario.check_password("otra"))
+
+    def test_password_en_texto_plano_no_se_acepta(self):
+        usuario = self.crear_usuario("secreta")
+
+        self.assertTrue(usuario.password_plana())
+        self.assertFalse(usuario.check_password("secreta"))
+        respuesta = self.iniciar_sesion("secreta")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertContains(respuesta, "Correo o contraseña incorrectos")
+
+    def test_inicio_de_sesion(self):
+        usuario = self.crear_usuario(make_password("secreta"))
+
+        respuesta = self.iniciar_sesion("secreta")
+
+        self.assertRedirects(
+            respuesta, SesionService.get_url_inicio(usuario), fetch_redirect_response=False
+        )
+
+    def test_password_incorrecta(self):
+        self.crear_usuario(make_password("secreta"))
+
+        respuesta = self.iniciar_sesion("otra")
+
+        self.assertContains(respuesta, "Correo o contraseña incorrectos")
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, respuesta.cookies)
+
+    def test_inicio_de_sesion_re_cifra_con_el_factor_actual(self):
+        with self.settings(SED_PASSWORD_ITERACIONES=500):
+            usuario = self.crear_usuario(make_password("secreta"))
+        self.assertIn("$500$", usuario.password)
+
+        self.iniciar_sesion("secreta")
+
+        usuario.refresh_from_db()
+        self.assertIn("$1000$", usuario.password)
+        self.assertTrue(usuario.check_password("secreta"))
+
+    def test_inicio_de_sesion_re_cifra_otro_hasher(self):
+        usuario = self.crear_usuario(
+            make_password("secreta", hasher="pbkdf2_sha1")
+        )
+
+        self.iniciar_sesion("secreta")
+
+        usuario.refresh_from_db()
+        self.assertEqual(identify_hasher(usuario.password).algorithm, "pbkdf2_sha256")
+
+    def test_migracion_cifra_passwords_planas(self):
+        plana = self.crear_usuario("secreta")
+        cifrada = self.crear_usuario(make_password("otra"), correo="otro@sed.test")
+        anterior = cifrada.password
+
+        migracion = import_module("apps.usuarios.migrations.0005_hashear_passwords")
+        migracion.hashear_passwords(apps, None)
+
+        plana.refresh_from_db()
+        cifrada.refresh_from_db()
+        self.assertFalse(plana.password_plana())
+        self.assertTrue(plana.check_password("secreta"))
+        self.assertEqual(cifrada.password, anterior)
+
+    def test_formulario_admin_cifra_la_password(self):
+        datos = {
+            "nombre": "Alumno",
+            "correo": "alumno@sed.test",
+            "rol": self.rol.pk,
+            "nueva_password": "secreta",
+            "confirmar_password": "secreta",
+        }
+
+        usuario = UsuarioAdminForm(datos).save()
+
+        self.assertFalse(usuario.password_plana())
+        self.assertTrue(usuario.check_password("secreta"))
+
+    def test_formulario_admin_exige_passwords_iguales(self):
+        formulario = UsuarioAdminForm(
+            {
+                "nombre": "Alumno",
+                "correo": "alumno@sed.test",
+                "rol": self.rol.pk,
+                "nueva_password": "secreta",
+                "confirmar_password": "distinta",
+            }
+        )
+
+        self.assertFalse(formulario.is_valid())
+        self.assertIn("confirmar_password", formulario.errors)
+
+    def test_formulario_admin_conserva_la_password_si_se_deja_vacia(self):
+        usuario = self.crear_usuario(make_password("secreta"))
+        anterior = usuario.password
+
+        formulario = UsuarioAdminForm(
+            {"nombre": "Otro nombre", "correo": usuario.correo, "rol": self.rol.pk},
+            instance=usuario,
+        )
+        formulario.save()
+
+        usuario.refresh_from_db()
+        self.assertEqual(usuario.password, anterior)
+        self.assertEqual(usuario.nombre, "Otro nombre")
+
+
+class PerfilSesionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rol = Rol.objects.create(nombre=ModosRoles.ALUMNO, permisos={})
+        cls.alumnos = [
+            Estudiante.objects.create(
+                usuario=Usuario.objects.create(
+                    nombre=f"Alumno {i}", correo=f"alumno{i}@sed.test", rol=rol
+                ),
+                semestre="1",
+                carrera="Sistemas",
+            )
+            for i in range(2)
+        ]
+
+    def peticion(self, usuario):
+        request = RequestFactory().get("/")
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+            SesionService.crear_sesion(usuario)
+        )
+        return request
+
+    def test_perfil_de_la_sesion(self):
+        alumno = self.alumnos[0]
+
+        perfil = SesionService.get_perfil_o_404(
+            self.peticion(alumno.usuario), Estudiante, alumno.usuario_id
+        )
+
+        self.assertEqual(perfil.pk, alumno.pk)
+        self.assertEqual(perfil.usuario.nombre, alumno.usuario.nombre)
+
+    def test_perfil_de_otro_usuario(self):
+        with self.assertRaises(Http404):
+            SesionService.get_perfil_o_404(
+                self.peticion(self.alumnos[0].usuario), Estudiante, self.alumnos[1].usuario_id
+            )
+
+    def test_perfil_de_otro_modelo(self):
+        with self.assertRaises(Http404):
+            SesionService.get_perfil_o_404(self.peticion(self.alumnos[0].usuario), Docente)
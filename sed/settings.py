@@ -42,10 +42,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.InstrumentacionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.roles.middleware.PermisosMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -68,11 +70,41 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "sed.wsgi.application"
+ASGI_APPLICATION = "sed.asgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Manejo de conexiones (DB_CONEXIONES):
+#   "por_peticion": abre y cierra una conexión en cada petición.
+#   "persistente" (por defecto): cada hilo reutiliza su conexión durante
+#       DB_CONN_MAX_AGE segundos y comprueba que siga viva antes de usarla.
+#   "pool": pool de conexiones nativo de Django 5 (requiere psycopg 3 con
+#       psycopg[pool]); recomendado con ASGI, donde las conexiones persistentes
+#       no se reutilizan entre peticiones.
+#   "pgbouncer": detrás de PgBouncer en modo transacción, que ya agrupa las
+#       conexiones; se desactivan los cursores del lado del servidor.
+DB_MODOS_CONEXION = {
+    "por_peticion": {"CONN_MAX_AGE": 0},
+    "persistente": {
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+    },
+    "pool": {
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            "pool": {
+                "min_size": config("DB_POOL_MIN", default=2, cast=int),
+                "max_size": config("DB_POOL_MAX", default=20, cast=int),
+                "timeout": config("DB_POOL_TIMEOUT", default=10, cast=int),
+            }
+        },
+    },
+    "pgbouncer": {"CONN_MAX_AGE": 0, "DISABLE_SERVER_SIDE_CURSORS": True},
+}
+DB_CONEXIONES = config("DB_CONEXIONES", default="persistente")
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -81,17 +113,63 @@ DATABASES = {
         "PASSWORD": config('DB_PASSWORD'),
         "HOST": config('DB_HOST'),
         "PORT": config('DB_PORT', default='5432'),  
+        **DB_MODOS_CONEXION[DB_CONEXIONES],
     }
 }
 
-# para poder ver el tiempo de respuesta de la base de datos
-DEVSERVER_MODULES = [
-    "devserver.modules.sql.SQLRealTimeModule",  # Muestra consultas SQL en tiempo real
-    "devserver.modules.sql.SQLSummaryModule",  # Resumen de consultas SQL
-    "devserver.modules.profile.ProfileSummaryModule",  # Tiempo que tarda cada vista
-    "devserver.modules.request.SessionInfoModule",  # Información de sesión
-    "devserver.modules.cache.CacheSummaryModule",  # Uso del caché
-]
+# Caché de reportes y estadísticas.
+# CACHE_BACKEND: "locmem" (memoria del proceso, por defecto), "file" (compartida
+# entre procesos de un mismo servidor) o "redis" (producción; requiere el paquete
+# redis y CACHE_LOCATION=redis://host:6379/1, o un servidor compatible).
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "sed"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+    "dummy": ("django.core.cache.backends.dummy.DummyCache", ""),
+}
+CACHE_BACKEND, CACHE_LOCATION_DEFAULT = CACHE_BACKENDS[config("CACHE_BACKEND", default="locmem")]
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config("CACHE_LOCATION", default=CACHE_LOCATION_DEFAULT),
+        "TIMEOUT": config("CACHE_TIMEOUT", default=300, cast=int),
+        "KEY_PREFIX": config("CACHE_KEY_PREFIX", default="sed"),
+    }
+}
+
+# Instrumentación de vistas: tiempo, consultas SQL y consultas repetidas (N+1).
+# MUESTREO es la fracción de peticiones medidas (1.0 = todas, 0.05 = 5%).
+# Los valores por defecto son los de producción; en desarrollo se pueden
+# medir todas las peticiones y enviar las cabeceras con las variables de entorno.
+SED_INSTRUMENTACION = {
+    "ACTIVA": config("INSTRUMENTACION_ACTIVA", default=True, cast=bool),
+    "MUESTREO": config("INSTRUMENTACION_MUESTREO", default=0.05, cast=float),
+    "UMBRAL_LENTO_MS": config("INSTRUMENTACION_UMBRAL_LENTO_MS", default=500, cast=float),
+    "CABECERAS": config("INSTRUMENTACION_CABECERAS", default=False, cast=bool),
+}
+
+# Vistas asíncronas (ASGI): ejecutar las consultas independientes de una petición
+# en paralelo, cada una con su propia conexión. Desactivar si el número de
+# conexiones disponibles es bajo.
+SED_CONSULTAS_PARALELAS = config("CONSULTAS_PARALELAS", default=True, cast=bool)
+# Hilos (y por lo tanto conexiones) por proceso para esas consultas
+SED_CONSULTAS_PARALELAS_HILOS = config("CONSULTAS_PARALELAS_HILOS", default=16, cast=int)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "sed.instrumentacion": {
+            "handlers": ["console"],
+            "level": config("INSTRUMENTACION_LOG_LEVEL", default="WARNING"),
+            "propagate": False,
+        },
+    },
+}
 
 
 # Password validation
@@ -112,6 +190,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Los usuarios del sistema (usuarios.Usuario) inician sesión con correo y
+# contraseña; auth.User queda solo para el admin
+AUTHENTICATION_BACKENDS = [
+    "apps.usuarios.backends.UsuarioBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Factor de trabajo (iteraciones de PBKDF2) de las contraseñas. Más
+# iteraciones encarecen la fuerza bruta y cada inicio de sesión; al
+# cambiarlo, las contraseñas se re-cifran cuando su usuario inicia sesión
+SED_PASSWORD_ITERACIONES = config("PASSWORD_ITERACIONES", default=1_000_000, cast=int)
+
+# El primer hasher cifra las contraseñas nuevas; los demás solo verifican.
+# No se incluye PBKDF2PasswordHasher porque comparte algoritmo con el primero
+PASSWORD_HASHERS = [
+    "apps.usuarios.hashers.PBKDF2IteracionesPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Las sesiones guardan el usuario, su rol y su perfil (ver SesionService);
+# con cached_db se leen desde la caché y se conservan en la base de datos
+SESSION_ENGINE = config(
+    "SESSION_ENGINE", default="django.contrib.sessions.backends.cached_db"
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -131,6 +237,10 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Archivos generados (reportes en segundo plano); se descargan a través de
+# las vistas de comisión, no se publican con MEDIA_URL
+MEDIA_ROOT = config("MEDIA_ROOT", default=str(BASE_DIR / "media"))
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field